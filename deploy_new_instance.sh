@@ -135,6 +135,10 @@ RestartSec=10s
 WantedBy=multi-user.target
 EOF'
 
+# Configure the background job worker (release/unrelease archiving, result processing, emails)
+echo "⚙️  Setting up background job worker..."
+sudo cp /home/ubuntu/edulytics/run_jobs.service /etc/systemd/system/run_jobs.service
+
 # Configure Nginx
 echo "🔌 Configuring Nginx..."
 sudo bash -c 'cat > /etc/nginx/sites-available/default << EOF
@@ -175,6 +179,8 @@ echo "🚀 Starting services..."
 sudo systemctl daemon-reload
 sudo systemctl enable gunicorn
 sudo systemctl start gunicorn
+sudo systemctl enable run_jobs
+sudo systemctl restart run_jobs
 sudo systemctl enable nginx
 sudo systemctl restart nginx
 
@@ -185,6 +191,9 @@ echo ""
 echo "Gunicorn status:"
 sudo systemctl status gunicorn --no-pager | head -5
 echo ""
+echo "Job worker status:"
+sudo systemctl status run_jobs --no-pager | head -5
+echo ""
 echo "Nginx status:"
 sudo systemctl status nginx --no-pager | head -5
 echo ""
@@ -16,6 +16,7 @@ pymysql.install_as_MySQLdb()
 
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -55,6 +56,14 @@ if _env_csrf_origins:
     CSRF_TRUSTED_ORIGINS = _env_csrf_origins
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+# Point at a local OpenAI-compatible server (e.g. a fake endpoint in tests); default is api.openai.com
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
+AI_REQUEST_TIMEOUT = float(os.getenv('AI_REQUEST_TIMEOUT', '60'))
+AI_REQUEST_MAX_RETRIES = int(os.getenv('AI_REQUEST_MAX_RETRIES', '3'))
+AI_RECOMMENDATION_CONCURRENCY = int(os.getenv('AI_RECOMMENDATION_CONCURRENCY', '4'))
+# Persistent cache of AI answers keyed by a hash of the prompt (see main/services/ai_cache.py)
+AI_RECOMMENDATION_CACHE_TTL = int(os.getenv('AI_RECOMMENDATION_CACHE_TTL', str(7 * 24 * 60 * 60)))
+AI_RECOMMENDATION_CACHE_MAX_ENTRIES = int(os.getenv('AI_RECOMMENDATION_CACHE_MAX_ENTRIES', '5000'))
 SECRET_KEY = os.getenv('SECRET_KEY')
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND')
 EMAIL_HOST = os.getenv('EMAIL_HOST')
@@ -64,8 +73,19 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL')
 SERVER_EMAIL = os.getenv('SERVER_EMAIL')
+# Bulk notifications open one SMTP connection per batch of this many recipients
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', '100'))
 SITE_URL = os.getenv('SITE_URL', 'http://13.211.104.201')
 
+# Background jobs (python manage.py run_jobs): a running job whose heartbeat is
+# older than this is assumed dead and handed to another worker
+JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '300'))
+
+# Excel account import: rows per bulk insert/update, and processes used to hash
+# passwords (unset = one per CPU)
+ACCOUNT_IMPORT_BATCH_SIZE = int(os.getenv('ACCOUNT_IMPORT_BATCH_SIZE', '500'))
+ACCOUNT_IMPORT_HASH_WORKERS = int(os.getenv('ACCOUNT_IMPORT_HASH_WORKERS', '0')) or None
+
 
 # =============================================================================
 # EMAIL CONFIGURATION - Edulytics Alert System
@@ -102,6 +122,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'main.middleware.RequestMetricsMiddleware',  # Per-request timing/SQL metrics (see /request-metrics/)
     'main.middleware.NoCacheMiddleware',
     'main.middleware.RestrictAdminMiddleware',  # Restrict admin access to superusers only
     'django_user_agents.middleware.UserAgentMiddleware',
@@ -190,18 +211,59 @@ else:
         }
     }
 
-# Cache Configuration - Using Redis would be better, but locmem works for now
-# Add timeout for cache to improve performance
+# Cache Configuration
+# The cache is shared by every gunicorn worker (and survives restarts), so rate
+# limits and cached data are consistent between workers. CACHE_BACKEND selects:
+#   file   - files under CACHE_LOCATION (default; no setup needed)
+#   db     - a database table; run `python manage.py createcachetable` once
+#   redis  - Redis at CACHE_LOCATION, e.g. redis://127.0.0.1:6379/1 (needs `redis`)
+#   locmem - per-process memory; tests and local development only
+# Code should go through main.services.shared_cache for namespaced keys.
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file').lower()
+CACHE_BACKENDS = {
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+CACHE_DEFAULT_LOCATIONS = {
+    'file': os.path.join(tempfile.gettempdir(), 'edulytics_cache'),
+    'db': 'edulytics_cache',
+    'redis': 'redis://127.0.0.1:6379/1',
+    'locmem': 'edulytics',
+}
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]),
         'TIMEOUT': 300,  # 5-minute cache timeout
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000
-        }
+        'KEY_PREFIX': 'edulytics',
     }
 }
+if CACHE_BACKEND != 'redis':
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '10000'))
+    }
+# Seconds between flushes of per-process cache hit/miss counters to the shared cache
+CACHE_METRICS_FLUSH_INTERVAL = int(os.getenv('CACHE_METRICS_FLUSH_INTERVAL', '10'))
+
+# Per-request metrics (main.middleware.RequestMetricsMiddleware): samples of the
+# last REQUEST_METRICS_BUFFER_SIZE requests per process, each process's
+# per-endpoint totals stored under its own shared cache key every
+# REQUEST_METRICS_FLUSH_INTERVAL seconds (summed by the dashboard), and
+# requests slower than REQUEST_METRICS_SLOW_MS logged with their queries
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True').lower() == 'true'
+REQUEST_METRICS_SLOW_MS = int(os.getenv('REQUEST_METRICS_SLOW_MS', '1000'))
+REQUEST_METRICS_BUFFER_SIZE = int(os.getenv('REQUEST_METRICS_BUFFER_SIZE', '500'))
+REQUEST_METRICS_FLUSH_INTERVAL = int(os.getenv('REQUEST_METRICS_FLUSH_INTERVAL', '10'))
+
+# Rendered evaluation report PDFs (main.services.report_artifacts): directory
+# shared by all workers, and total size kept before the least recently
+# downloaded reports are evicted
+REPORT_ARTIFACT_DIR = os.getenv('REPORT_ARTIFACT_DIR', os.path.join(tempfile.gettempdir(), 'edulytics_reports'))
+REPORT_ARTIFACT_MAX_BYTES = int(os.getenv('REPORT_ARTIFACT_MAX_BYTES', str(512 * 1024 * 1024)))
+# Processes used by `python manage.py prerender_reports` (unset = one per CPU)
+REPORT_PRERENDER_WORKERS = int(os.getenv('REPORT_PRERENDER_WORKERS', '0')) or None
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -249,6 +249,93 @@ class EvaluationHistoryAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         return request.user.is_superuser  # Only superusers can delete
 
+# Register EvaluationCycle
+@admin.register(EvaluationCycle)
+class EvaluationCycleAdmin(admin.ModelAdmin):
+    list_display = ('name', 'started_at', 'created_at')
+    search_fields = ('name', 'periods__name')
+    ordering = ('-started_at',)
+
+    def has_add_permission(self, request):
+        return False  # Cycles are created when periods are released
+
+# Register RankingSnapshot
+@admin.register(RankingSnapshot)
+class RankingSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('evaluation_period', 'institute', 'role', 'rank', 'user', 'score', 'percentile')
+    list_filter = ('evaluation_period', 'institute', 'role')
+    search_fields = ('user__username', 'user__first_name', 'user__last_name', 'evaluation_period__name')
+    ordering = ('evaluation_period', 'institute', 'role', 'rank')
+    
+    def has_add_permission(self, request):
+        return False  # Snapshots are written when a period's results are finalized
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Register EvaluationAggregate
+@admin.register(EvaluationAggregate)
+class EvaluationAggregateAdmin(admin.ModelAdmin):
+    list_display = ('evaluatee', 'evaluation_period', 'evaluation_type', 'section_code', 'response_count', 'updated_at')
+    list_filter = ('evaluation_type', 'evaluation_period')
+    search_fields = ('evaluatee__username', 'evaluatee__first_name', 'evaluatee__last_name', 'section_code')
+    ordering = ('evaluation_period', 'evaluatee', 'evaluation_type')
+
+    def has_add_permission(self, request):
+        return False  # Aggregates are updated by submissions (rebuild_evaluation_aggregates to recompute)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Register ProfileDashboardSnapshot
+@admin.register(ProfileDashboardSnapshot)
+class ProfileDashboardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('user', 'role', 'evaluation_period', 'is_stale', 'built_at')
+    list_filter = ('role', 'is_stale', 'evaluation_period')
+    search_fields = ('user__username', 'user__first_name', 'user__last_name')
+    ordering = ('-built_at',)
+
+    def has_add_permission(self, request):
+        return False  # Snapshots are built when results are processed or on first view
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Register AiRecommendationCacheEntry
+@admin.register(AiRecommendationCacheEntry)
+class AiRecommendationCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('key', 'user', 'evaluation_type', 'section_code', 'model_name', 'hit_count', 'last_accessed_at', 'expires_at')
+    list_filter = ('evaluation_type', 'model_name')
+    search_fields = ('key', 'user__username', 'section_code')
+    ordering = ('-last_accessed_at',)
+    
+    def has_add_permission(self, request):
+        return False  # Entries are written by the AI service
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+# Register BackgroundJob
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'status', 'progress', 'attempts', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'dedupe_key', 'locked_by')
+    readonly_fields = ('created_at', 'started_at', 'heartbeat_at', 'finished_at')
+    ordering = ('-created_at',)
+
+# Register EmailDeliveryLog
+@admin.register(EmailDeliveryLog)
+class EmailDeliveryLogAdmin(admin.ModelAdmin):
+    list_display = ('started_at', 'notification', 'evaluation_type', 'status', 'recipient_count', 'sent_count', 'failed_count', 'duration_seconds')
+    list_filter = ('notification', 'evaluation_type', 'status')
+    search_fields = ('subject', 'error')
+    readonly_fields = [field.name for field in EmailDeliveryLog._meta.fields]
+    ordering = ('-started_at',)
+
+    def has_add_permission(self, request):
+        return False  # Written by BulkEmailService only
+
 # Register AdminActivityLog
 @admin.register(AdminActivityLog)
 class AdminActivityLogAdmin(admin.ModelAdmin):
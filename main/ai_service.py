@@ -1,99 +1,104 @@
 import openai
 import json
+import logging
+import random
 import re
+import time
 from django.conf import settings
 from openai import OpenAI
 
+from main.services.ai_cache import AIRecommendationCacheService
+from main.services.sentiment import SentimentClassifier
+
+# Transient API failures worth retrying: 429, 5xx, timeouts and dropped connections
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+)
+
+logger = logging.getLogger(__name__)
+
 class TeachingAIRecommendationService:
     """
     AI service for generating teaching recommendations using GPT-4o
     Can be used by Coordinator, Dean, and Faculty views with evaluation type support
     """
     
-    def __init__(self):
+    MODEL = "gpt-4o"
+    
+    def __init__(self, timeout=None, max_retries=None, retry_backoff=1.0):
         self.api_key = settings.OPENAI_API_KEY
-        self.client = OpenAI(api_key=self.api_key)
+        self.timeout = timeout or getattr(settings, 'AI_REQUEST_TIMEOUT', 60)
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'AI_REQUEST_MAX_RETRIES', 3)
+        self.retry_backoff = retry_backoff
+        # Retries are handled in _create_completion so backoff is explicit and logged
+        self.client = OpenAI(
+            api_key=self.api_key,
+            base_url=getattr(settings, 'OPENAI_BASE_URL', None),
+            timeout=self.timeout,
+            max_retries=0,
+        )
+    
+    def _create_completion(self, **kwargs):
+        """Call the chat completions API, retrying 429/5xx/timeouts with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.client.chat.completions.create(**kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_backoff * (2 ** attempt) + random.uniform(0, self.retry_backoff)
+                response = getattr(e, 'response', None)
+                retry_after = response.headers.get('retry-after') if response is not None else None
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                logger.warning(
+                    f"AI request failed ({type(e).__name__}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                time.sleep(delay)
     
     @staticmethod
     def analyze_comment_sentiment(comment):
         """
         Analyze sentiment of a comment to categorize as positive, negative, mixed, or neutral
         Returns: 'positive', 'negative', 'mixed', or 'neutral'
+        Uses the compiled keyword classifier in main.services.sentiment.
         """
-        if not comment or not isinstance(comment, str):
-            return 'neutral'
-        
-        comment_lower = comment.lower()
-        
-        # Keywords for sentiment analysis - EXPANDED
-        positive_indicators = [
-            'excellent', 'great', 'good', 'wonderful', 'amazing', 'helpful',
-            'clear', 'engaging', 'knowledgeable', 'patient', 'friendly',
-            'caring', 'supportive', 'effective', 'love', 'best', 'awesome',
-            'fantastic', 'outstanding', 'brilliant', 'inspiring', 'dedicated',
-            'like', 'enjoyed', 'appreciate', 'thank', 'professional', 'nice',
-            'kind', 'understanding', 'thorough', 'organized', 'well', 'positive'
-        ]
-        
-        negative_indicators = [
-            'poor', 'bad', 'terrible', 'worst', 'boring', 'confusing',
-            'unclear', 'unfair', 'difficult', 'hard', 'hate', 'dislike',
-            'unprofessional', 'rude', 'unhelpful', 'lazy', 'absent',
-            'disorganized', 'disappointing', 'frustrating', 'inadequate',
-            'abused', 'abuse', 'strict', 'harsh', 'intimidating', 'mean',
-            'slow', 'waste', 'useless', 'horrible', 'awful'
-        ]
-        
-        # Mixed/constructive feedback indicators
-        mixed_indicators = [
-            'but', 'however', 'although', 'sometimes', 'though',
-            'could be', 'should be', 'would be better', 'except',
-            'needs', 'improve', 'wish'
-        ]
-        
-        # Count occurrences
-        positive_count = sum(1 for word in positive_indicators if word in comment_lower)
-        negative_count = sum(1 for word in negative_indicators if word in comment_lower)
-        has_mixed_indicator = any(indicator in comment_lower for indicator in mixed_indicators)
-        
-        # Determine sentiment
-        # If has mixed indicator (like "but"), treat as mixed
-        if has_mixed_indicator:
-            return 'mixed'
-        elif (positive_count > 0 and negative_count > 0):
-            return 'mixed'
-        elif positive_count > negative_count:
-            return 'positive'
-        elif negative_count > positive_count:
-            return 'negative'
-        else:
-            # If no clear sentiment but has text, treat as mixed for review
-            return 'mixed' if len(comment.strip()) > 10 else 'neutral'
+        return SentimentClassifier.label(comment)
     
-    def get_recommendations(self, user, section_data=None, section_code=None, role="Educator", evaluation_type="student"):
-        """Get AI-powered recommendations for any user role with evaluation type support"""
+    def get_recommendations(self, user, section_data=None, section_code=None, role="Educator", evaluation_type="student",
+                            ranking_data=None, use_cache=True, raise_errors=False):
+        """
+        Get AI-powered recommendations for any user role with evaluation type support
+        Pass ranking_data to skip the ranking lookup (e.g. when called from worker threads)
+        Successful answers are cached by prompt hash; use_cache=False forces a fresh call
+        Failures return the contextual fallback; raise_errors=True raises instead,
+        so batch callers can count them rather than save the fallback text
+        """
         print(f"🔍 AI Service Called - Section: {section_code}, Role: {role}, Evaluation Type: {evaluation_type}, Has Data: {section_data and section_data.get('has_data')}")
         
         try:
             # Prepare the context for the AI with evaluation type
-            context = self._prepare_ai_context(user, section_data, section_code, role, evaluation_type)
+            context = self._prepare_ai_context(user, section_data, section_code, role, evaluation_type, ranking_data)
             
             print(f"📝 AI Context Prepared - Section: {section_code}, Evaluation Type: {evaluation_type}")
             
             # Get the appropriate system prompt based on evaluation type
             system_prompt = self._get_system_prompt(evaluation_type)
             
-            # Call GPT-4o
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Generate 3 recommendations based on this data:
+            messages = [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": f"""Generate 3 recommendations based on this data:
 
 {context}
 
@@ -106,8 +111,22 @@ Look at the "STUDENT COMMENTS" section above. If student comments are provided:
 If NO student comments are provided, state "No comments available" and base recommendations on scores only.
 
 Generate 3 recommendations following the EXACT format from the system prompt:"""
-                    }
-                ],
+                }
+            ]
+            
+            # Identical prompts are answered from the persistent cache
+            cache_key = None
+            if use_cache:
+                cache_key = AIRecommendationCacheService.make_key(self.MODEL, messages)
+                cached = AIRecommendationCacheService.get(cache_key)
+                if cached:
+                    print(f"⚡ AI Cache Hit - Section: {section_code}, Evaluation Type: {evaluation_type}")
+                    return cached
+            
+            # Call GPT-4o
+            response = self._create_completion(
+                model=self.MODEL,
+                messages=messages,
                 max_tokens=1500,
                 temperature=0.7
             )
@@ -120,13 +139,26 @@ Generate 3 recommendations following the EXACT format from the system prompt:"""
             
             # Check if we got meaningful recommendations
             if not recommendations or len(recommendations) == 0:
+                if raise_errors:
+                    raise ValueError("No recommendations could be parsed from the AI response")
                 print(f"⚠️ No recommendations parsed, using contextual fallback")
                 return self._get_contextual_fallback(section_data, role, section_code, evaluation_type)
             
             print(f"✅ Generated {len(recommendations)} AI recommendations for {evaluation_type} evaluation")
+            if cache_key:
+                AIRecommendationCacheService.set(
+                    cache_key,
+                    recommendations,
+                    self.MODEL,
+                    user=user,
+                    evaluation_type=evaluation_type,
+                    section_code=section_code
+                )
             return recommendations
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"❌ AI Recommendation Error for {evaluation_type}: {e}")
             import traceback
             traceback.print_exc()
@@ -238,7 +270,7 @@ Analyze in this order:
 
 Format: 3 specific recommendations. Include direct student quotes ONLY if they are provided in the data."""
 
-    def _prepare_ai_context(self, user, section_data, section_code, role, evaluation_type):
+    def _prepare_ai_context(self, user, section_data, section_code, role, evaluation_type, ranking_data=None):
         """Prepare context with evaluation type support"""
         context_parts = []
         
@@ -248,8 +280,9 @@ Format: 3 specific recommendations. Include direct student quotes ONLY if they a
         context_parts.append(f"Evaluation Type: {evaluation_type.upper()}")
         
         # Add ranking information if available - MAKE IT PROMINENT
-        from main.views import calculate_user_ranking
-        ranking_data = calculate_user_ranking(user)
+        if ranking_data is None:
+            from main.views import calculate_user_ranking
+            ranking_data = calculate_user_ranking(user)
         if ranking_data.get('rank'):
             context_parts.append("\n🏆 INSTITUTE RANKING (CRITICAL CONTEXT):")
             context_parts.append(f"   Current Rank: {ranking_data.get('rank')} out of {ranking_data.get('total_users')} {user.userprofile.role}s in {user.userprofile.institute}")
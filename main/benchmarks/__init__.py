@@ -0,0 +1,5 @@
+"""
+Micro-benchmarks for the scoring, ranking and archiving functions: a seeded
+synthetic dataset (dataset), the benchmarked calls (cases) and the timing,
+report and baseline comparison (harness). Run with `python manage.py benchmark`.
+"""
@@ -0,0 +1,67 @@
+"""
+The benchmarked functions. Each case takes the dataset context and returns the
+number of items it produced (scores computed, results written, rows archived),
+which the report keeps next to the timings so a "fast" run that silently did
+nothing is visible. Per-user functions are called for a fixed sample of
+instructors so one timing covers many lookups.
+"""
+from main.views import (
+    calculate_user_ranking, compute_category_scores, compute_peer_scores, get_rating_distribution,
+    move_current_results_to_history, process_dean_evaluation_results, process_evaluation_period_to_results,
+)
+
+SAMPLE_SIZE = 50
+
+
+def bench_compute_category_scores(context):
+    period = context['periods']['student']
+    for instructor, section_code in context['teaching'][:SAMPLE_SIZE]:
+        compute_category_scores(instructor, section_code, period)
+    return min(SAMPLE_SIZE, len(context['teaching']))
+
+
+def bench_compute_peer_scores(context):
+    period = context['periods']['peer']
+    for instructor in context['instructors'][:SAMPLE_SIZE]:
+        compute_peer_scores(instructor, period)
+    return min(SAMPLE_SIZE, len(context['instructors']))
+
+
+def bench_get_rating_distribution(context):
+    period = context['periods']['student']
+    for instructor in context['instructors'][:SAMPLE_SIZE]:
+        get_rating_distribution(instructor, period)
+    return min(SAMPLE_SIZE, len(context['instructors']))
+
+
+def bench_calculate_user_ranking(context):
+    period = context['periods']['student']
+    ranked = 0
+    for instructor in context['instructors'][:SAMPLE_SIZE]:
+        if calculate_user_ranking(instructor, period).get('rank'):
+            ranked += 1
+    return ranked
+
+
+def bench_process_evaluation_period_to_results(context):
+    return process_evaluation_period_to_results(context['periods']['student'])
+
+
+def bench_move_current_results_to_history(context):
+    return move_current_results_to_history()
+
+
+def bench_process_dean_evaluation_results(context):
+    return process_dean_evaluation_results(context['periods']['dean']).get('processed_count', 0)
+
+
+# name -> case, in run order
+CASES = {
+    'compute_category_scores': bench_compute_category_scores,
+    'compute_peer_scores': bench_compute_peer_scores,
+    'get_rating_distribution': bench_get_rating_distribution,
+    'calculate_user_ranking': bench_calculate_user_ranking,
+    'process_evaluation_period_to_results': bench_process_evaluation_period_to_results,
+    'move_current_results_to_history': bench_move_current_results_to_history,
+    'process_dean_evaluation_results': bench_process_dean_evaluation_results,
+}
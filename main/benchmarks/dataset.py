@@ -0,0 +1,232 @@
+"""
+Seeded synthetic campus with closed student, peer and dean periods, sized by
+the number of student responses.
+
+For ``responses`` student responses the dataset has ``responses / 6`` students
+in sections of 40, six instructors per section (each teaching three sections),
+one dean per institute, three peer responses per instructor and one dean
+response per instructor. Answers are drawn from a fixed-seed generator, so two
+runs with the same size and seed produce identical data and identical results.
+
+Rows are bulk-inserted without signals, so the running EvaluationAggregate
+rows are rebuilt at the end and the student period is processed once, leaving
+EvaluationResult rows and ranking snapshots as after a real period close.
+"""
+import logging
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from main.constants import RATING_NUMERIC_REVERSE
+from main.models import (
+    Course, DeanEvaluationResponse, EvaluationPeriod, EvaluationResponse, Institute, Role, Section,
+    SectionAssignment, UserProfile,
+)
+from main.services.evaluation_aggregate import EvaluationAggregateService
+from main.services.evaluation_submission import AGREEMENT_ANSWERS
+
+logger = logging.getLogger(__name__)
+
+STUDENTS_PER_SECTION = 40
+INSTRUCTORS_PER_SECTION = 6
+SECTIONS_PER_INSTRUCTOR = 3
+PEERS_PER_INSTRUCTOR = 3
+INSTITUTES = [
+    ('Institute of Computing Studies', 'ICS'),
+    ('Institute of Business', 'IBM'),
+    ('Institute of Education', 'IED'),
+]
+BATCH_SIZE = 2000
+
+STUDENT_ANSWERS = [RATING_NUMERIC_REVERSE[value] for value in range(1, 6)]
+DEAN_ANSWERS = [AGREEMENT_ANSWERS[str(value)] for value in range(1, 6)]
+# Ratings lean positive, as they do in real evaluations
+ANSWER_WEIGHTS = [3, 7, 20, 35, 35]
+
+
+class BenchmarkDataset:
+    """Generate the benchmark data into the current (test) database."""
+
+    def __init__(self, responses=100_000, seed=1234):
+        self.responses = responses
+        self.rng = random.Random(seed)
+        self.students = max(1, -(-responses // INSTRUCTORS_PER_SECTION))
+        self.sections = max(1, -(-self.students // STUDENTS_PER_SECTION))
+        self.instructors = max(
+            INSTRUCTORS_PER_SECTION, self.sections * INSTRUCTORS_PER_SECTION // SECTIONS_PER_INSTRUCTOR
+        )
+        self.periods = {}
+
+    @staticmethod
+    def student_number(index):
+        return f'{10 + index // 10000:02d}-{index % 10000:04d}'
+
+    def answers(self, labels, count):
+        return {
+            f'question{number}': answer
+            for number, answer in enumerate(self.rng.choices(labels, ANSWER_WEIGHTS, k=count), start=1)
+        }
+
+    def generate(self):
+        """
+        Create everything and return a context for the cases:
+        {'periods': {'student'|'peer'|'dean': EvaluationPeriod},
+         'instructors': [User, ...], 'teaching': [(User, section_code), ...]}
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            for evaluation_type in ('student', 'peer', 'dean'):
+                self.periods[evaluation_type] = EvaluationPeriod.objects.create(
+                    name='Benchmark Semester',
+                    evaluation_type=evaluation_type,
+                    start_date=now - timedelta(days=30),
+                    end_date=now + timedelta(days=1),
+                    is_active=False,
+                )
+            institutes = [
+                Institute.objects.create(name=name, code=code) for name, code in INSTITUTES
+            ]
+            courses = [
+                Course.objects.create(name=f'{institute.code} Program', code=institute.code, institute=institute)
+                for institute in institutes
+            ]
+
+            codes = [f'B{n:05d}' for n in range(self.sections)]
+            Section.objects.bulk_create(
+                [Section(code=code, year_level=n % 4 + 1) for n, code in enumerate(codes)], batch_size=BATCH_SIZE
+            )
+            section_ids = dict(Section.objects.values_list('code', 'id'))
+
+            password = make_password('benchmark123')
+            dean_ids = self._users('dean', len(institutes), password)
+            instructor_ids = self._users('instructor', self.instructors, password)
+            student_ids = self._users('student', self.students, password)
+
+            # Instructors and sections are spread over the institutes round-robin
+            def institute_of(index):
+                return institutes[index % len(institutes)]
+
+            profiles = [
+                UserProfile(user_id=user_id, role=Role.DEAN, institute=institutes[d].name)
+                for d, user_id in enumerate(dean_ids)
+            ]
+            profiles += [
+                UserProfile(user_id=user_id, role=Role.FACULTY, institute=institute_of(m).name)
+                for m, user_id in enumerate(instructor_ids)
+            ]
+            profiles += [
+                UserProfile(
+                    user_id=user_id,
+                    role=Role.STUDENT,
+                    institute=institute_of(k // STUDENTS_PER_SECTION).name,
+                    course=courses[(k // STUDENTS_PER_SECTION) % len(courses)].name,
+                    studentnumber=self.student_number(k),
+                    section_id=section_ids[codes[k // STUDENTS_PER_SECTION]],
+                )
+                for k, user_id in enumerate(student_ids)
+            ]
+            UserProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+
+            teaching = {
+                n: [instructor_ids[(n * INSTRUCTORS_PER_SECTION + j) % self.instructors]
+                    for j in range(INSTRUCTORS_PER_SECTION)]
+                for n in range(self.sections)
+            }
+            SectionAssignment.objects.bulk_create([
+                SectionAssignment(user_id=user_id, section_id=section_ids[codes[n]], role='faculty')
+                for n, user_ids in teaching.items()
+                for user_id in user_ids
+            ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+            self._student_responses(student_ids, codes, teaching)
+            self._staff_responses(instructor_ids, dean_ids, institutes)
+
+        EvaluationAggregateService.rebuild(period_ids=[period.id for period in self.periods.values()])
+
+        # Leave the student period processed, as it is after a real close
+        from main.views import process_evaluation_period_to_results
+        process_evaluation_period_to_results(self.periods['student'])
+
+        instructors = list(User.objects.filter(id__in=instructor_ids).select_related('userprofile').order_by('id'))
+        by_id = {user.id: user for user in instructors}
+        logger.info(
+            f'Benchmark dataset: {self.students} students, {self.sections} sections, '
+            f'{self.instructors} instructors, ~{self.responses} student responses'
+        )
+        return {
+            'periods': self.periods,
+            'instructors': instructors,
+            'teaching': [
+                (by_id[user_id], codes[n]) for n, user_ids in sorted(teaching.items()) for user_id in user_ids
+            ],
+        }
+
+    def _users(self, kind, count, password):
+        usernames = [f'bench.{kind}{n}' for n in range(count)]
+        User.objects.bulk_create([
+            User(username=username, email=f'{username}@cca.edu.ph', first_name=kind.capitalize(),
+                 last_name=str(n), password=password)
+            for n, username in enumerate(usernames)
+        ], batch_size=BATCH_SIZE)
+        ids = dict(User.objects.filter(username__startswith=f'bench.{kind}').values_list('username', 'id'))
+        return [ids[username] for username in usernames]
+
+    def _student_responses(self, student_ids, codes, teaching):
+        period = self.periods['student']
+        batch = []
+        count = 0
+        for k, student_id in enumerate(student_ids):
+            n = k // STUDENTS_PER_SECTION
+            for instructor_id in teaching[n]:
+                if count >= self.responses:
+                    break
+                batch.append(EvaluationResponse(
+                    evaluator_id=student_id,
+                    evaluatee_id=instructor_id,
+                    evaluation_period=period,
+                    student_number=self.student_number(k),
+                    student_section=codes[n],
+                    submitted_at=period.start_date + timedelta(minutes=k % (60 * 24 * 28)),
+                    comments='',
+                    **self.answers(STUDENT_ANSWERS, 19)
+                ))
+                count += 1
+            if len(batch) >= BATCH_SIZE:
+                EvaluationResponse.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                batch = []
+        if batch:
+            EvaluationResponse.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+    def _staff_responses(self, instructor_ids, dean_ids, institutes):
+        peer_period, dean_period = self.periods['peer'], self.periods['dean']
+        peers = []
+        deans = []
+        for m, instructor_id in enumerate(instructor_ids):
+            institute = institutes[m % len(institutes)]
+            # The next few instructors of the same institute
+            colleagues = instructor_ids[m % len(institutes)::len(institutes)]
+            position = m // len(institutes)
+            for offset in range(1, min(PEERS_PER_INSTRUCTOR, len(colleagues) - 1) + 1):
+                peers.append(EvaluationResponse(
+                    evaluator_id=instructor_id,
+                    evaluatee_id=colleagues[(position + offset) % len(colleagues)],
+                    evaluation_period=peer_period,
+                    student_section=f'{institute.name} Staff',
+                    submitted_at=peer_period.start_date + timedelta(hours=m % 600),
+                    comments='',
+                    **self.answers(STUDENT_ANSWERS, 15)
+                ))
+            deans.append(DeanEvaluationResponse(
+                evaluator_id=instructor_id,
+                evaluatee_id=dean_ids[m % len(dean_ids)],
+                evaluation_period=dean_period,
+                submitted_at=dean_period.start_date + timedelta(hours=m % 600),
+                comments='',
+                **self.answers(DEAN_ANSWERS, 15)
+            ))
+        EvaluationResponse.objects.bulk_create(peers, batch_size=BATCH_SIZE)
+        DeanEvaluationResponse.objects.bulk_create(deans, batch_size=BATCH_SIZE)
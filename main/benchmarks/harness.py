@@ -0,0 +1,134 @@
+"""
+Timing, reporting and baseline comparison for the benchmark cases.
+
+Every run of a case happens inside a transaction that is rolled back and
+starts from an empty cache, so destructive cases (archiving deletes the
+results) and cached lookups (rankings) see the same state on every run and
+the runs are comparable. Warm-up runs are discarded; the median of the rest is
+the number compared between commits. Query counts are deterministic for a given
+dataset, so any increase over the baseline counts as a regression.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Time differences below this are noise, whatever the relative change
+MIN_REGRESSION_MS = 1.0
+
+
+class BenchmarkHarness:
+    """Run cases against a dataset context and compare reports."""
+
+    def __init__(self, context, repeat=5, warmup=1):
+        self.context = context
+        self.repeat = max(1, repeat)
+        self.warmup = max(0, warmup)
+
+    def run_case(self, case):
+        """
+        {'median_ms', 'min_ms', 'mean_ms', 'stdev_ms', 'runs', 'queries', 'items'}
+        for ``case`` over ``repeat`` measured runs.
+        """
+        timings = []
+        queries = items = None
+        for run in range(self.warmup + self.repeat):
+            cache.clear()
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    items = case(self.context)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                transaction.set_rollback(True)
+            if run >= self.warmup:
+                timings.append(elapsed_ms)
+                queries = len(captured)
+        return {
+            'median_ms': round(statistics.median(timings), 3),
+            'min_ms': round(min(timings), 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'stdev_ms': round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+            'runs': len(timings),
+            'queries': queries,
+            'items': items,
+        }
+
+    def run(self, cases, meta=None, progress=None):
+        """Run ``cases`` ({name: case}) and return the report dict."""
+        results = {}
+        for name, case in cases.items():
+            results[name] = self.run_case(case)
+            if progress:
+                progress(name, results[name])
+        return {
+            'meta': dict(
+                meta or {},
+                commit=current_commit(),
+                created_at=timezone.now().isoformat(),
+                database=connection.vendor,
+                python=platform.python_version(),
+                repeat=self.repeat,
+                warmup=self.warmup,
+            ),
+            'results': results,
+        }
+
+    @staticmethod
+    def compare(report, baseline, threshold=0.25):
+        """
+        Regressions of ``report`` against ``baseline``, as messages: a median
+        more than ``threshold`` (a fraction) and MIN_REGRESSION_MS slower, more
+        queries, or a different number of items. Raises ValueError when the
+        baseline was measured on a different dataset.
+        """
+        for key in ('responses', 'seed'):
+            if report['meta'].get(key) != baseline['meta'].get(key):
+                raise ValueError(
+                    f"Baseline was measured with {key}={baseline['meta'].get(key)}, "
+                    f"this run with {key}={report['meta'].get(key)}"
+                )
+
+        regressions = []
+        for name, result in report['results'].items():
+            before = baseline['results'].get(name)
+            if before is None:
+                continue
+            slower_ms = result['median_ms'] - before['median_ms']
+            if slower_ms > before['median_ms'] * threshold and slower_ms >= MIN_REGRESSION_MS:
+                regressions.append(
+                    f"{name}: {result['median_ms']:.1f} ms vs {before['median_ms']:.1f} ms "
+                    f"(+{slower_ms:.1f} ms, limit +{threshold:.0%})"
+                )
+            if (result['queries'] or 0) > (before['queries'] or 0):
+                regressions.append(f"{name}: {result['queries']} queries vs {before['queries']}")
+            if result['items'] != before['items']:
+                regressions.append(f"{name}: produced {result['items']} items vs {before['items']}")
+        return regressions
+
+    @staticmethod
+    def load(path):
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+
+    @staticmethod
+    def save(report, path):
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+
+def current_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
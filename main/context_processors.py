@@ -1,42 +1,13 @@
-from main.models import EvaluationPeriod, Evaluation
+from main.services.release_state import ReleaseStateRegistry
 
 def evaluation_context(request):
     """
-    Context processor to make evaluation status available in all templates
+    Context processor to make evaluation status available in all templates.
+    Read from the cached release-state registry, so a render makes no queries.
     """
-    # Check if there's both an active upward evaluation period AND a released evaluation
-    upward_evaluation_active = False
-    
-    active_period = EvaluationPeriod.objects.filter(
-        evaluation_type='upward',
-        is_active=True
-    ).first()
-    
-    if active_period:
-        # Check if there's a released evaluation linked to this period
-        upward_evaluation_active = Evaluation.objects.filter(
-            evaluation_type='upward',
-            evaluation_period=active_period,
-            is_released=True
-        ).exists()
-    
-    # Check for student upward evaluation (Student → Coordinator)
-    student_upward_evaluation_active = False
-    
-    student_upward_period = EvaluationPeriod.objects.filter(
-        evaluation_type='student_upward',
-        is_active=True
-    ).first()
-    
-    if student_upward_period:
-        # Check if there's a released evaluation linked to this period
-        student_upward_evaluation_active = Evaluation.objects.filter(
-            evaluation_type='student_upward',
-            evaluation_period=student_upward_period,
-            is_released=True
-        ).exists()
-    
+    # Upward / student upward (Student → Coordinator) evaluations are active when
+    # there's both an active period AND a released evaluation linked to it
     return {
-        'upward_evaluation_active': upward_evaluation_active,
-        'student_upward_evaluation_active': student_upward_evaluation_active
+        'upward_evaluation_active': ReleaseStateRegistry.is_open('upward'),
+        'student_upward_evaluation_active': ReleaseStateRegistry.is_open('student_upward')
     }
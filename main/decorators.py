@@ -1,12 +1,13 @@
 # decorators.py
 from django.shortcuts import render
 from django.http import HttpResponseForbidden
-from django.core.cache import cache
 import time
 import logging
+from functools import wraps
 
 from main.models import Evaluation
 from .utils import can_view_evaluation_results
+from main.services.shared_cache import rate_limit_cache
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,19 @@ def profile_settings_allowed(view_func):
         return view_func(request, *args, **kwargs)
     return wrapped_view
 
+def revalidate_privately(view_func):
+    """
+    Let the browser store a per-user response and revalidate it with its ETag
+    (If-None-Match -> 304) instead of NoCacheMiddleware's no-store. Put it
+    outside @condition so 304 responses are marked too.
+    """
+    @wraps(view_func)
+    def wrapped_view(request, *args, **kwargs):
+        response = view_func(request, *args, **kwargs)
+        response.revalidate_privately = True
+        return response
+    return wrapped_view
+
 def rate_limit(max_attempts=5, window_seconds=300):
     """
     Rate limiting decorator to prevent brute force attacks.
@@ -58,11 +72,11 @@ def rate_limit(max_attempts=5, window_seconds=300):
             if ',' in client_ip:  # X-Forwarded-For can contain multiple IPs
                 client_ip = client_ip.split(',')[0].strip()
             
-            # Create cache key for this IP and view
-            cache_key = f"rate_limit:{view_func.__name__}:{client_ip}"
+            # Create cache key for this IP and view (shared by all workers)
+            cache_key = f"{view_func.__name__}:{client_ip}"
             
             # Get current attempt count
-            attempt_count = cache.get(cache_key, 0)
+            attempt_count = rate_limit_cache.get(cache_key, 0)
             
             # Check if limit exceeded
             if attempt_count >= max_attempts:
@@ -70,13 +84,13 @@ def rate_limit(max_attempts=5, window_seconds=300):
                 return HttpResponseForbidden("Too many attempts. Please try again later.")
             
             # Increment attempt count
-            cache.set(cache_key, attempt_count + 1, window_seconds)
+            rate_limit_cache.set(cache_key, attempt_count + 1, window_seconds)
             
             try:
                 response = view_func(request, *args, **kwargs)
                 # On successful completion (2xx status), reset the counter
                 if hasattr(response, 'status_code') and 200 <= response.status_code < 300:
-                    cache.delete(cache_key)
+                    rate_limit_cache.delete(cache_key)
                     logger.debug(f"Rate limit counter reset for IP {client_ip} on {view_func.__name__} after successful request")
                 return response
             except Exception as e:
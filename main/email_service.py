@@ -10,6 +10,7 @@ from django.utils.html import strip_tags
 from django.conf import settings
 from django.contrib.auth.models import User
 from .models import UserProfile, Role
+from .services.bulk_email_service import BulkEmailService
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,72 @@ logger = logging.getLogger(__name__)
 class EvaluationEmailService:
     """Service for sending evaluation-related emails"""
     
+    @staticmethod
+    def _get_recipients(evaluation_type):
+        """
+        Active users with an email address who should hear about an evaluation type
+        
+        Email Recipients by Evaluation Type:
+        - student: Students only
+        - peer: Dean, Coordinator, Faculty (NOT Students)
+        - upward: Faculty only
+        - dean: Faculty only
+        - student_upward: Students only (coordinator evaluation)
+        """
+        base_users = User.objects.filter(is_active=True).exclude(email='')
+        
+        if evaluation_type in ('student', 'student_upward'):
+            return base_users.filter(userprofile__role='Student')
+        elif evaluation_type == 'peer':
+            return base_users.filter(userprofile__role__in=['Dean', 'Coordinator', 'Faculty'])
+        elif evaluation_type in ('upward', 'dean'):
+            return base_users.filter(userprofile__role='Faculty')
+        # Default: all users (shouldn't happen)
+        return base_users
+    
+    @staticmethod
+    def _send_bulk_notification(evaluation_type, notification, label, subject, html_content, text_content):
+        """
+        Send one pre-rendered notification to every recipient of an evaluation
+        type through BulkEmailService and return the result dict used by views
+        """
+        users = EvaluationEmailService._get_recipients(evaluation_type)
+        
+        if not users.exists():
+            logger.warning(f"No active users to notify about {evaluation_type} evaluation {label}")
+            return {
+                'success': False,
+                'sent_count': 0,
+                'failed_emails': [],
+                'message': 'No active users found to notify'
+            }
+        
+        logger.info(f"Sending {evaluation_type} evaluation {label} notification")
+        
+        log = BulkEmailService.send(
+            recipients=users.values_list('email', 'first_name').iterator(chunk_size=BulkEmailService.batch_size()),
+            subject=subject,
+            text_content=text_content,
+            html_content=html_content,
+            notification=notification,
+            evaluation_type=evaluation_type
+        )
+        
+        if log.status == 'failed':
+            return {
+                'success': False,
+                'sent_count': log.sent_count,
+                'failed_emails': log.failed_emails,
+                'message': f'Error sending notifications: {log.error}'
+            }
+        
+        return {
+            'success': True,
+            'sent_count': log.sent_count,
+            'failed_emails': log.failed_emails,
+            'message': f'Successfully sent {evaluation_type} evaluation {label} notification to {log.sent_count} users'
+        }
+    
     @staticmethod
     def send_evaluation_released_notification(evaluation_type='student'):
         """
@@ -33,82 +100,18 @@ class EvaluationEmailService:
                 'message': str
             }
         
-        Email Recipients by Evaluation Type:
-        - student: Students only
-        - peer: Dean, Coordinator, Faculty (NOT Students)
-        - upward: Faculty only
-        - dean: Faculty only
+        Recipients are chosen by _get_recipients; the message is rendered once
+        and delivered in batches, each batch over one SMTP connection.
         """
         try:
-            # Get all active users with valid email addresses
-            base_users = User.objects.filter(is_active=True).exclude(email='')
-            
-            # Filter users based on evaluation type
-            if evaluation_type == 'student':
-                # Only send to Students
-                users = base_users.filter(userprofile__role='Student')
-            elif evaluation_type == 'peer':
-                # Send to Dean, Coordinator, and Faculty (NOT Students)
-                users = base_users.filter(userprofile__role__in=['Dean', 'Coordinator', 'Faculty'])
-            elif evaluation_type == 'upward':
-                # Only send to Faculty
-                users = base_users.filter(userprofile__role='Faculty')
-            elif evaluation_type == 'dean':
-                # Only send to Faculty
-                users = base_users.filter(userprofile__role='Faculty')
-            elif evaluation_type == 'student_upward':
-                # Only send to Students (for coordinator evaluation)
-                users = base_users.filter(userprofile__role='Student')
-            else:
-                # Default: all users (shouldn't happen)
-                users = base_users
-            
-            if not users.exists():
-                logger.warning(f"No active users to notify about {evaluation_type} evaluation release")
-                return {
-                    'success': False,
-                    'sent_count': 0,
-                    'failed_emails': [],
-                    'message': 'No active users found to notify'
-                }
-            
-            logger.info(f"Sending {evaluation_type} evaluation release notification to {users.count()} users")
-            
-            sent_count = 0
-            failed_emails = []
-            
-            # Prepare email content
-            subject = EvaluationEmailService._get_release_subject(evaluation_type)
-            html_content = EvaluationEmailService._get_release_html_content(evaluation_type)
-            text_content = EvaluationEmailService._get_release_text_content(evaluation_type)
-            
-            # Send email to each user
-            for user in users:
-                try:
-                    email = EvaluationEmailService._send_release_email(
-                        recipient_email=user.email,
-                        recipient_name=user.first_name or user.username,
-                        subject=subject,
-                        html_content=html_content,
-                        text_content=text_content,
-                        evaluation_type=evaluation_type
-                    )
-                    sent_count += 1
-                    logger.debug(f"Successfully sent {evaluation_type} evaluation release email to {user.email}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send email to {user.email}: {str(e)}")
-                    failed_emails.append(user.email)
-            
-            logger.info(f"Sent {evaluation_type} evaluation release notification: "
-                       f"{sent_count} successful, {len(failed_emails)} failed")
-            
-            return {
-                'success': True,
-                'sent_count': sent_count,
-                'failed_emails': failed_emails,
-                'message': f'Successfully sent {evaluation_type} evaluation release notification to {sent_count} users'
-            }
+            return EvaluationEmailService._send_bulk_notification(
+                evaluation_type,
+                notification='evaluation_released',
+                label='release',
+                subject=EvaluationEmailService._get_release_subject(evaluation_type),
+                html_content=EvaluationEmailService._get_release_html_content(evaluation_type),
+                text_content=EvaluationEmailService._get_release_text_content(evaluation_type)
+            )
             
         except Exception as e:
             logger.error(f"Exception in send_evaluation_released_notification: {str(e)}", exc_info=True)
@@ -135,79 +138,17 @@ class EvaluationEmailService:
                 'message': str
             }
         
-        Email Recipients by Evaluation Type:
-        - student: Students only
-        - peer: Dean, Coordinator, Faculty (NOT Students)
-        - upward: Faculty only
-        - dean: Faculty only
+        Recipients are chosen by _get_recipients, same as the release notification.
         """
         try:
-            base_users = User.objects.filter(is_active=True).exclude(email='')
-            
-            # Filter users based on evaluation type
-            if evaluation_type == 'student':
-                # Only send to Students
-                users = base_users.filter(userprofile__role='Student')
-            elif evaluation_type == 'peer':
-                # Send to Dean, Coordinator, and Faculty (NOT Students)
-                users = base_users.filter(userprofile__role__in=['Dean', 'Coordinator', 'Faculty'])
-            elif evaluation_type == 'upward':
-                # Only send to Faculty
-                users = base_users.filter(userprofile__role='Faculty')
-            elif evaluation_type == 'dean':
-                # Only send to Faculty
-                users = base_users.filter(userprofile__role='Faculty')
-            elif evaluation_type == 'student_upward':
-                # Only send to Students (for coordinator evaluation)
-                users = base_users.filter(userprofile__role='Student')
-            else:
-                # Default: all users (shouldn't happen)
-                users = base_users
-            
-            if not users.exists():
-                logger.warning(f"No active users to notify about {evaluation_type} evaluation close")
-                return {
-                    'success': False,
-                    'sent_count': 0,
-                    'failed_emails': [],
-                    'message': 'No active users found to notify'
-                }
-            
-            logger.info(f"Sending {evaluation_type} evaluation close notification to {users.count()} users")
-            
-            sent_count = 0
-            failed_emails = []
-            
-            subject = EvaluationEmailService._get_unreleased_subject(evaluation_type)
-            html_content = EvaluationEmailService._get_unreleased_html_content(evaluation_type)
-            text_content = EvaluationEmailService._get_unreleased_text_content(evaluation_type)
-            
-            for user in users:
-                try:
-                    EvaluationEmailService._send_unreleased_email(
-                        recipient_email=user.email,
-                        recipient_name=user.first_name or user.username,
-                        subject=subject,
-                        html_content=html_content,
-                        text_content=text_content,
-                        evaluation_type=evaluation_type
-                    )
-                    sent_count += 1
-                    logger.debug(f"Successfully sent {evaluation_type} evaluation close email to {user.email}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send close email to {user.email}: {str(e)}")
-                    failed_emails.append(user.email)
-            
-            logger.info(f"Sent {evaluation_type} evaluation close notification: "
-                       f"{sent_count} successful, {len(failed_emails)} failed")
-            
-            return {
-                'success': True,
-                'sent_count': sent_count,
-                'failed_emails': failed_emails,
-                'message': f'Successfully sent {evaluation_type} evaluation close notification to {sent_count} users'
-            }
+            return EvaluationEmailService._send_bulk_notification(
+                evaluation_type,
+                notification='evaluation_closed',
+                label='close',
+                subject=EvaluationEmailService._get_unreleased_subject(evaluation_type),
+                html_content=EvaluationEmailService._get_unreleased_html_content(evaluation_type),
+                text_content=EvaluationEmailService._get_unreleased_text_content(evaluation_type)
+            )
             
         except Exception as e:
             logger.error(f"Exception in send_evaluation_unreleased_notification: {str(e)}", exc_info=True)
@@ -218,40 +159,6 @@ class EvaluationEmailService:
                 'message': f'Error sending notifications: {str(e)}'
             }
     
-    @staticmethod
-    def _send_release_email(recipient_email, recipient_name, subject, html_content, text_content, evaluation_type):
-        """Send individual release email"""
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[recipient_email]
-        )
-        msg.attach_alternative(html_content, "text/html")
-        result = msg.send()
-        
-        if result == 0:
-            raise Exception(f"Email send failed for {recipient_email}")
-        
-        return recipient_email
-    
-    @staticmethod
-    def _send_unreleased_email(recipient_email, recipient_name, subject, html_content, text_content, evaluation_type):
-        """Send individual unreleased/close email"""
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[recipient_email]
-        )
-        msg.attach_alternative(html_content, "text/html")
-        result = msg.send()
-        
-        if result == 0:
-            raise Exception(f"Email send failed for {recipient_email}")
-        
-        return recipient_email
-    
     @staticmethod
     def _get_release_subject(evaluation_type):
         """Get email subject for evaluation release"""
@@ -0,0 +1,6 @@
+"""
+Semester-open load testing: a synthetic campus seeded on top of the
+create_scenario data (population) and concurrent login -> form -> submit flows
+driven against a local gunicorn (runner). Scenario files under scenarios/
+describe both; see `python manage.py loadtest --help`.
+"""
@@ -0,0 +1,187 @@
+"""
+Synthetic campus for load tests.
+
+seed() first runs the create_scenario command, so the institute, course and
+the active "Second Semester Evaluation 2024" student period are the ones every
+developer already has locally, then releases that period and adds N sections,
+M instructors and K students on top of it with bulk inserts. Every instructor
+is assigned to a few sections and every student sits in one, so each student
+has a handful of instructors to evaluate, as on a real semester opening.
+
+All generated rows share a prefix (usernames "<prefix>.student<k>",
+sections "<PREFIX><n>"), so reset() removes them without touching real data.
+"""
+import io
+import logging
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
+
+from main.models import (
+    Course, Evaluation, EvaluationPeriod, Institute, Role, Section, SectionAssignment, UserProfile,
+)
+
+logger = logging.getLogger(__name__)
+
+# Created by the create_scenario command
+SCENARIO_INSTITUTE = 'College of Engineering'
+SCENARIO_COURSE = 'Computer Science'
+SCENARIO_PERIOD = 'Second Semester Evaluation 2024'
+
+DEFAULT_PREFIX = 'lt'
+PASSWORD = 'loadtest123'
+BATCH_SIZE = 1000
+
+
+class LoadTestPopulation:
+    """Seed, load and remove the synthetic load-test campus."""
+
+    @staticmethod
+    def section_code(prefix, number):
+        return f'{prefix.upper()}{number:04d}'
+
+    @staticmethod
+    def student_number(number):
+        # XX-XXXX: roll the two-digit prefix over every 10,000 students
+        return f'{50 + number // 10000:02d}-{number % 10000:04d}'
+
+    @staticmethod
+    def reset(prefix=DEFAULT_PREFIX):
+        """Delete every generated user and section. Returns the number of users removed."""
+        users = User.objects.filter(username__startswith=f'{prefix}.')
+        removed = users.count()
+        with transaction.atomic():
+            users.delete()
+            Section.objects.filter(code__startswith=prefix.upper()).delete()
+        return removed
+
+    @staticmethod
+    def seed(sections, instructors, students, instructors_per_section=6, prefix=DEFAULT_PREFIX):
+        """
+        Replace the generated campus with ``sections`` sections, ``instructors``
+        instructors and ``students`` students, and release the scenario's
+        student period. Returns the active period.
+        """
+        if sections < 1 or instructors < 1 or students < 1:
+            raise ValueError('A load-test campus needs at least one section, instructor and student')
+        instructors_per_section = max(1, min(instructors_per_section, instructors))
+
+        call_command('create_scenario', stdout=io.StringIO())
+        institute = Institute.objects.get(name=SCENARIO_INSTITUTE)
+        course = Course.objects.get(name=SCENARIO_COURSE, institute=institute)
+        period = EvaluationPeriod.objects.get(name=SCENARIO_PERIOD, evaluation_type='student')
+
+        # Saved (not updated) so the release-state signals reach the server's workers
+        evaluation = Evaluation.objects.filter(evaluation_type='student', evaluation_period=period).first()
+        if evaluation is None:
+            evaluation = Evaluation(evaluation_type='student', evaluator='students', evaluation_period=period)
+        if not evaluation.is_released:
+            evaluation.is_released = True
+            evaluation.save()
+
+        LoadTestPopulation.reset(prefix)
+        password = make_password(PASSWORD)  # hashed once, shared by every account
+
+        with transaction.atomic():
+            codes = [LoadTestPopulation.section_code(prefix, n) for n in range(sections)]
+            Section.objects.bulk_create(
+                [Section(code=code, year_level=n % 4 + 1) for n, code in enumerate(codes)],
+                batch_size=BATCH_SIZE
+            )
+            # bulk_create doesn't return primary keys on MySQL, so read them back
+            section_ids = dict(Section.objects.filter(code__in=codes).values_list('code', 'id'))
+            section_ids = [section_ids[code] for code in codes]
+
+            instructor_ids = LoadTestPopulation._create_users(
+                prefix, 'instructor', instructors, 'loadtest.edu', password
+            )
+            UserProfile.objects.bulk_create([
+                UserProfile(
+                    user_id=user_id,
+                    role=Role.FACULTY,
+                    institute=institute.name,
+                    display_name=f'Instructor {m}',
+                )
+                for m, user_id in enumerate(instructor_ids)
+            ], batch_size=BATCH_SIZE)
+
+            student_ids = LoadTestPopulation._create_users(
+                prefix, 'student', students, 'cca.edu.ph', password
+            )
+            UserProfile.objects.bulk_create([
+                UserProfile(
+                    user_id=user_id,
+                    role=Role.STUDENT,
+                    institute=institute.name,
+                    course=course.name,
+                    studentnumber=LoadTestPopulation.student_number(k),
+                    section_id=section_ids[k % sections],
+                    display_name=f'Student {k}',
+                )
+                for k, user_id in enumerate(student_ids)
+            ], batch_size=BATCH_SIZE)
+
+            # Section n is taught by instructors n*per .. n*per+per-1 (wrapping around)
+            SectionAssignment.objects.bulk_create([
+                SectionAssignment(
+                    user_id=instructor_ids[(n * instructors_per_section + j) % instructors],
+                    section_id=section_id,
+                    role='faculty',
+                )
+                for n, section_id in enumerate(section_ids)
+                for j in range(instructors_per_section)
+            ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+        logger.info(
+            f'Seeded load-test campus "{prefix}": {sections} sections, '
+            f'{instructors} instructors, {students} students'
+        )
+        return period
+
+    @staticmethod
+    def _create_users(prefix, kind, count, domain, password):
+        """Bulk-create ``count`` users and return their ids in creation order."""
+        usernames = [f'{prefix}.{kind}{n}' for n in range(count)]
+        User.objects.bulk_create([
+            User(
+                username=username,
+                email=f'{username}@{domain}',
+                first_name=kind.capitalize(),
+                last_name=str(n),
+                password=password,
+            )
+            for n, username in enumerate(usernames)
+        ], batch_size=BATCH_SIZE)
+        ids = dict(User.objects.filter(username__startswith=f'{prefix}.{kind}').values_list('username', 'id'))
+        return [ids[username] for username in usernames]
+
+    @staticmethod
+    def load(prefix=DEFAULT_PREFIX):
+        """
+        The seeded students and who they can evaluate:
+        [{'id', 'email', 'student_number', 'instructor_ids'}, ...] ordered by
+        student number. Two queries regardless of campus size.
+        """
+        instructors_by_section = {}
+        for section_id, user_id in SectionAssignment.objects.filter(
+            section__code__startswith=prefix.upper()
+        ).values_list('section_id', 'user_id'):
+            instructors_by_section.setdefault(section_id, []).append(user_id)
+
+        students = (
+            UserProfile.objects
+            .filter(user__username__startswith=f'{prefix}.student', role=Role.STUDENT)
+            .order_by('studentnumber')
+            .values_list('user_id', 'user__email', 'studentnumber', 'section_id')
+        )
+        return [
+            {
+                'id': user_id,
+                'email': email,
+                'student_number': student_number,
+                'instructor_ids': instructors_by_section.get(section_id, []),
+            }
+            for user_id, email, student_number, section_id in students
+        ]
@@ -0,0 +1,302 @@
+"""
+Drive semester-open traffic against a running server and summarize it.
+
+Every virtual student runs the flow a real one does when the evaluation opens:
+
+    GET  /login/             login_page
+    POST /login/             login
+    GET  /evaluationform/    evaluation_form
+    POST /submit_evaluation/ submit_evaluation   (once per assigned instructor)
+    GET  /evaluate/          evaluated
+
+Students start evenly spread over the ramp, up to ``concurrency`` at a time,
+and pause for a random think time between steps. Each virtual student sends
+its own X-Forwarded-For address, which keeps the per-IP login rate limit
+(5 attempts per 5 minutes) out of the measurement.
+
+Query counts can't be observed from outside the server, so probe_queries()
+replays the same flow once in-process with the test client and counts the
+queries of each step.
+"""
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from main.loadtest.population import PASSWORD
+
+logger = logging.getLogger(__name__)
+
+SCENARIO_DIR = Path(__file__).resolve().parent / 'scenarios'
+ENDPOINTS = ['login_page', 'login', 'evaluation_form', 'submit_evaluation', 'evaluated']
+STUDENT_QUESTIONS = 19
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil without floats
+    return sorted_values[int(rank) - 1]
+
+
+def load_scenario(name):
+    """A scenario dict from a file in scenarios/ (by name) or from a path."""
+    path = Path(name)
+    if not path.suffix:
+        path = SCENARIO_DIR / f'{name}.json'
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def submission_data(student, instructor_id):
+    """POST body of one student evaluation with random ratings."""
+    data = {
+        'evaluatee': str(instructor_id),
+        'studentNumber': student['student_number'],
+        'comments': 'Load test submission.',
+    }
+    for number in range(1, STUDENT_QUESTIONS + 1):
+        data[f'question{number}'] = str(random.randint(1, 5))
+    return data
+
+
+class LoadTestServer:
+    """A gunicorn serving this project on 127.0.0.1, for the duration of a `with` block."""
+
+    def __init__(self, port=8765, workers=4, threads=1, startup_timeout=30):
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.log_path = os.path.join(tempfile.gettempdir(), f'edulytics_loadtest_{port}.log')
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.port}'
+
+    def __enter__(self):
+        # The server inherits this environment, so it uses the same database (DB_ENGINE)
+        self.process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn', 'evaluationWeb.wsgi:application',
+                '--bind', f'127.0.0.1:{self.port}',
+                '--workers', str(self.workers),
+                '--threads', str(self.threads),
+                '--error-logfile', self.log_path,
+                '--log-level', 'warning',
+            ],
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'gunicorn exited during startup; see {self.log_path}')
+            try:
+                requests.get(f'{self.url}/login/', timeout=2)
+                return self
+            except requests.RequestException:
+                time.sleep(0.25)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f'gunicorn did not answer within {self.startup_timeout}s; see {self.log_path}')
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        return False
+
+
+class LoadTestRunner:
+    """Run virtual students against ``base_url`` and collect per-endpoint samples."""
+
+    def __init__(self, base_url, concurrency=50, ramp_seconds=30, think_time_ms=(0, 0),
+                 evaluations_per_student=None, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.ramp_seconds = ramp_seconds
+        self.think_time_ms = think_time_ms
+        self.evaluations_per_student = evaluations_per_student
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._samples = {endpoint: [] for endpoint in ENDPOINTS}  # endpoint -> [(ms, ok)]
+        self._errors = {}  # (endpoint, status or exception name) -> count
+        self._completed = 0
+
+    def _record(self, endpoint, elapsed_ms, ok, status):
+        with self._lock:
+            self._samples[endpoint].append((elapsed_ms, ok))
+            if not ok:
+                key = (endpoint, status)
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def _request(self, session, endpoint, method, path, check, **kwargs):
+        """Time one request; ``check(response)`` decides success. Returns the response or None."""
+        started = time.perf_counter()
+        try:
+            response = session.request(
+                method, self.base_url + path, allow_redirects=False, timeout=self.timeout, **kwargs
+            )
+        except requests.RequestException as e:
+            self._record(endpoint, (time.perf_counter() - started) * 1000, False, type(e).__name__)
+            return None
+        ok = check(response)
+        self._record(endpoint, (time.perf_counter() - started) * 1000, ok, response.status_code)
+        return response if ok else None
+
+    def _think(self):
+        low, high = self.think_time_ms
+        if high > 0:
+            time.sleep(random.uniform(low, high) / 1000)
+
+    def _student_flow(self, index, student, start_at):
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        with requests.Session() as session:
+            session.headers['X-Forwarded-For'] = f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}'
+
+            if self._request(session, 'login_page', 'GET', '/login/', lambda r: r.status_code == 200) is None:
+                return
+            logged_in = self._request(
+                session, 'login', 'POST', '/login/',
+                lambda r: r.status_code == 302 and '/login' not in r.headers.get('Location', ''),
+                data={
+                    'email': student['email'],
+                    'password': PASSWORD,
+                    'csrfmiddlewaretoken': session.cookies.get('csrftoken', ''),
+                },
+            )
+            if logged_in is None:
+                return
+
+            self._think()
+            if self._request(session, 'evaluation_form', 'GET', '/evaluationform/',
+                             lambda r: r.status_code == 200) is None:
+                return
+
+            instructor_ids = student['instructor_ids'][:self.evaluations_per_student]
+            for instructor_id in instructor_ids:
+                self._think()
+                data = submission_data(student, instructor_id)
+                # Login rotates the CSRF token; the session holds the current one
+                data['csrfmiddlewaretoken'] = session.cookies.get('csrftoken', '')
+                self._request(
+                    session, 'submit_evaluation', 'POST', '/submit_evaluation/',
+                    lambda r: r.status_code == 302 and 'submitted=true' in r.headers.get('Location', ''),
+                    data=data,
+                )
+
+            self._think()
+            self._request(session, 'evaluated', 'GET', '/evaluate/', lambda r: r.status_code == 200)
+
+        with self._lock:
+            self._completed += 1
+
+    def run(self, students):
+        """Run one flow per student; returns the summary (see summarize())."""
+        started = time.monotonic()
+        spacing = self.ramp_seconds / len(students) if students else 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [
+                pool.submit(self._student_flow, index, student, started + index * spacing)
+                for index, student in enumerate(students)
+            ]
+            for future in futures:
+                future.result()
+        return self.summarize(time.monotonic() - started, len(students))
+
+    def summarize(self, duration, flows):
+        """
+        {'duration_seconds', 'flows', 'flows_completed', 'requests',
+         'throughput_rps', 'error_rate', 'errors': [...],
+         'endpoints': {endpoint: {'requests', 'errors', 'error_rate',
+                                  'throughput_rps', 'p50_ms', 'p95_ms',
+                                  'p99_ms', 'mean_ms', 'max_ms'}}}
+        """
+        endpoints = {}
+        total_requests = total_errors = 0
+        for endpoint, samples in self._samples.items():
+            latencies = sorted(ms for ms, _ in samples)
+            errors = sum(1 for _, ok in samples if not ok)
+            total_requests += len(samples)
+            total_errors += errors
+            endpoints[endpoint] = {
+                'requests': len(samples),
+                'errors': errors,
+                'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+                'throughput_rps': round(len(samples) / duration, 2) if duration else 0.0,
+                'p50_ms': _round(percentile(latencies, 50)),
+                'p95_ms': _round(percentile(latencies, 95)),
+                'p99_ms': _round(percentile(latencies, 99)),
+                'mean_ms': _round(sum(latencies) / len(latencies)) if latencies else None,
+                'max_ms': _round(latencies[-1]) if latencies else None,
+            }
+        return {
+            'duration_seconds': round(duration, 2),
+            'flows': flows,
+            'flows_completed': self._completed,
+            'requests': total_requests,
+            'throughput_rps': round(total_requests / duration, 2) if duration else 0.0,
+            'error_rate': round(total_errors / total_requests, 4) if total_requests else 0.0,
+            'errors': [
+                {'endpoint': endpoint, 'status': status, 'count': count}
+                for (endpoint, status), count in sorted(self._errors.items(), key=lambda item: -item[1])
+            ],
+            'endpoints': endpoints,
+        }
+
+    @staticmethod
+    def probe_queries(student):
+        """
+        Run ``student``'s flow once through the test client and count the SQL
+        queries of each endpoint: {endpoint: count}. The student submits one
+        evaluation, so probe with a student the load run doesn't use.
+        """
+        client = Client(HTTP_X_FORWARDED_FOR='10.255.255.254')
+        steps = [
+            ('login_page', 'get', '/login/', None),
+            ('login', 'post', '/login/', {'email': student['email'], 'password': PASSWORD}),
+            ('evaluation_form', 'get', '/evaluationform/', None),
+        ]
+        if student['instructor_ids']:
+            steps.append((
+                'submit_evaluation', 'post', '/submit_evaluation/',
+                submission_data(student, student['instructor_ids'][0])
+            ))
+        steps.append(('evaluated', 'get', '/evaluate/', None))
+
+        counts = {}
+        for endpoint, method, path, data in steps:
+            with CaptureQueriesContext(connection) as queries:
+                try:
+                    getattr(client, method)(path, data or {})
+                except Exception as e:
+                    logger.warning(f'Query probe of {endpoint} raised {type(e).__name__}: {e}')
+            counts[endpoint] = len(queries)
+        return counts
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
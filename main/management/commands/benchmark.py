@@ -0,0 +1,101 @@
+"""
+Management command to benchmark the scoring, ranking and archiving functions
+Usage: python manage.py benchmark [--responses 100000] [--repeat 5] [--only NAME ...]
+                                  [--json out.json] [--compare baseline.json] [--threshold 0.25]
+
+Creates a throwaway test database (like `manage.py test`; the configured
+database is never touched), fills it with a seeded synthetic dataset
+(main.benchmarks.dataset) and times each function in main.benchmarks.cases,
+reporting the median, min and spread of the runs plus their SQL query count.
+
+Save a report from one commit with --json and pass it to --compare on another:
+the command fails if any function got slower than --threshold or issues more
+queries than the baseline.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases,
+    teardown_test_environment,
+)
+
+from main.benchmarks.cases import CASES
+from main.benchmarks.dataset import BenchmarkDataset
+from main.benchmarks.harness import BenchmarkHarness
+
+# Each run starts from an empty cache; never clear the shared one
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'edulytics-benchmark',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = 'Time the scoring, ranking and archiving functions on synthetic data and compare with a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--responses', type=int, default=100_000,
+                            help='Student responses in the synthetic dataset (default: 100000)')
+        parser.add_argument('--seed', type=int, default=1234, help='Random seed of the dataset (default: 1234)')
+        parser.add_argument('--repeat', type=int, default=5, help='Measured runs per function (default: 5)')
+        parser.add_argument('--warmup', type=int, default=1, help='Discarded runs per function (default: 1)')
+        parser.add_argument('--only', action='append', choices=list(CASES),
+                            help='Only this function (repeatable; default: all)')
+        parser.add_argument('--json', dest='json_path', help='Write the report to this JSON file')
+        parser.add_argument('--compare', help='Baseline report (from --json) to check for regressions')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed slowdown over the baseline median as a fraction (default: 0.25)')
+
+    def handle(self, *args, **options):
+        cases = {name: case for name, case in CASES.items() if not options['only'] or name in options['only']}
+        baseline = None
+        if options['compare']:
+            try:
+                baseline = BenchmarkHarness.load(options['compare'])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline {options['compare']}: {e}")
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(CACHES=BENCHMARK_CACHES):
+                self.stdout.write(f"Generating {options['responses']} responses (seed {options['seed']})...")
+                context = BenchmarkDataset(options['responses'], options['seed']).generate()
+
+                self.stdout.write(f"{'function':<38} {'median ms':>10} {'min ms':>10} {'stdev':>8} "
+                                  f"{'queries':>8} {'items':>7}")
+                harness = BenchmarkHarness(context, repeat=options['repeat'], warmup=options['warmup'])
+                report = harness.run(
+                    cases,
+                    meta={'responses': options['responses'], 'seed': options['seed']},
+                    progress=self.write_result,
+                )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if options['json_path']:
+            BenchmarkHarness.save(report, options['json_path'])
+            self.stdout.write(f"Report written to {options['json_path']}")
+
+        if baseline is not None:
+            try:
+                regressions = BenchmarkHarness.compare(report, baseline, options['threshold'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            if regressions:
+                for regression in regressions:
+                    self.stdout.write(self.style.ERROR(f'  ✗ {regression}'))
+                raise CommandError(
+                    f"{len(regressions)} regressions against {baseline['meta'].get('commit') or options['compare']}"
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ No regressions against {baseline['meta'].get('commit') or options['compare']}"
+            ))
+
+    def write_result(self, name, result):
+        self.stdout.write(
+            f"{name:<38} {result['median_ms']:>10.2f} {result['min_ms']:>10.2f} {result['stdev_ms']:>8.2f} "
+            f"{result['queries']:>8} {result['items']:>7}"
+        )
@@ -0,0 +1,60 @@
+"""
+Management command to store comment sentiment on existing evaluations
+Usage: python manage.py classify_comments [--all] [--batch-size N]
+
+New EvaluationResponse and IrregularEvaluation rows are classified when they
+are saved. This fills in rows submitted before that (or, with --all,
+reclassifies every row after the keyword lists change). Pages classify
+unlabelled rows on the fly, so running it is an optimization, not a fix.
+"""
+from django.core.management.base import BaseCommand
+
+from main.models import EvaluationResponse, IrregularEvaluation
+from main.services.sentiment import SentimentClassifier
+
+
+class Command(BaseCommand):
+    help = 'Store comment sentiment labels and scores on evaluation responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Reclassify every row, not only rows without a stored label',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows read and updated per batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        for model in (EvaluationResponse, IrregularEvaluation):
+            rows = model.objects.only('id', 'comments').order_by('id')
+            if not options['all']:
+                rows = rows.filter(comment_sentiment__isnull=True)
+
+            updated = self.classify(model, rows, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {model._meta.verbose_name_plural}: classified {updated} comment(s)'
+            ))
+
+    def classify(self, model, rows, batch_size):
+        updated = 0
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                updated += self.write(model, batch, batch_size)
+                batch = []
+        if batch:
+            updated += self.write(model, batch, batch_size)
+        return updated
+
+    def write(self, model, batch, batch_size):
+        results = SentimentClassifier.classify_many([row.comments for row in batch])
+        for row, (label, score) in zip(batch, results):
+            row.comment_sentiment, row.comment_sentiment_score = label, score
+        model.objects.bulk_update(batch, ['comment_sentiment', 'comment_sentiment_score'], batch_size=batch_size)
+        return len(batch)
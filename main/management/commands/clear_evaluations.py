@@ -8,6 +8,8 @@ from main.models import (
     EvaluationHistory, EvaluationResponse, EvaluationResult, 
     IrregularEvaluation, AiRecommendation, EvaluationPeriod
 )
+from main.services.evaluation_aggregate import EvaluationAggregateService
+from main.services.profile_dashboard import ProfileDashboardService
 
 
 class Command(BaseCommand):
@@ -86,6 +88,11 @@ class Command(BaseCommand):
                     EvaluationPeriod.objects.all().delete()
                     self.stdout.write(self.style.SUCCESS(f'✓ Deleted {period_count} evaluation periods'))
                 
+                # Bulk deletes send no per-row signals; every dashboard is out of date now
+                # and the running aggregates only keep the remaining upward/dean responses
+                ProfileDashboardService.invalidate_all()
+                EvaluationAggregateService.rebuild()
+                
                 self.stdout.write(self.style.SUCCESS('\n✅ All evaluation data cleared successfully!'))
                 self.stdout.write(self.style.NOTICE('\nYou can now start fresh with new evaluations.'))
                 
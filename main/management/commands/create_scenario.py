@@ -4,6 +4,7 @@ from main.models import (
     EvaluationPeriod, EvaluationResponse, IrregularEvaluation,
     EvaluationHistory, UserProfile, Section, Institute, Course
 )
+from main.services.evaluation_aggregate import EvaluationAggregateService
 from django.utils import timezone
 from datetime import timedelta
 
@@ -408,6 +409,9 @@ class Command(BaseCommand):
         )
         self.stdout.write(f"  ✓ {peer.username} → Aeron (Peer, Excellent) - 'Outstanding colleague in Period 2!...'")
         
+        # Responses above bypass the submit views, so recompute their running aggregates
+        EvaluationAggregateService.rebuild(period_ids=[period1.id, period2.id])
+        
         self.stdout.write("\n" + "=" * 70)
         self.stdout.write("SCENARIO CREATION COMPLETE!")
         self.stdout.write("=" * 70)
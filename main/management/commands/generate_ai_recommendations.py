@@ -0,0 +1,48 @@
+"""
+Management command to generate AI recommendations for a finished evaluation period
+Usage: python manage.py generate_ai_recommendations --period <id> [--concurrency 8]
+
+Set OPENAI_BASE_URL to run against a local OpenAI-compatible (or fake) endpoint.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import EvaluationPeriod
+from main.services.ai_recommendation_batch import AIRecommendationBatchService
+
+
+class Command(BaseCommand):
+    help = 'Generate and save AI recommendations for every user and assigned section of a period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            type=int,
+            help='Evaluation period id (defaults to the latest completed student period)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Maximum number of AI requests in flight (defaults to AI_RECOMMENDATION_CONCURRENCY)',
+        )
+
+    def handle(self, *args, **options):
+        if options['period']:
+            try:
+                period = EvaluationPeriod.objects.get(id=options['period'])
+            except EvaluationPeriod.DoesNotExist:
+                raise CommandError(f"Evaluation period {options['period']} does not exist")
+        else:
+            period = EvaluationPeriod.objects.filter(
+                evaluation_type='student',
+                is_active=False
+            ).order_by('-end_date').first()
+            if not period:
+                raise CommandError('No completed student evaluation period found')
+
+        self.stdout.write(f'Generating AI recommendations for period: {period.name}')
+        stats = AIRecommendationBatchService.generate(period, concurrency=options['concurrency'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Saved {stats['saved_count']} recommendations for {stats['jobs']} sections "
+            f"in {stats['elapsed_seconds']}s ({stats['failed_count']} failed)"
+        ))
@@ -0,0 +1,155 @@
+"""
+Management command to load-test the evaluation form and submission endpoints
+Usage: python manage.py loadtest [--scenario smoke|semester_open|spike|<path>] [--students K] ...
+
+Seeds a synthetic campus on top of the create_scenario data (main.loadtest.population),
+starts gunicorn on 127.0.0.1 against the same database and runs concurrent
+login -> evaluation form -> submit -> evaluated flows (main.loadtest.runner).
+Reports throughput, p50/p95/p99 latency, error rate and SQL queries per endpoint.
+
+Pick the database as for the server itself, e.g. `DB_ENGINE=sqlite python manage.py
+loadtest` or the default local MySQL. Use --url to target a server you started yourself.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.loadtest.population import DEFAULT_PREFIX, LoadTestPopulation
+from main.loadtest.runner import ENDPOINTS, LoadTestRunner, LoadTestServer, load_scenario
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic campus and load-test login, evaluation form and submission under concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', default='smoke',
+                            help='Scenario name in main/loadtest/scenarios or a JSON file path (default: smoke)')
+        parser.add_argument('--sections', type=int, help='Override the scenario\'s number of sections')
+        parser.add_argument('--instructors', type=int, help='Override the scenario\'s number of instructors')
+        parser.add_argument('--students', type=int, help='Override the scenario\'s number of students')
+        parser.add_argument('--concurrency', type=int, help='Override the number of simultaneous students')
+        parser.add_argument('--ramp', type=float, help='Override the seconds over which students start')
+        parser.add_argument('--workers', type=int, help='Override the gunicorn worker count')
+        parser.add_argument('--threads', type=int, help='Override the gunicorn threads per worker')
+        parser.add_argument('--port', type=int, default=8765, help='Port for the local gunicorn (default: 8765)')
+        parser.add_argument('--url', help='Load-test an already running server instead of starting gunicorn')
+        parser.add_argument('--prefix', default=DEFAULT_PREFIX, help='Username/section prefix of the generated campus')
+        parser.add_argument('--no-seed', action='store_true', help='Reuse the campus from the previous run')
+        parser.add_argument('--seed-only', action='store_true', help='Seed the campus and exit')
+        parser.add_argument('--reset', action='store_true', help='Remove the generated campus and exit')
+        parser.add_argument('--skip-probe', action='store_true', help='Don\'t count queries per endpoint')
+        parser.add_argument('--json', dest='json_path', help='Also write the report to this JSON file')
+        parser.add_argument('--max-error-rate', type=float,
+                            help='Fail when the overall error rate exceeds this fraction, e.g. 0.01')
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if options['reset']:
+            removed = LoadTestPopulation.reset(prefix)
+            self.stdout.write(self.style.SUCCESS(f'✓ Removed {removed} load-test users'))
+            return
+
+        try:
+            scenario = load_scenario(options['scenario'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read scenario {options['scenario']}: {e}")
+        seed = scenario.get('seed', {})
+        server = scenario.get('server', {})
+        load = scenario.get('load', {})
+
+        if not options['no_seed']:
+            sections = options['sections'] or seed.get('sections', 4)
+            instructors = options['instructors'] or seed.get('instructors', 12)
+            students = options['students'] or seed.get('students', 50)
+            self.stdout.write(f'Seeding {sections} sections, {instructors} instructors, {students} students...')
+            try:
+                period = LoadTestPopulation.seed(
+                    sections, instructors, students,
+                    instructors_per_section=seed.get('instructors_per_section', 6),
+                    prefix=prefix,
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f'✓ Campus seeded; evaluating in "{period.name}"'))
+        if options['seed_only']:
+            return
+
+        population = LoadTestPopulation.load(prefix)
+        if len(population) < 2:
+            raise CommandError('No load-test campus found; run without --no-seed first')
+        # The first student is kept for the query probe, the rest are the load
+        probe_student, students = population[0], population[1:]
+
+        query_counts = {}
+        if not options['skip_probe']:
+            query_counts = LoadTestRunner.probe_queries(probe_student)
+
+        runner = LoadTestRunner(
+            base_url=options['url'] or '',
+            concurrency=options['concurrency'] or load.get('concurrency', 50),
+            ramp_seconds=options['ramp'] if options['ramp'] is not None else load.get('ramp_seconds', 30),
+            think_time_ms=tuple(load.get('think_time_ms', (0, 0))),
+            evaluations_per_student=load.get('evaluations_per_student'),
+            timeout=load.get('timeout_seconds', 30),
+        )
+        self.stdout.write(
+            f'Running {len(students)} students, {runner.concurrency} at a time, '
+            f'ramping over {runner.ramp_seconds}s...'
+        )
+        if options['url']:
+            report = runner.run(students)
+        else:
+            try:
+                with LoadTestServer(
+                    port=options['port'],
+                    workers=options['workers'] or server.get('workers', 4),
+                    threads=options['threads'] or server.get('threads', 1),
+                ) as gunicorn:
+                    runner.base_url = gunicorn.url
+                    report = runner.run(students)
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        report['scenario'] = options['scenario']
+        for endpoint, counts in report['endpoints'].items():
+            counts['queries'] = query_counts.get(endpoint)
+        self.write_report(report)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Report written to {options['json_path']}")
+
+        if options['max_error_rate'] is not None and report['error_rate'] > options['max_error_rate']:
+            raise CommandError(
+                f"Error rate {report['error_rate']:.2%} exceeds {options['max_error_rate']:.2%}"
+            )
+
+    def write_report(self, report):
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'endpoint':<18} {'requests':>8} {'errors':>7} {'req/s':>7} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7}"
+        )
+        for endpoint in ENDPOINTS:
+            row = report['endpoints'][endpoint]
+            self.stdout.write(
+                f"{endpoint:<18} {row['requests']:>8} {row['error_rate']:>7.1%} {row['throughput_rps']:>7} "
+                f"{_cell(row['p50_ms']):>8} {_cell(row['p95_ms']):>8} {_cell(row['p99_ms']):>8} "
+                f"{_cell(row['queries']):>7}"
+            )
+        self.stdout.write('')
+        self.stdout.write(
+            f"{report['requests']} requests in {report['duration_seconds']}s "
+            f"({report['throughput_rps']} req/s), {report['flows_completed']}/{report['flows']} flows completed"
+        )
+        for error in report['errors'][:10]:
+            self.stdout.write(self.style.WARNING(
+                f"  ⚠ {error['endpoint']}: {error['status']} × {error['count']}"
+            ))
+        style = self.style.SUCCESS if report['error_rate'] == 0 else self.style.WARNING
+        self.stdout.write(style(f"Error rate: {report['error_rate']:.2%}"))
+
+
+def _cell(value):
+    return '-' if value is None else value
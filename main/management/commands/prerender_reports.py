@@ -0,0 +1,54 @@
+"""
+Management command to pre-render every instructor's evaluation report PDF
+Usage: python manage.py prerender_reports [--period <id>] [--workers N]
+
+Reports are rendered in a process pool into the report artifact store
+(REPORT_ARTIFACT_DIR), so downloads from evaluation history are file sends.
+Reports that are already current are skipped, so it is safe to re-run.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import EvaluationPeriod
+from main.services.report_artifacts import ReportArtifactStore
+
+
+class Command(BaseCommand):
+    help = 'Render and store evaluation report PDFs for every instructor of a closed period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            type=int,
+            help='Closed evaluation period id (defaults to the latest completed student period)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Rendering processes (defaults to REPORT_PRERENDER_WORKERS, or one per CPU)',
+        )
+
+    def handle(self, *args, **options):
+        if options['period']:
+            try:
+                period = EvaluationPeriod.objects.get(id=options['period'])
+            except EvaluationPeriod.DoesNotExist:
+                raise CommandError(f"Evaluation period {options['period']} does not exist")
+            if period.is_active:
+                raise CommandError(f'Evaluation period "{period.name}" is still active')
+        else:
+            period = EvaluationPeriod.objects.filter(
+                evaluation_type='student',
+                is_active=False
+            ).order_by('-end_date').first()
+            if not period:
+                raise CommandError('No completed student evaluation period found')
+
+        self.stdout.write(f'Pre-rendering evaluation reports for period: {period.name}')
+        stats = ReportArtifactStore.prerender(period, workers=options['workers'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {stats['rendered']} rendered, {stats['cached']} already current, "
+            f"{stats['empty']} without data for {stats['instructors']} instructors"
+        ))
+        if stats['failed']:
+            self.stdout.write(self.style.WARNING(f"⚠ {stats['failed']} reports failed; see the log"))
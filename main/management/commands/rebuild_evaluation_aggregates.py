@@ -0,0 +1,49 @@
+"""
+Management command to rebuild or verify the running evaluation aggregates
+Usage: python manage.py rebuild_evaluation_aggregates [--period <id> ...] [--verify]
+
+The submit views keep one EvaluationAggregate row per (evaluatee, period,
+section, evaluation type) up to date. This recomputes those rows from the raw
+responses, e.g. after responses were imported or edited directly. With
+--verify nothing is written: rows that disagree with the raw responses are
+listed and the command fails if there are any.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from main.services.evaluation_aggregate import EvaluationAggregateService
+
+
+class Command(BaseCommand):
+    help = 'Recompute evaluation aggregates from the raw responses, or check them with --verify'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            type=int,
+            action='append',
+            dest='periods',
+            help='Only this evaluation period id (repeatable; default: all periods)',
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare the aggregates with the raw responses without changing them',
+        )
+
+    def handle(self, *args, **options):
+        period_ids = options['periods']
+
+        if options['verify']:
+            mismatches = EvaluationAggregateService.verify(period_ids)
+            if mismatches:
+                for evaluatee_id, period_id, section_code, evaluation_type in mismatches[:50]:
+                    self.stdout.write(
+                        f'  ✗ evaluatee {evaluatee_id}, period {period_id}, '
+                        f'section "{section_code}", {evaluation_type}'
+                    )
+                raise CommandError(f'{len(mismatches)} evaluation aggregates differ from the raw responses')
+            self.stdout.write(self.style.SUCCESS('✓ Evaluation aggregates match the raw responses'))
+            return
+
+        written = EvaluationAggregateService.rebuild(period_ids)
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt {written} evaluation aggregates'))
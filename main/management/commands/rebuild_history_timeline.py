@@ -0,0 +1,20 @@
+"""
+Management command to rebuild the history timeline rows of archived periods
+Usage: python manage.py rebuild_history_timeline
+
+Archiving a student period writes one timeline row per user (section-less
+EvaluationHistory row summarizing their sections) carrying the peer, irregular
+and upward totals of the same evaluation cycle. This writes those rows for
+periods archived before the timeline existed. Safe to re-run.
+"""
+from django.core.management.base import BaseCommand
+
+from main.services.history_timeline import HistoryTimelineService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild evaluation history timeline rows for every archived student period'
+
+    def handle(self, *args, **options):
+        updated = HistoryTimelineService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt {updated} history timeline rows'))
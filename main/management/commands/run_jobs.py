@@ -0,0 +1,69 @@
+"""
+Management command that runs queued background jobs
+Usage: python manage.py run_jobs [--once] [--poll-interval 2] [--max-jobs N]
+
+Run it under a process supervisor (systemd, supervisord) next to gunicorn.
+Stopping it with SIGTERM/SIGINT finishes the current job first; a worker that
+dies mid-job is recovered by another worker once the job's lease expires.
+"""
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from main.services.job_queue import JobQueueService
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs (archiving, result processing, notification emails)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run every due job and exit instead of polling forever',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the queue is empty (default: 2)',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            help='Exit after running this many jobs',
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        worker_id = JobQueueService.worker_id()
+        max_jobs = options['max_jobs']
+        processed = 0
+        self.stdout.write(f'Job worker {worker_id} started')
+
+        while not self.stopping and (max_jobs is None or processed < max_jobs):
+            close_old_connections()
+            job = JobQueueService.claim_next(worker_id)
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+                continue
+
+            self.stdout.write(f'→ Running job #{job.id} {job.task} (attempt {job.attempts}/{job.max_attempts})')
+            job = JobQueueService.run(job)
+            processed += 1
+            if job.status == job.STATUS_SUCCEEDED:
+                self.stdout.write(self.style.SUCCESS(f'✓ Job #{job.id} succeeded: {job.result}'))
+            else:
+                self.stdout.write(self.style.ERROR(f'✗ Job #{job.id} {job.status}'))
+
+        self.stdout.write(f'Job worker {worker_id} stopped after {processed} job(s)')
+
+    def _stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,60 @@
+"""
+Management command to inspect and invalidate the shared cache
+Usage: python manage.py shared_cache [--stats] [--invalidate NAMESPACE ...] [--clear]
+
+With no options it prints the per-namespace hit/miss statistics. Invalidating
+a namespace bumps its version, so every worker stops using the old entries at
+once; --clear empties the whole cache backend (including rate-limit counters).
+"""
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from main.services.shared_cache import CacheNamespace, SharedCache
+
+
+class Command(BaseCommand):
+    help = 'Show shared cache statistics or invalidate cache namespaces'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print hit/miss statistics per namespace (default)',
+        )
+        parser.add_argument(
+            '--invalidate',
+            nargs='+',
+            metavar='NAMESPACE',
+            help='Invalidate these namespaces ("all" for every namespace)',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Remove every entry from the cache backend',
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            cache.clear()
+            self.stdout.write(self.style.SUCCESS('✓ Cleared the shared cache'))
+
+        if options['invalidate']:
+            names = options['invalidate']
+            if 'all' in names:
+                names = list(CacheNamespace.registry)
+            unknown = [name for name in names if name not in CacheNamespace.registry]
+            if unknown:
+                raise CommandError(
+                    f"Unknown namespace(s): {', '.join(unknown)}. "
+                    f"Known: {', '.join(sorted(CacheNamespace.registry))}"
+                )
+            for name in names:
+                SharedCache.namespace(name).invalidate()
+                self.stdout.write(self.style.SUCCESS(f'✓ Invalidated {name}'))
+
+        if options['stats'] or not (options['clear'] or options['invalidate']):
+            self.stdout.write(f"{'Namespace':<20} {'Hits':>10} {'Misses':>10} {'Hit rate':>9}")
+            for row in SharedCache.stats():
+                self.stdout.write(
+                    f"{row['namespace']:<20} {row['hits']:>10} {row['misses']:>10} {row['hit_rate']:>8}%"
+                )
@@ -1,10 +1,24 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
 from django.utils.deprecation import MiddlewareMixin
 from django.shortcuts import redirect
 from django.http import HttpResponseForbidden
 from django.urls import reverse
 
+from main.services.request_metrics import QueryRecorder, RequestMetrics
+
+logger = logging.getLogger(__name__)
+
 class NoCacheMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
+        if getattr(response, 'revalidate_privately', False):
+            # Per-user JSON with an ETag (see decorators.revalidate_privately):
+            # the browser may keep it but must revalidate before every use
+            response['Cache-Control'] = 'private, no-cache'
+            return response
         if request.user.is_authenticated:
             response['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
             response['Pragma'] = 'no-cache'
@@ -12,6 +26,37 @@ class NoCacheMiddleware(MiddlewareMixin):
         return response
 
 
+class RequestMetricsMiddleware:
+    """
+    Record wall time, SQL queries and response size of every request in
+    RequestMetrics (see main.services.request_metrics). Static and media files
+    are skipped. Superusers see the results at /request-metrics/.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_METRICS_ENABLED', True)
+        self.skipped_prefixes = tuple(
+            prefix for prefix in (settings.STATIC_URL, getattr(settings, 'MEDIA_URL', None)) if prefix
+        )
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.skipped_prefixes):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            RequestMetrics.record(request, response, wall_ms, recorder)
+        except Exception as e:
+            # Metrics must never break a request
+            logger.warning(f"Could not record request metrics for {request.path}: {str(e)}")
+        return response
+
+
 class RestrictAdminMiddleware(MiddlewareMixin):
     """
     Restrict access to Django admin panel - only allow superusers
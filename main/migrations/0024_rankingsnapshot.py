@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0023_userprofile_profile_picture'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('institute', models.CharField(blank=True, max_length=50, null=True)),
+                ('role', models.CharField(choices=[('Student', 'Student'), ('Dean', 'Dean'), ('Coordinator', 'Coordinator'), ('Faculty', 'Faculty'), ('Admin', 'Admin')], max_length=20)),
+                ('rank', models.IntegerField()),
+                ('total_users', models.IntegerField(default=0)),
+                ('score', models.FloatField(default=0.0)),
+                ('percentile', models.FloatField(default=0.0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('evaluation_period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_snapshots', to='main.evaluationperiod')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['evaluation_period', 'institute', 'role', 'rank'],
+                'indexes': [models.Index(fields=['evaluation_period', 'institute', 'role'], name='main_rankin_evaluat_cc83f9_idx')],
+                'unique_together': {('evaluation_period', 'user')},
+            },
+        ),
+    ]
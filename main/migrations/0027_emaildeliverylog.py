@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0026_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailDeliveryLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification', models.CharField(max_length=50)),
+                ('evaluation_type', models.CharField(blank=True, max_length=20)),
+                ('subject', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('recipient_count', models.IntegerField(default=0)),
+                ('sent_count', models.IntegerField(default=0)),
+                ('failed_count', models.IntegerField(default=0)),
+                ('batch_count', models.IntegerField(default=0)),
+                ('failed_emails', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_seconds', models.FloatField(default=0.0)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
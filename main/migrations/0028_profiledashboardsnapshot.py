@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:27
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0027_emaildeliverylog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileDashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('Student', 'Student'), ('Dean', 'Dean'), ('Coordinator', 'Coordinator'), ('Faculty', 'Faculty'), ('Admin', 'Admin')], max_length=20)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('evaluation_period', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshots', to='main.evaluationperiod')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-built_at'],
+                'indexes': [models.Index(fields=['user', 'is_stale', '-built_at'], name='main_profil_user_id_809509_idx')],
+                'unique_together': {('user', 'evaluation_period')},
+            },
+        ),
+    ]
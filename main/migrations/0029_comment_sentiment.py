@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0028_profiledashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationresponse',
+            name='comment_sentiment',
+            field=models.CharField(blank=True, choices=[('positive', 'Positive'), ('negative', 'Negative'), ('mixed', 'Mixed'), ('neutral', 'Neutral')], max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='evaluationresponse',
+            name='comment_sentiment_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='irregularevaluation',
+            name='comment_sentiment',
+            field=models.CharField(blank=True, choices=[('positive', 'Positive'), ('negative', 'Negative'), ('mixed', 'Mixed'), ('neutral', 'Neutral')], max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='irregularevaluation',
+            name='comment_sentiment_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:38
+
+import re
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+# How periods were grouped before cycles existed: by the timestamp in their name
+PERIOD_TIMESTAMP_PATTERN = re.compile(
+    r'((?:January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'\s+\d{1,2},?\s+\d{4}(?:\s+\d{1,2}:\d{2})?)'
+)
+
+
+def assign_cycles(apps, schema_editor):
+    """Put existing periods that shared a name timestamp into one cycle."""
+    EvaluationCycle = apps.get_model('main', 'EvaluationCycle')
+    EvaluationPeriod = apps.get_model('main', 'EvaluationPeriod')
+
+    groups = {}
+    for period in EvaluationPeriod.objects.order_by('start_date', 'id'):
+        timestamp_match = PERIOD_TIMESTAMP_PATTERN.search(period.name)
+        key = timestamp_match.group(1) if timestamp_match else f'period:{period.id}'
+        groups.setdefault(key, []).append(period)
+
+    for key, periods in groups.items():
+        name = f'Evaluation {key}' if not key.startswith('period:') else periods[0].name
+        cycle = EvaluationCycle.objects.create(name=name[:100], started_at=periods[0].start_date)
+        EvaluationPeriod.objects.filter(id__in=[period.id for period in periods]).update(cycle=cycle)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0029_comment_sentiment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('started_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='evaluationperiod',
+            name='cycle',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='periods', to='main.evaluationcycle'),
+        ),
+        migrations.RunPython(assign_cycles, noop),
+    ]
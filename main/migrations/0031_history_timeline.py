@@ -0,0 +1,54 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0030_evaluation_cycle'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluationhistory',
+            name='irregular_percentage',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='evaluationhistory',
+            name='irregular_responses',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='evaluationhistory',
+            name='is_summary',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='evaluationhistory',
+            name='peer_percentage',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='evaluationhistory',
+            name='peer_responses',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='evaluationhistory',
+            name='upward_percentage',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='evaluationhistory',
+            name='upward_responses',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='evaluationhistory',
+            index=models.Index(fields=['user', 'evaluation_type', '-period_end_date', '-id'], name='main_evalua_user_id_7e64ba_idx'),
+        ),
+    ]
@@ -0,0 +1,169 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of main.services.evaluation_aggregate as of this migration, so
+# the backfill keeps computing the same totals when the live service changes.
+STANDARD_SCALE = ({
+    'Poor': 1,
+    'Unsatisfactory': 2,
+    'Satisfactory': 3,
+    'Very Satisfactory': 4,
+    'Outstanding': 5,
+}, 1)
+AGREEMENT_SCALE = ({
+    'Strongly Disagree': 1,
+    'Disagree': 2,
+    'Neutral': 3,
+    'Agree': 4,
+    'Strongly Agree': 5,
+    'Poor': 1,
+    'Fair': 2,
+    'Satisfactory': 3,
+    'Very Satisfactory': 4,
+    'Outstanding': 5,
+}, 3)
+STUDENT_UPWARD_SCALE = ({
+    '1': 1,
+    '2': 2,
+    '3': 3,
+    '4': 4,
+    '5': 5,
+    **STANDARD_SCALE[0],
+}, 0)
+
+# evaluation type -> (scale, questions on the form, questions scored)
+TYPES = {
+    'student': (STANDARD_SCALE, 19, 15),
+    'peer': (STANDARD_SCALE, 15, 15),
+    'irregular': (STANDARD_SCALE, 19, 15),
+    'upward': (AGREEMENT_SCALE, 15, 15),
+    'dean': (AGREEMENT_SCALE, 15, 15),
+    'student_upward': (STUDENT_UPWARD_SCALE, 12, 12),
+}
+
+# response model -> (its type, None for EvaluationResponse; question fields read)
+SOURCES = {
+    'EvaluationResponse': (None, 19),
+    'IrregularEvaluation': ('irregular', 19),
+    'UpwardEvaluationResponse': ('upward', 15),
+    'DeanEvaluationResponse': ('dean', 15),
+    'StudentUpwardEvaluationResponse': ('student_upward', 12),
+}
+
+MAX_QUESTIONS = 19
+QUESTION_SUM_FIELDS = [f'question{number}_sum' for number in range(1, MAX_QUESTIONS + 1)]
+BUCKET_FIELDS = [
+    'poor_count', 'unsatisfactory_count', 'satisfactory_count',
+    'very_satisfactory_count', 'outstanding_count',
+]
+
+
+def contribution(evaluation_type, answers):
+    (ratings, default), question_count, scored = TYPES[evaluation_type]
+    values = [ratings.get(answer, default) for answer in answers[:question_count]]
+    buckets = [0] * len(BUCKET_FIELDS)
+    for value in values[:scored]:
+        if 1 <= value <= len(BUCKET_FIELDS):
+            buckets[value - 1] += 1
+    return values, buckets
+
+
+def build_aggregates(apps, schema_editor):
+    """Aggregate the responses submitted before the table existed."""
+    EvaluationAggregate = apps.get_model('main', 'EvaluationAggregate')
+
+    totals_by_key = {}
+    for model_name, (evaluation_type, question_count) in SOURCES.items():
+        model = apps.get_model('main', model_name)
+        # EvaluationResponse rows carry a section and take their type from their period
+        if evaluation_type is None:
+            keys = ['evaluatee_id', 'evaluation_period_id', 'student_section', 'evaluation_period__evaluation_type']
+        else:
+            keys = ['evaluatee_id', 'evaluation_period_id']
+        questions = [f'question{number}' for number in range(1, question_count + 1)]
+
+        rows = model.objects.order_by().values_list(*keys, *questions).iterator(chunk_size=2000)
+        for row in rows:
+            if evaluation_type is None:
+                key = (row[0], row[1], row[2] or '', 'peer' if row[3] == 'peer' else 'student')
+            else:
+                key = (row[0], row[1], '', evaluation_type)
+            values, buckets = contribution(key[3], row[len(keys):])
+
+            totals = totals_by_key.setdefault(
+                key, dict.fromkeys(['response_count'] + QUESTION_SUM_FIELDS + BUCKET_FIELDS, 0)
+            )
+            totals['response_count'] += 1
+            for field, value in zip(QUESTION_SUM_FIELDS, values):
+                totals[field] += value
+            for field, count in zip(BUCKET_FIELDS, buckets):
+                totals[field] += count
+
+    EvaluationAggregate.objects.bulk_create(
+        [
+            EvaluationAggregate(
+                evaluatee_id=evaluatee_id,
+                evaluation_period_id=period_id,
+                section_code=section_code,
+                evaluation_type=evaluation_type,
+                **totals
+            )
+            for (evaluatee_id, period_id, section_code, evaluation_type), totals in totals_by_key.items()
+        ],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0031_history_timeline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section_code', models.CharField(blank=True, default='', max_length=50)),
+                ('evaluation_type', models.CharField(choices=[('student', 'Student Evaluation'), ('peer', 'Peer Evaluation'), ('irregular', 'Irregular Student Evaluation'), ('upward', 'Upward Evaluation'), ('dean', 'Dean Evaluation'), ('student_upward', 'Student Upward Evaluation')], max_length=20)),
+                ('response_count', models.IntegerField(default=0)),
+                ('question1_sum', models.IntegerField(default=0)),
+                ('question2_sum', models.IntegerField(default=0)),
+                ('question3_sum', models.IntegerField(default=0)),
+                ('question4_sum', models.IntegerField(default=0)),
+                ('question5_sum', models.IntegerField(default=0)),
+                ('question6_sum', models.IntegerField(default=0)),
+                ('question7_sum', models.IntegerField(default=0)),
+                ('question8_sum', models.IntegerField(default=0)),
+                ('question9_sum', models.IntegerField(default=0)),
+                ('question10_sum', models.IntegerField(default=0)),
+                ('question11_sum', models.IntegerField(default=0)),
+                ('question12_sum', models.IntegerField(default=0)),
+                ('question13_sum', models.IntegerField(default=0)),
+                ('question14_sum', models.IntegerField(default=0)),
+                ('question15_sum', models.IntegerField(default=0)),
+                ('question16_sum', models.IntegerField(default=0)),
+                ('question17_sum', models.IntegerField(default=0)),
+                ('question18_sum', models.IntegerField(default=0)),
+                ('question19_sum', models.IntegerField(default=0)),
+                ('poor_count', models.IntegerField(default=0)),
+                ('unsatisfactory_count', models.IntegerField(default=0)),
+                ('satisfactory_count', models.IntegerField(default=0)),
+                ('very_satisfactory_count', models.IntegerField(default=0)),
+                ('outstanding_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('evaluatee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='evaluation_aggregates', to=settings.AUTH_USER_MODEL)),
+                ('evaluation_period', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='main.evaluationperiod')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['evaluation_period', 'evaluation_type'], name='main_evalua_evaluat_f10f85_idx')],
+                'unique_together': {('evaluatee', 'evaluation_period', 'section_code', 'evaluation_type')},
+            },
+        ),
+        migrations.RunPython(build_aggregates, migrations.RunPython.noop),
+    ]
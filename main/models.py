@@ -3,7 +3,10 @@ from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Q
+from django.dispatch import Signal
+from main.services.sentiment import SentimentClassifier, SENTIMENT_CHOICES
 
 # 🚫 Removed: from .models import SectionAssignment, Section, UserProfile
 # Never import models from the same file — they're already available below.
@@ -18,6 +21,35 @@ class Role(models.TextChoices):
     FACULTY = 'Faculty', 'Faculty'
     ADMIN = 'Admin', 'Admin'
 
+# ------------------------
+# Evaluation State Changes
+# ------------------------
+# Sent whenever evaluations or evaluation periods are written: by save()/delete()
+# (see main.signals) and by queryset update()/delete(), which the release and
+# unrelease views use and which bypass the per-instance signals.
+evaluation_state_changed = Signal()
+
+
+class EvaluationStateQuerySet(models.QuerySet):
+    """QuerySet that reports bulk writes through evaluation_state_changed."""
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            evaluation_state_changed.send(sender=self.model)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        result = super().delete()
+        if result[0]:
+            evaluation_state_changed.send(sender=self.model)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 # ------------------------
 # Institute and Course Models
 # ------------------------
@@ -195,6 +227,25 @@ class Section(models.Model):
     def __str__(self):
         return f"{self.code} ({self.get_year_level_display()})"
 
+# ------------------------
+# Evaluation Cycle
+# ------------------------
+class EvaluationCycle(models.Model):
+    """
+    One evaluation round: the student, peer, upward and dean periods that were
+    released together. History pages, reports and the history API group
+    periods by their cycle (see main.services.evaluation_cycle).
+    """
+    name = models.CharField(max_length=100)
+    started_at = models.DateTimeField(default=timezone.now, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return self.name
+
 # ------------------------
 # Evaluation Period (MUST BE DEFINED BEFORE Evaluation)
 # ------------------------
@@ -218,6 +269,15 @@ class EvaluationPeriod(models.Model):
     end_date = models.DateTimeField()
     is_active = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    cycle = models.ForeignKey(
+        EvaluationCycle,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="periods"
+    )
+
+    objects = EvaluationStateQuerySet.as_manager()
 
     class Meta:
         ordering = ['-start_date']
@@ -265,11 +325,15 @@ class Evaluation(models.Model):
         blank=True
     )
 
+    objects = EvaluationStateQuerySet.as_manager()
+
     # Add these methods
     @classmethod
     def is_evaluation_period_active(cls, evaluation_type='student'):
         """Check if evaluation period is active (form is released)"""
-        return cls.objects.filter(is_released=True, evaluation_type=evaluation_type).exists()
+        # Served from the cached release-state registry (no query per call)
+        from main.services.release_state import ReleaseStateRegistry
+        return ReleaseStateRegistry.is_released(evaluation_type)
     
     @classmethod
     def can_view_results(cls, evaluation_type='student'):
@@ -325,6 +389,9 @@ class EvaluationResponse(models.Model):
 
     # ADD COMMENTS FIELD
     comments = models.TextField(blank=True, null=True, verbose_name="Additional Comments/Suggestions")
+    # Classified on save so pages never re-run sentiment analysis (see main.services.sentiment)
+    comment_sentiment = models.CharField(max_length=10, choices=SENTIMENT_CHOICES, blank=True, null=True)
+    comment_sentiment_score = models.FloatField(blank=True, null=True)
 
     class Meta:
         # Allow same evaluator to evaluate same evaluatee in different periods
@@ -334,6 +401,14 @@ class EvaluationResponse(models.Model):
     def __str__(self):
         return f"{self.evaluator.get_full_name() or self.evaluator.username}'s Evaluation for {self.evaluatee.get_full_name() or self.evaluatee.username}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'comments' in update_fields:
+            self.comment_sentiment, self.comment_sentiment_score = SentimentClassifier.classify(self.comments)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'comment_sentiment', 'comment_sentiment_score'}
+        super().save(*args, **kwargs)
+
 # ------------------------
 # Irregular Student Evaluation (Separate from regular evaluations)
 # ------------------------
@@ -370,6 +445,9 @@ class IrregularEvaluation(models.Model):
     question19 = models.CharField(max_length=50, default='Poor')
 
     comments = models.TextField(blank=True, null=True, verbose_name="Additional Comments/Suggestions")
+    # Classified on save so pages never re-run sentiment analysis (see main.services.sentiment)
+    comment_sentiment = models.CharField(max_length=10, choices=SENTIMENT_CHOICES, blank=True, null=True)
+    comment_sentiment_score = models.FloatField(blank=True, null=True)
 
     class Meta:
         unique_together = ('evaluator', 'evaluatee', 'evaluation_period')
@@ -379,6 +457,79 @@ class IrregularEvaluation(models.Model):
     def __str__(self):
         return f"[IRREGULAR] {self.evaluator.get_full_name() or self.evaluator.username}'s Evaluation for {self.evaluatee.get_full_name() or self.evaluatee.username}"
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'comments' in update_fields:
+            self.comment_sentiment, self.comment_sentiment_score = SentimentClassifier.classify(self.comments)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'comment_sentiment', 'comment_sentiment_score'}
+        super().save(*args, **kwargs)
+
+# ------------------------
+# Evaluation Aggregate
+# ------------------------
+class EvaluationAggregate(models.Model):
+    """
+    Running totals of the responses about one evaluatee, kept up to date as
+    responses are submitted (see main.services.evaluation_aggregate)
+    """
+    EVALUATION_TYPE_CHOICES = [
+        ('student', 'Student Evaluation'),
+        ('peer', 'Peer Evaluation'),
+        ('irregular', 'Irregular Student Evaluation'),
+        ('upward', 'Upward Evaluation'),
+        ('dean', 'Dean Evaluation'),
+        ('student_upward', 'Student Upward Evaluation'),
+    ]
+
+    evaluatee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='evaluation_aggregates')
+    evaluation_period = models.ForeignKey(EvaluationPeriod, on_delete=models.CASCADE, null=True, blank=True)
+    # EvaluationResponse.student_section; empty for evaluations without one
+    section_code = models.CharField(max_length=50, blank=True, default='')
+    evaluation_type = models.CharField(max_length=20, choices=EVALUATION_TYPE_CHOICES)
+
+    response_count = models.IntegerField(default=0)
+
+    # Sum of each question's rating values over all responses
+    question1_sum = models.IntegerField(default=0)
+    question2_sum = models.IntegerField(default=0)
+    question3_sum = models.IntegerField(default=0)
+    question4_sum = models.IntegerField(default=0)
+    question5_sum = models.IntegerField(default=0)
+    question6_sum = models.IntegerField(default=0)
+    question7_sum = models.IntegerField(default=0)
+    question8_sum = models.IntegerField(default=0)
+    question9_sum = models.IntegerField(default=0)
+    question10_sum = models.IntegerField(default=0)
+    question11_sum = models.IntegerField(default=0)
+    question12_sum = models.IntegerField(default=0)
+    question13_sum = models.IntegerField(default=0)
+    question14_sum = models.IntegerField(default=0)
+    question15_sum = models.IntegerField(default=0)
+    question16_sum = models.IntegerField(default=0)
+    question17_sum = models.IntegerField(default=0)
+    question18_sum = models.IntegerField(default=0)
+    question19_sum = models.IntegerField(default=0)
+
+    # Rating distribution of the scored questions
+    poor_count = models.IntegerField(default=0)
+    unsatisfactory_count = models.IntegerField(default=0)
+    satisfactory_count = models.IntegerField(default=0)
+    very_satisfactory_count = models.IntegerField(default=0)
+    outstanding_count = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['evaluatee', 'evaluation_period', 'section_code', 'evaluation_type']
+        indexes = [
+            models.Index(fields=['evaluation_period', 'evaluation_type']),
+        ]
+
+    def __str__(self):
+        section_info = f" - {self.section_code}" if self.section_code else ""
+        return f"{self.evaluatee.username} - {self.evaluation_type} ({self.response_count}){section_info}"
+
 # ------------------------
 # Evaluation Result
 # ------------------------
@@ -516,6 +667,19 @@ class EvaluationHistory(models.Model):
     very_satisfactory_count = models.IntegerField(default=0)
     outstanding_count = models.IntegerField(default=0)
     
+    # Marks the per-period timeline row HistoryTimelineService writes next to
+    # the user's archived results; real section-less results keep False
+    is_summary = models.BooleanField(default=False)
+    
+    # The user's other evaluations in the same cycle, stored on the student
+    # summary rows (see main.services.history_timeline)
+    peer_responses = models.IntegerField(default=0)
+    peer_percentage = models.FloatField(default=0.0)
+    irregular_responses = models.IntegerField(default=0)
+    irregular_percentage = models.FloatField(default=0.0)
+    upward_responses = models.IntegerField(default=0)
+    upward_percentage = models.FloatField(default=0.0)
+    
     # Timestamps
     archived_at = models.DateTimeField(auto_now_add=True)
     period_start_date = models.DateTimeField(null=True, blank=True)  # Snapshot of period start
@@ -527,6 +691,8 @@ class EvaluationHistory(models.Model):
         indexes = [
             models.Index(fields=['user', '-period_start_date']),
             models.Index(fields=['evaluation_type', '-period_start_date']),
+            # Keyset pagination of the history timeline
+            models.Index(fields=['user', 'evaluation_type', '-period_end_date', '-id']),
         ]
     
     def __str__(self):
@@ -567,13 +733,13 @@ class EvaluationHistory(models.Model):
         ]
     
     @classmethod
-    def create_from_result(cls, result):
-        """Create a history record from an EvaluationResult"""
-        return cls.objects.create(
-            user=result.user,
+    def from_result(cls, result):
+        """Build an unsaved history record copying every score field of an EvaluationResult"""
+        return cls(
+            user_id=result.user_id,
             evaluation_period=result.evaluation_period,
             evaluation_type=result.evaluation_period.evaluation_type,
-            section=result.section,
+            section_id=result.section_id,
             category_a_score=result.category_a_score,
             category_b_score=result.category_b_score,
             category_c_score=result.category_c_score,
@@ -591,6 +757,85 @@ class EvaluationHistory(models.Model):
             period_end_date=result.evaluation_period.end_date,
         )
 
+    @classmethod
+    def create_from_result(cls, result):
+        """Create a history record from an EvaluationResult"""
+        history = cls.from_result(result)
+        history.save()
+        return history
+
+# ------------------------
+# Ranking Snapshot
+# ------------------------
+class RankingSnapshot(models.Model):
+    """
+    Materialized institute/role ranking for a finished evaluation period.
+    Written once when the period's results are finalized so ranking pages,
+    profile settings and reports never recompute it, and historical periods
+    keep their rankings after results move to history.
+    """
+    evaluation_period = models.ForeignKey(
+        EvaluationPeriod,
+        on_delete=models.CASCADE,
+        related_name="ranking_snapshots"
+    )
+    institute = models.CharField(max_length=50, blank=True, null=True)
+    role = models.CharField(max_length=20, choices=Role.choices)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ranking_snapshots")
+
+    rank = models.IntegerField()
+    total_users = models.IntegerField(default=0)
+    score = models.FloatField(default=0.0)  # Average total_percentage across sections
+    percentile = models.FloatField(default=0.0)  # Share of the group ranked at or below this user
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['evaluation_period', 'user']
+        ordering = ['evaluation_period', 'institute', 'role', 'rank']
+        indexes = [
+            models.Index(fields=['evaluation_period', 'institute', 'role']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.evaluation_period.name} - #{self.rank} of {self.total_users}"
+
+# ------------------------
+# Profile Dashboard Snapshot
+# ------------------------
+class ProfileDashboardSnapshot(models.Model):
+    """
+    Everything the staff profile settings pages show about a user's results
+    (section scores, peer and irregular scores, rating distributions,
+    classified comments, ranking), serialized once per user and period.
+    Built when a period's results are processed and marked stale when one of
+    its inputs changes; see main.services.profile_dashboard.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="dashboard_snapshots")
+    # Latest completed student period when the snapshot was built (null before the first one)
+    evaluation_period = models.ForeignKey(
+        EvaluationPeriod,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="dashboard_snapshots"
+    )
+    role = models.CharField(max_length=20, choices=Role.choices)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    is_stale = models.BooleanField(default=False)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'evaluation_period']
+        ordering = ['-built_at']
+        indexes = [
+            models.Index(fields=['user', 'is_stale', '-built_at']),
+        ]
+
+    def __str__(self):
+        period_name = self.evaluation_period.name if self.evaluation_period else 'No period'
+        return f"{self.user.username} - {period_name}{' (stale)' if self.is_stale else ''}"
+
 # ------------------------
 # Evaluation Comment
 # ------------------------
@@ -657,6 +902,33 @@ class AiRecommendation(models.Model):
     def __str__(self):
         return f"Recommendation for {self.user.email} at {self.created_at}"
 
+# ------------------------
+# AI Recommendation Cache
+# ------------------------
+class AiRecommendationCacheEntry(models.Model):
+    """
+    Content-addressed cache of AI recommendation responses.
+    The key is a SHA-256 of the prompt context, system prompt and model, so
+    identical inputs reuse the stored answer instead of a new paid API call.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name="ai_cache_entries")
+    evaluation_type = models.CharField(max_length=20, default='student')
+    section_code = models.CharField(max_length=50, null=True, blank=True)
+    model_name = models.CharField(max_length=50)
+    recommendations = models.JSONField(default=list)
+
+    hit_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(db_index=True)  # LRU eviction order
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-last_accessed_at']
+
+    def __str__(self):
+        return f"{self.key[:12]} - {self.evaluation_type} - {self.section_code or 'Overall'}"
+
 # ------------------------
 # Admin Activity Log
 # ------------------------
@@ -685,6 +957,89 @@ class AdminActivityLog(models.Model):
     def __str__(self):
         return f"{self.admin.username if self.admin else 'Unknown'} - {self.get_action_display()} - {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
 
+# ------------------------
+# Background Job
+# ------------------------
+class BackgroundJob(models.Model):
+    """
+    A unit of deferred work (archiving, result processing, notification emails)
+    picked up by the `run_jobs` worker command. Rows survive web worker restarts,
+    and a running job whose heartbeat goes stale is handed to another worker.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Jobs sharing a dedupe key are enqueued once, so double-clicks don't duplicate work
+    dedupe_key = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    progress = models.IntegerField(default=0)  # 0-100
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="background_jobs")
+    locked_by = models.CharField(max_length=100, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.task} ({self.status})"
+
+# ------------------------
+# Email Delivery Log
+# ------------------------
+class EmailDeliveryLog(models.Model):
+    """One row per bulk notification send, with delivered and failed counts"""
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    notification = models.CharField(max_length=50)  # e.g. 'evaluation_released', 'evaluation_closed'
+    evaluation_type = models.CharField(max_length=20, blank=True)
+    subject = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+
+    recipient_count = models.IntegerField(default=0)
+    sent_count = models.IntegerField(default=0)
+    failed_count = models.IntegerField(default=0)
+    batch_count = models.IntegerField(default=0)
+    failed_emails = models.JSONField(default=list, blank=True)  # capped, see BulkEmailService
+    error = models.TextField(blank=True)
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(default=0.0)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.notification} ({self.evaluation_type}) - {self.sent_count}/{self.recipient_count} sent"
+
 # ------------------------
 # Section Assignment
 # ------------------------
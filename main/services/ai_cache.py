@@ -0,0 +1,152 @@
+"""
+Content-addressed, persistent cache for AI recommendations.
+
+Entries are keyed by a SHA-256 of the exact prompt sent to the model (the
+``_prepare_ai_context`` output, the system prompt and the model name), so
+identical inputs are answered from the database in milliseconds. Entries
+expire after a TTL, the least recently used ones are evicted once the table
+grows past its limit, and hit/miss counters are kept in the Django cache.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+from main.models import AiRecommendationCacheEntry, EvaluationResult
+
+logger = logging.getLogger(__name__)
+
+
+class AIRecommendationCacheService:
+    """Look up, store and invalidate cached AI recommendation responses."""
+
+    HITS_KEY = 'ai_cache:hits'
+    MISSES_KEY = 'ai_cache:misses'
+
+    @staticmethod
+    def ttl():
+        return getattr(settings, 'AI_RECOMMENDATION_CACHE_TTL', 7 * 24 * 60 * 60)
+
+    @staticmethod
+    def max_entries():
+        return getattr(settings, 'AI_RECOMMENDATION_CACHE_MAX_ENTRIES', 5000)
+
+    @staticmethod
+    def make_key(model_name, messages):
+        """Stable hash of the model and the full message list sent to it."""
+        payload = json.dumps({'model': model_name, 'messages': messages}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _count(counter_key):
+        # add() is a no-op when the counter exists, so incr() never races a missing key
+        cache.add(counter_key, 0, None)
+        try:
+            cache.incr(counter_key)
+        except ValueError:
+            cache.set(counter_key, 1, None)
+
+    @staticmethod
+    def get(key):
+        """Return cached recommendations for a key, or None on a miss."""
+        now = timezone.now()
+        try:
+            recommendations = (
+                AiRecommendationCacheEntry.objects
+                .filter(key=key, expires_at__gt=now)
+                .values_list('recommendations', flat=True)
+                .first()
+            )
+            if recommendations is not None:
+                AiRecommendationCacheEntry.objects.filter(key=key).update(
+                    hit_count=F('hit_count') + 1,
+                    last_accessed_at=now
+                )
+        except DatabaseError as e:
+            logger.warning(f"AI cache lookup failed for {key[:12]}: {str(e)}")
+            recommendations = None
+
+        if recommendations is None:
+            AIRecommendationCacheService._count(AIRecommendationCacheService.MISSES_KEY)
+            return None
+
+        AIRecommendationCacheService._count(AIRecommendationCacheService.HITS_KEY)
+        return recommendations
+
+    @staticmethod
+    def set(key, recommendations, model_name, user=None, evaluation_type='student', section_code=None):
+        """
+        Store recommendations under a key and evict expired / least recently used entries.
+        A failed write is logged and ignored; the caller already has its answer.
+        """
+        now = timezone.now()
+        try:
+            AiRecommendationCacheEntry.objects.update_or_create(
+                key=key,
+                defaults={
+                    'user': user,
+                    'evaluation_type': evaluation_type,
+                    'section_code': section_code,
+                    'model_name': model_name,
+                    'recommendations': recommendations,
+                    'last_accessed_at': now,
+                    'expires_at': now + timedelta(seconds=AIRecommendationCacheService.ttl()),
+                }
+            )
+            AIRecommendationCacheService.evict()
+        except DatabaseError as e:
+            logger.warning(f"Could not store AI cache entry {key[:12]}: {str(e)}")
+
+    @staticmethod
+    def evict():
+        """Drop expired entries, then the least recently used ones beyond the size limit."""
+        expired = AiRecommendationCacheEntry.objects.filter(expires_at__lte=timezone.now()).delete()[0]
+
+        evicted = 0
+        overflow = AiRecommendationCacheEntry.objects.count() - AIRecommendationCacheService.max_entries()
+        if overflow > 0:
+            stale_ids = list(
+                AiRecommendationCacheEntry.objects
+                .order_by('last_accessed_at')
+                .values_list('id', flat=True)[:overflow]
+            )
+            evicted = AiRecommendationCacheEntry.objects.filter(id__in=stale_ids).delete()[0]
+
+        if expired or evicted:
+            logger.info(f"AI cache eviction: {expired} expired, {evicted} least recently used")
+        return expired + evicted
+
+    @staticmethod
+    def invalidate_user(user):
+        """Forget every cached answer for one user."""
+        return AiRecommendationCacheEntry.objects.filter(user=user).delete()[0]
+
+    @staticmethod
+    def invalidate_period(evaluation_period):
+        """
+        Forget cached answers for everyone with results in a period.
+        Called when a period's results are reprocessed.
+        """
+        user_ids = EvaluationResult.objects.filter(evaluation_period=evaluation_period).values('user_id')
+        deleted = AiRecommendationCacheEntry.objects.filter(user_id__in=user_ids).delete()[0]
+        if deleted:
+            logger.info(f"Invalidated {deleted} cached AI recommendations for period: {evaluation_period.name}")
+        return deleted
+
+    @staticmethod
+    def stats():
+        hits = cache.get(AIRecommendationCacheService.HITS_KEY, 0)
+        misses = cache.get(AIRecommendationCacheService.MISSES_KEY, 0)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups * 100, 1) if lookups else 0.0,
+            'entries': AiRecommendationCacheEntry.objects.count(),
+        }
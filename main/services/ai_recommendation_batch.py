@@ -0,0 +1,213 @@
+"""
+Batch generation of AI recommendations for a finished evaluation period.
+
+All database work (results, assigned sections, per-question averages,
+comments and rankings) is done up front in a handful of queries. Only the
+OpenAI round trips (and their prompt-cache lookups) run in a bounded thread
+pool, and the recommendations are saved with one ``bulk_create`` at the end.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import connections
+
+from main.ai_service import TeachingAIRecommendationService
+from main.constants import MAX_RATING_SCORE
+from main.models import AiRecommendation, EvaluationQuestion, EvaluationResponse, EvaluationResult, SectionAssignment
+from main.services.ranking_service import RankingService
+from main.services.score_aggregation import ScoreAggregationService
+from main.services.sentiment import SentimentClassifier
+
+logger = logging.getLogger(__name__)
+
+
+class AIRecommendationBatchService:
+    """Generate and store AI recommendations for every user/section of a period."""
+
+    @staticmethod
+    def concurrency():
+        return max(1, getattr(settings, 'AI_RECOMMENDATION_CONCURRENCY', 4))
+
+    @staticmethod
+    def build_jobs(period):
+        """
+        Collect the AI input for every (user, assigned section) that has a result
+        in this period. Returns a list of dicts ready for get_recommendations.
+        """
+        results = list(
+            EvaluationResult.objects
+            .filter(evaluation_period=period, section__isnull=False)
+            .select_related('user__userprofile', 'section')
+        )
+        if not results:
+            return []
+
+        user_ids = {result.user_id for result in results}
+        assigned = set(
+            SectionAssignment.objects
+            .filter(user_id__in=user_ids)
+            .values_list('user_id', 'section_id')
+        )
+        results = [result for result in results if (result.user_id, result.section_id) in assigned]
+
+        responses = EvaluationResponse.objects.filter(evaluation_period=period, evaluatee_id__in=user_ids)
+        question_scores = AIRecommendationBatchService._question_scores(responses)
+        comments = AIRecommendationBatchService._comments(responses)
+
+        ranking_table = None
+        ranking_period = RankingService.latest_completed_period()
+        if ranking_period:
+            ranking_table = RankingService.rankings_for_period(ranking_period)
+
+        jobs = []
+        for result in results:
+            key = (result.user_id, result.section.code)
+            section_data = {
+                'has_data': True,
+                'category_scores': [
+                    result.category_a_score,
+                    result.category_b_score,
+                    result.category_c_score,
+                    result.category_d_score
+                ],
+                'total_percentage': result.total_percentage,
+                'evaluation_count': result.total_responses,
+                'positive_comments': [],
+                'negative_comments': [],
+                'mixed_comments': [],
+                'question_scores': question_scores.get(key, []),
+            }
+            for sentiment, comment in comments.get(key, []):
+                if sentiment in ('positive', 'negative', 'mixed'):
+                    section_data[f'{sentiment}_comments'].append(comment)
+
+            profile = getattr(result.user, 'userprofile', None)
+            if ranking_table and ranking_table['users'] and profile:
+                ranking_data = RankingService.lookup(ranking_table, result.user_id, profile.institute, profile.role)
+            else:
+                ranking_data = dict(RankingService.EMPTY_RANKING)
+
+            jobs.append({
+                'user': result.user,
+                'section_code': result.section.code,
+                'section_data': section_data,
+                'role': profile.role if profile else "Faculty",
+                'ranking_data': ranking_data,
+            })
+        return jobs
+
+    @staticmethod
+    def _question_scores(responses):
+        """Average score per question for each (evaluatee, section), from one GROUP BY query."""
+        question_texts = dict(
+            EvaluationQuestion.objects
+            .filter(evaluation_type='student')
+            .values_list('question_number', 'question_text')
+        )
+        scores = {}
+        for group in ScoreAggregationService.aggregate(responses):
+            summary = group['summary']
+            if not summary['response_count']:
+                continue
+            entries = []
+            for number, total in enumerate(summary['question_sums'], start=1):
+                avg_score = total / summary['response_count']
+                entries.append({
+                    'question': question_texts.get(number, f'Question {number}'),
+                    'score': round(avg_score, 2),
+                    'percentage': round(avg_score / MAX_RATING_SCORE * 100, 1)
+                })
+            scores[(group['evaluatee_id'], group['student_section'])] = entries
+        return scores
+
+    @staticmethod
+    def _comments(responses):
+        """Non-empty comments with their sentiment, keyed by (evaluatee, section)."""
+        comments = {}
+        rows = (
+            responses
+            .filter(comments__isnull=False)
+            .exclude(comments='')
+            .values_list('evaluatee_id', 'student_section', 'comments', 'comment_sentiment')
+        )
+        rows = list(rows)
+        labelled = SentimentClassifier.labelled((comment, stored) for _, _, comment, stored in rows)
+        for (evaluatee_id, section_code, _, _), (comment, sentiment) in zip(rows, labelled):
+            comments.setdefault((evaluatee_id, section_code), []).append((sentiment, comment))
+        return comments
+
+    @staticmethod
+    def _run_job(ai_service, job):
+        try:
+            return ai_service.get_recommendations(
+                user=job['user'],
+                section_data=job['section_data'],
+                section_code=job['section_code'],
+                role=job['role'],
+                ranking_data=job['ranking_data'],
+                raise_errors=True,
+            )
+        finally:
+            # Cache lookups open a connection per worker thread; don't leak it
+            connections.close_all()
+
+    @staticmethod
+    def generate(period, concurrency=None, ai_service=None):
+        """
+        Generate recommendations for a period with at most ``concurrency``
+        requests in flight and save them in one bulk insert.
+        Returns a dict with job, saved and failure counts plus elapsed seconds.
+        """
+        concurrency = concurrency or AIRecommendationBatchService.concurrency()
+        ai_service = ai_service or TeachingAIRecommendationService()
+        started = time.perf_counter()
+
+        jobs = AIRecommendationBatchService.build_jobs(period)
+        recommendations = []
+        failed = 0
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {
+                executor.submit(AIRecommendationBatchService._run_job, ai_service, job): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    generated = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Error generating AI recommendations for {job['user'].username} - {job['section_code']}: {str(e)}")
+                    continue
+
+                if not isinstance(generated, list):
+                    continue
+                for rec in generated:
+                    if isinstance(rec, dict):
+                        recommendations.append(AiRecommendation(
+                            user=job['user'],
+                            evaluation_period=period,
+                            title=str(rec.get('title', ''))[:255],
+                            description=rec.get('description', ''),
+                            priority=rec.get('priority', ''),
+                            reason=rec.get('reason', ''),
+                            recommendation=rec.get('description', ''),
+                            evaluation_type='student',
+                            section_code=job['section_code']
+                        ))
+
+        AiRecommendation.objects.bulk_create(recommendations, batch_size=500)
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Generated {len(recommendations)} AI recommendations for {len(jobs)} sections "
+            f"in {elapsed:.1f}s (concurrency {concurrency}, {failed} failed) for period: {period.name}"
+        )
+        return {
+            'jobs': len(jobs),
+            'saved_count': len(recommendations),
+            'failed_count': failed,
+            'elapsed_seconds': round(elapsed, 2),
+        }
@@ -0,0 +1,398 @@
+"""
+Bulk account import for large Excel rosters.
+
+Rows are validated in memory against lookups loaded once up front (usernames,
+emails, student numbers and sections), passwords are hashed in a process pool,
+and users and profiles are written with chunked bulk_create / bulk_update.
+bulk_create does not send post_save, so the create_user_profile signal is
+bypassed and each profile is inserted once with its final values.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from openpyxl import load_workbook
+
+from main.models import UserProfile, Section, Role
+from main.validation_utils import AccountValidator
+
+logger = logging.getLogger(__name__)
+
+STAFF_ROLES = [Role.DEAN, Role.FACULTY, Role.COORDINATOR]
+
+# Profile fields an import row can change
+PROFILE_FIELDS = ['display_name', 'role', 'studentnumber', 'course', 'section', 'institute']
+
+
+class RowError(Exception):
+    """A row failed validation; the message goes into the import report."""
+
+
+class BulkAccountImporter:
+    """
+    Import an accounts workbook with a fixed number of queries per batch.
+
+    Rows are applied in file order against the in-memory lookups, so a later
+    row sees the accounts created or changed by earlier rows exactly as the
+    row-by-row import did.
+    """
+
+    KEEP_PASSWORD = '***EXISTING***'
+    # Below this many passwords a process pool costs more than it saves
+    HASH_POOL_MIN_PASSWORDS = 20
+
+    def __init__(self, default_password, batch_size=None, hash_workers=None):
+        self.default_password = default_password
+        self.batch_size = batch_size or getattr(settings, 'ACCOUNT_IMPORT_BATCH_SIZE', 500)
+        self.hash_workers = (
+            hash_workers or getattr(settings, 'ACCOUNT_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+        )
+        self.result = {
+            'success': False,
+            'created': 0,
+            'updated': 0,
+            'skipped': 0,
+            'errors': []
+        }
+
+    # ------------------------------------------------------------------
+    # Entry point
+    # ------------------------------------------------------------------
+    def run(self, excel_file):
+        """Import ``excel_file`` and return the created/updated/skipped/errors report."""
+        started = time.perf_counter()
+        try:
+            rows = self._read_rows(excel_file)
+        except Exception as e:
+            self.result['errors'].append(f"Failed to read Excel file: {str(e)}")
+            return self.result
+        if rows is None:
+            return self.result
+
+        self._load_lookups(rows)
+
+        for row_idx, row_data in rows:
+            try:
+                self._apply_row(row_idx, row_data)
+            except RowError as e:
+                self.result['errors'].append(f"Row {row_idx}: {e}")
+                self.result['skipped'] += 1
+
+        try:
+            self._hash_passwords()
+            with transaction.atomic():
+                self._write()
+        except Exception as e:
+            logger.error(f"Account import failed while saving: {str(e)}", exc_info=True)
+            self.result['errors'].append(f"Import failed, no accounts were saved: {str(e)}")
+            self.result['created'] = 0
+            self.result['updated'] = 0
+            return self.result
+
+        self.result['success'] = True
+        logger.info(
+            f"Imported accounts from {len(rows)} rows in {time.perf_counter() - started:.2f}s: "
+            f"created={self.result['created']} updated={self.result['updated']} skipped={self.result['skipped']}"
+        )
+        return self.result
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def _read_rows(self, excel_file):
+        """Return [(row_idx, {header: value})], or None if required columns are missing."""
+        workbook = load_workbook(excel_file, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.active
+            rows_iter = worksheet.iter_rows(values_only=True)
+            header_row = next(rows_iter, ())
+
+            headers = [
+                str(value).strip().lower().replace(' ', '_')
+                for value in header_row if value
+            ]
+
+            required = {'username', 'email', 'display_name', 'role'}
+            if not required.issubset(set(headers)):
+                missing = required - set(headers)
+                self.result['errors'].append(f"Missing required columns: {', '.join(missing)}")
+                return None
+
+            rows = []
+            for row_idx, values in enumerate(rows_iter, 2):
+                row_data = {}
+                for col_idx, header in enumerate(headers):
+                    value = values[col_idx] if col_idx < len(values) else None
+                    row_data[header] = value if value else ''
+                rows.append((row_idx, row_data))
+            return rows
+        finally:
+            workbook.close()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def _load_lookups(self, rows):
+        """Load everything row validation needs in a handful of queries."""
+        file_usernames = {str(row_data.get('username', '')).strip() for _, row_data in rows}
+        file_usernames.discard('')
+
+        # Existing accounts named in the file, with their profiles
+        self.users = {}
+        file_usernames = list(file_usernames)
+        for start in range(0, len(file_usernames), self.batch_size):
+            for user in User.objects.filter(
+                username__in=file_usernames[start:start + self.batch_size]
+            ).select_related('userprofile'):
+                self.users[user.username] = user
+
+        self.usernames_lower = {
+            username.lower() for username in User.objects.values_list('username', flat=True)
+        }
+
+        # Owners are keyed by user id, or ('new', username) for rows not yet saved
+        self.email_owner = {}
+        for user_id, email in User.objects.exclude(email='').values_list('id', 'email'):
+            self.email_owner.setdefault(email.lower(), user_id)
+
+        self.student_number_owner = dict(
+            UserProfile.objects.filter(role=Role.STUDENT)
+            .exclude(studentnumber__isnull=True)
+            .values_list('studentnumber', 'user_id')
+        )
+
+        self.sections_by_code = {}
+        self.sections_by_id = {}
+        for section in Section.objects.all():
+            self.sections_by_code.setdefault(section.code, section)
+            self.sections_by_id[section.id] = section
+
+        self.new_accounts = {}   # username -> (User, UserProfile), not yet saved
+        self.updated_users = {}  # user id -> User
+        self.passwords = {}      # owner key -> raw password to hash
+
+    def _find_section(self, section_value):
+        """Resolve a section cell given as "CODE", "CODE (Label)" or a section id."""
+        normalized_section = section_value.split('(')[0].strip()
+        if not normalized_section:
+            return None
+        section = self.sections_by_code.get(normalized_section)
+        if section is None:
+            try:
+                section = self.sections_by_id.get(int(normalized_section))
+            except ValueError:
+                section = None
+        return section
+
+    # ------------------------------------------------------------------
+    # Row handling
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _check(valid_msg):
+        valid, msg = valid_msg
+        if not valid:
+            raise RowError(msg)
+
+    def _apply_row(self, row_idx, row_data):
+        username = str(row_data.get('username', '')).strip()
+        email = str(row_data.get('email', '')).strip()
+        password = str(row_data.get('password', '')).strip()
+        display_name = str(row_data.get('display_name', '')).strip()
+        role = str(row_data.get('role', '')).strip()
+
+        # If no password provided, use default password
+        if not password:
+            password = self.default_password
+
+        if not all([username, email, display_name, role]):
+            raise RowError("Missing required fields")
+
+        existing = self.users.get(username)
+        pending = self.new_accounts.get(username)
+        is_update = existing is not None or pending is not None
+        owner_key = existing.id if existing is not None else ('new', username)
+
+        self._check(AccountValidator.validate_username(username, check_unique=False))
+        if not is_update and username.lower() in self.usernames_lower:
+            # Catches case-only clashes that a case-insensitive collation would reject on insert
+            raise RowError(f"Username '{username}' is already taken")
+
+        self._check(AccountValidator.validate_email(email, check_unique=False))
+        if self.email_owner.get(email.lower(), owner_key) != owner_key:
+            raise RowError(f"Email '{email.lower()}' is already registered")
+
+        if not is_update or password != self.KEEP_PASSWORD:
+            valid, msg = AccountValidator.validate_password(password)
+            if not valid:
+                raise RowError(f"Password invalid - {msg}")
+
+        self._check(AccountValidator.validate_display_name(display_name))
+        self._check(AccountValidator.validate_role(role))
+
+        changes = {'display_name': display_name, 'role': role}
+        if role == Role.STUDENT:
+            student_number = str(row_data.get('student_number', '')).strip()
+            course = str(row_data.get('course', '')).strip()
+            section_value = str(row_data.get('section', '')).strip()
+
+            if not student_number:
+                raise RowError("Student number required for students")
+            self._check(AccountValidator.validate_student_number(student_number))
+            if self.student_number_owner.get(student_number, owner_key) != owner_key:
+                raise RowError(f"Student number '{student_number}' is already registered")
+            self._check(AccountValidator.validate_course(course))
+
+            changes['studentnumber'] = student_number
+            changes['course'] = course
+            if section_value:
+                section = self._find_section(section_value)
+                if section is None:
+                    raise RowError(f"Section '{section_value}' not found")
+                changes['section'] = section
+
+        elif role in STAFF_ROLES:
+            institute = str(row_data.get('institute', '')).strip()
+            self._check(AccountValidator.validate_institute(institute))
+            changes['institute'] = institute
+
+        # Resolve the account this row writes to
+        if existing is not None:
+            user = existing
+            try:
+                profile = user.userprofile
+            except UserProfile.DoesNotExist:
+                profile = UserProfile(user=user)
+                user.userprofile = profile
+        elif pending is not None:
+            user, profile = pending
+        else:
+            name_parts = display_name.split(None, 1)
+            user = User(
+                username=username,
+                first_name=name_parts[0] if name_parts else display_name,
+                last_name=name_parts[1] if len(name_parts) > 1 else ''
+            )
+            profile = UserProfile(role=Role.ADMIN)
+
+        # Run the model validation (UserProfile.save() would call full_clean)
+        # on a copy, so a rejected row leaves the account untouched
+        candidate = UserProfile(user=User(username=username, email=email))
+        for field in PROFILE_FIELDS:
+            if field == 'section':
+                # Use the preloaded section instead of a per-row FK query
+                value = changes.get('section', self.sections_by_id.get(profile.section_id))
+            else:
+                value = changes.get(field, getattr(profile, field))
+            setattr(candidate, field, value)
+        try:
+            candidate.clean_fields(exclude=['user', 'section', 'profile_picture'])
+            candidate.clean()
+        except ValidationError as e:
+            raise RowError('; '.join(e.messages))
+
+        # Row accepted: move lookups over to the new values
+        self._reassign(self.email_owner, user.email.lower() if user.email else None, email.lower(), owner_key)
+        old_number = profile.studentnumber if profile.role == Role.STUDENT else None
+        new_number = candidate.studentnumber if candidate.role == Role.STUDENT else None
+        self._reassign(self.student_number_owner, old_number, new_number, owner_key)
+
+        user.email = email
+        for field, value in changes.items():
+            setattr(profile, field, value)
+        if not is_update or password != self.KEEP_PASSWORD:
+            self.passwords[owner_key] = password
+
+        if existing is not None:
+            self.updated_users[user.id] = user
+            self.result['updated'] += 1
+        elif pending is not None:
+            self.result['updated'] += 1
+        else:
+            self.new_accounts[username] = (user, profile)
+            self.usernames_lower.add(username.lower())
+            self.result['created'] += 1
+
+    @staticmethod
+    def _reassign(owners, old_value, new_value, owner_key):
+        if old_value and owners.get(old_value) == owner_key:
+            del owners[old_value]
+        if new_value:
+            owners[new_value] = owner_key
+
+    # ------------------------------------------------------------------
+    # Passwords
+    # ------------------------------------------------------------------
+    def _hash_passwords(self):
+        """
+        Hash every accepted password. PBKDF2 is CPU-bound and holds the GIL, so
+        large imports spread it over worker processes. Each account still gets
+        its own salt, even when many rows share the default password.
+        """
+        keys = list(self.passwords)
+        raw = [self.passwords[key] for key in keys]
+
+        if len(raw) >= self.HASH_POOL_MIN_PASSWORDS and self.hash_workers > 1:
+            workers = min(self.hash_workers, len(raw))
+            chunksize = max(1, len(raw) // (workers * 4))
+            # django.setup() makes spawned workers (macOS/Windows) load settings
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+                hashed = list(pool.map(make_password, raw, chunksize=chunksize))
+        else:
+            hashed = [make_password(password) for password in raw]
+
+        for key, password_hash in zip(keys, hashed):
+            if isinstance(key, tuple):
+                user, _ = self.new_accounts[key[1]]
+            else:
+                user = self.updated_users[key]
+            user.password = password_hash
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _chunks(self, items):
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def _write(self):
+        # Updates first so values they release (emails, student numbers) are
+        # free before new rows claim them
+        updated_users = list(self.updated_users.values())
+        new_profiles = []
+        changed_profiles = []
+        for user in updated_users:
+            if user.userprofile.pk is None:
+                new_profiles.append(user.userprofile)
+            else:
+                changed_profiles.append(user.userprofile)
+
+        for chunk in self._chunks(updated_users):
+            User.objects.bulk_update(chunk, ['email', 'password'])
+        for chunk in self._chunks(changed_profiles):
+            UserProfile.objects.bulk_update(chunk, PROFILE_FIELDS)
+
+        accounts = list(self.new_accounts.values())
+        for chunk in self._chunks(accounts):
+            users = [user for user, _ in chunk]
+            User.objects.bulk_create(users)
+            if any(user.pk is None for user in users):
+                # Backends without RETURNING (MySQL) don't set pks on bulk_create
+                ids = dict(
+                    User.objects.filter(username__in=[user.username for user in users])
+                    .values_list('username', 'id')
+                )
+                for user in users:
+                    user.pk = ids[user.username]
+            for user, profile in chunk:
+                profile.user = user
+                new_profiles.append(profile)
+
+        for chunk in self._chunks(new_profiles):
+            UserProfile.objects.bulk_create(chunk)
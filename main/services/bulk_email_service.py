@@ -0,0 +1,118 @@
+"""
+Bulk email delivery for notifications sent to many users at once.
+
+The subject and bodies are rendered once by the caller; recipients are
+streamed from the database as ``(email, first_name)`` tuples and sent in
+batches, each batch over a single SMTP connection from ``get_connection()``.
+Every run is recorded in EmailDeliveryLog with delivered and failed counts.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from main.models import EmailDeliveryLog
+
+logger = logging.getLogger(__name__)
+
+
+class BulkEmailService:
+    """Send one rendered message to a stream of recipients in batches."""
+
+    MAX_LOGGED_FAILURES = 500
+
+    @staticmethod
+    def batch_size():
+        return getattr(settings, 'EMAIL_BATCH_SIZE', 100)
+
+    @staticmethod
+    def send(recipients, subject, text_content, html_content=None, notification='', evaluation_type='',
+             batch_size=None):
+        """
+        Send a message to every ``(email, first_name)`` in ``recipients``.
+        Returns the saved EmailDeliveryLog.
+        """
+        batch_size = batch_size or BulkEmailService.batch_size()
+        log = EmailDeliveryLog.objects.create(
+            notification=notification,
+            evaluation_type=evaluation_type,
+            subject=subject[:255]
+        )
+        started = time.perf_counter()
+        failed_emails = []
+
+        try:
+            batch = []
+            for email, first_name in recipients:
+                if not email:
+                    continue
+                message = EmailMultiAlternatives(
+                    subject=subject,
+                    body=text_content,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[email]
+                )
+                if html_content:
+                    message.attach_alternative(html_content, "text/html")
+                batch.append(message)
+
+                if len(batch) >= batch_size:
+                    BulkEmailService._send_batch(batch, log, failed_emails)
+                    batch = []
+            if batch:
+                BulkEmailService._send_batch(batch, log, failed_emails)
+
+            log.status = 'completed'
+        except Exception as e:
+            log.status = 'failed'
+            log.error = str(e)
+            logger.error(f"Bulk email '{notification}' aborted: {str(e)}", exc_info=True)
+
+        log.failed_count = len(failed_emails)
+        log.failed_emails = failed_emails[:BulkEmailService.MAX_LOGGED_FAILURES]
+        log.finished_at = timezone.now()
+        log.duration_seconds = round(time.perf_counter() - started, 3)
+        log.save()
+
+        logger.info(
+            f"Bulk email '{notification}' ({evaluation_type}): {log.sent_count}/{log.recipient_count} sent, "
+            f"{log.failed_count} failed in {log.batch_count} batches, {log.duration_seconds}s"
+        )
+        return log
+
+    @staticmethod
+    def _send_batch(messages, log, failed_emails):
+        """
+        Deliver one batch over a single connection. Messages go through
+        send_messages one at a time on that connection so a rejected address
+        fails alone instead of aborting the rest of the batch.
+        """
+        connection = get_connection(fail_silently=False)
+        sent = 0
+        try:
+            connection.open()
+            for message in messages:
+                try:
+                    sent += connection.send_messages([message]) or 0
+                except Exception as e:
+                    logger.error(f"Failed to send email to {message.to[0]}: {str(e)}")
+                    failed_emails.append(message.to[0])
+        except Exception as e:
+            # The connection itself failed; nothing in this batch was delivered
+            logger.error(f"Email batch of {len(messages)} failed to connect: {str(e)}")
+            failed_emails.extend(message.to[0] for message in messages[sent:])
+        finally:
+            connection.close()
+
+        log.recipient_count += len(messages)
+        log.sent_count += sent
+        log.batch_count += 1
+        # Persist progress so a crashed run still shows how far it got
+        EmailDeliveryLog.objects.filter(id=log.id).update(
+            recipient_count=log.recipient_count,
+            sent_count=log.sent_count,
+            batch_count=log.batch_count,
+            failed_count=len(failed_emails)
+        )
@@ -0,0 +1,360 @@
+"""
+Running per-evaluatee aggregates of evaluation responses.
+
+Results processing and the live detail pages used to re-read and re-score every
+raw response. Each submission now also adds its rating values to one
+EvaluationAggregate row per (evaluatee, period, section, evaluation type):
+response count, per-question sums and the Poor..Outstanding counts. The submit
+views do this with F() updates in the same transaction as the insert.
+Responses are only deleted in bulk, through ResponseDeletionService, which
+subtracts them again with F() updates just before the delete. Category totals are
+not stored: the two category layouts (STUDENT_CATEGORY_LAYOUT and
+PERIOD_RESULTS_CATEGORY_LAYOUT) are both derived from the question sums by
+ScoringEngine.summarize_sums, so reading a score costs one query over a
+handful of rows whatever the number of responses.
+
+Each evaluation type keeps the rating scale its results code has always used
+(see TYPES). A response counts towards its own evaluation_period.
+
+`python manage.py rebuild_evaluation_aggregates` recomputes the table from the
+raw rows, or with --verify only reports rows that disagree with them.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from main.constants import RATING_NUMERIC_MAP, MAX_RATING_SCORE, TOTAL_QUESTIONS
+from main.models import (
+    DeanEvaluationResponse, EvaluationAggregate, EvaluationPeriod, EvaluationResponse,
+    IrregularEvaluation, StudentUpwardEvaluationResponse, UpwardEvaluationResponse,
+)
+from main.services.scoring_engine import ScoringEngine, STUDENT_CATEGORY_LAYOUT
+
+logger = logging.getLogger(__name__)
+
+# (label -> value, value of any other label)
+STANDARD_SCALE = (RATING_NUMERIC_MAP, 1)
+# Faculty -> coordinator and faculty -> dean forms answer on an agreement scale
+AGREEMENT_SCALE = ({
+    'Strongly Disagree': 1,
+    'Disagree': 2,
+    'Neutral': 3,
+    'Agree': 4,
+    'Strongly Agree': 5,
+    'Poor': 1,
+    'Fair': 2,
+    'Satisfactory': 3,
+    'Very Satisfactory': 4,
+    'Outstanding': 5,
+}, 3)
+# The student -> coordinator form posts the rating digits themselves
+STUDENT_UPWARD_SCALE = ({
+    '1': 1,
+    '2': 2,
+    '3': 3,
+    '4': 4,
+    '5': 5,
+    **RATING_NUMERIC_MAP,
+}, 0)
+
+# evaluation type -> (response model, scale, questions on the form, questions scored)
+TYPES = {
+    'student': (EvaluationResponse, STANDARD_SCALE, 19, TOTAL_QUESTIONS),
+    'peer': (EvaluationResponse, STANDARD_SCALE, 15, TOTAL_QUESTIONS),
+    'irregular': (IrregularEvaluation, STANDARD_SCALE, 19, TOTAL_QUESTIONS),
+    'upward': (UpwardEvaluationResponse, AGREEMENT_SCALE, 15, 15),
+    'dean': (DeanEvaluationResponse, AGREEMENT_SCALE, 15, 15),
+    'student_upward': (StudentUpwardEvaluationResponse, STUDENT_UPWARD_SCALE, 12, 12),
+}
+
+# Types stored as EvaluationResponse rows (told apart by their period's type)
+RESPONSE_TYPES = ['student', 'peer']
+
+# response model name -> (its type, None for EvaluationResponse; question fields read)
+SOURCES = {
+    'EvaluationResponse': (None, 19),
+    'IrregularEvaluation': ('irregular', 19),
+    'UpwardEvaluationResponse': ('upward', 15),
+    'DeanEvaluationResponse': ('dean', 15),
+    'StudentUpwardEvaluationResponse': ('student_upward', 12),
+}
+
+MAX_QUESTIONS = 19
+QUESTION_SUM_FIELDS = [f'question{number}_sum' for number in range(1, MAX_QUESTIONS + 1)]
+BUCKET_FIELDS = [
+    'poor_count', 'unsatisfactory_count', 'satisfactory_count',
+    'very_satisfactory_count', 'outstanding_count',
+]
+
+
+class EvaluationAggregateService:
+    """Maintain, read and rebuild EvaluationAggregate rows."""
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    @staticmethod
+    def evaluation_type_of(response, period_type=None):
+        """Aggregate type of a response instance."""
+        if isinstance(response, EvaluationResponse):
+            if period_type is None and response.evaluation_period_id:
+                period_type = (
+                    EvaluationPeriod.objects.filter(id=response.evaluation_period_id)
+                    .values_list('evaluation_type', flat=True).first()
+                )
+            return EvaluationAggregateService.response_type(period_type)
+        for evaluation_type, (model, *_) in TYPES.items():
+            if isinstance(response, model):
+                return evaluation_type
+        raise ValueError(f'Not an evaluation response: {response!r}')
+
+    @staticmethod
+    def response_type(period_type):
+        """Aggregate type of an EvaluationResponse whose period has ``period_type``."""
+        return 'peer' if period_type == 'peer' else 'student'
+
+    @staticmethod
+    def contribution(evaluation_type, answers):
+        """
+        (question values, bucket counts) that one response with these answer
+        labels adds to its aggregate.
+        """
+        _, (ratings, default), question_count, scored = TYPES[evaluation_type]
+        values = [ratings.get(answer, default) for answer in answers[:question_count]]
+        buckets = [0] * MAX_RATING_SCORE
+        for value in values[:scored]:
+            if 1 <= value <= MAX_RATING_SCORE:
+                buckets[value - 1] += 1
+        return values, buckets
+
+    @staticmethod
+    def record(response, evaluation_type=None):
+        """
+        Add a newly saved response to its aggregate. Call inside the
+        transaction that inserted it.
+        """
+        EvaluationAggregateService._apply(response, evaluation_type, 1)
+
+    @staticmethod
+    def _apply(response, evaluation_type, sign):
+        evaluation_type = evaluation_type or EvaluationAggregateService.evaluation_type_of(response)
+        question_count = TYPES[evaluation_type][2]
+        answers = [getattr(response, f'question{number}') for number in range(1, question_count + 1)]
+        values, buckets = EvaluationAggregateService.contribution(evaluation_type, answers)
+
+        updates = {'response_count': F('response_count') + sign, 'updated_at': timezone.now()}
+        for field, value in zip(QUESTION_SUM_FIELDS, values):
+            if value:
+                updates[field] = F(field) + sign * value
+        for field, count in zip(BUCKET_FIELDS, buckets):
+            if count:
+                updates[field] = F(field) + sign * count
+
+        key = {
+            'evaluatee_id': response.evaluatee_id,
+            'evaluation_period_id': response.evaluation_period_id,
+            'section_code': getattr(response, 'student_section', None) or '',
+            'evaluation_type': evaluation_type,
+        }
+        if sign > 0:
+            EvaluationAggregate.objects.get_or_create(**key)
+        EvaluationAggregate.objects.filter(**key).update(**updates)
+
+    @staticmethod
+    def subtract(responses):
+        """
+        Take a queryset of responses that is about to be deleted out of their
+        aggregates: one read of the rows, then one F() update per aggregate
+        they touch, the reverse of the submit path. Concurrent submissions
+        to the same aggregates keep their increments. Call inside the
+        transaction that deletes the rows. Returns aggregates updated.
+        """
+        now = timezone.now()
+        totals_by_key = EvaluationAggregateService.tally(responses)
+        for (evaluatee_id, period_id, section_code, evaluation_type), totals in totals_by_key.items():
+            updates = {field: F(field) - value for field, value in totals.items() if value}
+            EvaluationAggregate.objects.filter(
+                evaluatee_id=evaluatee_id,
+                evaluation_period_id=period_id,
+                section_code=section_code,
+                evaluation_type=evaluation_type,
+            ).update(updated_at=now, **updates)
+        return len(totals_by_key)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    @staticmethod
+    def rows(evaluation_types, evaluatee=None, evaluation_period=None, section_code=None):
+        """Aggregate rows with responses, filtered like the raw-response queries they replace."""
+        aggregates = EvaluationAggregate.objects.filter(evaluation_type__in=evaluation_types, response_count__gt=0)
+        if evaluatee is not None:
+            aggregates = aggregates.filter(evaluatee=evaluatee)
+        if evaluation_period is not None:
+            aggregates = aggregates.filter(evaluation_period=evaluation_period)
+        if section_code:
+            aggregates = aggregates.filter(section_code=section_code)
+        return aggregates
+
+    @staticmethod
+    def _totals(question_count):
+        totals = {'total_responses': Sum('response_count')}
+        for field in QUESTION_SUM_FIELDS[:question_count] + BUCKET_FIELDS:
+            totals[f'total_{field}'] = Sum(field)
+        return totals
+
+    @staticmethod
+    def _summary(row, layout, question_count):
+        return ScoringEngine.summarize_sums(
+            [row[f'total_{field}'] or 0 for field in QUESTION_SUM_FIELDS[:question_count]],
+            row['total_responses'] or 0,
+            layout,
+            [row[f'total_{field}'] or 0 for field in BUCKET_FIELDS],
+        )
+
+    @staticmethod
+    def summary(aggregates, layout=STUDENT_CATEGORY_LAYOUT, question_count=TOTAL_QUESTIONS):
+        """ScoringEngine summary of all ``aggregates`` combined, in one query."""
+        row = aggregates.aggregate(**EvaluationAggregateService._totals(question_count))
+        return EvaluationAggregateService._summary(row, layout, question_count)
+
+    @staticmethod
+    def aggregate(aggregates, group_by=('evaluatee_id', 'section_code'), layout=STUDENT_CATEGORY_LAYOUT,
+                  question_count=TOTAL_QUESTIONS):
+        """
+        Same shape as ScoreAggregationService.aggregate: one dict per group
+        with the group keys plus a ScoringEngine summary, from one query over
+        the aggregate rows instead of the responses.
+        """
+        rows = (
+            aggregates
+            .order_by()
+            .values(*group_by)
+            .annotate(**EvaluationAggregateService._totals(question_count))
+        )
+        return [
+            {
+                **{key: row[key] for key in group_by},
+                'summary': EvaluationAggregateService._summary(row, layout, question_count),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def period_section_scores(evaluation_period, evaluatee_ids=None, layout=STUDENT_CATEGORY_LAYOUT):
+        """
+        Drop-in for ScoreAggregationService.period_section_scores: per-evaluatee,
+        per-section scores of every EvaluationResponse of a period.
+        """
+        aggregates = EvaluationAggregateService.rows(RESPONSE_TYPES, evaluation_period=evaluation_period)
+        if evaluatee_ids is not None:
+            aggregates = aggregates.filter(evaluatee_id__in=evaluatee_ids)
+        groups = EvaluationAggregateService.aggregate(aggregates, layout=layout)
+        for group in groups:
+            group['student_section'] = group.pop('section_code') or None
+        return groups
+
+    # ------------------------------------------------------------------
+    # Rebuilding
+    # ------------------------------------------------------------------
+    @staticmethod
+    def expected(period_ids=None):
+        """
+        Aggregates computed from the raw responses:
+        {(evaluatee_id, period_id, section_code, evaluation_type): {field: value}}.
+        """
+        expected = {}
+        for evaluation_type, _ in SOURCES.values():
+            responses = TYPES[evaluation_type or 'student'][0].objects.all()
+            if period_ids is not None:
+                responses = responses.filter(evaluation_period_id__in=period_ids)
+            EvaluationAggregateService.tally(responses, expected)
+        return expected
+
+    @staticmethod
+    def tally(responses, totals_by_key=None):
+        """
+        Add what a queryset of responses (of one response model) contributes
+        to each aggregate, read in one streamed query, into ``totals_by_key``:
+        {(evaluatee_id, period_id, section_code, evaluation_type): {field: value}}.
+        """
+        totals_by_key = {} if totals_by_key is None else totals_by_key
+        evaluation_type, question_count = SOURCES[responses.model.__name__]
+        # EvaluationResponse rows carry a section and take their type from their period
+        if evaluation_type is None:
+            keys = ['evaluatee_id', 'evaluation_period_id', 'student_section', 'evaluation_period__evaluation_type']
+        else:
+            keys = ['evaluatee_id', 'evaluation_period_id']
+        questions = [f'question{number}' for number in range(1, question_count + 1)]
+
+        for row in responses.order_by().values_list(*keys, *questions).iterator(chunk_size=2000):
+            if evaluation_type is None:
+                key = (row[0], row[1], row[2] or '', EvaluationAggregateService.response_type(row[3]))
+            else:
+                key = (row[0], row[1], '', evaluation_type)
+            values, buckets = EvaluationAggregateService.contribution(key[3], row[len(keys):])
+
+            totals = totals_by_key.setdefault(key, dict.fromkeys(['response_count'] + QUESTION_SUM_FIELDS + BUCKET_FIELDS, 0))
+            totals['response_count'] += 1
+            for field, value in zip(QUESTION_SUM_FIELDS, values):
+                totals[field] += value
+            for field, count in zip(BUCKET_FIELDS, buckets):
+                totals[field] += count
+        return totals_by_key
+
+    @staticmethod
+    def stored(period_ids=None):
+        """The aggregate table in the same shape as expected(), rows with responses only."""
+        aggregates = EvaluationAggregate.objects.filter(response_count__gt=0)
+        if period_ids is not None:
+            aggregates = aggregates.filter(evaluation_period_id__in=period_ids)
+        fields = ['response_count'] + QUESTION_SUM_FIELDS + BUCKET_FIELDS
+        return {
+            (row[0], row[1], row[2], row[3]): dict(zip(fields, row[4:]))
+            for row in aggregates.values_list(
+                'evaluatee_id', 'evaluation_period_id', 'section_code', 'evaluation_type', *fields
+            )
+        }
+
+    @staticmethod
+    def verify(period_ids=None):
+        """Keys whose stored aggregate differs from the raw responses."""
+        expected = EvaluationAggregateService.expected(period_ids)
+        stored = EvaluationAggregateService.stored(period_ids)
+        return sorted(
+            (key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key)),
+            key=str
+        )
+
+    @staticmethod
+    def rebuild(period_ids=None):
+        """
+        Replace the aggregates (of the given periods, or all) with totals
+        recomputed from the raw responses. Returns rows written. Submissions
+        made while this runs may be lost from the totals, so run it while
+        evaluations are closed.
+        """
+        expected = EvaluationAggregateService.expected(period_ids)
+
+        with transaction.atomic():
+            existing = EvaluationAggregate.objects.all()
+            if period_ids is not None:
+                existing = existing.filter(evaluation_period_id__in=period_ids)
+            existing.delete()
+            EvaluationAggregate.objects.bulk_create(
+                [
+                    EvaluationAggregate(
+                        evaluatee_id=evaluatee_id,
+                        evaluation_period_id=period_id,
+                        section_code=section_code,
+                        evaluation_type=evaluation_type,
+                        **totals
+                    )
+                    for (evaluatee_id, period_id, section_code, evaluation_type), totals in expected.items()
+                ],
+                batch_size=500
+            )
+        logger.info(f"Rebuilt {len(expected)} evaluation aggregates")
+        return len(expected)
@@ -0,0 +1,82 @@
+"""
+Evaluation cycles: which periods belong to the same evaluation round.
+
+Periods used to be grouped by running a month-name regex over
+EvaluationPeriod.name and matching other periods with name__icontains, which
+missed periods named by the release endpoints and could not use an index.
+Each period now points at an EvaluationCycle, set when it is created:
+
+- starting a new evaluation period creates one cycle for the student and peer
+  periods it opens
+- a release endpoint joins the latest cycle that still has an active period
+  and no period of its type yet, or starts a new cycle
+
+History pages, the PDF report and the history API then find related periods,
+and the user's EvaluationHistory rows for all of them, with one query on the
+indexed cycle foreign key.
+"""
+from django.utils import timezone
+
+from main.models import EvaluationCycle, EvaluationHistory, EvaluationPeriod
+
+
+class EvaluationCycleService:
+    """Create cycles for new periods and look up a period's cycle."""
+
+    @staticmethod
+    def start(now=None):
+        """Create a new cycle starting now."""
+        now = now or timezone.now()
+        return EvaluationCycle.objects.create(
+            name=f"Evaluation {timezone.localtime(now).strftime('%B %d, %Y %H:%M')}",
+            started_at=now
+        )
+
+    @staticmethod
+    def for_release(evaluation_type, now=None):
+        """
+        Cycle for a newly released period of ``evaluation_type``: the latest
+        cycle with an active period and none of this type, else a new one.
+        """
+        cycle = (
+            EvaluationCycle.objects
+            .filter(periods__is_active=True)
+            .exclude(periods__evaluation_type=evaluation_type)
+            .order_by('-started_at')
+            .first()
+        )
+        return cycle or EvaluationCycleService.start(now)
+
+    @staticmethod
+    def related_period_ids(period):
+        """
+        Ids of ``period`` and every closed period in its cycle. A period
+        without a cycle stands alone.
+        """
+        if not period.cycle_id:
+            return [period.id]
+        period_ids = list(
+            EvaluationPeriod.objects.filter(cycle_id=period.cycle_id, is_active=False)
+            .values_list('id', flat=True)
+        )
+        if period.id not in period_ids:
+            period_ids.append(period.id)
+        return period_ids
+
+    @staticmethod
+    def group_key(period):
+        """Key that groups ``period`` with the rest of its cycle."""
+        return ('cycle', period.cycle_id) if period.cycle_id else ('period', period.id)
+
+    @staticmethod
+    def history_records(user, period):
+        """
+        The user's EvaluationHistory rows for every period in ``period``'s
+        cycle (or only ``period`` without one), newest first, in one query.
+        """
+        records = EvaluationHistory.objects.filter(user=user)
+        if period.cycle_id:
+            records = records.filter(evaluation_period__cycle_id=period.cycle_id)
+        else:
+            records = records.filter(evaluation_period=period)
+        return records.select_related('section').order_by('-period_start_date', 'id')
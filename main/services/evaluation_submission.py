@@ -0,0 +1,257 @@
+"""
+Accepting evaluation submissions.
+
+submit_evaluation is the hot path when a semester opens and every student
+submits at once. It used to re-read the evaluator's profile several times,
+check period activity twice, look up the evaluatee, its section assignment and
+an existing response with separate queries, and print the POST on every call.
+
+A submission now costs two reads before the insert:
+
+- the evaluator's profile with its section
+- one query on the evaluatee that also resolves the active period of the
+  submission type, the evaluatee's role and institute, whether it is assigned
+  to the evaluator's section and whether this evaluator already answered it
+  in that period (see eligibility())
+
+The insert itself relies on the models' (evaluator, evaluatee, period)
+unique_together: a duplicate that slips past the eligibility read (a double
+click, two tabs) fails the insert with IntegrityError and is reported as
+already evaluated. The response and its EvaluationAggregate update commit in
+one transaction.
+
+The student/peer, upward, dean and student-upward submit views share this
+service; SUBMISSION_TYPES holds what differs between them.
+"""
+import logging
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Subquery
+
+from main.constants import RATING_NUMERIC_REVERSE
+from main.models import (
+    DeanEvaluationResponse, EvaluationPeriod, EvaluationResponse, IrregularEvaluation, Role,
+    SectionAssignment, StudentUpwardEvaluationResponse, UpwardEvaluationResponse, UserProfile,
+)
+from main.services.evaluation_aggregate import EvaluationAggregateService
+
+logger = logging.getLogger(__name__)
+
+STAFF_ROLES = [Role.FACULTY, Role.COORDINATOR, Role.DEAN]
+
+# Posted rating digit -> stored answer
+STANDARD_ANSWERS = {str(value): label for value, label in RATING_NUMERIC_REVERSE.items()}
+AGREEMENT_ANSWERS = {
+    '1': 'Strongly Disagree',
+    '2': 'Disagree',
+    '3': 'Neutral',
+    '4': 'Agree',
+    '5': 'Strongly Agree',
+}
+# The student -> coordinator form stores the digits themselves
+DIGIT_ANSWERS = {str(value): str(value) for value in range(1, 6)}
+
+# Submission type (also its EvaluationAggregate type) -> what it accepts
+SUBMISSION_TYPES = {
+    'student': {
+        'model': EvaluationResponse,
+        'period_type': 'student',
+        'evaluatee_roles': STAFF_ROLES,
+        'question_count': 19,
+        'answers': STANDARD_ANSWERS,
+        'evaluatee_label': 'instructor',
+    },
+    'irregular': {
+        'model': IrregularEvaluation,
+        'period_type': 'student',
+        'evaluatee_roles': STAFF_ROLES,
+        'question_count': 19,
+        'answers': STANDARD_ANSWERS,
+        'evaluatee_label': 'instructor',
+    },
+    'peer': {
+        'model': EvaluationResponse,
+        'period_type': 'peer',
+        'evaluatee_roles': STAFF_ROLES,
+        'question_count': 15,
+        'answers': STANDARD_ANSWERS,
+        'evaluatee_label': 'instructor',
+    },
+    'upward': {
+        'model': UpwardEvaluationResponse,
+        'period_type': 'upward',
+        'evaluatee_roles': [Role.COORDINATOR],
+        'question_count': 15,
+        'answers': AGREEMENT_ANSWERS,
+        'evaluatee_label': 'coordinator',
+    },
+    'dean': {
+        'model': DeanEvaluationResponse,
+        'period_type': 'dean',
+        'evaluatee_roles': [Role.DEAN],
+        'question_count': 15,
+        'answers': AGREEMENT_ANSWERS,
+        'evaluatee_label': 'dean',
+    },
+    'student_upward': {
+        'model': StudentUpwardEvaluationResponse,
+        'period_type': 'student_upward',
+        'evaluatee_roles': [Role.COORDINATOR],
+        'question_count': 12,
+        'answers': DIGIT_ANSWERS,
+        'evaluatee_label': 'coordinator',
+    },
+}
+
+
+class SubmissionError(Exception):
+    """A submission was rejected; the message is shown to the evaluator."""
+
+
+class EvaluationSubmissionService:
+    """Validate and store one evaluation submission."""
+
+    @staticmethod
+    def evaluator_profile(user):
+        """The evaluator's profile with its section, in one query."""
+        return UserProfile.objects.select_related('section').get(user=user)
+
+    @staticmethod
+    def submission_type(evaluator_profile):
+        """Type of a submission from the student/peer form, by evaluator role."""
+        if evaluator_profile.role == Role.STUDENT:
+            return 'irregular' if evaluator_profile.is_irregular else 'student'
+        if evaluator_profile.role in STAFF_ROLES:
+            return 'peer'
+        return None
+
+    @staticmethod
+    def eligibility(evaluator_profile, submission_type, evaluatee_id):
+        """
+        One query resolving everything a submission is checked against:
+        {'id', 'username', 'role', 'institute', 'period_id', 'in_section',
+        'already_submitted'}, or None when the evaluatee does not exist.
+        ``period_id`` is None when no period of the type is active.
+        """
+        spec = SUBMISSION_TYPES[submission_type]
+        active_periods = EvaluationPeriod.objects.filter(
+            evaluation_type=spec['period_type'], is_active=True
+        ).order_by('-start_date')
+
+        return (
+            User.objects.filter(id=evaluatee_id)
+            .annotate(
+                role=F('userprofile__role'),
+                institute=F('userprofile__institute'),
+                period_id=Subquery(active_periods.values('id')[:1]),
+                in_section=Exists(SectionAssignment.objects.filter(
+                    user=OuterRef('pk'), section_id=evaluator_profile.section_id
+                )),
+                already_submitted=Exists(spec['model'].objects.filter(
+                    evaluator_id=evaluator_profile.user_id,
+                    evaluatee=OuterRef('pk'),
+                    # The same period the submission would be stored under
+                    evaluation_period_id=Subquery(active_periods.values('id')[:1]),
+                )),
+            )
+            .values('id', 'username', 'role', 'institute', 'period_id', 'in_section', 'already_submitted')
+            .first()
+        )
+
+    @staticmethod
+    def check(evaluator_profile, submission_type, evaluatee):
+        """Raise SubmissionError if ``evaluatee`` (an eligibility() row) cannot be evaluated."""
+        spec = SUBMISSION_TYPES[submission_type]
+        label = spec['evaluatee_label']
+
+        if evaluatee is None:
+            raise SubmissionError(f'Selected {label} does not exist.')
+        if evaluatee['period_id'] is None:
+            raise SubmissionError('Evaluation period has ended. You cannot submit evaluations at this time.')
+        if evaluatee['role'] not in spec['evaluatee_roles']:
+            if submission_type in ('student', 'irregular', 'peer'):
+                raise SubmissionError('You do not have permission to evaluate this user.')
+            raise SubmissionError(f'You can only evaluate {label}s.')
+
+        if submission_type == 'student':
+            # Irregular students can evaluate any instructor; regular ones only their section's
+            if not evaluator_profile.section_id:
+                raise SubmissionError('You cannot evaluate instructors as you are not assigned to any section.')
+            if not evaluatee['in_section']:
+                raise SubmissionError(
+                    f"You cannot evaluate {evaluatee['username']} as you are not in their assigned section."
+                )
+        elif submission_type == 'peer':
+            if evaluator_profile.institute != evaluatee['institute']:
+                raise SubmissionError(
+                    f"You cannot evaluate {evaluatee['username']} as they are from a different institute."
+                )
+            if evaluator_profile.user_id == evaluatee['id']:
+                raise SubmissionError('You cannot evaluate yourself.')
+        elif submission_type in ('upward', 'dean'):
+            if evaluator_profile.institute != evaluatee['institute']:
+                raise SubmissionError(f'You can only evaluate your own institute {label}.')
+
+        if evaluatee['already_submitted']:
+            raise SubmissionError(f'You have already evaluated this {label} in this evaluation period.')
+
+    @staticmethod
+    def answers(submission_type, data):
+        """{'question1': answer, ...} from the posted ratings. Raises SubmissionError."""
+        spec = SUBMISSION_TYPES[submission_type]
+        answers = {}
+        for number in range(1, spec['question_count'] + 1):
+            value = data.get(f'question{number}')
+            if not value:
+                raise SubmissionError(f'All questions must be answered. Missing: Question {number}')
+            if value not in spec['answers']:
+                raise SubmissionError(f'Invalid rating for question {number}.')
+            answers[f'question{number}'] = spec['answers'][value]
+        return answers
+
+    @staticmethod
+    def submit(user, submission_type, evaluatee_id, data, evaluator_profile=None):
+        """
+        Validate and store a submission from the posted ``data``. Returns the
+        saved response; raises SubmissionError with the message to show.
+        """
+        evaluator_profile = evaluator_profile or EvaluationSubmissionService.evaluator_profile(user)
+        spec = SUBMISSION_TYPES[submission_type]
+
+        if not evaluatee_id:
+            raise SubmissionError(f"No {spec['evaluatee_label']} selected.")
+        if not str(evaluatee_id).isdigit():
+            raise SubmissionError(f"Selected {spec['evaluatee_label']} does not exist.")
+
+        evaluatee = EvaluationSubmissionService.eligibility(evaluator_profile, submission_type, evaluatee_id)
+        EvaluationSubmissionService.check(evaluator_profile, submission_type, evaluatee)
+        answers = EvaluationSubmissionService.answers(submission_type, data)
+
+        fields = {'comments': data.get('comments', '').strip()}
+        if submission_type in ('student', 'irregular', 'peer'):
+            fields['student_number'] = data.get('studentNumber', '')
+        if submission_type == 'student':
+            fields['student_section'] = evaluator_profile.section.code
+        elif submission_type == 'peer':
+            fields['student_section'] = f"{evaluator_profile.institute} Staff"
+
+        response = spec['model'](
+            evaluator=user,
+            evaluatee_id=evaluatee['id'],
+            evaluation_period_id=evaluatee['period_id'],
+            **fields,
+            **answers
+        )
+        try:
+            with transaction.atomic():
+                response.save()
+                EvaluationAggregateService.record(response, submission_type)
+        except IntegrityError:
+            # Submitted concurrently (double click, second tab) since eligibility()
+            raise SubmissionError(
+                f"You have already evaluated this {spec['evaluatee_label']} in this evaluation period."
+            )
+
+        logger.info(f"✅ {submission_type} evaluation saved: {user.username} → {evaluatee['username']} (ID {response.id})")
+        return response
@@ -0,0 +1,136 @@
+"""
+Archiving of EvaluationResult rows into EvaluationHistory.
+
+One pipeline for both "archive this period" and "archive everything": streams
+results with ``iterator(chunk_size=...)``, copies every score, distribution,
+section and period-date field, writes history rows with ``bulk_create`` and
+removes the archived results, all inside a single transaction. Archived
+student periods then get their per-user timeline rows
+(main.services.history_timeline), and the archived users' dashboard snapshots
+are marked stale with one UPDATE.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from main.models import EvaluationResult, EvaluationHistory
+from main.services.history_timeline import HistoryTimelineService
+from main.services.profile_dashboard import ProfileDashboardService
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryArchiveService:
+    """Move finalized evaluation results into the history table in bulk."""
+
+    UNIQUE_FIELDS = ['user', 'evaluation_period', 'section']
+    UPDATE_FIELDS = [
+        'evaluation_type',
+        'category_a_score',
+        'category_b_score',
+        'category_c_score',
+        'category_d_score',
+        'total_percentage',
+        'average_rating',
+        'total_responses',
+        'total_questions',
+        'poor_count',
+        'unsatisfactory_count',
+        'satisfactory_count',
+        'very_satisfactory_count',
+        'outstanding_count',
+        'period_start_date',
+        'period_end_date',
+    ]
+
+    @staticmethod
+    def chunk_size():
+        return getattr(settings, 'EVALUATION_HISTORY_CHUNK_SIZE', 1000)
+
+    @staticmethod
+    def archive(results=None, delete_results=True, chunk_size=None):
+        """
+        Archive a queryset of EvaluationResult rows (all results by default).
+        Re-archiving a period updates its existing history rows in place.
+        Returns a dict with counts, elapsed seconds and rows per second.
+        """
+        if results is None:
+            results = EvaluationResult.objects.all()
+        chunk_size = chunk_size or HistoryArchiveService.chunk_size()
+
+        started = time.perf_counter()
+        archived_count = 0
+        deleted_count = 0
+
+        with transaction.atomic():
+            batch = []
+            period_ids = set()
+            user_ids = set()
+            rows = results.select_related('user', 'evaluation_period', 'section').order_by('pk')
+            for result in rows.iterator(chunk_size=chunk_size):
+                batch.append(EvaluationHistory.from_result(result))
+                period_ids.add(result.evaluation_period_id)
+                user_ids.add(result.user_id)
+                if len(batch) >= chunk_size:
+                    archived_count += HistoryArchiveService._write_batch(batch)
+                    batch = []
+            if batch:
+                archived_count += HistoryArchiveService._write_batch(batch)
+            HistoryTimelineService.summarize(period_ids)
+
+            if delete_results and archived_count:
+                deleted_count = results.delete()[0]
+                ProfileDashboardService.invalidate_users(user_ids)
+
+        elapsed = time.perf_counter() - started
+        rows_per_second = round(archived_count / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            f"Archived {archived_count} evaluation results to history in {elapsed:.2f}s "
+            f"({rows_per_second} rows/s), deleted {deleted_count} results"
+        )
+
+        return {
+            'archived_count': archived_count,
+            'deleted_count': deleted_count,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': rows_per_second,
+        }
+
+    @staticmethod
+    def archive_period(evaluation_period, delete_results=True):
+        """Archive the results of a single evaluation period."""
+        return HistoryArchiveService.archive(
+            EvaluationResult.objects.filter(evaluation_period=evaluation_period),
+            delete_results=delete_results
+        )
+
+    @staticmethod
+    def _write_batch(histories):
+        with_section = [history for history in histories if history.section_id is not None]
+        without_section = [history for history in histories if history.section_id is None]
+
+        if with_section:
+            upsert_options = {
+                'update_conflicts': True,
+                'update_fields': HistoryArchiveService.UPDATE_FIELDS,
+            }
+            # MySQL upserts on any unique key and rejects an explicit conflict target
+            if connection.features.supports_update_conflicts_with_target:
+                upsert_options['unique_fields'] = HistoryArchiveService.UNIQUE_FIELDS
+            EvaluationHistory.objects.bulk_create(with_section, **upsert_options)
+
+        if without_section:
+            # NULL sections never collide on the unique index, so replace those rows
+            # explicitly (never the timeline summaries, which are section-less too)
+            for period_id in {history.evaluation_period_id for history in without_section}:
+                EvaluationHistory.objects.filter(
+                    evaluation_period_id=period_id,
+                    section__isnull=True,
+                    is_summary=False,
+                    user_id__in=[h.user_id for h in without_section if h.evaluation_period_id == period_id]
+                ).delete()
+            EvaluationHistory.objects.bulk_create(without_section)
+
+        return len(histories)
@@ -0,0 +1,274 @@
+"""
+Evaluation history timeline served from EvaluationHistory alone.
+
+EvaluationHistoryView rebuilds its list by joining every inactive period to
+the user's responses and re-scoring them in Python. The timeline API reads one
+precomputed row per student period instead, newest first, with keyset
+pagination on (period_end_date, id), so each page is one indexed range scan no
+matter how many semesters a user has.
+
+That row is the user's student EvaluationHistory row flagged is_summary.
+Student results are archived per section, so when a period is archived
+summarize() writes it as the response-weighted summary of the user's archived
+rows (section rows and any real section-less row alike), and stores on it the user's peer, irregular and upward response counts and average
+percentages from every period of the same evaluation cycle (one grouped query
+per source). `python manage.py rebuild_history_timeline` writes these rows for
+periods archived earlier.
+"""
+import base64
+import binascii
+import logging
+from functools import reduce
+from operator import add
+
+from django.db.models import Count, Q, Sum
+from django.utils.dateparse import parse_datetime
+
+from main.constants import MAX_RATING_SCORE
+from main.models import (
+    EvaluationHistory, EvaluationPeriod, EvaluationResponse, IrregularEvaluation, Role,
+    UpwardEvaluationResponse,
+)
+from main.services.evaluation_cycle import EvaluationCycleService
+from main.services.score_aggregation import ScoreAggregationService
+
+logger = logging.getLogger(__name__)
+
+STAFF_ROLES = [Role.FACULTY, Role.COORDINATOR, Role.DEAN]
+
+
+class HistoryTimelineService:
+    """Write and page through the per-period history timeline."""
+
+    # source -> (response model, extra filter, questions per response)
+    SOURCES = {
+        'peer': (EvaluationResponse, Q(evaluator__userprofile__role__in=STAFF_ROLES), 15),
+        'irregular': (IrregularEvaluation, Q(), 19),
+        'upward': (UpwardEvaluationResponse, Q(), 15),
+    }
+
+    # Scores of a timeline row: response-weighted means / sums of the user's section rows
+    WEIGHTED_FIELDS = [
+        'category_a_score', 'category_b_score', 'category_c_score', 'category_d_score',
+        'total_percentage', 'average_rating',
+    ]
+    SUMMED_FIELDS = [
+        'total_responses', 'poor_count', 'unsatisfactory_count', 'satisfactory_count',
+        'very_satisfactory_count', 'outstanding_count',
+    ]
+    SUMMARY_FIELDS = WEIGHTED_FIELDS + SUMMED_FIELDS + [
+        'total_questions', 'period_start_date', 'period_end_date',
+        'peer_responses', 'peer_percentage', 'irregular_responses', 'irregular_percentage',
+        'upward_responses', 'upward_percentage',
+    ]
+
+    DEFAULT_PAGE_SIZE = 12
+    MAX_PAGE_SIZE = 50
+    TREND_POINTS = 24
+
+    @staticmethod
+    def timeline_rows():
+        """History rows that make up the timeline: one student summary row per period."""
+        return EvaluationHistory.objects.filter(evaluation_type='student', is_summary=True)
+
+    @staticmethod
+    def without_summaries(histories):
+        """
+        ``histories`` minus the summary rows summarize() added. Use it wherever
+        history rows are averaged or listed as results, or the summary counts
+        twice.
+        """
+        return histories.filter(is_summary=False)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    @staticmethod
+    def source_totals(user_ids, period_ids):
+        """
+        {user_id: {'peer_responses', 'peer_percentage', ...}} for the given
+        evaluatees over the given periods, one grouped query per source.
+        """
+        totals = {}
+        for source, (model, extra, question_count) in HistoryTimelineService.SOURCES.items():
+            rating_sum = reduce(add, [
+                Sum(ScoreAggregationService.rating_value(f'question{number}')) for number in range(1, question_count + 1)
+            ])
+            rows = (
+                model.objects
+                .filter(extra, evaluatee_id__in=user_ids, evaluation_period_id__in=period_ids)
+                .values('evaluatee_id')
+                .annotate(response_count=Count('id'), rating_sum=rating_sum)
+                .order_by()
+            )
+            for row in rows:
+                count = row['response_count']
+                percentage = (row['rating_sum'] or 0) / (count * question_count * MAX_RATING_SCORE) * 100 if count else 0.0
+                user_totals = totals.setdefault(row['evaluatee_id'], {})
+                user_totals[f'{source}_responses'] = count
+                user_totals[f'{source}_percentage'] = round(percentage, 2)
+        return totals
+
+    @staticmethod
+    def summarize(period_ids):
+        """
+        Write the timeline row of every user archived in these student
+        periods and fill its cycle totals. Returns timeline rows written.
+        """
+        written = 0
+        for period in EvaluationPeriod.objects.filter(id__in=period_ids, evaluation_type='student'):
+            written += HistoryTimelineService._summarize_period(period)
+        return written
+
+    @staticmethod
+    def _summarize_period(period):
+        rows = list(
+            EvaluationHistory.objects.filter(evaluation_period=period, evaluation_type='student')
+            .order_by('user_id', 'id')
+        )
+        summaries = {row.user_id: row for row in rows if row.is_summary}
+        by_user = {}
+        for row in rows:
+            if not row.is_summary:
+                by_user.setdefault(row.user_id, []).append(row)
+
+        # Summaries whose results are gone (e.g. re-archived without them) are dropped
+        orphaned = [summaries.pop(user_id).pk for user_id in list(summaries) if user_id not in by_user]
+        if orphaned:
+            EvaluationHistory.objects.filter(pk__in=orphaned).delete()
+
+        # Every archived user gets a response-weighted summary of their rows
+        created = []
+        for user_id, result_rows in by_user.items():
+            summary = summaries.get(user_id)
+            if summary is None:
+                summary = EvaluationHistory(
+                    user_id=user_id,
+                    evaluation_period=period,
+                    evaluation_type='student',
+                    section=None,
+                    is_summary=True,
+                )
+                summaries[user_id] = summary
+                created.append(summary)
+            HistoryTimelineService._combine(summary, result_rows)
+
+        for summary in summaries.values():
+            summary.period_start_date = summary.period_start_date or period.start_date
+            summary.period_end_date = summary.period_end_date or period.end_date
+
+        totals = HistoryTimelineService.source_totals(list(summaries), EvaluationCycleService.related_period_ids(period))
+        for user_id, summary in summaries.items():
+            user_totals = totals.get(user_id, {})
+            for source in HistoryTimelineService.SOURCES:
+                setattr(summary, f'{source}_responses', user_totals.get(f'{source}_responses', 0))
+                setattr(summary, f'{source}_percentage', user_totals.get(f'{source}_percentage', 0.0))
+
+        existing = [summary for summary in summaries.values() if summary.pk]
+        if existing:
+            EvaluationHistory.objects.bulk_update(existing, HistoryTimelineService.SUMMARY_FIELDS)
+        if created:
+            EvaluationHistory.objects.bulk_create(created)
+        return len(summaries)
+
+    @staticmethod
+    def _combine(summary, section_rows):
+        """Set ``summary``'s scores from the user's result rows, weighted by responses."""
+        weights = [row.total_responses or 0 for row in section_rows]
+        if not sum(weights):
+            weights = [1] * len(section_rows)
+        weight_total = sum(weights)
+
+        for field in HistoryTimelineService.WEIGHTED_FIELDS:
+            value = sum(getattr(row, field) * weight for row, weight in zip(section_rows, weights)) / weight_total
+            setattr(summary, field, round(value, 2))
+        for field in HistoryTimelineService.SUMMED_FIELDS:
+            setattr(summary, field, sum(getattr(row, field) for row in section_rows))
+        summary.total_questions = section_rows[0].total_questions
+
+    @staticmethod
+    def rebuild():
+        """Rewrite the timeline rows of every archived student period."""
+        period_ids = set(
+            EvaluationHistory.objects.filter(evaluation_type='student')
+            .values_list('evaluation_period_id', flat=True).distinct()
+        )
+        written = HistoryTimelineService.summarize(period_ids)
+        logger.info(f"Rebuilt {written} history timeline rows for {len(period_ids)} periods")
+        return written
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    @staticmethod
+    def encode_cursor(row):
+        raw = f'{row.period_end_date.isoformat()}|{row.id}'
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """(period_end_date, id) from a cursor. Raises ValueError if malformed."""
+        try:
+            end_date, row_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+            parsed = parse_datetime(end_date)
+            if parsed is None:
+                raise ValueError(cursor)
+            return parsed, int(row_id)
+        except (binascii.Error, UnicodeError, ValueError) as e:
+            raise ValueError(f'Invalid cursor: {cursor}') from e
+
+    @staticmethod
+    def page(user, cursor=None, limit=None):
+        """
+        One page of the user's timeline, newest first:
+        {'entries': [...], 'next_cursor': str|None}. ``cursor`` is the
+        next_cursor of the previous page.
+        """
+        limit = max(1, min(limit or HistoryTimelineService.DEFAULT_PAGE_SIZE, HistoryTimelineService.MAX_PAGE_SIZE))
+        rows = HistoryTimelineService.timeline_rows().filter(user=user, period_end_date__isnull=False)
+        if cursor:
+            end_date, row_id = HistoryTimelineService.decode_cursor(cursor)
+            rows = rows.filter(Q(period_end_date__lt=end_date) | Q(period_end_date=end_date, id__lt=row_id))
+
+        rows = list(rows.select_related('evaluation_period').order_by('-period_end_date', '-id')[:limit + 1])
+        next_cursor = HistoryTimelineService.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return {
+            'entries': [HistoryTimelineService.entry(row) for row in rows[:limit]],
+            'next_cursor': next_cursor,
+        }
+
+    @staticmethod
+    def trend(user, points=None):
+        """
+        Compact chart series of the latest ``points`` periods, oldest first:
+        [[period_end_date, total_percentage], ...].
+        """
+        rows = (
+            HistoryTimelineService.timeline_rows()
+            .filter(user=user, period_end_date__isnull=False)
+            .order_by('-period_end_date', '-id')
+            .values_list('period_end_date', 'total_percentage')[:points or HistoryTimelineService.TREND_POINTS]
+        )
+        return [[end_date.date().isoformat(), round(float(total or 0), 2)] for end_date, total in reversed(rows)]
+
+    @staticmethod
+    def entry(row):
+        return {
+            'id': row.id,
+            'evaluation_period_id': row.evaluation_period_id,
+            'evaluation_period_name': row.evaluation_period.name,
+            'period_start_date': row.period_start_date.isoformat() if row.period_start_date else None,
+            'period_end_date': row.period_end_date.isoformat(),
+            'total_percentage': float(row.total_percentage or 0),
+            'average_rating': float(row.average_rating or 0),
+            'category_scores': [
+                float(row.category_a_score or 0),
+                float(row.category_b_score or 0),
+                float(row.category_c_score or 0),
+                float(row.category_d_score or 0),
+            ],
+            'student_responses': row.total_responses or 0,
+            'peer': {'responses': row.peer_responses, 'percentage': row.peer_percentage},
+            'irregular': {'responses': row.irregular_responses, 'percentage': row.irregular_percentage},
+            'upward': {'responses': row.upward_responses, 'percentage': row.upward_percentage},
+        }
@@ -1,14 +1,16 @@
 """
 Service for importing and exporting accounts to/from Excel files.
 """
+import csv
 import io
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from django.contrib.auth.models import User
-from django.db import transaction
+import tempfile
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.utils import get_column_letter
+from django.db.models import Case, When, Value, IntegerField
 from main.models import UserProfile, Section, Role
-from django.core.exceptions import ValidationError
-from main.validation_utils import AccountValidator
+from main.services.bulk_account_import import BulkAccountImporter
 
 
 class AccountImportExportService:
@@ -22,15 +24,127 @@ class AccountImportExportService:
     STUDENT_FIELDS = ['student_number', 'course', 'section']
     STAFF_FIELDS = ['institute']
     
+    # Export layout
+    EXPORT_HEADERS = [
+        'Username',
+        'Email',
+        'Display Name',
+        'Role',
+        'Student Number',
+        'Course',
+        'Section',
+        'Institute',
+        'Date Joined'
+    ]
+    EXPORT_COLUMN_WIDTHS = [15, 20, 20, 15, 15, 30, 15, 20, 15]
+    
+    # Sort users by role priority: Student, Faculty, Coordinator, Dean, Admin
+    ROLE_ORDER = {
+        Role.STUDENT: 0,
+        Role.FACULTY: 1,
+        Role.COORDINATOR: 2,
+        Role.DEAN: 3,
+        Role.ADMIN: 4
+    }
+    
+    # Define role colors for visual grouping
+    ROLE_COLORS = {
+        Role.STUDENT: "E8F5E9",      # Light green
+        Role.FACULTY: "E3F2FD",      # Light blue
+        Role.COORDINATOR: "FFF3E0",  # Light orange
+        Role.DEAN: "F3E5F5",         # Light purple
+        Role.ADMIN: "FCE4EC"         # Light pink
+    }
+    
+    # Rows fetched per database round trip while exporting
+    EXPORT_CHUNK_SIZE = 2000
+    
+    @staticmethod
+    def iter_export_rows():
+        """
+        Yield (role, row_data) for every account with a profile, sorted by role
+        priority then username. Rows are read with values().iterator() so memory
+        stays flat however many accounts there are.
+        """
+        role_order = AccountImportExportService.ROLE_ORDER
+        role_labels = dict(Role.choices)
+        year_labels = dict(Section.YEAR_CHOICES)
+        staff_roles = [Role.DEAN, Role.FACULTY, Role.COORDINATOR]
+        
+        profiles = (
+            UserProfile.objects
+            .annotate(role_rank=Case(
+                *[When(role=role, then=Value(rank)) for role, rank in role_order.items()],
+                default=Value(len(role_order)),
+                output_field=IntegerField()
+            ))
+            .order_by('role_rank', 'user__username')
+            .values(
+                'role', 'studentnumber', 'course', 'institute', 'display_name',
+                'user__username', 'user__email', 'user__date_joined',
+                'section__code', 'section__year_level'
+            )
+        )
+        
+        for profile in profiles.iterator(chunk_size=AccountImportExportService.EXPORT_CHUNK_SIZE):
+            role = profile['role']
+            is_student = role == Role.STUDENT
+            
+            section = ''
+            if is_student and profile['section__code'] is not None:
+                # Same text as str(Section)
+                year_level = profile['section__year_level']
+                section = f"{profile['section__code']} ({year_labels.get(year_level, year_level)})"
+            
+            date_joined = profile['user__date_joined']
+            yield role, [
+                profile['user__username'],
+                profile['user__email'],
+                profile['display_name'] or '',
+                role_labels.get(role, role),
+                profile['studentnumber'] if is_student else '',
+                profile['course'] if is_student else '',
+                section,
+                profile['institute'] if role in staff_roles else '',
+                date_joined.strftime('%Y-%m-%d %H:%M:%S') if date_joined else ''
+            ]
+    
     @staticmethod
-    def export_accounts_to_excel():
+    def stream_accounts_csv():
         """
-        Export all accounts from the system to an Excel file.
-        Returns: BytesIO object with the Excel file.
+        Yield the account export as CSV text, one chunk per row. Nothing is
+        buffered, so the first bytes go out as soon as the first rows are read.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        def flush():
+            value = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            return value
+        
+        # BOM so Excel opens the file as UTF-8
+        writer.writerow(AccountImportExportService.EXPORT_HEADERS)
+        yield '\ufeff' + flush()
+        
+        for _, row_data in AccountImportExportService.iter_export_rows():
+            writer.writerow(row_data)
+            yield flush()
+    
+    @staticmethod
+    def stream_accounts_excel(chunk_size=64 * 1024):
+        """
+        Yield the account export as an .xlsx file in byte chunks.
+        
+        The workbook is built in openpyxl write-only mode, which writes rows to
+        a temporary file as they are appended instead of keeping every cell in
+        memory. An .xlsx is a zip archive that is only valid once finished, so
+        the bytes are sent after the last row is written; use the CSV export
+        when the download should start immediately.
         """
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = "Accounts"
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet("Accounts")
         
         # Define header style
         header_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
@@ -42,380 +156,71 @@ class AccountImportExportService:
             bottom=Side(style='thin')
         )
         
-        # Create headers
-        headers = [
-            'Username',
-            'Email',
-            'Display Name',
-            'Role',
-            'Student Number',
-            'Course',
-            'Section',
-            'Institute',
-            'Date Joined'
-        ]
+        # One named style per row kind: assigning a registered style is much
+        # cheaper than setting fill/border/alignment on every cell
+        workbook.add_named_style(NamedStyle(
+            name='Export Header',
+            fill=header_fill,
+            font=header_font,
+            border=border,
+            alignment=Alignment(horizontal='center', vertical='center')
+        ))
+        role_styles = {}
+        for role, bg_color in list(AccountImportExportService.ROLE_COLORS.items()) + [(None, "FFFFFF")]:
+            style_name = f'Export {role or "Other"}'
+            workbook.add_named_style(NamedStyle(
+                name=style_name,
+                fill=PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid"),
+                border=border,
+                alignment=Alignment(horizontal='left', vertical='center')
+            ))
+            role_styles[role] = style_name
         
-        for col, header in enumerate(headers, 1):
-            cell = worksheet.cell(row=1, column=col)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+        # Column widths must be set before the first row in write-only mode
+        for col, width in enumerate(AccountImportExportService.EXPORT_COLUMN_WIDTHS, 1):
+            worksheet.column_dimensions[get_column_letter(col)].width = width
         
-        # Set column widths
-        column_widths = [15, 20, 20, 15, 15, 30, 15, 20, 15]
-        for col, width in enumerate(column_widths, 1):
-            worksheet.column_dimensions[chr(64 + col)].width = width
+        def styled_row(values, style_name):
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(worksheet, value=value)
+                cell.style = style_name
+                cells.append(cell)
+            return cells
         
-        # Add user data - sorted by role
-        users = User.objects.select_related('userprofile').all()
-        
-        # Filter out users without userprofile
-        users_with_profile = [u for u in users if hasattr(u, 'userprofile') and u.userprofile is not None]
-        
-        # Sort users by role priority: Student, Faculty, Coordinator, Dean, Admin
-        role_order = {
-            Role.STUDENT: 0,
-            Role.FACULTY: 1,
-            Role.COORDINATOR: 2,
-            Role.DEAN: 3,
-            Role.ADMIN: 4
-        }
-        
-        # Define role colors for visual grouping
-        role_colors = {
-            Role.STUDENT: "E8F5E9",      # Light green
-            Role.FACULTY: "E3F2FD",      # Light blue
-            Role.COORDINATOR: "FFF3E0",  # Light orange
-            Role.DEAN: "F3E5F5",         # Light purple
-            Role.ADMIN: "FCE4EC"         # Light pink
-        }
-        
-        sorted_users = sorted(users_with_profile, key=lambda u: (role_order.get(u.userprofile.role, 5), u.username))
+        worksheet.append(styled_row(AccountImportExportService.EXPORT_HEADERS, 'Export Header'))
         
         current_role = None
-        for row, user in enumerate(sorted_users, 2):
-            profile = user.userprofile
-            
-            # Add a section separator if role changes
-            if current_role != profile.role and current_role is not None:
-                # Add an empty row with role separator
-                row += 1
-            
-            current_role = profile.role
-            
-            row_data = [
-                user.username,
-                user.email,
-                profile.display_name or '',
-                profile.get_role_display(),
-                profile.studentnumber if profile.role == Role.STUDENT else '',
-                profile.course if profile.role == Role.STUDENT else '',
-                str(profile.section) if profile.role == Role.STUDENT and profile.section else '',
-                profile.institute if profile.role in [Role.DEAN, Role.FACULTY, Role.COORDINATOR] else '',
-                user.date_joined.strftime('%Y-%m-%d %H:%M:%S') if user.date_joined else ''
-            ]
-            
-            # Get the background color for this role
-            bg_color = role_colors.get(profile.role, "FFFFFF")
-            role_fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type="solid")
-            
-            for col, value in enumerate(row_data, 1):
-                cell = worksheet.cell(row=row, column=col)
-                cell.value = value
-                cell.alignment = Alignment(horizontal='left', vertical='center')
-                cell.border = border
-                cell.fill = role_fill  # Apply role-based color
-        
-        # Save to BytesIO
-        excel_file = io.BytesIO()
-        workbook.save(excel_file)
-        excel_file.seek(0)
+        for role, row_data in AccountImportExportService.iter_export_rows():
+            # Add an empty separator row when the role changes
+            if current_role is not None and role != current_role:
+                worksheet.append([])
+            current_role = role
+            worksheet.append(styled_row(row_data, role_styles.get(role, role_styles[None])))
         
-        return excel_file
+        with tempfile.TemporaryFile() as output:
+            workbook.save(output)
+            output.seek(0)
+            while True:
+                chunk = output.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
     
     @staticmethod
     def import_accounts_from_excel(excel_file):
         """
         Import accounts from an Excel file with comprehensive validation.
         
+        Rows are validated against lookups loaded once and written with bulk
+        queries (see BulkAccountImporter), so large rosters fit in one request.
+        
         Args:
             excel_file: The uploaded Excel file
             
         Returns:
-            dict with 'success' (bool), 'created' (int), 'updated' (int), 'errors' (list)
+            dict with 'success' (bool), 'created' (int), 'updated' (int),
+            'skipped' (int), 'errors' (list)
         """
-        result = {
-            'success': False,
-            'created': 0,
-            'updated': 0,
-            'skipped': 0,
-            'errors': []
-        }
-        
-        try:
-            # Load the workbook
-            workbook = load_workbook(excel_file)
-            worksheet = workbook.active
-            
-            # Get headers from first row
-            headers = []
-            for cell in worksheet[1]:
-                if cell.value:
-                    header = str(cell.value).strip().lower().replace(' ', '_')
-                    headers.append(header)
-            
-            # Validate headers
-            required = {'username', 'email', 'display_name', 'role'}
-            if not required.issubset(set(headers)):
-                missing = required - set(headers)
-                result['errors'].append(f"Missing required columns: {', '.join(missing)}")
-                return result
-            
-            # Create a mapping of header name to column index
-            header_mapping = {header: idx + 1 for idx, header in enumerate(headers)}
-            
-            # Track duplicate checking
-            usernames_in_batch = set()
-            emails_in_batch = set()
-            
-            # Process each row
-            with transaction.atomic():
-                for row_idx, row in enumerate(worksheet.iter_rows(min_row=2, values_only=False), 2):
-                    try:
-                        # Extract values
-                        row_data = {}
-                        for header, col_idx in header_mapping.items():
-                            cell = row[col_idx - 1]
-                            row_data[header] = cell.value if cell.value else ''
-                        
-                        # Get required fields
-                        username = str(row_data.get('username', '')).strip()
-                        email = str(row_data.get('email', '')).strip()
-                        password = str(row_data.get('password', '')).strip()
-                        display_name = str(row_data.get('display_name', '')).strip()
-                        role = str(row_data.get('role', '')).strip()
-                        
-                        # If no password provided, use default password
-                        if not password:
-                            password = AccountImportExportService.DEFAULT_PASSWORD
-                        
-                        # Validate required fields (password now optional)
-                        if not all([username, email, display_name, role]):
-                            result['errors'].append(f"Row {row_idx}: Missing required fields")
-                            result['skipped'] += 1
-                            continue
-                        
-                        # ✅ VALIDATE USERNAME using AccountValidator
-                        is_update = User.objects.filter(username=username).exists()
-                        exclude_id = User.objects.filter(username=username).values_list('id', flat=True).first() if is_update else None
-                        
-                        valid, msg = AccountValidator.validate_username(
-                            username,
-                            exclude_user_id=exclude_id
-                        )
-                        if not valid:
-                            result['errors'].append(f"Row {row_idx}: {msg}")
-                            result['skipped'] += 1
-                            continue
-                        
-                        # Check for duplicates within batch
-                        if username in usernames_in_batch and not is_update:
-                            result['errors'].append(f"Row {row_idx}: Duplicate username '{username}' in batch")
-                            result['skipped'] += 1
-                            continue
-                        
-                        # ✅ VALIDATE EMAIL using AccountValidator
-                        valid, msg = AccountValidator.validate_email(
-                            email,
-                            exclude_user_id=exclude_id
-                        )
-                        if not valid:
-                            result['errors'].append(f"Row {row_idx}: {msg}")
-                            result['skipped'] += 1
-                            continue
-                        
-                        # Check for email duplicates within batch
-                        if email in emails_in_batch and not is_update:
-                            result['errors'].append(f"Row {row_idx}: Duplicate email '{email}' in batch")
-                            result['skipped'] += 1
-                            continue
-                        
-                        # ✅ VALIDATE PASSWORD (only for new users or if provided)
-                        if not is_update or (password and password != '***EXISTING***'):
-                            valid, msg = AccountValidator.validate_password(password)
-                            if not valid:
-                                result['errors'].append(f"Row {row_idx}: Password invalid - {msg}")
-                                result['skipped'] += 1
-                                continue
-                        
-                        # ✅ VALIDATE DISPLAY NAME using AccountValidator
-                        valid, msg = AccountValidator.validate_display_name(display_name)
-                        if not valid:
-                            result['errors'].append(f"Row {row_idx}: {msg}")
-                            result['skipped'] += 1
-                            continue
-                        
-                        # Validate role
-                        valid, msg = AccountValidator.validate_role(role)
-                        if not valid:
-                            result['errors'].append(f"Row {row_idx}: {msg}")
-                            result['skipped'] += 1
-                            continue
-                        
-                        # Role is already in correct format (Student, Faculty, etc.)
-                        role_enum = role
-                        
-                        # ✅ VALIDATE ROLE-SPECIFIC FIELDS
-                        if role_enum == Role.STUDENT:
-                            student_number = str(row_data.get('student_number', '')).strip()
-                            course = str(row_data.get('course', '')).strip()
-                            section_value = str(row_data.get('section', '')).strip()
-                            
-                            # Validate student number
-                            if not student_number:
-                                result['errors'].append(f"Row {row_idx}: Student number required for students")
-                                result['skipped'] += 1
-                                continue
-                            
-                            valid, msg = AccountValidator.validate_student_number(student_number)
-                            if not valid:
-                                result['errors'].append(f"Row {row_idx}: {msg}")
-                                result['skipped'] += 1
-                                continue
-                            
-                            # Validate course
-                            valid, msg = AccountValidator.validate_course(course)
-                            if not valid:
-                                result['errors'].append(f"Row {row_idx}: {msg}")
-                                result['skipped'] += 1
-                                continue
-                            
-                            # Validate section if provided (supports "CODE (Label)" format)
-                            section_obj = None
-                            if section_value:
-                                normalized_section = section_value.split('(')[0].strip()
-                                if normalized_section:
-                                    section_obj = Section.objects.filter(code=normalized_section).first()
-                                    if not section_obj:
-                                        try:
-                                            section_obj = Section.objects.get(id=int(normalized_section))
-                                        except (ValueError, Section.DoesNotExist):
-                                            section_obj = None
-                                if not section_obj:
-                                    result['errors'].append(f"Row {row_idx}: Section '{section_value}' not found")
-                                    result['skipped'] += 1
-                                    continue
-                        
-                        elif role_enum in [Role.DEAN, Role.FACULTY, Role.COORDINATOR]:
-                            institute = str(row_data.get('institute', '')).strip()
-                            
-                            # Validate institute
-                            valid, msg = AccountValidator.validate_institute(institute)
-                            if not valid:
-                                result['errors'].append(f"Row {row_idx}: {msg}")
-                                result['skipped'] += 1
-                                continue
-                        
-                        # Check if user exists
-                        user_exists = User.objects.filter(username=username).exists()
-                        
-                        if user_exists:
-                            # Update existing user
-                            user = User.objects.get(username=username)
-                            user.email = email
-                            if password and password != '***EXISTING***':  # Allow skipping password update
-                                user.set_password(password)
-                            user.save()
-                            
-                            profile = user.userprofile
-                            profile.display_name = display_name
-                            profile.role = role_enum
-                            
-                            # Handle student-specific fields
-                            if role_enum == Role.STUDENT:
-                                profile.studentnumber = str(row_data.get('student_number', '')).strip()
-                                profile.course = str(row_data.get('course', '')).strip()
-                                
-                                # Handle section
-                                section_value = str(row_data.get('section', '')).strip()
-                                if section_value:
-                                    normalized_section = section_value.split('(')[0].strip()
-                                    section = Section.objects.filter(code=normalized_section).first()
-                                    if not section:
-                                        try:
-                                            section = Section.objects.get(id=int(normalized_section))
-                                        except (ValueError, Section.DoesNotExist):
-                                            section = None
-                                    if section:
-                                        profile.section = section
-                                    else:
-                                        result['errors'].append(f"Row {row_idx}: Section '{section_value}' not found")
-                            
-                            # Handle staff-specific fields
-                            elif role_enum in [Role.DEAN, Role.FACULTY, Role.COORDINATOR]:
-                                profile.institute = str(row_data.get('institute', '')).strip()
-                            
-                            profile.save()
-                            result['updated'] += 1
-                        else:
-                            # Create new user
-                            # Split display_name into first_name and last_name
-                            name_parts = display_name.strip().split(None, 1)
-                            first_name = name_parts[0] if name_parts else display_name
-                            last_name = name_parts[1] if len(name_parts) > 1 else ''
-                            
-                            user = User.objects.create_user(
-                                username=username,
-                                email=email,
-                                password=password,
-                                first_name=first_name,
-                                last_name=last_name
-                            )
-                            
-                            profile = user.userprofile
-                            profile.display_name = display_name
-                            profile.role = role_enum
-                            
-                            # Handle student-specific fields
-                            if role_enum == Role.STUDENT:
-                                profile.studentnumber = str(row_data.get('student_number', '')).strip()
-                                profile.course = str(row_data.get('course', '')).strip()
-                                
-                                # Handle section
-                                section_value = str(row_data.get('section', '')).strip()
-                                if section_value:
-                                    normalized_section = section_value.split('(')[0].strip()
-                                    section = Section.objects.filter(code=normalized_section).first()
-                                    if not section:
-                                        try:
-                                            section = Section.objects.get(id=int(normalized_section))
-                                        except (ValueError, Section.DoesNotExist):
-                                            section = None
-                                    if section:
-                                        profile.section = section
-                                    else:
-                                        result['errors'].append(f"Row {row_idx}: Section '{section_value}' not found")
-                            
-                            # Handle staff-specific fields
-                            elif role_enum in [Role.DEAN, Role.FACULTY, Role.COORDINATOR]:
-                                profile.institute = str(row_data.get('institute', '')).strip()
-                            
-                            profile.save()
-                            result['created'] += 1
-                            
-                            # Track batch duplicates
-                            usernames_in_batch.add(username)
-                            emails_in_batch.add(email)
-                    
-                    except Exception as e:
-                        result['errors'].append(f"Row {row_idx}: {str(e)}")
-                        result['skipped'] += 1
-            
-            result['success'] = True
-            
-        except Exception as e:
-            result['errors'].append(f"Failed to read Excel file: {str(e)}")
-        
-        return result
+        importer = BulkAccountImporter(default_password=AccountImportExportService.DEFAULT_PASSWORD)
+        return importer.run(excel_file)
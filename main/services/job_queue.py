@@ -0,0 +1,220 @@
+"""
+Database-backed background job queue.
+
+Web requests enqueue BackgroundJob rows and return immediately; the
+``run_jobs`` management command claims and runs them. Jobs record status and
+progress for polling, retry with backoff, and a job whose worker disappears
+(e.g. gunicorn recycling a process) is reclaimed once its heartbeat is stale.
+Task functions must therefore be idempotent.
+"""
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from main.models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# task name -> callable(job, **payload)
+TASKS = {}
+
+
+def task(name):
+    """Register a function as a background task under ``name``."""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def load_tasks():
+    # Task modules register themselves on import
+    import main.tasks  # noqa: F401
+
+
+class JobQueueService:
+    """Enqueue, claim, run and report on background jobs."""
+
+    RETRY_BASE_DELAY = 30  # seconds; doubled on every failed attempt
+
+    @staticmethod
+    def lease_seconds():
+        return getattr(settings, 'JOB_LEASE_SECONDS', 300)
+
+    @staticmethod
+    def worker_id():
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def enqueue(task_name, payload=None, dedupe_key=None, user=None, max_attempts=3):
+        """
+        Queue a job and return it. If a job with the same dedupe_key is pending,
+        running or already succeeded, that job is returned instead.
+        """
+        load_tasks()
+        if task_name not in TASKS:
+            raise ValueError(f"Unknown background task: {task_name}")
+
+        if dedupe_key:
+            existing = (
+                BackgroundJob.objects
+                .filter(dedupe_key=dedupe_key)
+                .exclude(status=BackgroundJob.STATUS_FAILED)
+                .first()
+            )
+            if existing:
+                return existing
+
+        job = BackgroundJob.objects.create(
+            task=task_name,
+            payload=payload or {},
+            dedupe_key=dedupe_key,
+            max_attempts=max_attempts,
+            created_by=user if user is not None and user.is_authenticated else None,
+        )
+        logger.info(f"Enqueued background job #{job.id} {task_name} {job.payload}")
+        return job
+
+    @staticmethod
+    def claim_next(worker_id=None):
+        """
+        Atomically claim the oldest runnable job: a pending job that is due, or a
+        running job whose heartbeat expired. An expired job that has used all
+        its attempts is marked failed instead of being run again (a worker
+        that died mid-send must not send the emails twice). Returns the job or None.
+        """
+        now = timezone.now()
+        stale_before = now - timedelta(seconds=JobQueueService.lease_seconds())
+        runnable = Q(status=BackgroundJob.STATUS_PENDING, run_after__lte=now) | Q(
+            status=BackgroundJob.STATUS_RUNNING, heartbeat_at__lt=stale_before
+        )
+
+        with transaction.atomic():
+            queryset = BackgroundJob.objects.filter(runnable).order_by('run_after', 'id')
+            if connection.features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            while True:
+                job = queryset.first()
+                if job is None:
+                    return None
+                if job.status != BackgroundJob.STATUS_RUNNING:
+                    break
+                if job.attempts < job.max_attempts:
+                    logger.warning(f"Reclaiming background job #{job.id} from {job.locked_by} (heartbeat expired)")
+                    break
+
+                job.status = BackgroundJob.STATUS_FAILED
+                job.error = (
+                    f"Worker {job.locked_by} stopped responding during attempt {job.attempts} "
+                    f"of {job.max_attempts}; not retried"
+                )
+                job.finished_at = now
+                job.save(update_fields=['status', 'error', 'finished_at'])
+                logger.error(f"Background job #{job.id} {job.task} failed permanently: heartbeat expired")
+
+            job.status = BackgroundJob.STATUS_RUNNING
+            job.attempts += 1
+            job.locked_by = worker_id or JobQueueService.worker_id()
+            job.started_at = now
+            job.heartbeat_at = now
+            job.save(update_fields=['status', 'attempts', 'locked_by', 'started_at', 'heartbeat_at'])
+        return job
+
+    @staticmethod
+    def set_progress(job, percent, message=''):
+        """Record progress (0-100) and refresh the job's heartbeat."""
+        job.progress = max(0, min(100, int(percent)))
+        job.progress_message = message[:255]
+        job.heartbeat_at = timezone.now()
+        BackgroundJob.objects.filter(id=job.id).update(
+            progress=job.progress,
+            progress_message=job.progress_message,
+            heartbeat_at=job.heartbeat_at
+        )
+
+    @staticmethod
+    def _heartbeat(job_id, stop_event):
+        interval = max(1, JobQueueService.lease_seconds() / 3)
+        try:
+            while not stop_event.wait(interval):
+                BackgroundJob.objects.filter(id=job_id, status=BackgroundJob.STATUS_RUNNING).update(
+                    heartbeat_at=timezone.now()
+                )
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def run(job):
+        """Run a claimed job and record its outcome. Returns the updated job."""
+        load_tasks()
+        func = TASKS.get(job.task)
+
+        stop_event = threading.Event()
+        heartbeat = threading.Thread(target=JobQueueService._heartbeat, args=(job.id, stop_event), daemon=True)
+        heartbeat.start()
+        try:
+            if func is None:
+                raise ValueError(f"Unknown background task: {job.task}")
+            result = func(job, **job.payload)
+        except Exception as e:
+            job.error = traceback.format_exc()
+            job.finished_at = timezone.now()
+            if job.attempts < job.max_attempts:
+                job.status = BackgroundJob.STATUS_PENDING
+                job.run_after = timezone.now() + timedelta(
+                    seconds=JobQueueService.RETRY_BASE_DELAY * (2 ** (job.attempts - 1))
+                )
+                logger.warning(f"Background job #{job.id} {job.task} failed (attempt {job.attempts}), retrying: {e}")
+            else:
+                job.status = BackgroundJob.STATUS_FAILED
+                logger.error(f"Background job #{job.id} {job.task} failed permanently: {e}")
+        else:
+            job.status = BackgroundJob.STATUS_SUCCEEDED
+            job.result = result
+            job.error = ''
+            job.progress = 100
+            job.finished_at = timezone.now()
+            logger.info(f"Background job #{job.id} {job.task} succeeded: {result}")
+        finally:
+            stop_event.set()
+            heartbeat.join()
+
+        job.save(update_fields=['status', 'result', 'error', 'progress', 'finished_at', 'run_after'])
+        return job
+
+    @staticmethod
+    def run_pending(max_jobs=None, worker_id=None):
+        """Claim and run jobs until the queue is empty. Returns the number run."""
+        count = 0
+        while max_jobs is None or count < max_jobs:
+            job = JobQueueService.claim_next(worker_id)
+            if job is None:
+                break
+            JobQueueService.run(job)
+            count += 1
+        return count
+
+    @staticmethod
+    def to_dict(job):
+        return {
+            'id': job.id,
+            'task': job.task,
+            'status': job.status,
+            'progress': job.progress,
+            'progress_message': job.progress_message,
+            'attempts': job.attempts,
+            'max_attempts': job.max_attempts,
+            'result': job.result,
+            'error': job.error.strip().splitlines()[-1] if job.error else '',
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        }
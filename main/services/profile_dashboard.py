@@ -0,0 +1,248 @@
+"""
+Precomputed dashboards for the staff profile settings pages.
+
+FacultyProfileSettingsView, CoordinatorProfileSettingsView and
+DeanProfileSettingsView show the same expensive data: section scores with
+classified comments, overall evaluation data and rating distribution, peer and
+irregular scores, evaluation history and ranking. Building it takes dozens of
+queries plus sentiment analysis of every comment, so it is serialized into a
+ProfileDashboardSnapshot per (user, period) and a page view reads it back with
+one query.
+
+The pages render only their shell; static/js/profile_settings.js fetches each
+tab of the snapshot (see TABS) from api_profile_dashboard when first needed.
+The endpoint's ETag is derived from version(), so a browser revalidating an
+unchanged tab gets a 304 without the payload being read.
+
+Snapshots are built for every staff member when a period's results are
+processed, and lazily for anyone without a fresh one. They are marked stale,
+never edited, when an input changes:
+- a response, irregular evaluation, result or section assignment of the user
+  is saved (see main.signals)
+- responses or results of the user are removed or written in bulk: the bulk
+  paths (ResponseDeletionService, EvaluationResultWriter, HistoryArchiveService)
+  invalidate once per batch, so there are no per-row delete receivers and
+  those deletes stay fast
+- any release or period change, which can move the "latest completed period"
+- per-user result processing, which changes everyone's ranking in the period
+"""
+import logging
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+
+from main.models import EvaluationResponse, ProfileDashboardSnapshot, Role
+from main.services.ranking_service import RankingService
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileDashboardService:
+    """Build, read and invalidate per-user profile dashboard snapshots."""
+
+    # Parts of the payload the profile settings pages load on demand
+    TABS = ('summary', 'sections', 'peer', 'irregular', 'overall', 'history')
+
+    # Role -> view in main.views whose get_* methods compute the dashboard
+    PROFILE_VIEWS = {
+        Role.FACULTY: 'FacultyProfileSettingsView',
+        Role.COORDINATOR: 'CoordinatorProfileSettingsView',
+        Role.DEAN: 'DeanProfileSettingsView',
+    }
+
+    @staticmethod
+    def _view_for(role):
+        # Imported here: main.views imports this module
+        from main import views
+        return getattr(views, ProfileDashboardService.PROFILE_VIEWS[role])()
+
+    @staticmethod
+    def build_payload(user, role, evaluation_period=None):
+        """
+        Compute the dashboard with the role's view methods. Returns a
+        JSON-serializable dict:
+
+            {'section_scores', 'assigned_section_ids', 'section_map',
+             'peer_scores', 'irregular_scores', 'evaluation_data',
+             'evaluation_history', 'total_evaluations', 'ranking'}
+        """
+        view = ProfileDashboardService._view_for(role)
+        assigned_sections = list(view.get_assigned_sections(user).select_related('section'))
+
+        # Faculty only show assigned sections; coordinators and deans also show
+        # sections that only appear in their results
+        if assigned_sections or role != Role.FACULTY:
+            section_scores = view.get_section_scores(user, assigned_sections)
+        else:
+            section_scores = {}
+
+        ranking = RankingService.get_user_ranking(user, evaluation_period)
+
+        return {
+            'section_scores': section_scores,
+            'assigned_section_ids': [assignment.section.id for assignment in assigned_sections],
+            'section_map': {assignment.section.id: assignment.section.code for assignment in assigned_sections},
+            'peer_scores': view.get_peer_evaluation_scores(user),
+            'irregular_scores': view.get_irregular_evaluation_scores(user),
+            'evaluation_data': view.get_evaluation_data(user),
+            'evaluation_history': view.get_evaluation_history(user),
+            'total_evaluations': EvaluationResponse.objects.filter(evaluatee=user).count(),
+            'ranking': {
+                'rank': ranking.get('rank'),
+                'total_users': ranking.get('total_users'),
+                'overall_score': ranking.get('overall_score'),
+            },
+        }
+
+    @staticmethod
+    def build(user, role=None):
+        """Compute and store the user's snapshot for the latest completed period."""
+        role = role or user.userprofile.role
+        evaluation_period = RankingService.latest_completed_period()
+        payload = ProfileDashboardService.build_payload(user, role, evaluation_period)
+
+        try:
+            ProfileDashboardSnapshot.objects.update_or_create(
+                user=user,
+                evaluation_period=evaluation_period,
+                defaults={'role': role, 'payload': payload, 'is_stale': False}
+            )
+        except IntegrityError:
+            # Another request built the same snapshot first; ours is just as fresh
+            logger.info(f"Dashboard snapshot for {user.username} was built concurrently")
+        return payload
+
+    @staticmethod
+    def get(user, role=None):
+        """
+        The user's dashboard payload: one query when a fresh snapshot exists,
+        otherwise built and stored now.
+        """
+        role = role or user.userprofile.role
+        payload = (
+            ProfileDashboardSnapshot.objects
+            .filter(user=user, role=role, is_stale=False)
+            .order_by('-built_at')
+            .values_list('payload', flat=True)
+            .first()
+        )
+        if payload is None:
+            payload = ProfileDashboardService.build(user, role)
+        return payload
+
+    @staticmethod
+    def version(user, role=None):
+        """
+        Results-version stamp of the user's fresh snapshot: changes whenever the
+        snapshot is rebuilt (new period or changed inputs). Reads two columns;
+        builds the snapshot first if there is no fresh one.
+        """
+        role = role or user.userprofile.role
+        for _ in range(2):
+            stamp = (
+                ProfileDashboardSnapshot.objects
+                .filter(user=user, role=role, is_stale=False)
+                .order_by('-built_at')
+                .values_list('evaluation_period_id', 'built_at')
+                .first()
+            )
+            if stamp is not None:
+                period_id, built_at = stamp
+                return f"{role}:{period_id or 0}:{built_at.timestamp():.6f}"
+            ProfileDashboardService.build(user, role)
+        return None
+
+    @staticmethod
+    def tab(user, tab, role=None):
+        """
+        One tab of the dashboard, as served by the profile settings JSON
+        endpoint. Raises KeyError for an unknown tab.
+        """
+        if tab not in ProfileDashboardService.TABS:
+            raise KeyError(tab)
+        payload = ProfileDashboardService.get(user, role)
+        return getattr(ProfileDashboardService, f'_tab_{tab}')(payload)
+
+    @staticmethod
+    def _tab_summary(payload):
+        section_scores = payload['section_scores']
+        return {
+            'total_sections': len(payload['assigned_section_ids']),
+            'sections_with_data': sum(1 for scores in section_scores.values() if scores.get('has_data')),
+            'has_any_data': any(scores.get('has_data') for scores in section_scores.values()),
+            'total_evaluations': payload['total_evaluations'],
+            'ranking': payload['ranking'],
+        }
+
+    @staticmethod
+    def _tab_sections(payload):
+        return {'section_scores': payload['section_scores'], 'section_map': payload['section_map']}
+
+    @staticmethod
+    def _tab_peer(payload):
+        return payload['peer_scores']
+
+    @staticmethod
+    def _tab_irregular(payload):
+        return payload['irregular_scores']
+
+    @staticmethod
+    def _tab_overall(payload):
+        return payload['evaluation_data']
+
+    @staticmethod
+    def _tab_history(payload):
+        return {'history': payload['evaluation_history']}
+
+    @staticmethod
+    def build_for_staff(users=None):
+        """
+        Rebuild snapshots for every staff member (or the given users).
+        Called after a period's results are processed. Returns snapshots built.
+        """
+        if users is None:
+            users = User.objects.filter(
+                userprofile__role__in=list(ProfileDashboardService.PROFILE_VIEWS)
+            ).select_related('userprofile')
+
+        built = 0
+        for user in users:
+            try:
+                ProfileDashboardService.build(user)
+                built += 1
+            except Exception as e:
+                # A failed snapshot is rebuilt on the user's next visit
+                logger.error(f"Could not build dashboard snapshot for {user.username}: {str(e)}", exc_info=True)
+        logger.info(f"Built {built} profile dashboard snapshots")
+        return built
+
+    @staticmethod
+    def invalidate_user(user_id):
+        """Mark a user's snapshots stale after one of their inputs changed."""
+        return ProfileDashboardSnapshot.objects.filter(user_id=user_id, is_stale=False).update(is_stale=True)
+
+    @staticmethod
+    def invalidate_users(user_ids):
+        """
+        Mark the snapshots of several users stale with one UPDATE. ``user_ids``
+        may be a list or a values() queryset, evaluated as a subquery.
+        """
+        return ProfileDashboardSnapshot.objects.filter(user_id__in=user_ids, is_stale=False).update(is_stale=True)
+
+    @staticmethod
+    def invalidate_period(evaluation_period):
+        """Mark every snapshot of a period stale (its rankings changed)."""
+        return ProfileDashboardSnapshot.objects.filter(
+            evaluation_period=evaluation_period, is_stale=False
+        ).update(is_stale=True)
+
+    @staticmethod
+    def invalidate_all(built_before=None):
+        """
+        Mark every snapshot stale. ``built_before`` spares snapshots built
+        after that moment, e.g. ones rebuilt later in the same transaction.
+        """
+        snapshots = ProfileDashboardSnapshot.objects.filter(is_stale=False)
+        if built_before is not None:
+            snapshots = snapshots.filter(built_at__lt=built_before)
+        return snapshots.update(is_stale=True)
@@ -0,0 +1,211 @@
+"""
+Ranking service for staff evaluation results.
+
+Ranks every user's average total_percentage within their institute and role
+using a single annotated query with a window function. The ranking table is
+materialized per period in RankingSnapshot so pages, reports and AI requests
+can look a rank up in O(1), including for historical periods.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import Avg, F, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from main.models import EvaluationPeriod, EvaluationResult, EvaluationHistory, RankingSnapshot
+from main.services.history_timeline import HistoryTimelineService
+from main.services.shared_cache import rankings_cache
+
+logger = logging.getLogger(__name__)
+
+
+class RankingService:
+    """Compute and serve per-period institute/role rankings."""
+
+    CACHE_KEY = 'period:{period_id}'  # in the shared 'rankings' namespace
+    CACHE_TIMEOUT = 60 * 60  # 1 hour; invalidated explicitly when results change
+
+    EMPTY_RANKING = {'rank': None, 'total_users': 0, 'overall_score': 0}
+
+    @staticmethod
+    def latest_completed_period():
+        """Most recent INACTIVE student period that has ended."""
+        return EvaluationPeriod.objects.filter(
+            evaluation_type='student',
+            is_active=False,
+            end_date__lte=timezone.now()
+        ).order_by('-end_date').first()
+
+    @staticmethod
+    def compute_period_rankings(evaluation_period):
+        """
+        Build the ranking table for a period with one query.
+        Falls back to EvaluationHistory once the period's results were archived.
+        Returns {'users': {user_id: {...}}, 'groups': {(institute, role): total_users}}
+        """
+        table = RankingService._rank_rows(EvaluationResult, evaluation_period)
+        if not table['users']:
+            table = RankingService._rank_rows(EvaluationHistory, evaluation_period)
+        return table
+
+    @staticmethod
+    def _rank_rows(model, evaluation_period):
+        institute = F('user__userprofile__institute')
+        role = F('user__userprofile__role')
+
+        rows = model.objects.filter(evaluation_period=evaluation_period)
+        if model is EvaluationHistory:
+            # Rank on the archived results, not their timeline summaries as well
+            rows = HistoryTimelineService.without_summaries(rows)
+        rows = (
+            rows
+            .order_by()
+            .values('user_id', institute=institute, role=role)
+            .annotate(score=Avg('total_percentage'))
+            .filter(score__gt=0)
+            .annotate(rank=Window(
+                expression=Rank(),
+                partition_by=[institute, role],
+                order_by=F('score').desc()
+            ))
+        )
+
+        users = {}
+        groups = {}
+        for row in rows:
+            group_key = (row['institute'], row['role'])
+            groups[group_key] = groups.get(group_key, 0) + 1
+            users[row['user_id']] = {
+                'rank': row['rank'],
+                'overall_score': round(row['score'], 2),
+                'institute': row['institute'],
+                'role': row['role'],
+            }
+
+        for entry in users.values():
+            entry['total_users'] = groups[(entry['institute'], entry['role'])]
+
+        return {'users': users, 'groups': groups}
+
+    @staticmethod
+    def _percentile(rank, total_users):
+        return round((total_users - rank + 1) / total_users * 100, 2) if total_users else 0.0
+
+    @staticmethod
+    def snapshot_period(evaluation_period):
+        """
+        Materialize the ranking table of a finalized period into RankingSnapshot.
+        Replaces any earlier snapshot of the same period. Returns rows written.
+        """
+        table = RankingService.compute_period_rankings(evaluation_period)
+        return RankingService._store_snapshot(evaluation_period, table)
+
+    @staticmethod
+    def _store_snapshot(evaluation_period, table):
+        snapshots = [
+            RankingSnapshot(
+                evaluation_period=evaluation_period,
+                institute=entry['institute'],
+                role=entry['role'],
+                user_id=user_id,
+                rank=entry['rank'],
+                total_users=entry['total_users'],
+                score=entry['overall_score'],
+                percentile=RankingService._percentile(entry['rank'], entry['total_users']),
+            )
+            for user_id, entry in table['users'].items()
+        ]
+
+        with transaction.atomic():
+            RankingSnapshot.objects.filter(evaluation_period=evaluation_period).delete()
+            RankingSnapshot.objects.bulk_create(snapshots, batch_size=500)
+
+        rankings_cache.set(RankingService.CACHE_KEY.format(period_id=evaluation_period.id), table, RankingService.CACHE_TIMEOUT)
+        logger.info(f"Stored {len(snapshots)} ranking snapshots for period: {evaluation_period.name}")
+        return len(snapshots)
+
+    @staticmethod
+    def load_snapshot(evaluation_period):
+        """Rebuild the ranking table from stored snapshots, or None if there are none."""
+        rows = list(
+            RankingSnapshot.objects
+            .filter(evaluation_period=evaluation_period)
+            .values_list('user_id', 'institute', 'role', 'rank', 'total_users', 'score')
+        )
+        if not rows:
+            return None
+
+        users = {}
+        groups = {}
+        for user_id, institute, role, rank, total_users, score in rows:
+            groups[(institute, role)] = total_users
+            users[user_id] = {
+                'rank': rank,
+                'total_users': total_users,
+                'overall_score': score,
+                'institute': institute,
+                'role': role,
+            }
+        return {'users': users, 'groups': groups}
+
+    @staticmethod
+    def rankings_for_period(evaluation_period):
+        """
+        Ranking table for a period: cache, then stored snapshot, then a fresh
+        computation (materialized straight away for periods that have ended).
+        """
+        key = RankingService.CACHE_KEY.format(period_id=evaluation_period.id)
+        table = rankings_cache.get(key)
+        if table is not None:
+            return table
+
+        table = RankingService.load_snapshot(evaluation_period)
+        if table is None:
+            table = RankingService.compute_period_rankings(evaluation_period)
+            if not evaluation_period.is_active and table['users']:
+                RankingService._store_snapshot(evaluation_period, table)
+                return table
+
+        rankings_cache.set(key, table, RankingService.CACHE_TIMEOUT)
+        return table
+
+    @staticmethod
+    def invalidate(evaluation_period):
+        """
+        Drop the cached table and stored snapshot after a period's results change,
+        so the next read (or snapshot_period) materializes fresh rankings.
+        """
+        RankingSnapshot.objects.filter(evaluation_period=evaluation_period).delete()
+        rankings_cache.delete(RankingService.CACHE_KEY.format(period_id=evaluation_period.id))
+
+    @staticmethod
+    def lookup(table, user_id, institute, role):
+        """O(1) lookup of one user's ranking in a precomputed table."""
+        entry = table['users'].get(user_id)
+        if entry:
+            return {
+                'rank': entry['rank'],
+                'total_users': entry['total_users'],
+                'overall_score': entry['overall_score'],
+            }
+        return {
+            'rank': None,
+            'total_users': table['groups'].get((institute, role), 0),
+            'overall_score': 0,
+        }
+
+    @staticmethod
+    def get_user_ranking(user, evaluation_period=None):
+        """Ranking of a user within their institute and role for a period."""
+        if evaluation_period is None:
+            evaluation_period = RankingService.latest_completed_period()
+        if not evaluation_period:
+            return dict(RankingService.EMPTY_RANKING)
+
+        table = RankingService.rankings_for_period(evaluation_period)
+        if not table['users']:
+            return dict(RankingService.EMPTY_RANKING)
+
+        user_profile = user.userprofile
+        return RankingService.lookup(table, user.id, user_profile.institute, user_profile.role)
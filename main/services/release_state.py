@@ -0,0 +1,119 @@
+"""
+Release-state registry: which evaluation types have an active period and a
+released evaluation.
+
+Every page render asks these questions (the evaluation_context context
+processor, can_view_evaluation_results, Evaluation.is_evaluation_period_active).
+The registry answers them from one snapshot of all five evaluation types,
+loaded with a single query, kept in the shared 'release_state' cache namespace
+and memoized in each process. The namespace is release-scoped, so any write to
+Evaluation or EvaluationPeriod (see main.signals) moves it to a new version;
+each process notices the new version on its next lookup, which is a cache read
+rather than a database query.
+"""
+import threading
+
+from django.db.models import CharField, F, Value
+
+from main.models import Evaluation, EvaluationPeriod
+from main.services.shared_cache import release_state_cache
+
+EVALUATION_TYPES = ['student', 'peer', 'upward', 'dean', 'student_upward']
+
+
+class ReleaseStateRegistry:
+    """Process-wide view of release state for all evaluation types."""
+
+    CACHE_KEY = 'snapshot'
+
+    _lock = threading.Lock()
+    _memo = None  # (namespace version, snapshot)
+
+    @staticmethod
+    def load():
+        """
+        Build the snapshot with one UNION query over active periods and
+        released evaluations:
+
+            {evaluation_type: {'active_period_id': int|None,
+                               'is_released': bool,
+                               'released_period_ids': [int, ...]}}
+        """
+        periods = (
+            EvaluationPeriod.objects
+            .filter(is_active=True)
+            .annotate(kind=Value('period', output_field=CharField()), sort_time=F('start_date'))
+            .order_by()
+            .values_list('kind', 'evaluation_type', 'id', 'sort_time')
+        )
+        released = (
+            Evaluation.objects
+            .filter(is_released=True)
+            .annotate(kind=Value('released', output_field=CharField()), sort_time=F('created_at'))
+            .order_by()
+            .values_list('kind', 'evaluation_type', 'evaluation_period_id', 'sort_time')
+        )
+
+        snapshot = {
+            evaluation_type: {'active_period_id': None, 'is_released': False, 'released_period_ids': []}
+            for evaluation_type in EVALUATION_TYPES
+        }
+        latest_start = {}
+        for kind, evaluation_type, object_id, sort_time in periods.union(released, all=True):
+            state = snapshot.setdefault(
+                evaluation_type, {'active_period_id': None, 'is_released': False, 'released_period_ids': []}
+            )
+            if kind == 'period':
+                # Same pick as .filter(is_active=True).first(): latest start_date
+                if evaluation_type not in latest_start or sort_time > latest_start[evaluation_type]:
+                    latest_start[evaluation_type] = sort_time
+                    state['active_period_id'] = object_id
+            else:
+                state['is_released'] = True
+                if object_id is not None:
+                    state['released_period_ids'].append(object_id)
+        return snapshot
+
+    @classmethod
+    def snapshot(cls):
+        """Current snapshot; a cache read when nothing changed since the last call."""
+        version = release_state_cache.version()
+        memo = cls._memo
+        if memo is not None and memo[0] == version:
+            return memo[1]
+
+        # Pinned to the version read above: if a release lands while loading,
+        # the next call sees the newer version and reloads
+        snapshot = release_state_cache.get(cls.CACHE_KEY, version=version)
+        if snapshot is None:
+            snapshot = cls.load()
+            release_state_cache.set(cls.CACHE_KEY, snapshot, None, version=version)
+        with cls._lock:
+            cls._memo = (version, snapshot)
+        return snapshot
+
+    @classmethod
+    def state(cls, evaluation_type):
+        return cls.snapshot().get(evaluation_type)
+
+    @classmethod
+    def is_released(cls, evaluation_type='student'):
+        """Any evaluation of this type is released (the form is open)."""
+        state = cls.state(evaluation_type)
+        if state is None:
+            # Not one of the known types; ask the database directly
+            return Evaluation.objects.filter(is_released=True, evaluation_type=evaluation_type).exists()
+        return state['is_released']
+
+    @classmethod
+    def active_period_id(cls, evaluation_type='student'):
+        state = cls.state(evaluation_type)
+        return state['active_period_id'] if state else None
+
+    @classmethod
+    def is_open(cls, evaluation_type):
+        """There is an active period and an evaluation released for that period."""
+        state = cls.state(evaluation_type)
+        if not state or state['active_period_id'] is None:
+            return False
+        return state['active_period_id'] in state['released_period_ids']
@@ -0,0 +1,272 @@
+"""
+On-disk store of rendered evaluation report PDFs.
+
+download_evaluation_history_pdf used to rebuild the whole ReportLab document on
+every click. Reports are now rendered once per data version and kept under
+REPORT_ARTIFACT_DIR as <user id>/<period id>-<version>.pdf, so a download is a
+file send. The version is a hash of everything the report shows: the periods
+of the cycle, the user's name and assigned sections, the row count / newest id /
+newest submission of their student, peer and irregular responses in the cycle,
+and their ranking. A new response or a re-ranked period therefore produces a
+new file instead of serving a stale one, and nothing has to be invalidated.
+
+The directory is shared by all workers. Files are written to a temporary name
+and renamed into place, so concurrent renders of the same report are harmless.
+When the directory grows past REPORT_ARTIFACT_MAX_BYTES the least recently
+downloaded reports are evicted (downloads touch the file's mtime).
+
+prerender() renders every instructor's report for a closed period in a process
+pool, so the first downloads after results are released are already on disk
+(see `python manage.py prerender_reports`).
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import Count, Max
+
+from main.models import EvaluationPeriod, EvaluationResponse, IrregularEvaluation, Role, SectionAssignment
+from main.services.evaluation_cycle import EvaluationCycleService
+from main.services.ranking_service import RankingService
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report layout changes so existing files are re-rendered
+RENDERER_VERSION = 1
+
+STAFF_ROLES = [Role.FACULTY, Role.COORDINATOR, Role.DEAN]
+
+
+class ReportArtifactStore:
+    """Render, keep and evict per-user evaluation report PDFs."""
+
+    @staticmethod
+    def root():
+        return settings.REPORT_ARTIFACT_DIR
+
+    @staticmethod
+    def related_period_ids(period):
+        """Ids of every period the report for ``period`` covers (its cycle)."""
+        return EvaluationCycleService.related_period_ids(period)
+
+    @staticmethod
+    def _response_stats(model, user, period_ids):
+        stats = model.objects.filter(evaluatee=user, evaluation_period_id__in=period_ids).aggregate(
+            count=Count('id'), last_id=Max('id'), last_submitted=Max('submitted_at')
+        )
+        return stats['count'], stats['last_id'], stats['last_submitted'].isoformat() if stats['last_submitted'] else None
+
+    @staticmethod
+    def data_version(user, period, period_ids):
+        """
+        Hash of the inputs of the user's report for ``period``, or None when
+        there is no student or irregular evaluation to report on.
+        """
+        responses = ReportArtifactStore._response_stats(EvaluationResponse, user, period_ids)
+        irregular = ReportArtifactStore._response_stats(IrregularEvaluation, user, period_ids)
+        if not responses[0] and not irregular[0]:
+            return None
+
+        periods = list(
+            EvaluationPeriod.objects.filter(id__in=period_ids)
+            .order_by('id')
+            .values_list('id', 'evaluation_type')
+        )
+        # Same ranking period as the report
+        ranking_period = period if period.evaluation_type == 'student' else EvaluationPeriod.objects.filter(
+            id__in=period_ids, evaluation_type='student'
+        ).first()
+        ranking = RankingService.get_user_ranking(user, ranking_period) if ranking_period else None
+
+        sections = sorted(
+            SectionAssignment.objects.filter(user=user).values_list('section__code', flat=True)
+        )
+
+        key = repr((
+            RENDERER_VERSION, period.name, periods, user.get_full_name() or user.username,
+            sections, responses, irregular,
+            ranking and (ranking.get('rank'), ranking.get('total_users'), ranking.get('overall_score')),
+        ))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+    @staticmethod
+    def path_for(user_id, period_id, version):
+        return os.path.join(ReportArtifactStore.root(), str(user_id), f'{period_id}-{version}.pdf')
+
+    @staticmethod
+    def ensure(user, period):
+        """
+        Make sure the current version of the user's report for ``period`` is on
+        disk. Returns (path, rendered) with rendered False when it already
+        existed, or (None, False) when there is no data to report on.
+        """
+        from main.views import render_evaluation_report_pdf
+
+        period_ids = ReportArtifactStore.related_period_ids(period)
+        version = ReportArtifactStore.data_version(user, period, period_ids)
+        if version is None:
+            return None, False
+
+        path = ReportArtifactStore.path_for(user.id, period.id, version)
+        if os.path.exists(path):
+            return path, False
+
+        pdf = render_evaluation_report_pdf(user, period, period_ids)
+        ReportArtifactStore._write(path, pdf)
+        ReportArtifactStore._remove_other_versions(path)
+        return path, True
+
+    @staticmethod
+    def open_report(user, period):
+        """
+        Open the user's report for ``period`` for reading, rendering it first
+        if needed. Returns a binary file object, or None without data.
+        """
+        path, rendered = ReportArtifactStore.ensure(user, period)
+        if path is None:
+            return None
+
+        try:
+            report = open(path, 'rb')
+        except FileNotFoundError:
+            # Evicted between the check and the open by another worker
+            path, rendered = ReportArtifactStore.ensure(user, period)
+            report = open(path, 'rb')
+
+        if rendered:
+            ReportArtifactStore.evict()
+        else:
+            # Mark as recently used for eviction
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return report
+
+    @staticmethod
+    def _write(path, data):
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _remove_other_versions(path):
+        directory, name = os.path.split(path)
+        prefix = name.split('-', 1)[0] + '-'
+        for other in os.listdir(directory):
+            if other != name and other.startswith(prefix) and other.endswith('.pdf'):
+                try:
+                    os.unlink(os.path.join(directory, other))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def evict(max_bytes=None):
+        """
+        Delete least recently used reports until the store is within
+        ``max_bytes`` (default REPORT_ARTIFACT_MAX_BYTES). Returns files removed.
+        """
+        max_bytes = settings.REPORT_ARTIFACT_MAX_BYTES if max_bytes is None else max_bytes
+        files = []
+        total = 0
+        for directory, _, names in os.walk(ReportArtifactStore.root()):
+            for name in names:
+                if not name.endswith('.pdf'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        if total <= max_bytes:
+            return removed
+        for _, size, path in sorted(files):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            removed += 1
+            total -= size
+            if total <= max_bytes:
+                break
+        logger.info(f"Evicted {removed} report artifacts")
+        return removed
+
+    @staticmethod
+    def instructors_for(period):
+        """Staff evaluated in ``period``'s group (by students or irregular students)."""
+        period_ids = ReportArtifactStore.related_period_ids(period)
+        evaluatee_ids = set(
+            EvaluationResponse.objects.filter(evaluation_period_id__in=period_ids)
+            .values_list('evaluatee_id', flat=True).distinct()
+        )
+        evaluatee_ids.update(
+            IrregularEvaluation.objects.filter(evaluation_period_id__in=period_ids)
+            .values_list('evaluatee_id', flat=True).distinct()
+        )
+        return list(
+            User.objects.filter(id__in=evaluatee_ids, userprofile__role__in=STAFF_ROLES)
+            .order_by('id').values_list('id', flat=True)
+        )
+
+    @staticmethod
+    def prerender(period, workers=None):
+        """
+        Render every instructor's report for a closed period. Reports run in
+        a process pool (ReportLab is CPU-bound) unless ``workers`` is 1.
+        Returns {'instructors', 'rendered', 'cached', 'empty', 'failed'}.
+        """
+        user_ids = ReportArtifactStore.instructors_for(period)
+        workers = workers or settings.REPORT_PRERENDER_WORKERS or os.cpu_count() or 1
+        workers = max(1, min(workers, len(user_ids) or 1))
+        jobs = [(user_id, period.id) for user_id in user_ids]
+
+        if workers > 1:
+            # Forked workers must open their own database connections
+            connections.close_all()
+            # django.setup() makes spawned workers (macOS/Windows) load settings
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+                outcomes = list(pool.map(_prerender_one, jobs))
+        else:
+            outcomes = [_prerender_one(job) for job in jobs]
+
+        stats = {'instructors': len(user_ids), 'rendered': 0, 'cached': 0, 'empty': 0, 'failed': 0}
+        for outcome in outcomes:
+            stats[outcome] += 1
+        ReportArtifactStore.evict()
+        return stats
+
+
+def _prerender_one(job):
+    """Pool worker: render one instructor's report. Returns the outcome key."""
+    user_id, period_id = job
+    try:
+        user = User.objects.select_related('userprofile').get(id=user_id)
+        period = EvaluationPeriod.objects.get(id=period_id)
+        path, rendered = ReportArtifactStore.ensure(user, period)
+    except Exception as e:
+        logger.error(f"Could not pre-render report for user {user_id}: {str(e)}", exc_info=True)
+        return 'failed'
+    if path is None:
+        return 'empty'
+    return 'rendered' if rendered else 'cached'
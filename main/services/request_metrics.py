@@ -0,0 +1,306 @@
+"""
+Per-request performance metrics recorded by RequestMetricsMiddleware.
+
+Each request becomes a sample: endpoint (method and URL name), status, wall
+time, SQL query count and time, duplicate queries (same SQL with the same
+parameters run more than once in the request) and response size. Samples go
+into a per-process ring buffer of the last REQUEST_METRICS_BUFFER_SIZE
+requests, and are added to per-endpoint counters and a latency histogram.
+Each process keeps running totals of its own counters and, every
+REQUEST_METRICS_FLUSH_INTERVAL seconds, stores them whole under its own key in
+the 'request_metrics' cache namespace. The dashboard sums the keys of every
+process that has flushed. Only one process ever writes a given key, so this
+needs no atomic incr: the default FileBasedCache implements incr as a get and
+a set, and concurrent workers would lose increments. A reset moves the
+namespace to a new version and deletes the old version's keys; other
+processes notice at their next flush and carry over only what they counted
+since their previous flush, so requests in the last flush interval before a
+reset may still show up after it.
+
+Requests slower than REQUEST_METRICS_SLOW_MS are logged with their queries,
+grouped by SQL and sorted by time, and the latest SLOW_LOG_SIZE of them are
+kept in the shared cache for the dashboard.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.utils import timezone
+
+from main.services.shared_cache import request_metrics_cache
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last one catches the rest
+HISTOGRAM_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, None]
+COUNTER_FIELDS = ['count', 'errors', 'slow', 'wall_us', 'sql_us', 'queries', 'duplicates', 'bytes']
+SLOW_LOG_SIZE = 50
+SLOW_QUERY_LIMIT = 50  # distinct statements kept per slow request
+RECENT_SAMPLES_SHOWN = 50
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() callback counting and timing a request's queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.by_sql = {}  # sql -> [count, ms]
+        self.executed = set()  # (sql, params) already seen
+        self.duplicates = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.total_ms += elapsed_ms
+            stats = self.by_sql.setdefault(sql, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed_ms
+            key = (sql, repr(params))
+            if key in self.executed:
+                self.duplicates += 1
+            else:
+                self.executed.add(key)
+
+    def slowest(self, limit=SLOW_QUERY_LIMIT):
+        """Statements by total time: [{'sql', 'count', 'ms'}, ...]."""
+        ranked = sorted(self.by_sql.items(), key=lambda item: -item[1][1])[:limit]
+        return [{'sql': sql, 'count': count, 'ms': round(ms, 2)} for sql, (count, ms) in ranked]
+
+
+class RequestMetrics:
+    """Per-process sample buffer and counters, flushed to shared totals."""
+
+    _lock = threading.Lock()
+    _samples = None  # deque of recent samples, created on first use
+    _totals = defaultdict(int)  # (endpoint, field) -> this process's running total
+    _dirty = False  # totals changed since the last flush
+    _version = None  # namespace version the totals were last stored under
+    _flushed = {}  # the totals as last stored, to tell what was counted since
+    _last_flush = time.monotonic()
+
+    PROCESSES_KEY = 'processes'
+    SLOW_KEY = 'slow'
+
+    @staticmethod
+    def process_key():
+        """This process's key for its totals (computed per call: workers are forked)."""
+        return f'process:{socket.gethostname()}:{os.getpid()}'
+
+    @staticmethod
+    def slow_threshold_ms():
+        return getattr(settings, 'REQUEST_METRICS_SLOW_MS', 1000)
+
+    @staticmethod
+    def endpoint_name(request):
+        """'<METHOD>:<url name>', e.g. 'POST:main:submit_evaluation' (no spaces: it is a cache key)."""
+        match = getattr(request, 'resolver_match', None)
+        name = (match.view_name or match.route) if match else 'unresolved'
+        return f'{request.method}:{name}'
+
+    @staticmethod
+    def bucket(wall_ms):
+        for index, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if bound is None or wall_ms <= bound:
+                return index
+
+    @classmethod
+    def record(cls, request, response, wall_ms, recorder):
+        """Add one finished request to the buffer and counters."""
+        endpoint = cls.endpoint_name(request)
+        if getattr(response, 'streaming', False):
+            size = int(response.get('Content-Length') or 0)
+        else:
+            size = len(response.content)
+        slow = wall_ms >= cls.slow_threshold_ms()
+
+        sample = {
+            'endpoint': endpoint,
+            'path': request.path,
+            'status': response.status_code,
+            'wall_ms': round(wall_ms, 2),
+            'sql_ms': round(recorder.total_ms, 2),
+            'queries': recorder.count,
+            'duplicates': recorder.duplicates,
+            'bytes': size,
+            'at': timezone.now(),
+        }
+
+        with cls._lock:
+            if cls._samples is None:
+                cls._samples = deque(maxlen=getattr(settings, 'REQUEST_METRICS_BUFFER_SIZE', 500))
+            cls._samples.append(sample)
+            totals = cls._totals
+            totals[(endpoint, 'count')] += 1
+            totals[(endpoint, 'errors')] += response.status_code >= 500
+            totals[(endpoint, 'slow')] += slow
+            totals[(endpoint, 'wall_us')] += int(wall_ms * 1000)
+            totals[(endpoint, 'sql_us')] += int(recorder.total_ms * 1000)
+            totals[(endpoint, 'queries')] += recorder.count
+            totals[(endpoint, 'duplicates')] += recorder.duplicates
+            totals[(endpoint, 'bytes')] += size
+            totals[(endpoint, f'bucket{cls.bucket(wall_ms)}')] += 1
+            cls._dirty = True
+            due = time.monotonic() - cls._last_flush >= getattr(settings, 'REQUEST_METRICS_FLUSH_INTERVAL', 10)
+
+        if slow:
+            cls.record_slow(sample, recorder)
+        if due:
+            cls.flush()
+
+    @classmethod
+    def record_slow(cls, sample, recorder):
+        queries = recorder.slowest()
+        logger.warning(
+            f"Slow request {sample['endpoint']} {sample['path']}: {sample['wall_ms']:.0f} ms, "
+            f"{sample['queries']} queries ({sample['sql_ms']:.0f} ms SQL, {sample['duplicates']} duplicates)\n"
+            + '\n'.join(f"  {query['count']}× {query['ms']:.1f} ms  {query['sql']}" for query in queries)
+        )
+        # Read-modify-write: two workers logging at the same instant may drop one entry
+        slow_requests = request_metrics_cache.get(cls.SLOW_KEY) or []
+        slow_requests.insert(0, dict(sample, query_list=queries))
+        request_metrics_cache.set(cls.SLOW_KEY, slow_requests[:SLOW_LOG_SIZE])
+
+    @classmethod
+    def flush(cls):
+        """Store this process's running totals under its own key (one set, no incr)."""
+        with cls._lock:
+            cls._last_flush = time.monotonic()
+            if not cls._dirty:
+                return
+            cls._dirty = False
+        try:
+            version = request_metrics_cache.version()
+            with cls._lock:
+                if cls._version is not None and cls._version != version:
+                    # Another process reset the metrics: start over from what was
+                    # counted since the last flush, which is mostly after the reset
+                    cls._totals = defaultdict(int, {
+                        counter: value - cls._flushed.get(counter, 0)
+                        for counter, value in cls._totals.items()
+                        if value != cls._flushed.get(counter, 0)
+                    })
+                cls._version = version
+                cls._flushed = dict(cls._totals)
+                totals = {f'{field}:{endpoint}': value for (endpoint, field), value in cls._totals.items()}
+
+            key = cls.process_key()
+            request_metrics_cache.set(key, totals, timeout=None, version=version)
+            # Read-modify-write, re-checked on every flush: a key dropped by two
+            # processes registering at once is added back by its next flush
+            processes = set(request_metrics_cache.get(cls.PROCESSES_KEY, version=version) or [])
+            if key not in processes:
+                request_metrics_cache.set(cls.PROCESSES_KEY, sorted(processes | {key}), timeout=None, version=version)
+        except Exception as e:
+            # Metrics must never break a request
+            logger.warning(f"Could not flush request metrics: {str(e)}")
+
+    @classmethod
+    def totals(cls):
+        """Every process's stored totals summed, this one's flushed first: {endpoint: {field: value}}."""
+        cls.flush()
+        fields = COUNTER_FIELDS + [f'bucket{index}' for index in range(len(HISTOGRAM_BUCKETS_MS))]
+        version = request_metrics_cache.version()
+        processes = request_metrics_cache.get(cls.PROCESSES_KEY, version=version) or []
+        stored = request_metrics_cache.cache.get_many(
+            [request_metrics_cache.make_key(key, version) for key in processes]
+        )
+        if len(stored) < len(processes):
+            # Keys evicted by the cache: stop listing them (a live process re-registers at its next flush)
+            request_metrics_cache.set(cls.PROCESSES_KEY, [
+                key for key in processes if request_metrics_cache.make_key(key, version) in stored
+            ], timeout=None, version=version)
+
+        totals = {}
+        for process_totals in stored.values():
+            for counter, value in process_totals.items():
+                field, endpoint = counter.split(':', 1)
+                totals.setdefault(endpoint, dict.fromkeys(fields, 0))[field] += value
+        return totals
+
+    @staticmethod
+    def histogram_percentile(histogram, pct):
+        """Upper bound (ms) of the bucket holding the ``pct`` percentile; None above the last bound."""
+        total = sum(histogram)
+        if not total:
+            return None
+        threshold = total * pct / 100
+        seen = 0
+        for count, bound in zip(histogram, HISTOGRAM_BUCKETS_MS):
+            seen += count
+            if seen >= threshold:
+                return bound
+        return None
+
+    @classmethod
+    def snapshot(cls):
+        """
+        Everything the dashboard and the JSON endpoint show:
+        {'endpoints': [...], 'recent': [...], 'slow_requests': [...],
+         'slow_threshold_ms', 'histogram_buckets_ms'}. Endpoints are sorted
+        by total wall time, i.e. where the server spends its time.
+        """
+        endpoints = []
+        for endpoint, counters in cls.totals().items():
+            count = counters['count']
+            if not count:
+                continue
+            histogram = [counters[f'bucket{index}'] for index in range(len(HISTOGRAM_BUCKETS_MS))]
+            endpoints.append({
+                'endpoint': endpoint,
+                'count': count,
+                'errors': counters['errors'],
+                'slow': counters['slow'],
+                'total_seconds': round(counters['wall_us'] / 1e6, 2),
+                'mean_ms': round(counters['wall_us'] / count / 1000, 1),
+                'mean_sql_ms': round(counters['sql_us'] / count / 1000, 1),
+                'mean_queries': round(counters['queries'] / count, 1),
+                'duplicates_per_request': round(counters['duplicates'] / count, 1),
+                'mean_bytes': counters['bytes'] // count,
+                'p50_ms': cls.histogram_percentile(histogram, 50),
+                'p95_ms': cls.histogram_percentile(histogram, 95),
+                'p99_ms': cls.histogram_percentile(histogram, 99),
+                'histogram': histogram,
+            })
+        endpoints.sort(key=lambda row: -row['total_seconds'])
+
+        with cls._lock:
+            recent = list(cls._samples or [])[-RECENT_SAMPLES_SHOWN:]
+        return {
+            'endpoints': endpoints,
+            'recent': recent[::-1],
+            'slow_requests': request_metrics_cache.get(cls.SLOW_KEY) or [],
+            'slow_threshold_ms': cls.slow_threshold_ms(),
+            'histogram_buckets_ms': HISTOGRAM_BUCKETS_MS,
+        }
+
+    @classmethod
+    def reset(cls):
+        """
+        Forget all recorded metrics: this process's totals and buffer now, and
+        every other process's totals by moving the namespace to a new version
+        and deleting the old version's keys (each process starts a new count
+        at its next flush).
+        """
+        with cls._lock:
+            cls._totals = defaultdict(int)
+            cls._flushed = {}
+            cls._dirty = False
+            cls._version = None
+            if cls._samples is not None:
+                cls._samples.clear()
+        version = request_metrics_cache.version()
+        request_metrics_cache.invalidate()
+        # The stored keys never expire, so prune them rather than leave them orphaned
+        processes = request_metrics_cache.get(cls.PROCESSES_KEY, version=version) or []
+        request_metrics_cache.cache.delete_many([
+            request_metrics_cache.make_key(key, version) for key in [*processes, cls.PROCESSES_KEY, cls.SLOW_KEY]
+        ])
@@ -0,0 +1,64 @@
+"""
+Bulk removal of evaluation responses.
+
+Section reassignments and account deletion remove a user's responses as
+querysets. There are no per-row delete receivers on the response models (they
+would disable Django's fast delete and cost queries per row), so everything
+derived from the deleted rows is fixed here once per call: the evaluatees'
+dashboard snapshots are marked stale and the deleted rows' contributions are
+subtracted from the running EvaluationAggregate rows, so a deletion during an
+open period leaves concurrent submissions alone.
+"""
+import logging
+
+from django.db import transaction
+
+from main.models import (
+    DeanEvaluationResponse, EvaluationResponse, IrregularEvaluation, StudentUpwardEvaluationResponse,
+    UpwardEvaluationResponse,
+)
+from main.services.evaluation_aggregate import EvaluationAggregateService
+from main.services.profile_dashboard import ProfileDashboardService
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_MODELS = [
+    EvaluationResponse,
+    IrregularEvaluation,
+    UpwardEvaluationResponse,
+    DeanEvaluationResponse,
+    StudentUpwardEvaluationResponse,
+]
+
+
+class ResponseDeletionService:
+    """Delete response querysets and repair what was derived from them."""
+
+    @staticmethod
+    def delete(*querysets):
+        """
+        Delete querysets of responses (of any response model) in one
+        transaction, subtracting each from the aggregates right before it
+        goes. Returns the number of responses deleted.
+        """
+        aggregate_count = 0
+        deleted_count = 0
+        with transaction.atomic():
+            for responses in querysets:
+                # Read while the rows still exist; querysets that overlap an
+                # earlier one no longer match the rows it already deleted
+                aggregate_count += EvaluationAggregateService.subtract(responses)
+                ProfileDashboardService.invalidate_users(responses.values('evaluatee_id'))
+                deleted_count += responses.delete()[0]
+
+        logger.info(f"Deleted {deleted_count} evaluation responses from {aggregate_count} aggregates")
+        return deleted_count
+
+    @staticmethod
+    def delete_user_responses(user):
+        """Delete every response written by or about ``user``. Returns responses deleted."""
+        return ResponseDeletionService.delete(*[
+            model.objects.filter(**{field: user})
+            for model in RESPONSE_MODELS
+            for field in ('evaluator', 'evaluatee')
+        ])
@@ -0,0 +1,128 @@
+"""
+Batch writer for EvaluationResult rows.
+
+Collects every result row of a period in memory and persists them with
+``bulk_create(update_conflicts=True)`` inside one transaction, so closing a
+period costs a handful of statements instead of a SELECT plus INSERT/UPDATE
+per user and section.
+"""
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from main.models import EvaluationResult
+from main.services.profile_dashboard import ProfileDashboardService
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationResultWriter:
+    """Accumulate EvaluationResult rows and upsert them in batches."""
+
+    UNIQUE_FIELDS = ['user', 'evaluation_period', 'section']
+    UPDATE_FIELDS = [
+        'category_a_score',
+        'category_b_score',
+        'category_c_score',
+        'category_d_score',
+        'total_percentage',
+        'average_rating',
+        'total_responses',
+        'total_questions',
+        'poor_count',
+        'unsatisfactory_count',
+        'satisfactory_count',
+        'very_satisfactory_count',
+        'outstanding_count',
+        'calculated_at',
+        'last_updated',
+    ]
+
+    def __init__(self, evaluation_period, batch_size=None):
+        self.evaluation_period = evaluation_period
+        self.batch_size = batch_size or getattr(settings, 'EVALUATION_RESULTS_BATCH_SIZE', 500)
+        self.results = []
+
+    def add(self, user_id, section=None, **scores):
+        """
+        Queue one result row. ``section`` may be a Section or its primary key;
+        ``scores`` are EvaluationResult field values. Recalculated rows get a
+        fresh ``calculated_at``, as update_or_create used to give them.
+        """
+        section_id = getattr(section, 'pk', section)
+        scores.setdefault('calculated_at', timezone.now())
+        self.results.append(EvaluationResult(
+            user_id=user_id,
+            evaluation_period=self.evaluation_period,
+            section_id=section_id,
+            **scores
+        ))
+
+    def add_summary(self, user_id, summary, section=None, total_questions=15, peer=False, average_rating=None):
+        """Queue a row built from a ScoringEngine / ScoreAggregationService summary."""
+        if peer:
+            # Peer scoring: simple average of all questions, no categories
+            category_scores = [0, 0, 0, 0]
+            total_percentage = summary['flat_percentage']
+        else:
+            category_scores = summary['category_scores']
+            total_percentage = summary['total_percentage']
+        if average_rating is None:
+            average_rating = summary['average_rating']
+        poor, unsatisfactory, satisfactory, very_satisfactory, outstanding = summary['distribution']
+
+        self.add(
+            user_id,
+            section=section,
+            category_a_score=round(category_scores[0], 2),
+            category_b_score=round(category_scores[1], 2),
+            category_c_score=round(category_scores[2], 2),
+            category_d_score=round(category_scores[3], 2),
+            total_percentage=round(total_percentage, 2),
+            average_rating=round(average_rating, 2),
+            total_responses=summary['response_count'],
+            total_questions=total_questions,
+            poor_count=poor,
+            unsatisfactory_count=unsatisfactory,
+            satisfactory_count=satisfactory,
+            very_satisfactory_count=very_satisfactory,
+            outstanding_count=outstanding,
+        )
+
+    def write(self):
+        """Upsert every queued row in one transaction. Returns the number of rows written."""
+        if not self.results:
+            return 0
+
+        with_section = [result for result in self.results if result.section_id is not None]
+        without_section = [result for result in self.results if result.section_id is None]
+
+        with transaction.atomic():
+            if with_section:
+                upsert_options = {
+                    'update_conflicts': True,
+                    'update_fields': self.UPDATE_FIELDS,
+                }
+                # MySQL upserts on any unique key and rejects an explicit conflict target
+                if connection.features.supports_update_conflicts_with_target:
+                    upsert_options['unique_fields'] = self.UNIQUE_FIELDS
+                EvaluationResult.objects.bulk_create(with_section, batch_size=self.batch_size, **upsert_options)
+
+            if without_section:
+                # NULL sections never collide on the unique index, so replace those rows explicitly
+                EvaluationResult.objects.filter(
+                    evaluation_period=self.evaluation_period,
+                    section__isnull=True,
+                    user_id__in=[result.user_id for result in without_section]
+                ).delete()
+                EvaluationResult.objects.bulk_create(without_section, batch_size=self.batch_size)
+
+            # bulk_create sends no post_save, so mark the affected dashboards stale here
+            ProfileDashboardService.invalidate_users({result.user_id for result in self.results})
+
+        written = len(self.results)
+        logger.info(f"Wrote {written} evaluation results for period: {self.evaluation_period.name}")
+        self.results = []
+        return written
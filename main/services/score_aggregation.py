@@ -0,0 +1,122 @@
+"""
+Database-side aggregation of evaluation scores.
+
+Builds category totals and Poor..Outstanding counts with conditional
+aggregation (``Sum(Case(When(...)))`` / ``Count(filter=...)``) so a whole
+EvaluationPeriod can be scored in one GROUP BY query instead of pulling
+every response row into Python.
+"""
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+
+from main.constants import RATING_NUMERIC_MAP, RATING_NUMERIC_REVERSE, MAX_RATING_SCORE, TOTAL_QUESTIONS
+from main.models import EvaluationResponse
+from main.services.scoring_engine import ScoringEngine, QUESTION_FIELDS, STUDENT_CATEGORY_LAYOUT
+
+
+class ScoreAggregationService:
+    """Score responses inside MySQL/SQLite with a single grouped query."""
+
+    @staticmethod
+    def rating_value(field, default=1):
+        """CASE expression mapping a rating label column to its 1-5 value."""
+        return Case(
+            *[When(**{field: label}, then=Value(code)) for label, code in RATING_NUMERIC_MAP.items()],
+            default=Value(default),
+            output_field=IntegerField()
+        )
+
+    @staticmethod
+    def annotations(question_count=TOTAL_QUESTIONS):
+        """Aggregate expressions for per-question sums and rating bucket counts."""
+        fields = QUESTION_FIELDS[:question_count]
+        aggregates = {'response_count': Count('id')}
+
+        for field in fields:
+            aggregates[f'{field}_sum'] = Sum(ScoreAggregationService.rating_value(field))
+
+        # Poor is derived afterwards so unknown labels fall into it like the Python path
+        for code in range(2, MAX_RATING_SCORE + 1):
+            label = RATING_NUMERIC_REVERSE[code]
+            bucket = None
+            for field in fields:
+                count = Count('id', filter=Q(**{field: label}))
+                bucket = count if bucket is None else bucket + count
+            aggregates[f'rating_{code}_count'] = bucket
+
+        return aggregates
+
+    @staticmethod
+    def aggregate(queryset, group_by=('evaluatee_id', 'student_section'), layout=STUDENT_CATEGORY_LAYOUT,
+                  question_count=TOTAL_QUESTIONS):
+        """
+        Run one GROUP BY query over ``queryset`` and return a list of dicts,
+        one per group, holding the group keys plus a ScoringEngine summary.
+        """
+        rows = (
+            queryset
+            .order_by()
+            .values(*group_by)
+            .annotate(**ScoreAggregationService.annotations(question_count))
+        )
+
+        groups = []
+        for row in rows:
+            response_count = row['response_count']
+            question_sums = [row[f'{field}_sum'] or 0 for field in QUESTION_FIELDS[:question_count]]
+            upper_buckets = [row[f'rating_{code}_count'] for code in range(2, MAX_RATING_SCORE + 1)]
+            poor = response_count * question_count - sum(upper_buckets)
+
+            groups.append({
+                **{key: row[key] for key in group_by},
+                'summary': ScoringEngine.summarize_sums(
+                    question_sums, response_count, layout, [poor] + upper_buckets
+                ),
+            })
+        return groups
+
+    @staticmethod
+    def merge_groups(groups, key='evaluatee_id', layout=STUDENT_CATEGORY_LAYOUT):
+        """
+        Combine per-(evaluatee, section) groups into per-evaluatee summaries.
+        Sums are additive, so no second query is needed. Each merged entry also
+        records the section with the most responses.
+        """
+        merged = {}
+        for group in groups:
+            entry = merged.setdefault(group[key], {
+                'question_sums': None,
+                'response_count': 0,
+                'distribution': [0] * MAX_RATING_SCORE,
+                'top_section': None,
+                'top_section_count': 0,
+            })
+            summary = group['summary']
+            if entry['question_sums'] is None:
+                entry['question_sums'] = list(summary['question_sums'])
+            else:
+                entry['question_sums'] = [a + b for a, b in zip(entry['question_sums'], summary['question_sums'])]
+            entry['response_count'] += summary['response_count']
+            entry['distribution'] = [a + b for a, b in zip(entry['distribution'], summary['distribution'])]
+
+            section_code = group.get('student_section')
+            if section_code and summary['response_count'] > entry['top_section_count']:
+                entry['top_section'] = section_code
+                entry['top_section_count'] = summary['response_count']
+
+        return {
+            evaluatee_id: {
+                'summary': ScoringEngine.summarize_sums(
+                    entry['question_sums'], entry['response_count'], layout, entry['distribution']
+                ),
+                'top_section': entry['top_section'],
+            }
+            for evaluatee_id, entry in merged.items()
+        }
+
+    @staticmethod
+    def period_section_scores(evaluation_period, evaluatee_ids=None, layout=STUDENT_CATEGORY_LAYOUT):
+        """Per-evaluatee, per-section scores for every response linked to a period."""
+        responses = EvaluationResponse.objects.filter(evaluation_period=evaluation_period)
+        if evaluatee_ids is not None:
+            responses = responses.filter(evaluatee_id__in=evaluatee_ids)
+        return ScoreAggregationService.aggregate(responses, layout=layout)
@@ -0,0 +1,115 @@
+"""
+Vectorized scoring engine for evaluation responses.
+
+Pulls only the question columns as ``values_list`` tuples, maps the rating
+labels onto a NumPy int8 matrix and derives category totals, weighted
+percentages and the 5-bucket rating distribution in a single pass.
+"""
+import numpy as np
+
+from main.constants import RATING_NUMERIC_MAP, MAX_RATING_SCORE, TOTAL_QUESTIONS
+
+
+QUESTION_FIELDS = [f'question{i}' for i in range(1, TOTAL_QUESTIONS + 1)]
+
+# (question numbers, weight) for each of the four categories
+# Student evaluation form: A = Q1-4, B = Q5-8, C = Q9-12, D = Q13-15
+STUDENT_CATEGORY_LAYOUT = (
+    (range(1, 5), 0.35),    # Mastery of Subject Matter
+    (range(5, 9), 0.25),    # Classroom Management
+    (range(9, 13), 0.20),   # Compliance to Policies
+    (range(13, 16), 0.20),  # Personality
+)
+
+# Layout used when a whole period is turned into EvaluationResult rows
+# (process_evaluation_period_to_results): A = Q1-5, B = Q6-9, C = Q10-12, D = Q13-15
+PERIOD_RESULTS_CATEGORY_LAYOUT = (
+    (range(1, 6), 0.35),
+    (range(6, 10), 0.25),
+    (range(10, 13), 0.20),
+    (range(13, 16), 0.20),
+)
+
+# Student -> coordinator upward form (process_student_upward_evaluation_results):
+# four categories of three questions, 25% each
+STUDENT_UPWARD_CATEGORY_LAYOUT = (
+    (range(1, 4), 0.25),
+    (range(4, 7), 0.25),
+    (range(7, 10), 0.25),
+    (range(10, 13), 0.25),
+)
+
+
+class ScoringEngine:
+    """Score evaluation responses without instantiating model objects."""
+
+    @staticmethod
+    def fetch_ratings(responses, question_count=TOTAL_QUESTIONS):
+        """Return the raw rating labels of a queryset as a list of tuples."""
+        return list(responses.values_list(*QUESTION_FIELDS[:question_count]))
+
+    @staticmethod
+    def rating_matrix(rows, question_count=TOTAL_QUESTIONS, default=1):
+        """
+        Map rating labels to an (n_responses, question_count) int8 matrix.
+        Unknown or empty labels fall back to ``default`` (Poor), matching the
+        ``rating_to_numeric.get(rating, 1)`` behaviour of the old loops.
+        """
+        if not rows:
+            return np.empty((0, question_count), dtype=np.int8)
+
+        labels = np.asarray(rows, dtype=str)
+        # Map each distinct label once, then broadcast back over the matrix
+        unique_labels, inverse = np.unique(labels, return_inverse=True)
+        codes = np.array(
+            [RATING_NUMERIC_MAP.get(label, default) for label in unique_labels],
+            dtype=np.int8
+        )
+        return codes[inverse].reshape(labels.shape)
+
+    @staticmethod
+    def summarize_sums(question_sums, response_count, layout=STUDENT_CATEGORY_LAYOUT, distribution=None):
+        """
+        Turn per-question rating sums into category totals and weighted scores.
+        Shared by the NumPy path and the database aggregation path.
+        """
+        question_sums = [int(total) for total in question_sums]
+        category_totals = []
+        category_scores = []
+
+        for questions, weight in layout:
+            total = sum(question_sums[q - 1] for q in questions)
+            count = response_count * len(questions)
+            category_totals.append(total)
+            if count == 0:
+                category_scores.append(0)
+            else:
+                category_scores.append((total / count) / MAX_RATING_SCORE * weight * 100)
+
+        answered = response_count * len(question_sums)
+        overall_total = sum(question_sums)
+
+        return {
+            'response_count': response_count,
+            'question_sums': question_sums,
+            'category_totals': category_totals,
+            'category_scores': category_scores,
+            'total_percentage': sum(category_scores),
+            'flat_percentage': (overall_total / answered) / MAX_RATING_SCORE * 100 if answered else 0,
+            'average_rating': overall_total / answered if answered else 0,
+            'distribution': [int(count) for count in distribution] if distribution is not None else [0] * MAX_RATING_SCORE,
+        }
+
+    @staticmethod
+    def summarize_matrix(matrix, layout=STUDENT_CATEGORY_LAYOUT):
+        """Score an int8 rating matrix in one vectorized pass."""
+        question_sums = matrix.sum(axis=0, dtype=np.int64)
+        distribution = np.bincount(matrix.ravel(), minlength=MAX_RATING_SCORE + 1)[1:MAX_RATING_SCORE + 1]
+        return ScoringEngine.summarize_sums(question_sums, matrix.shape[0], layout, distribution)
+
+    @staticmethod
+    def score_responses(responses, layout=STUDENT_CATEGORY_LAYOUT, question_count=TOTAL_QUESTIONS):
+        """Fetch, map and score a queryset of responses."""
+        rows = ScoringEngine.fetch_ratings(responses, question_count)
+        matrix = ScoringEngine.rating_matrix(rows, question_count)
+        return ScoringEngine.summarize_matrix(matrix, layout)
@@ -0,0 +1,159 @@
+"""
+Keyword sentiment classifier for evaluation comments.
+
+Classifies a comment as 'positive', 'negative', 'mixed' or 'neutral' with the
+same rules TeachingAIRecommendationService has always used: an indicator
+counts when it appears anywhere in the lower-cased comment (so 'dislike' also
+contains 'like' and reads as mixed). Instead of ~80 substring scans per
+comment, all indicators are folded into one precompiled regex (a prefix trie,
+so the engine never retries shared prefixes) that reports, at every position,
+the longest indicator starting there; indicators hidden inside a longer match
+('abuse' in 'abused') are added from a precomputed table, so the set of
+indicators found is exactly the substring-scan result.
+
+The label and a polarity score are stored on EvaluationResponse and
+IrregularEvaluation when they are saved, so pages read them back instead of
+reclassifying. labelled() classifies only rows saved before that.
+"""
+import re
+
+POSITIVE_INDICATORS = [
+    'excellent', 'great', 'good', 'wonderful', 'amazing', 'helpful',
+    'clear', 'engaging', 'knowledgeable', 'patient', 'friendly',
+    'caring', 'supportive', 'effective', 'love', 'best', 'awesome',
+    'fantastic', 'outstanding', 'brilliant', 'inspiring', 'dedicated',
+    'like', 'enjoyed', 'appreciate', 'thank', 'professional', 'nice',
+    'kind', 'understanding', 'thorough', 'organized', 'well', 'positive'
+]
+
+NEGATIVE_INDICATORS = [
+    'poor', 'bad', 'terrible', 'worst', 'boring', 'confusing',
+    'unclear', 'unfair', 'difficult', 'hard', 'hate', 'dislike',
+    'unprofessional', 'rude', 'unhelpful', 'lazy', 'absent',
+    'disorganized', 'disappointing', 'frustrating', 'inadequate',
+    'abused', 'abuse', 'strict', 'harsh', 'intimidating', 'mean',
+    'slow', 'waste', 'useless', 'horrible', 'awful'
+]
+
+# Mixed/constructive feedback indicators
+MIXED_INDICATORS = [
+    'but', 'however', 'although', 'sometimes', 'though',
+    'could be', 'should be', 'would be better', 'except',
+    'needs', 'improve', 'wish'
+]
+
+SENTIMENT_CHOICES = [
+    ('positive', 'Positive'),
+    ('negative', 'Negative'),
+    ('mixed', 'Mixed'),
+    ('neutral', 'Neutral'),
+]
+
+
+
+def _trie_pattern(words):
+    """Regex source matching any of ``words``, longest first, factored by prefix."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A word ends here: the longer continuations are optional
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+_POSITIVE = frozenset(POSITIVE_INDICATORS)
+_NEGATIVE = frozenset(NEGATIVE_INDICATORS)
+_MIXED = frozenset(MIXED_INDICATORS)
+_ALL_INDICATORS = _POSITIVE | _NEGATIVE | _MIXED
+
+# Zero-width lookahead so matches may overlap
+_PATTERN = re.compile('(?=(' + _trie_pattern(_ALL_INDICATORS) + '))')
+
+# indicator -> every indicator it contains, itself included
+_CONTAINS = {
+    word: frozenset(other for other in _ALL_INDICATORS if other in word)
+    for word in _ALL_INDICATORS
+}
+
+
+class SentimentClassifier:
+    """Classify comments with one compiled pattern over every indicator."""
+
+    @classmethod
+    def indicators(cls, comment):
+        """Set of indicators that occur anywhere in the lower-cased comment."""
+        found = set()
+        for word in set(_PATTERN.findall(comment.lower())):
+            found |= _CONTAINS[word]
+        return found
+
+    @classmethod
+    def classify(cls, comment):
+        """
+        Returns (label, score). ``score`` is the keyword polarity,
+        (positive - negative) / (positive + negative), or 0.0 without any.
+        """
+        if not comment or not isinstance(comment, str):
+            return 'neutral', 0.0
+
+        found = cls.indicators(comment)
+        positive_count = len(found & _POSITIVE)
+        negative_count = len(found & _NEGATIVE)
+        matched = positive_count + negative_count
+        score = round((positive_count - negative_count) / matched, 3) if matched else 0.0
+
+        # If has mixed indicator (like "but"), treat as mixed
+        if found & _MIXED:
+            label = 'mixed'
+        elif positive_count > 0 and negative_count > 0:
+            label = 'mixed'
+        elif positive_count > negative_count:
+            label = 'positive'
+        elif negative_count > positive_count:
+            label = 'negative'
+        else:
+            # If no clear sentiment but has text, treat as mixed for review
+            label = 'mixed' if len(comment.strip()) > 10 else 'neutral'
+        return label, score
+
+    @classmethod
+    def label(cls, comment):
+        return cls.classify(comment)[0]
+
+    @classmethod
+    def classify_many(cls, comments):
+        """
+        Classify a list of comments, returning (label, score) pairs in order.
+        Repeated comments ('none', 'good job') are classified once.
+        """
+        seen = {}
+        results = []
+        for comment in comments:
+            key = comment if isinstance(comment, str) else None
+            if key not in seen:
+                seen[key] = cls.classify(comment)
+            results.append(seen[key])
+        return results
+
+    @classmethod
+    def labelled(cls, rows):
+        """
+        Yield (comment, label) for (comment, stored_label) rows, e.g. from
+        ``values_list('comments', 'comment_sentiment')``. Rows saved before
+        labels were stored are classified in one batch.
+        """
+        rows = list(rows)
+        missing = [comment for comment, stored in rows if stored is None]
+        computed = iter(cls.classify_many(missing))
+        for comment, stored in rows:
+            yield comment, stored if stored is not None else next(computed)[0]
@@ -0,0 +1,203 @@
+"""
+Namespaced, versioned access to the shared cache.
+
+settings.CACHES points at a backend every gunicorn worker can see (file or
+database by default, Redis or locmem by choice, see CACHE_BACKEND). Code caches
+through a CacheNamespace instead of raw keys:
+
+    rankings_cache = CacheNamespace('rankings', timeout=3600, release_scoped=True)
+    table = rankings_cache.get_or_set(f'period:{period.id}', compute, timeout)
+
+Each namespace keeps a version counter in the cache and builds keys as
+``<namespace>:v<version>:<key>``. invalidate() bumps the counter, which orphans
+every key of the namespace at once (old entries simply expire). Namespaces
+marked ``release_scoped`` are all invalidated when an evaluation is released or
+unreleased (see main.signals). Hit/miss counts are kept per process and flushed
+to the shared cache every CACHE_METRICS_FLUSH_INTERVAL seconds.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CacheMetrics:
+    """Per-process hit/miss counters, periodically added to shared totals."""
+
+    _lock = threading.Lock()
+    _pending = defaultdict(int)  # (namespace, 'hits'|'misses') -> count not yet flushed
+    _last_flush = time.monotonic()
+
+    @staticmethod
+    def key(namespace, kind):
+        return f'cache_metrics:{namespace}:{kind}'
+
+    @classmethod
+    def record(cls, cache, namespace, hit):
+        with cls._lock:
+            cls._pending[(namespace, 'hits' if hit else 'misses')] += 1
+            due = time.monotonic() - cls._last_flush >= getattr(settings, 'CACHE_METRICS_FLUSH_INTERVAL', 10)
+        if due:
+            cls.flush(cache)
+
+    @classmethod
+    def flush(cls, cache):
+        with cls._lock:
+            pending, cls._pending = cls._pending, defaultdict(int)
+            cls._last_flush = time.monotonic()
+        for (namespace, kind), count in pending.items():
+            try:
+                _incr(cache, cls.key(namespace, kind), count, None)
+            except Exception as e:
+                # Metrics must never break a request
+                logger.warning(f"Could not flush cache metrics for {namespace}: {str(e)}")
+
+    @classmethod
+    def stats(cls, cache, namespace):
+        """Shared totals plus this process's unflushed counts."""
+        totals = cache.get_many([cls.key(namespace, 'hits'), cls.key(namespace, 'misses')])
+        with cls._lock:
+            hits = totals.get(cls.key(namespace, 'hits'), 0) + cls._pending[(namespace, 'hits')]
+            misses = totals.get(cls.key(namespace, 'misses'), 0) + cls._pending[(namespace, 'misses')]
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups * 100, 1) if lookups else 0.0,
+        }
+
+
+def _incr(cache, key, delta, timeout):
+    # add() is a no-op when the key exists, so incr() only fails if the key
+    # expired in between; fall back to set() in that case
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout)
+        return delta
+
+
+class CacheNamespace:
+    """A group of cache keys that share a prefix, a version and metrics."""
+
+    # name -> CacheNamespace; the app's namespaces are declared at the bottom
+    # of this module so every process (web or run_jobs) knows all of them
+    registry = {}
+
+    def __init__(self, name, timeout=DEFAULT_TIMEOUT, release_scoped=False, alias='default'):
+        self.name = name
+        self.timeout = timeout
+        self.release_scoped = release_scoped
+        self.alias = alias
+        CacheNamespace.registry[name] = self
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def version_key(self):
+        return f'cache_version:{self.name}'
+
+    def version(self):
+        version = self.cache.get(self.version_key)
+        if version is None:
+            # Start from the clock rather than 1: if the counter was evicted,
+            # an old version number must not come back and revive stale keys
+            self.cache.add(self.version_key, int(time.time() * 1000), None)
+            version = self.cache.get(self.version_key)
+        return version
+
+    def make_key(self, key, version=None):
+        """
+        Full cache key. Pass ``version`` (read earlier from version()) to pin
+        a read-compute-write sequence to one version, so a value computed just
+        before an invalidation is never stored under the new version.
+        """
+        return f'{self.name}:v{version or self.version()}:{key}'
+
+    def _timeout(self, timeout):
+        return self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def get(self, key, default=None, version=None):
+        value = self.cache.get(self.make_key(key, version), _MISSING)
+        CacheMetrics.record(self.cache, self.name, hit=value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.cache.set(self.make_key(key, version), value, self._timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        return self.cache.add(self.make_key(key), value, self._timeout(timeout))
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT):
+        """Return the cached value, or compute ``default()`` and cache it."""
+        version = self.version()
+        value = self.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            value = default() if callable(default) else default
+            self.set(key, value, timeout, version=version)
+        return value
+
+    def delete(self, key):
+        self.cache.delete(self.make_key(key))
+
+    def incr(self, key, delta=1, timeout=DEFAULT_TIMEOUT):
+        """Increment a counter, creating it with ``timeout`` on first use."""
+        return _incr(self.cache, self.make_key(key), delta, self._timeout(timeout))
+
+    def invalidate(self):
+        """Drop every key in the namespace by moving to a new version."""
+        self.version()
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            # Evicted between the two calls
+            self.cache.set(self.version_key, int(time.time() * 1000), None)
+        logger.info(f"Invalidated cache namespace '{self.name}'")
+
+    def stats(self):
+        return dict(CacheMetrics.stats(self.cache, self.name), namespace=self.name)
+
+
+class SharedCache:
+    """App-wide operations over all registered namespaces."""
+
+    @staticmethod
+    def namespace(name):
+        return CacheNamespace.registry[name]
+
+    @staticmethod
+    def invalidate_release_scoped():
+        """Invalidate every namespace whose data depends on release state."""
+        for namespace in list(CacheNamespace.registry.values()):
+            if namespace.release_scoped:
+                try:
+                    namespace.invalidate()
+                except Exception as e:
+                    # Runs after the release has committed; don't turn it into an error
+                    logger.error(f"Could not invalidate cache namespace '{namespace.name}': {str(e)}")
+
+    @staticmethod
+    def stats():
+        for namespace in list(CacheNamespace.registry.values()):
+            CacheMetrics.flush(namespace.cache)
+        return [namespace.stats() for namespace in CacheNamespace.registry.values()]
+
+
+# ------------------------------------------------------------------
+# Namespaces used by the app
+# ------------------------------------------------------------------
+rankings_cache = CacheNamespace('rankings', timeout=60 * 60, release_scoped=True)
+rate_limit_cache = CacheNamespace('rate_limit')
+release_state_cache = CacheNamespace('release_state', timeout=None, release_scoped=True)
+request_metrics_cache = CacheNamespace('request_metrics', timeout=None)
@@ -1,12 +1,21 @@
 """
 Signals for the main app
-Handles auto-creation of UserProfile when User is created
+Handles auto-creation of UserProfile when User is created, and invalidation
+of cached data when evaluations are released or unreleased or when a user's
+evaluation inputs change
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile, Role
+from django.utils import timezone
+from .models import (
+    UserProfile, Role, Evaluation, EvaluationPeriod, EvaluationResponse, EvaluationResult,
+    IrregularEvaluation, SectionAssignment, evaluation_state_changed
+)
+from .services.shared_cache import SharedCache
+from .services.profile_dashboard import ProfileDashboardService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -50,3 +59,54 @@ def create_user_profile(sender, instance, created, **kwargs):
         except Exception as e:
             # Log the error but don't raise it - let the view handle transaction rollback
             logger.error(f"Failed to auto-create UserProfile for {instance.username}: {str(e)}", exc_info=True)
+
+
+@receiver(post_save, sender=Evaluation)
+@receiver(post_delete, sender=Evaluation)
+@receiver(post_save, sender=EvaluationPeriod)
+@receiver(post_delete, sender=EvaluationPeriod)
+def evaluation_saved(sender, **kwargs):
+    """Route per-instance writes into evaluation_state_changed."""
+    evaluation_state_changed.send(sender=sender)
+
+
+@receiver(evaluation_state_changed)
+def invalidate_release_scoped_cache(sender, **kwargs):
+    """
+    A release or unrelease changes what every release-scoped cache namespace
+    should return, so move them all to a new version. Deferred until commit so
+    other workers can't re-cache the old state from an uncommitted transaction.
+    """
+    transaction.on_commit(SharedCache.invalidate_release_scoped)
+
+
+@receiver(evaluation_state_changed)
+def invalidate_profile_dashboards(sender, **kwargs):
+    """
+    Release and period changes can move every user's "latest completed period",
+    so every dashboard snapshot goes stale. Snapshots rebuilt later in the same
+    transaction (result processing on unrelease) are kept.
+    """
+    changed_at = timezone.now()
+    transaction.on_commit(lambda: ProfileDashboardService.invalidate_all(built_before=changed_at))
+
+
+# No post_delete receivers on the response models or EvaluationResult: they
+# would stop Django from fast-deleting them, turning every bulk delete (and
+# every period or user cascade) into queries per row. Their bulk paths fix
+# dashboards and running aggregates once per batch instead
+# (ResponseDeletionService, EvaluationResultWriter, HistoryArchiveService).
+@receiver(post_save, sender=EvaluationResponse)
+@receiver(post_save, sender=IrregularEvaluation)
+def evaluation_response_changed(sender, instance, **kwargs):
+    """A response about a user changes their dashboard scores and comments."""
+    ProfileDashboardService.invalidate_user(instance.evaluatee_id)
+
+
+@receiver(post_save, sender=EvaluationResult)
+@receiver(post_save, sender=SectionAssignment)
+@receiver(post_delete, sender=SectionAssignment)
+def dashboard_input_changed(sender, instance, **kwargs):
+    """Results and section assignments decide which sections a dashboard shows."""
+    ProfileDashboardService.invalidate_user(instance.user_id)
+
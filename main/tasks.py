@@ -0,0 +1,95 @@
+"""
+Background tasks run by the `run_jobs` worker.
+
+Each task receives the BackgroundJob plus its JSON payload and returns a small
+JSON-serializable summary. Tasks must be safe to run again after a crash:
+archiving and result processing upsert, so a retry converges on the same rows.
+Failures must raise, so the job is retried and finally marked failed; the
+view-level wrappers that log and return 0 are not used here.
+"""
+import logging
+
+from main.models import EvaluationPeriod
+from main.services.history_archive_service import HistoryArchiveService
+from main.services.job_queue import task, JobQueueService
+
+logger = logging.getLogger(__name__)
+
+
+@task('archive_results')
+def archive_results(job):
+    """Move every current EvaluationResult to EvaluationHistory (run on release)."""
+    JobQueueService.set_progress(job, 10, 'Archiving current results to history')
+    stats = HistoryArchiveService.archive()
+    return {'archived_count': stats['archived_count']}
+
+
+@task('archive_periods')
+def archive_periods(job, period_ids):
+    """Archive the results of specific ended periods (run by release-all)."""
+    archived_count = 0
+    periods = list(EvaluationPeriod.objects.filter(id__in=period_ids))
+    for index, period in enumerate(periods):
+        JobQueueService.set_progress(job, index * 100 / len(periods), f'Archiving {period.name}')
+        archived_count += HistoryArchiveService.archive_period(period)['archived_count']
+    return {'archived_count': archived_count, 'periods': len(periods)}
+
+
+@task('process_results')
+def process_results(job, period_id, processor=None):
+    """
+    Turn a finished period's responses into EvaluationResult rows.
+    ``processor`` defaults to the period's evaluation type; 'student_all' uses
+    process_all_evaluation_results (the release-all / unrelease-all path).
+    """
+    from main import views
+
+    processors = {
+        'student': views.process_evaluation_period_to_results,
+        'student_all': views.process_all_evaluation_results,
+        'peer': views.process_peer_evaluation_results,
+        'upward': views.process_upward_evaluation_results,
+        'dean': views.process_dean_evaluation_results,
+        'student_upward': views.process_student_upward_evaluation_results,
+    }
+
+    period = EvaluationPeriod.objects.get(id=period_id)
+    processor = processor or period.evaluation_type
+    JobQueueService.set_progress(job, 10, f'Processing results for {period.name}')
+
+    if processor == 'student':
+        processed_count = processors['student'](period, raise_errors=True)
+        return {'success': True, 'processed_count': processed_count, 'period': period.name}
+
+    outcome = processors[processor](evaluation_period=period)
+    if not outcome.get('success'):
+        # Raise so the job is retried and the failure is visible to admins
+        raise RuntimeError(outcome.get('error', f'Processing {processor} results failed'))
+    return {'success': True, 'processed_count': outcome.get('processed_count', 0), 'period': period.name}
+
+
+@task('send_evaluation_emails')
+def send_evaluation_emails(job, evaluation_type, released=True):
+    """Send the release or closing notification for an evaluation type."""
+    from main.email_service import EvaluationEmailService
+
+    JobQueueService.set_progress(job, 10, 'Sending notification emails')
+    if released:
+        email_result = EvaluationEmailService.send_evaluation_released_notification(evaluation_type)
+    else:
+        email_result = EvaluationEmailService.send_evaluation_unreleased_notification(evaluation_type)
+    return {
+        'sent_count': email_result.get('sent_count', 0),
+        'failed_count': len(email_result.get('failed_emails', [])),
+        'message': email_result.get('message', ''),
+    }
+
+
+@task('generate_ai_recommendations')
+def generate_ai_recommendations(job, period_id, concurrency=None):
+    """Pre-generate AI recommendations for a finished period."""
+    from main.services.ai_recommendation_batch import AIRecommendationBatchService
+
+    period = EvaluationPeriod.objects.get(id=period_id)
+    JobQueueService.set_progress(job, 10, f'Generating AI recommendations for {period.name}')
+    return AIRecommendationBatchService.generate(period, concurrency=concurrency)
@@ -68,12 +68,18 @@ urlpatterns = [
     path('remove-section-assignment/<int:assignment_id>/', views.remove_section_assignment, name='remove-section-assignment'),
     path('api/ai-recommendations/', views.AIRecommendationsAPIView.as_view(), name='ai_recommendations'),
     path('api/student-comments/', views.StudentCommentsAPIView.as_view(), name='student_comments'),
+    path('api/profile-dashboard/<str:tab>/', views.api_profile_dashboard, name='api_profile_dashboard'),
     path('api/evaluation-history/', views.api_evaluation_history, name='api_evaluation_history'),
+    path('api/jobs/', views.api_job_status, name='api_job_status'),
+    path('api/jobs/<int:job_id>/', views.api_job_status, name='api_job_status_detail'),
+    path('api/evaluation-history/timeline/', views.api_evaluation_history_timeline, name='api_evaluation_history_timeline'),
     path('api/evaluation-history/<int:history_id>/', views.api_evaluation_history_detail, name='api_evaluation_history_detail'),
     path('api/evaluation-history/period/<int:period_id>/', views.api_evaluation_history_by_period, name='api_evaluation_history_by_period'),
     path('admin-control/', views.admin_evaluation_control, name='admin_control'),
     path('manage-evaluations/', views.manage_evaluations, name='manage_evaluations'),
     path('activity-logs/', views.admin_activity_logs, name='activity_logs'),
+    path('request-metrics/', views.admin_request_metrics, name='request_metrics'),
+    path('api/request-metrics/', views.api_request_metrics, name='api_request_metrics'),
     path('process-results/', views.process_results, name='process_results'),
     path('reset-failures/', views.reset_failures, name='reset_failures'),
     path('reset-selected-failures/', views.reset_selected_failures, name='reset_selected_failures'),
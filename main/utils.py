@@ -1,4 +1,5 @@
-from .models import Evaluation, AdminActivityLog
+from .models import AdminActivityLog
+from .services.release_state import ReleaseStateRegistry
 
 def can_view_evaluation_results(evaluation_type='student'):
     """
@@ -6,10 +7,7 @@ def can_view_evaluation_results(evaluation_type='student'):
     Users can only see results when evaluations are UNRELEASED
     """
     try:
-        is_released = Evaluation.objects.filter(
-            is_released=True, 
-            evaluation_type=evaluation_type
-        ).exists()
+        is_released = ReleaseStateRegistry.is_released(evaluation_type)
         return not is_released  # Can view results when NOT released
     except Exception:
         # If there's any error, default to allowing view (safe fallback)
@@ -21,10 +19,7 @@ def is_evaluation_period_active(evaluation_type='student'):
     Evaluation period is active when forms are RELEASED
     """
     try:
-        return Evaluation.objects.filter(
-            is_released=True, 
-            evaluation_type=evaluation_type
-        ).exists()
+        return ReleaseStateRegistry.is_released(evaluation_type)
     except Exception:
         # If there's any error, default to inactive (safe fallback)
         return False
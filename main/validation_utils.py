@@ -20,13 +20,15 @@ class AccountValidator:
     PASSWORD_SPECIAL_CHARS = '!@#$%^&*()_+-=[]{}|;:,.<>?'
     
     @staticmethod
-    def validate_username(username, exclude_user_id=None):
+    def validate_username(username, exclude_user_id=None, check_unique=True):
         """
         Validate username format and uniqueness.
         
         Args:
             username: Username to validate
             exclude_user_id: User ID to exclude from duplicate check (for updates)
+            check_unique: Set False when the caller checks uniqueness itself
+                          (e.g. the bulk importer's preloaded lookups)
             
         Returns:
             tuple: (is_valid, error_message)
@@ -45,6 +47,9 @@ class AccountValidator:
         if not AccountValidator.USERNAME_PATTERN.match(username):
             return False, "Username can only contain letters, numbers, dots, hyphens, and underscores"
         
+        if not check_unique:
+            return True, ""
+        
         # Check for duplicates (excluding current user if updating)
         query = User.objects.filter(username=username)
         if exclude_user_id:
@@ -56,13 +61,14 @@ class AccountValidator:
         return True, ""
     
     @staticmethod
-    def validate_email(email, exclude_user_id=None):
+    def validate_email(email, exclude_user_id=None, check_unique=True):
         """
         Validate email format and uniqueness.
         
         Args:
             email: Email to validate
             exclude_user_id: User ID to exclude from duplicate check (for updates)
+            check_unique: Set False when the caller checks uniqueness itself
             
         Returns:
             tuple: (is_valid, error_message)
@@ -78,6 +84,9 @@ class AccountValidator:
         if len(email) > 254:
             return False, "Email is too long (max 254 characters)"
         
+        if not check_unique:
+            return True, ""
+        
         # Check for duplicates (excluding current user if updating)
         query = User.objects.filter(email=email)
         if exclude_user_id:
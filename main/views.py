@@ -5,10 +5,10 @@ from django.db import transaction
 from django.core.paginator import Paginator
 import openai
 from .models import EvaluationComment, EvaluationPeriod, EvaluationResult, UserProfile, Role, AiRecommendation, EvaluationHistory
-from django.http import HttpResponseForbidden, JsonResponse
+from django.http import FileResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, condition
 from django.utils.decorators import method_decorator
 from django.contrib import messages
 from django.contrib.auth.hashers import make_password
@@ -21,13 +21,33 @@ from django.contrib.auth.decorators import login_required
 from openai import OpenAI
 import google.generativeai as genai
 from django.conf import settings
+import hashlib
 import json
 import logging
 import time
 from .ai_service import TeachingAIRecommendationService
-from .decorators import evaluation_results_required, profile_settings_allowed
+from .decorators import evaluation_results_required, profile_settings_allowed, revalidate_privately
 from .utils import log_admin_activity, can_view_evaluation_results
 from main.services.evaluation_service import EvaluationService
+from main.services.evaluation_cycle import EvaluationCycleService
+from main.services.scoring_engine import (
+    ScoringEngine, STUDENT_CATEGORY_LAYOUT, PERIOD_RESULTS_CATEGORY_LAYOUT, STUDENT_UPWARD_CATEGORY_LAYOUT,
+)
+from main.services.score_aggregation import ScoreAggregationService
+from main.services.evaluation_aggregate import EvaluationAggregateService, RESPONSE_TYPES
+from main.services.evaluation_submission import EvaluationSubmissionService, SubmissionError
+from main.services.ranking_service import RankingService
+from main.services.results_writer import EvaluationResultWriter
+from main.services.response_deletion import ResponseDeletionService
+from main.services.history_archive_service import HistoryArchiveService
+from main.services.history_timeline import HistoryTimelineService
+from main.services.ai_cache import AIRecommendationCacheService
+from main.services.profile_dashboard import ProfileDashboardService
+from main.services.release_state import ReleaseStateRegistry
+from main.services.report_artifacts import ReportArtifactStore
+from main.services.sentiment import SentimentClassifier
+from main.services.job_queue import JobQueueService
+from main.services.request_metrics import RequestMetrics
 from .validation_utils import AccountValidator
 from .email_service import EvaluationEmailService
 
@@ -42,71 +62,13 @@ except Exception as e:
     client = None
 
 
-def calculate_user_ranking(user):
+def calculate_user_ranking(user, evaluation_period=None):
     """
     Calculate the ranking of a user within their institute and role based on overall evaluation results.
+    Rankings for a period are computed once (single window-function query) and then looked up.
     Returns: dict with 'rank', 'total_users', 'overall_score'
     """
-    from django.db.models import Avg, Count
-    from django.utils import timezone
-    
-    user_profile = user.userprofile
-    user_role = user_profile.role
-    user_institute = user_profile.institute
-    
-    # Get the most recent INACTIVE period that has ended
-    latest_period = EvaluationPeriod.objects.filter(
-        evaluation_type='student',
-        is_active=False,
-        end_date__lte=timezone.now()
-    ).order_by('-end_date').first()
-    
-    if not latest_period:
-        return {'rank': None, 'total_users': 0, 'overall_score': 0}
-    
-    # Get all users with the same role and institute
-    users_in_group = User.objects.filter(
-        userprofile__role=user_role,
-        userprofile__institute=user_institute
-    )
-    
-    # Calculate overall scores for each user in the group
-    user_scores = []
-    for u in users_in_group:
-        results = EvaluationResult.objects.filter(
-            user=u,
-            evaluation_period=latest_period
-        )
-        
-        if results.exists():
-            # Calculate average total_percentage across all sections
-            avg_score = results.aggregate(Avg('total_percentage'))['total_percentage__avg']
-            if avg_score:
-                user_scores.append({
-                    'user_id': u.id,
-                    'score': round(avg_score, 2)
-                })
-    
-    if not user_scores:
-        return {'rank': None, 'total_users': 0, 'overall_score': 0}
-    
-    # Sort by score descending (highest score = rank 1)
-    user_scores.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Find current user's rank
-    current_user_score = None
-    rank = None
-    for idx, score_data in enumerate(user_scores, 1):
-        if score_data['user_id'] == user.id:
-            rank = idx
-            current_user_score = score_data['score']
-            break
-    
-    return {
-        'rank': rank,
-        'total_users': len(user_scores),
-        'overall_score': current_user_score if current_user_score else 0
-    }
+    return RankingService.get_user_ranking(user, evaluation_period)
 
 
     
@@ -369,8 +331,7 @@ class UpdateUser(View):
                                 
                                     # Delete all evaluations
                                     total_deleted = evaluator_count + evaluatee_count
-                                    evaluations_as_evaluator.delete()
-                                    evaluations_as_evaluatee.delete()
+                                    ResponseDeletionService.delete(evaluations_as_evaluator, evaluations_as_evaluatee)
                                 
                                     
                                 else:
@@ -410,8 +371,7 @@ class UpdateUser(View):
                             evaluatee_count = evaluations_as_evaluatee.count()
                         
                             total_deleted = evaluator_count + evaluatee_count
-                            evaluations_as_evaluator.delete()
-                            evaluations_as_evaluatee.delete()
+                            ResponseDeletionService.delete(evaluations_as_evaluator, evaluations_as_evaluatee)
                         
                             
                     
@@ -468,7 +428,6 @@ class UpdateUser(View):
                                 student_section=section_code
                             )
                             evaluatee_count = evaluations_as_evaluatee.count()
-                            evaluations_as_evaluatee.delete()
                         
                             # Delete evaluations where this staff is the EVALUATOR in this section
                             evaluations_as_evaluator = EvaluationResponse.objects.filter(
@@ -476,7 +435,7 @@ class UpdateUser(View):
                                 student_section=section_code
                             )
                             evaluator_count = evaluations_as_evaluator.count()
-                            evaluations_as_evaluator.delete()
+                            ResponseDeletionService.delete(evaluations_as_evaluatee, evaluations_as_evaluator)
                         
                             total_evaluations_deleted += evaluatee_count + evaluator_count
                             
@@ -511,7 +470,6 @@ class UpdateUser(View):
                                     student_section=section_code
                                 )
                                 evaluatee_count = evaluations_as_evaluatee.count()
-                                evaluations_as_evaluatee.delete()
                             
                                 # Delete evaluations where this staff is the EVALUATOR in this section
                                 evaluations_as_evaluator = EvaluationResponse.objects.filter(
@@ -519,7 +477,7 @@ class UpdateUser(View):
                                     student_section=section_code
                                 )
                                 evaluator_count = evaluations_as_evaluator.count()
-                                evaluations_as_evaluator.delete()
+                                ResponseDeletionService.delete(evaluations_as_evaluatee, evaluations_as_evaluator)
                             
                                 total_evaluations_deleted += evaluatee_count + evaluator_count
                                 
@@ -598,6 +556,9 @@ class SelectStudentView(View):
     def delete(self, request, user_Id):
         user = get_object_or_404(User, id=user_Id)
 
+        # Responses first, so the aggregates of other evaluatees are rebuilt
+        ResponseDeletionService.delete_user_responses(user)
+
         # Deleting the user account
         user.delete()
 
@@ -688,10 +649,15 @@ class FacultyOnlyView(View):
             else:
                 return HttpResponseForbidden("You do not have permission to access this page.")
             
-            # Calculate rankings for all faculty members
+            # Calculate rankings for all faculty members from the precomputed period table
+            ranking_period = RankingService.latest_completed_period()
+            ranking_table = RankingService.rankings_for_period(ranking_period) if ranking_period else None
             faculty_rankings = []
             for faculty in faculties_list:
-                ranking_data = calculate_user_ranking(faculty.user)
+                if ranking_table:
+                    ranking_data = RankingService.lookup(ranking_table, faculty.user_id, faculty.institute, faculty.role)
+                else:
+                    ranking_data = dict(RankingService.EMPTY_RANKING)
                 faculty_rankings.append({
                     'profile': faculty,
                     'rank': ranking_data.get('rank'),
@@ -751,10 +717,24 @@ class FacultyRankingsView(View):
             # Get all faculty members
             all_faculty = UserProfile.objects.filter(role=Role.FACULTY).select_related('user')
 
-            # Calculate rankings for all faculty
+            # Rankings of a finished period are read from its snapshot; default to the latest one
+            ranking_periods = EvaluationPeriod.objects.filter(
+                evaluation_type='student',
+                is_active=False
+            ).order_by('-end_date')
+            ranking_period = None
+            selected_period_id = request.GET.get('period')
+            if selected_period_id and selected_period_id.isdigit():
+                ranking_period = ranking_periods.filter(id=selected_period_id).first()
+            if not ranking_period:
+                ranking_period = RankingService.latest_completed_period()
+            ranking_table = RankingService.rankings_for_period(ranking_period) if ranking_period else None
             faculty_rankings = []
             for faculty in all_faculty:
-                ranking_data = calculate_user_ranking(faculty.user)
+                if ranking_table:
+                    ranking_data = RankingService.lookup(ranking_table, faculty.user_id, faculty.institute, faculty.role)
+                else:
+                    ranking_data = dict(RankingService.EMPTY_RANKING)
                 faculty_rankings.append({
                     'profile': faculty,
                     'rank': ranking_data.get('rank'),
@@ -782,6 +762,8 @@ class FacultyRankingsView(View):
             context = {
                 'user_profile': user_profile,
                 'rankings_by_institute': rankings_by_institute,
+                'ranking_period': ranking_period,
+                'ranking_periods': ranking_periods,
             }
             return render(request, 'main/faculty_rankings.html', context)
 
@@ -886,9 +868,8 @@ class DeleteAccountView(View):
                 # Evaluation uses 'evaluator' field
                 Evaluation.objects.filter(evaluator=user).delete()
                 
-                # EvaluationResponse uses 'evaluator' and 'evaluatee' fields
-                EvaluationResponse.objects.filter(evaluator=user).delete()
-                EvaluationResponse.objects.filter(evaluatee=user).delete()
+                # Every response type, written by or about the user (rebuilds their periods' aggregates once)
+                ResponseDeletionService.delete_user_responses(user)
                 
                 # EvaluationResult uses 'user' field
                 EvaluationResult.objects.filter(user=user).delete()
@@ -1043,14 +1024,45 @@ class EvaluationConfigView(View):
             'evaluation_period_ended': not student_evaluation_released,  # Add this
         }
         return render(request, 'main/evaluationconfig.html', context)
+def queue_release_side_effects(request, evaluation_type, period, released):
+    """
+    Queue the slow part of a release/unrelease as background jobs instead of
+    running it inside the request: archiving the previous results (release) or
+    processing the period's results (unrelease), then the notification emails.
+    Returns the queued jobs as dicts for the JSON response.
+    """
+    if released:
+        work_job = JobQueueService.enqueue(
+            'archive_results',
+            dedupe_key=f'archive_results:{period.id}',
+            user=request.user
+        )
+    else:
+        work_job = JobQueueService.enqueue(
+            'process_results',
+            {'period_id': period.id},
+            dedupe_key=f'process_results:{period.id}',
+            user=request.user
+        )
+    # Emails are not idempotent, so they are attempted once
+    email_job = JobQueueService.enqueue(
+        'send_evaluation_emails',
+        {'evaluation_type': evaluation_type, 'released': released},
+        dedupe_key=f"emails:{'released' if released else 'unreleased'}:{period.id}",
+        user=request.user,
+        max_attempts=1
+    )
+    return [JobQueueService.to_dict(work_job), JobQueueService.to_dict(email_job)]
+
 # Update your release/unrelease functions to return better messages
 def release_student_evaluation(request):
     """
     NEW FLOW: When admin clicks release (starts new evaluation):
-    1. Move old EvaluationResult records to EvaluationHistory (archive previous results)
-    2. Create new EvaluationPeriod with is_active=True
-    3. Create/update Evaluation record with evaluator='students' and link to period
-    4. Students can now evaluate
+    1. Create new EvaluationPeriod with is_active=True
+    2. Create/update Evaluation record with evaluator='students' and link to period
+    3. Students can now evaluate
+    4. Queue background jobs that move old EvaluationResult records to
+       EvaluationHistory and send the notification emails
     """
     logger.debug("release_student_evaluation called")
     logger.debug(f"Request method: {request.method}")
@@ -1069,24 +1081,19 @@ def release_student_evaluation(request):
                 logger.info("Attempting to release evaluation when period is already active")
                 return JsonResponse({'success': False, 'error': "Student evaluation is already released."})
 
-            # STEP 1: Move current EvaluationResult records to EvaluationHistory
-            # This moves old results from profile settings to history when starting new evaluation
-            logger.info("Moving current EvaluationResult records to history...")
-            archived_count = move_current_results_to_history()
-            logger.info(f"Moved {archived_count} results to evaluation history")
-            
-            # STEP 2: Create a new active evaluation period with unique name
+            # STEP 1: Create a new active evaluation period with unique name
             period_timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
             new_period = EvaluationPeriod.objects.create(
                 name=f"Student Evaluation {period_timestamp}",
                 evaluation_type='student',
                 start_date=timezone.now(),
                 end_date=timezone.now() + timezone.timedelta(days=30),
-                is_active=True
+                is_active=True,
+                cycle=EvaluationCycleService.for_release('student')
             )
             logger.info(f"Created new evaluation period: {new_period.name}")
 
-            # STEP 3: Create or update Evaluation record with evaluator='students'
+            # STEP 2: Create or update Evaluation record with evaluator='students'
             evaluation, created = Evaluation.objects.update_or_create(
                 evaluation_type='student',
                 defaults={
@@ -1098,40 +1105,22 @@ def release_student_evaluation(request):
             action = "Created" if created else "Updated"
             logger.info(f"{action} student evaluation record with evaluator='students'")
 
+            # STEP 3: Archive previous results and send emails in the background
+            jobs = queue_release_side_effects(request, 'student', new_period, released=True)
+            
             log_admin_activity(
                 request=request,
                 action='release_evaluation',
-                description=f"Started new evaluation period '{new_period.name}'. Previous results ({archived_count} records) moved to history."
+                description=f"Started new evaluation period '{new_period.name}'. Previous results queued for archiving to history."
             )
             
-            # Send email notifications asynchronously (won't block response)
-            email_notification = {'sent': 0, 'failed': 0, 'message': 'Emails are being sent in background'}
-            try:
-                import threading
-                def send_emails_background():
-                    try:
-                        logger.info("Background: Sending email notifications about evaluation release")
-                        email_result = EvaluationEmailService.send_evaluation_released_notification('student')
-                        logger.info(f"Background: Email notification result: {email_result}")
-                    except Exception as e:
-                        logger.error(f"Background: Email notification failed: {e}")
-                
-                # Start email sending in background thread
-                email_thread = threading.Thread(target=send_emails_background, daemon=True)
-                email_thread.start()
-                logger.info("Email notification thread started in background")
-            except Exception as e:
-                logger.error(f"Failed to start email thread: {e}")
-                email_notification['message'] = 'Email notification skipped due to error'
-            
             response_data = {
                 'success': True,
-                'message': f'New evaluation period started: {new_period.name}. Previous results ({archived_count} records) moved to evaluation history. Students can now evaluate.',
+                'message': f'New evaluation period started: {new_period.name}. Previous results are being moved to evaluation history in the background. Students can now evaluate.',
                 'student_evaluation_released': True,
                 'evaluation_period_ended': False,
-                'results_archived': archived_count,
                 'new_period': new_period.name,
-                'email_notification': email_notification
+                'jobs': jobs
             }
             logger.debug(f"Returning success: {response_data}")
             return JsonResponse(response_data)
@@ -1144,164 +1133,25 @@ def release_student_evaluation(request):
     return JsonResponse({'success': False, 'error': 'Invalid request'})
 
 
-def generate_and_save_ai_recommendations_for_period(period):
+def generate_and_save_ai_recommendations_for_period(period, concurrency=None):
     """
     Generate and save AI recommendations for all users who have evaluation results in this period
     Called when a period ends (unrelease) to preserve AI recommendations for history
+    Runs up to `concurrency` AI requests at once (AI_RECOMMENDATION_CONCURRENCY by default)
     """
-    from main.models import EvaluationResult, AiRecommendation, SectionAssignment
-    from main.services.teaching_ai_service import TeachingAIRecommendationService
-    
-    ai_service = TeachingAIRecommendationService()
-    recommendations_saved = 0
-    
-    # Get all unique users who have results in this period
-    users_with_results = EvaluationResult.objects.filter(
-        evaluation_period=period
-    ).values_list('user', flat=True).distinct()
-    
-    for user_id in users_with_results:
-        try:
-            user = User.objects.get(id=user_id)
-            
-            # Get user's assigned sections
-            assigned_sections = SectionAssignment.objects.filter(user=user).select_related('section')
-            
-            # Get results for each section
-            for assignment in assigned_sections:
-                section = assignment.section
-                section_code = section.code
-                
-                # Get evaluation result for this section
-                try:
-                    result = EvaluationResult.objects.get(
-                        user=user,
-                        section=section,
-                        evaluation_period=period
-                    )
-                    
-                    # Prepare section data for AI recommendations
-                    section_data = {
-                        'has_data': True,
-                        'category_scores': [
-                            result.category_a_score,
-                            result.category_b_score,
-                            result.category_c_score,
-                            result.category_d_score
-                        ],
-                        'total_percentage': result.total_percentage,
-                        'evaluation_count': result.total_responses,
-                        'positive_comments': [],
-                        'negative_comments': [],
-                        'mixed_comments': [],
-                        'question_scores': []
-                    }
-                    
-                    # Calculate individual question scores from responses
-                    responses = EvaluationResponse.objects.filter(
-                        evaluatee=user,
-                        student_section=section_code,
-                        evaluation_period=period
-                    )
-                    
-                    if responses.exists():
-                        # Get all question fields (q1 through q19)
-                        question_fields = [f'q{i}' for i in range(1, 20)]
-                        question_texts = {
-                            'q1': 'Demonstrates mastery of the subject matter',
-                            'q2': 'Draws and shares conclusions from relevant experiences',
-                            'q3': 'Integrates subject with relevant disciplines',
-                            'q4': 'Organizes subject matter effectively',
-                            'q5': 'Provides relevant and updated references',
-                            'q6': 'Maintains discipline in the classroom',
-                            'q7': 'Holds interest of students throughout the period',
-                            'q8': 'Manages classroom interactions effectively',
-                            'q9': 'Starts and ends class on time',
-                            'q10': 'Demonstrates leadership and professionalism',
-                            'q11': 'Comes to class prepared',
-                            'q12': 'Complies with course requirements',
-                            'q13': 'Returns checked tests/assignments on time',
-                            'q14': 'Shows mastery in using educational technology',
-                            'q15': 'Explains concepts clearly',
-                            'q16': 'Shows enthusiasm in teaching',
-                            'q17': 'Encourages participation and discussion',
-                            'q18': 'Demonstrates fairness in grading',
-                            'q19': 'Overall teaching effectiveness'
-                        }
-                        
-                        for field in question_fields:
-                            # Calculate average for this question
-                            scores = responses.values_list(field, flat=True)
-                            valid_scores = [s for s in scores if s is not None and s > 0]
-                            if valid_scores:
-                                avg_score = sum(valid_scores) / len(valid_scores)
-                                percentage = (avg_score / 5.0) * 100
-                                section_data['question_scores'].append({
-                                    'question': question_texts.get(field, field),
-                                    'score': round(avg_score, 2),
-                                    'percentage': round(percentage, 1)
-                                })
-                    
-                    # Get comments for this section
-                    comments = EvaluationResponse.objects.filter(
-                        evaluatee=user,
-                        student_section=section_code,
-                        evaluation_period=period,
-                        comments__isnull=False
-                    ).exclude(comments='').values_list('comments', flat=True)
-                    
-                    # Categorize comments
-                    for comment in comments:
-                        sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
-                        if sentiment == 'positive':
-                            section_data['positive_comments'].append(comment)
-                        elif sentiment == 'negative':
-                            section_data['negative_comments'].append(comment)
-                        elif sentiment == 'mixed':
-                            section_data['mixed_comments'].append(comment)
-                    
-                    # Generate AI recommendations for this section
-                    recommendations = ai_service.get_recommendations(
-                        user=user,
-                        section_data=section_data,
-                        section_code=section_code,
-                        role=user.userprofile.role if hasattr(user, 'userprofile') else "Faculty"
-                    )
-                    
-                    # Save recommendations to database
-                    if recommendations and isinstance(recommendations, list):
-                        for rec in recommendations:
-                            if isinstance(rec, dict):
-                                AiRecommendation.objects.create(
-                                    user=user,
-                                    evaluation_period=period,
-                                    title=str(rec.get('title', '')[:255]),
-                                    description=rec.get('description', ''),
-                                    priority=rec.get('priority', ''),
-                                    reason=rec.get('reason', ''),
-                                    recommendation=rec.get('description', ''),
-                                    evaluation_type='student',
-                                    section_code=section_code
-                                )
-                                recommendations_saved += 1
-                                
-                except EvaluationResult.DoesNotExist:
-                    # No result for this section, skip
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"Error generating AI recommendations for user {user_id}: {str(e)}")
-            continue
+    from main.services.ai_recommendation_batch import AIRecommendationBatchService
     
-    return recommendations_saved
+    stats = AIRecommendationBatchService.generate(period, concurrency=concurrency)
+    return stats['saved_count']
 
 
 def unrelease_student_evaluation(request):
     """
     NEW FLOW: When admin clicks unrelease (ends evaluation):
-    1. Process evaluation responses into EvaluationResult (visible in profile settings)
+    1. Set Evaluation.is_released=False
     2. Set EvaluationPeriod to is_active=False
-    3. Set Evaluation.is_released=False
+    3. Queue a background job that processes evaluation responses into
+       EvaluationResult (visible in profile settings), plus the closing emails
     4. Results stay in EvaluationResult until next release moves them to history
     """
     if request.method == 'POST':
@@ -1322,57 +1172,32 @@ def unrelease_student_evaluation(request):
             evaluations = Evaluation.objects.filter(evaluation_type='student')
             evaluations.update(is_released=False)
 
-            # Process the period
-            # STEP 1: Process all evaluation responses from this period into EvaluationResult
-            # This makes results visible in profile settings
-            logger.info(f"Processing evaluation results for period: {active_period.name}")
-            processed_count = process_evaluation_period_to_results(active_period)
-            logger.info(f"Processed {processed_count} evaluation results")
-            
-            # STEP 2: Deactivate the evaluation period (set is_active=False)
+            # STEP 1: Deactivate the evaluation period (set is_active=False)
             active_period.is_active = False
             active_period.end_date = timezone.now()
             active_period.save()
             logger.info(f"Deactivated evaluation period: {active_period.name}")
-            logger.info(f"Results are now visible in profile settings (EvaluationResult table)")
+            
+            # STEP 2: Process responses into EvaluationResult and send emails in the background
+            jobs = queue_release_side_effects(request, 'student', active_period, released=False)
+            logger.info(f"Queued result processing for period: {active_period.name}")
             
             # Log admin activity
             log_admin_activity(
                 request=request,
                 action='unrelease_evaluation',
-                description=f"Ended student evaluation period '{active_period.name}'. Processed {processed_count} results now visible in profile settings."
+                description=f"Ended student evaluation period '{active_period.name}'. Results queued for processing."
             )
             
-            # Send email notifications asynchronously (won't block response)
-            email_notification = {'sent': 0, 'failed': 0, 'message': 'Emails are being sent in background'}
-            try:
-                import threading
-                def send_emails_background():
-                    try:
-                        logger.info("Background: Sending email notifications about evaluation close")
-                        email_result = EvaluationEmailService.send_evaluation_unreleased_notification('student')
-                        logger.info(f"Background: Email notification result: {email_result}")
-                    except Exception as e:
-                        logger.error(f"Background: Email notification failed: {e}")
-                
-                # Start email sending in background thread
-                email_thread = threading.Thread(target=send_emails_background, daemon=True)
-                email_thread.start()
-                logger.info("Email notification thread started in background")
-            except Exception as e:
-                logger.error(f"Failed to start email thread: {e}")
-                email_notification['message'] = 'Email notification skipped due to error'
-            
-            message = f'Student evaluation period "{active_period.name}" has ended. Results processed for {processed_count} staff members and are now visible in profile settings.'
+            message = f'Student evaluation period "{active_period.name}" has ended. Results are being processed in the background and will appear in profile settings shortly.'
             
             return JsonResponse({
                 'success': True,
                 'message': message,
-                'processed_count': processed_count,
                 'student_evaluation_released': False,
                 'evaluation_period_ended': True,
                 'period_name': active_period.name,
-                'email_notification': email_notification
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Error in unrelease_student_evaluation: {str(e)}", exc_info=True)
@@ -1389,9 +1214,10 @@ def unrelease_student_evaluation(request):
 def release_peer_evaluation(request):
     """
     NEW FLOW for peer evaluation release:
-    1. Move old EvaluationResult records to EvaluationHistory
-    2. Create new EvaluationPeriod with is_active=True
-    3. Create/update Evaluation record with evaluator='peer'
+    1. Create new EvaluationPeriod with is_active=True
+    2. Create/update Evaluation record with evaluator='peer'
+    3. Queue background jobs that move old EvaluationResult records to
+       EvaluationHistory and send the notification emails
     """
     if request.method == 'POST':
         try:
@@ -1406,23 +1232,19 @@ def release_peer_evaluation(request):
                     'error': "Peer evaluation is already released."
                 })
 
-            # STEP 1: Move current EvaluationResult records to EvaluationHistory
-            logger.info("Moving current peer EvaluationResult records to history...")
-            archived_count = move_current_results_to_history()
-            logger.info(f"Moved {archived_count} results to evaluation history")
-
-            # STEP 2: Create new active evaluation period with unique name
+            # STEP 1: Create new active evaluation period with unique name
             period_timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
             evaluation_period = EvaluationPeriod.objects.create(
                 name=f"Peer Evaluation {period_timestamp}",
                 evaluation_type='peer',
                 start_date=timezone.now(),
                 end_date=timezone.now() + timezone.timedelta(days=30),
-                is_active=True
+                is_active=True,
+                cycle=EvaluationCycleService.for_release('peer')
             )
             logger.info(f"Created new peer evaluation period: {evaluation_period.name}")
 
-            # STEP 3: Create or update Evaluation record with evaluator='peer'
+            # STEP 2: Create or update Evaluation record with evaluator='peer'
             evaluation, created = Evaluation.objects.update_or_create(
                 evaluation_type='peer',
                 defaults={
@@ -1434,33 +1256,16 @@ def release_peer_evaluation(request):
             action = "Created" if created else "Updated"
             logger.info(f"{action} peer evaluation record with evaluator='peer'")
 
-            # Send email notifications asynchronously
-            email_notification = {'sent': 0, 'failed': 0, 'message': 'Emails are being sent in background'}
-            try:
-                import threading
-                def send_emails_background():
-                    try:
-                        logger.info("Background: Sending email notifications about peer evaluation release")
-                        email_result = EvaluationEmailService.send_evaluation_released_notification('peer')
-                        logger.info(f"Background: Email notification result: {email_result}")
-                    except Exception as e:
-                        logger.error(f"Background: Email notification failed: {e}")
-                
-                email_thread = threading.Thread(target=send_emails_background, daemon=True)
-                email_thread.start()
-                logger.info("Email notification thread started in background")
-            except Exception as e:
-                logger.error(f"Failed to start email thread: {e}")
-                email_notification['message'] = 'Email notification skipped due to error'
+            # STEP 3: Archive previous results and send emails in the background
+            jobs = queue_release_side_effects(request, 'peer', evaluation_period, released=True)
             
             return JsonResponse({
                 'success': True,
-                'message': f'Peer evaluation period started: {evaluation_period.name}. Previous results ({archived_count} records) moved to history. Staff can now evaluate peers.',
+                'message': f'Peer evaluation period started: {evaluation_period.name}. Previous results are being moved to history in the background. Staff can now evaluate peers.',
                 'peer_evaluation_released': True,
                 'evaluation_period_ended': False,
-                'results_archived': archived_count,
                 'new_period': evaluation_period.name,
-                'email_notification': email_notification
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Exception in release_peer_evaluation: {e}", exc_info=True)
@@ -1476,9 +1281,10 @@ def release_peer_evaluation(request):
 def unrelease_peer_evaluation(request):
     """
     NEW FLOW for peer evaluation unrelease:
-    1. Process responses into EvaluationResult (visible in profile settings)
+    1. Set Evaluation.is_released=False
     2. Set EvaluationPeriod to is_active=False
-    3. Set Evaluation.is_released=False
+    3. Queue a background job that processes responses into EvaluationResult
+       (visible in profile settings), plus the closing emails
     """
     if request.method == 'POST':
         try:
@@ -1498,44 +1304,17 @@ def unrelease_peer_evaluation(request):
             evaluations = Evaluation.objects.filter(evaluation_type='peer')
             evaluations.update(is_released=False)
 
-            # STEP 1: Process peer evaluation responses into EvaluationResult
-            logger.info(f"Processing peer evaluation results for period: {active_period.name}")
-            processing_results = process_peer_evaluation_results(evaluation_period=active_period)
-            logger.info(f"Processed {processing_results.get('processed_count', 0)} peer results")
-
-            # STEP 2: Deactivate the evaluation period
+            # STEP 1: Deactivate the evaluation period
             active_period.is_active = False
             active_period.end_date = timezone.now()
             active_period.save()
             logger.info(f"Deactivated peer evaluation period: {active_period.name}")
 
-            # Send email notifications asynchronously (won't block response)
-            email_notification = {'sent': 0, 'failed': 0, 'message': 'Emails are being sent in background'}
-            try:
-                import threading
-                def send_emails_background():
-                    try:
-                        logger.info("Background: Sending email notifications about peer evaluation close")
-                        email_result = EvaluationEmailService.send_evaluation_unreleased_notification('peer')
-                        logger.info(f"Background: Email notification result: {email_result}")
-                    except Exception as e:
-                        logger.error(f"Background: Email notification failed: {e}")
-                
-                # Start email sending in background thread
-                email_thread = threading.Thread(target=send_emails_background, daemon=True)
-                email_thread.start()
-                logger.info("Email notification thread started in background")
-            except Exception as e:
-                logger.error(f"Failed to start email thread: {e}")
-                email_notification['message'] = 'Email notification skipped due to error'
-
-            message = f'Peer evaluation period "{active_period.name}" has ended.'
+            # STEP 2: Process peer responses into EvaluationResult and send emails in the background
+            jobs = queue_release_side_effects(request, 'peer', active_period, released=False)
+            logger.info(f"Queued peer result processing for period: {active_period.name}")
 
-            if processing_results['success']:
-                processed_count = processing_results['processed_count']
-                message += f' Successfully processed evaluation results for {processed_count} staff members.'
-            else:
-                message += ' But evaluation processing failed. Please check the logs.'
+            message = f'Peer evaluation period "{active_period.name}" has ended. Evaluation results are being processed in the background.'
 
             return JsonResponse({
                 'success': True,
@@ -1543,7 +1322,7 @@ def unrelease_peer_evaluation(request):
                 'peer_evaluation_released': False,
                 'evaluation_period_ended': True,
                 'period_name': active_period.name,
-                'email_notification': email_notification
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Error in unrelease_peer_evaluation: {str(e)}", exc_info=True)
@@ -1560,9 +1339,10 @@ def unrelease_peer_evaluation(request):
 def release_upward_evaluation(request):
     """
     Release upward evaluation (Faculty → Coordinator):
-    1. Move old EvaluationResult records to EvaluationHistory
-    2. Create new EvaluationPeriod with is_active=True
-    3. Create/update Evaluation record with evaluator='upward'
+    1. Create new EvaluationPeriod with is_active=True
+    2. Create/update Evaluation record with evaluator='upward'
+    3. Queue background jobs that move old EvaluationResult records to
+       EvaluationHistory and send the notification emails
     """
     if request.method == 'POST':
         try:
@@ -1577,23 +1357,19 @@ def release_upward_evaluation(request):
                     'error': "Upward evaluation is already released."
                 })
 
-            # STEP 1: Move current EvaluationResult records to EvaluationHistory
-            logger.info("Moving current upward EvaluationResult records to history...")
-            archived_count = move_current_results_to_history()
-            logger.info(f"Moved {archived_count} results to evaluation history")
-
-            # STEP 2: Create new active evaluation period with unique name
+            # STEP 1: Create new active evaluation period with unique name
             period_timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
             evaluation_period = EvaluationPeriod.objects.create(
                 name=f"Upward Evaluation {period_timestamp}",
                 evaluation_type='upward',
                 start_date=timezone.now(),
                 end_date=timezone.now() + timezone.timedelta(days=30),
-                is_active=True
+                is_active=True,
+                cycle=EvaluationCycleService.for_release('upward')
             )
             logger.info(f"Created new upward evaluation period: {evaluation_period.name}")
 
-            # STEP 3: Create or update Evaluation record with evaluator='upward'
+            # STEP 2: Create or update Evaluation record with evaluator='upward'
             evaluation, created = Evaluation.objects.update_or_create(
                 evaluation_type='upward',
                 defaults={
@@ -1605,25 +1381,22 @@ def release_upward_evaluation(request):
             action = "Created" if created else "Updated"
             logger.info(f"{action} upward evaluation record with evaluator='upward'")
 
-            # Send email notifications to Faculty only
-            logger.info("Background: Sending email notifications about upward evaluation release")
-            email_result = EvaluationEmailService.send_evaluation_released_notification('upward')
-            logger.info(f"Email notification result: {email_result.get('message', 'Unknown')}")
+            # STEP 3: Archive previous results and email Faculty in the background
+            jobs = queue_release_side_effects(request, 'upward', evaluation_period, released=True)
 
             log_admin_activity(
                 request=request,
                 action='release_evaluation',
-                description=f"Started upward evaluation period '{evaluation_period.name}'. Previous results ({archived_count} records) moved to history."
+                description=f"Started upward evaluation period '{evaluation_period.name}'. Previous results queued for archiving to history."
             )
 
             return JsonResponse({
                 'success': True,
-                'message': f'Upward evaluation period started: {evaluation_period.name}. Previous results ({archived_count} records) moved to history. Faculty can now evaluate coordinators.',
+                'message': f'Upward evaluation period started: {evaluation_period.name}. Previous results are being moved to history in the background. Faculty can now evaluate coordinators.',
                 'upward_evaluation_released': True,
                 'evaluation_period_ended': False,
-                'results_archived': archived_count,
                 'new_period': evaluation_period.name,
-                'emails_sent': email_result.get('sent_count', 0)
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Exception in release_upward_evaluation: {e}", exc_info=True)
@@ -1640,9 +1413,10 @@ def release_upward_evaluation(request):
 def unrelease_upward_evaluation(request):
     """
     Unrelease upward evaluation:
-    1. Process responses into EvaluationResult (visible to admin only)
+    1. Set Evaluation.is_released=False
     2. Set EvaluationPeriod to is_active=False
-    3. Set Evaluation.is_released=False
+    3. Queue a background job that processes responses into EvaluationResult
+       (visible to admin only), plus the closing emails
     """
     if request.method == 'POST':
         try:
@@ -1662,35 +1436,23 @@ def unrelease_upward_evaluation(request):
             evaluations = Evaluation.objects.filter(evaluation_type='upward')
             evaluations.update(is_released=False)
 
-            # STEP 1: Process upward evaluation responses into EvaluationResult
-            logger.info(f"Processing upward evaluation results for period: {active_period.name}")
-            processing_results = process_upward_evaluation_results(evaluation_period=active_period)
-            logger.info(f"Processed {processing_results.get('processed_count', 0)} upward results")
-
-            # STEP 2: Deactivate the evaluation period
+            # STEP 1: Deactivate the evaluation period
             active_period.is_active = False
             active_period.end_date = timezone.now()
             active_period.save()
             logger.info(f"Deactivated upward evaluation period: {active_period.name}")
 
-            # Send email notifications to Faculty only
-            logger.info("Background: Sending email notifications about upward evaluation closure")
-            email_result = EvaluationEmailService.send_evaluation_unreleased_notification('upward')
-            logger.info(f"Email notification result: {email_result.get('message', 'Unknown')}")
+            # STEP 2: Process upward responses into EvaluationResult and email Faculty in the background
+            jobs = queue_release_side_effects(request, 'upward', active_period, released=False)
+            logger.info(f"Queued upward result processing for period: {active_period.name}")
 
             log_admin_activity(
                 request=request,
                 action='unrelease_evaluation',
-                description=f"Ended upward evaluation period '{active_period.name}'. Processed {processing_results.get('processed_count', 0)} coordinator evaluations."
+                description=f"Ended upward evaluation period '{active_period.name}'. Coordinator evaluations queued for processing."
             )
 
-            message = f'Upward evaluation period "{active_period.name}" has ended.'
-
-            if processing_results['success']:
-                processed_count = processing_results['processed_count']
-                message += f' Successfully processed evaluation results for {processed_count} coordinators (visible to admin only).'
-            else:
-                message += ' But evaluation processing failed. Please check the logs.'
+            message = f'Upward evaluation period "{active_period.name}" has ended. Results for coordinators are being processed in the background (visible to admin only).'
 
             return JsonResponse({
                 'success': True,
@@ -1698,7 +1460,7 @@ def unrelease_upward_evaluation(request):
                 'upward_evaluation_released': False,
                 'evaluation_period_ended': True,
                 'period_name': active_period.name,
-                'emails_sent': email_result.get('sent_count', 0)
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Error in unrelease_upward_evaluation: {str(e)}", exc_info=True)
@@ -1715,9 +1477,10 @@ def unrelease_upward_evaluation(request):
 def release_dean_evaluation(request):
     """
     Release dean evaluation (Faculty → Dean):
-    1. Move old EvaluationResult records to EvaluationHistory
-    2. Create new EvaluationPeriod with is_active=True
-    3. Create/update Evaluation record with evaluator='dean'
+    1. Create new EvaluationPeriod with is_active=True
+    2. Create/update Evaluation record with evaluator='dean'
+    3. Queue background jobs that move old EvaluationResult records to
+       EvaluationHistory and send the notification emails
     """
     if request.method == 'POST':
         try:
@@ -1732,23 +1495,19 @@ def release_dean_evaluation(request):
                     'error': "Dean evaluation is already released."
                 })
 
-            # STEP 1: Move current EvaluationResult records to EvaluationHistory
-            logger.info("Moving current dean EvaluationResult records to history...")
-            archived_count = move_current_results_to_history()
-            logger.info(f"Moved {archived_count} results to evaluation history")
-
-            # STEP 2: Create new active evaluation period with unique name
+            # STEP 1: Create new active evaluation period with unique name
             period_timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
             evaluation_period = EvaluationPeriod.objects.create(
                 name=f"Dean Evaluation {period_timestamp}",
                 evaluation_type='dean',
                 start_date=timezone.now(),
                 end_date=timezone.now() + timezone.timedelta(days=30),
-                is_active=True
+                is_active=True,
+                cycle=EvaluationCycleService.for_release('dean')
             )
             logger.info(f"Created new dean evaluation period: {evaluation_period.name}")
 
-            # STEP 3: Create or update Evaluation record with evaluator='dean'
+            # STEP 2: Create or update Evaluation record with evaluator='dean'
             evaluation, created = Evaluation.objects.update_or_create(
                 evaluation_type='dean',
                 defaults={
@@ -1760,25 +1519,22 @@ def release_dean_evaluation(request):
             action = "Created" if created else "Updated"
             logger.info(f"{action} dean evaluation record with evaluator='dean'")
 
-            # Send email notifications to Faculty only
-            logger.info("Background: Sending email notifications about dean evaluation release")
-            email_result = EvaluationEmailService.send_evaluation_released_notification('dean')
-            logger.info(f"Email notification result: {email_result.get('message', 'Unknown')}")
+            # STEP 3: Archive previous results and email Faculty in the background
+            jobs = queue_release_side_effects(request, 'dean', evaluation_period, released=True)
 
             log_admin_activity(
                 request=request,
                 action='release_evaluation',
-                description=f"Started dean evaluation period '{evaluation_period.name}'. Previous results ({archived_count} records) moved to history."
+                description=f"Started dean evaluation period '{evaluation_period.name}'. Previous results queued for archiving to history."
             )
 
             return JsonResponse({
                 'success': True,
-                'message': f'Dean evaluation period started: {evaluation_period.name}. Previous results ({archived_count} records) moved to history. Faculty can now evaluate deans.',
+                'message': f'Dean evaluation period started: {evaluation_period.name}. Previous results are being moved to history in the background. Faculty can now evaluate deans.',
                 'dean_evaluation_released': True,
                 'evaluation_period_ended': False,
-                'results_archived': archived_count,
                 'new_period': evaluation_period.name,
-                'emails_sent': email_result.get('sent_count', 0)
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Exception in release_dean_evaluation: {e}", exc_info=True)
@@ -1795,9 +1551,10 @@ def release_dean_evaluation(request):
 def unrelease_dean_evaluation(request):
     """
     Unrelease dean evaluation:
-    1. Process responses into EvaluationResult (visible to admin only)
+    1. Set Evaluation.is_released=False
     2. Set EvaluationPeriod to is_active=False
-    3. Set Evaluation.is_released=False
+    3. Queue a background job that processes responses into EvaluationResult
+       (visible to admin only), plus the closing emails
     """
     if request.method == 'POST':
         try:
@@ -1817,44 +1574,31 @@ def unrelease_dean_evaluation(request):
             evaluations = Evaluation.objects.filter(evaluation_type='dean')
             evaluations.update(is_released=False)
 
-            # STEP 1: Process dean evaluation responses into EvaluationResult
-            logger.info(f"Processing dean evaluation results for period: {active_period.name}")
-            processing_results = process_dean_evaluation_results(evaluation_period=active_period)
-            logger.info(f"Processed {processing_results.get('processed_count', 0)} dean results")
-
-            # STEP 2: Deactivate the evaluation period
+            # STEP 1: Deactivate the evaluation period
             active_period.is_active = False
             active_period.end_date = timezone.now()
             active_period.save()
             logger.info(f"Deactivated dean evaluation period: {active_period.name}")
 
-            # Send email notifications to Faculty only
-            logger.info("Background: Sending email notifications about dean evaluation closure")
-            email_result = EvaluationEmailService.send_evaluation_unreleased_notification('dean')
-            logger.info(f"Email notification result: {email_result.get('message', 'Unknown')}")
+            # STEP 2: Process dean responses into EvaluationResult and email Faculty in the background
+            jobs = queue_release_side_effects(request, 'dean', active_period, released=False)
+            logger.info(f"Queued dean result processing for period: {active_period.name}")
 
             log_admin_activity(
                 request=request,
                 action='unrelease_evaluation',
-                description=f"Ended dean evaluation period '{active_period.name}'. Processed {processing_results.get('processed_count', 0)} dean evaluations."
+                description=f"Ended dean evaluation period '{active_period.name}'. Dean evaluations queued for processing."
             )
 
-            message = f'Dean evaluation period "{active_period.name}" has ended.'
-
-            if processing_results['success']:
-                processed_count = processing_results['processed_count']
-                message += f' Successfully processed evaluation results for {processed_count} deans (visible to admin only).'
-            else:
-                message += ' But evaluation processing failed. Please check the logs.'
+            message = f'Dean evaluation period "{active_period.name}" has ended. Results for deans are being processed in the background (visible to admin only).'
 
             return JsonResponse({
                 'success': True,
                 'message': message,
                 'dean_evaluation_released': False,
                 'evaluation_period_ended': True,
-                'results_processed': processing_results['success'],
-                'processed_count': processing_results.get('processed_count', 0),
-                'emails_sent': email_result.get('sent_count', 0)
+                'period_name': active_period.name,
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Exception in unrelease_dean_evaluation: {e}", exc_info=True)
@@ -1876,9 +1620,9 @@ def release_student_upward_evaluation(request):
     """
     Release student upward evaluation (Student → Coordinator):
     - Creates new evaluation period for 'student_upward'
-    - Moves any current results to history
     - Creates new Evaluation record linked to period
-    - Sends email notifications to students
+    - Queues background jobs that move current results to history and
+      send email notifications to students
     """
     if request.method == 'POST':
         try:
@@ -1896,8 +1640,6 @@ def release_student_upward_evaluation(request):
                     'error': "Student upward evaluation is already released."
                 })
 
-            logger.info("Moving current student upward EvaluationResult records to history...")
-            
             # Create new evaluation period with unique timestamp
             period_timestamp = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
             evaluation_period = EvaluationPeriod.objects.create(
@@ -1905,15 +1647,11 @@ def release_student_upward_evaluation(request):
                 evaluation_type='student_upward',
                 start_date=timezone.now(),
                 end_date=timezone.now() + timezone.timedelta(days=30),
-                is_active=True
+                is_active=True,
+                cycle=EvaluationCycleService.for_release('student_upward')
             )
             logger.info(f"Created new student upward evaluation period: {evaluation_period.name}")
             
-            # Archive existing results to history
-            logger.info("Moving current EvaluationResult records to history...")
-            archived_count = move_current_results_to_history()
-            logger.info(f"Moved {archived_count} results to evaluation history")
-            
             # Create/update evaluation record linked to the period
             evaluation, action = Evaluation.objects.update_or_create(
                 evaluator='students',
@@ -1922,23 +1660,22 @@ def release_student_upward_evaluation(request):
             )
             logger.info(f"{action} student upward evaluation record with evaluator='students'")
             
-            # Send email notifications in background
-            logger.info("Background: Sending email notifications about student upward evaluation release")
-            evaluation_email_service = EvaluationEmailService()
-            evaluation_email_service.send_evaluation_released_notification('student_upward')
+            # Archive existing results and send emails in the background
+            jobs = queue_release_side_effects(request, 'student_upward', evaluation_period, released=True)
             
             # Log admin activity
             AdminActivityLog.objects.create(
                 admin=request.user,
                 action='release_evaluation',
-                description=f"Started student upward evaluation period '{evaluation_period.name}'. Previous results ({archived_count} records) moved to history."
+                description=f"Started student upward evaluation period '{evaluation_period.name}'. Previous results queued for archiving to history."
             )
             
             return JsonResponse({
                 'success': True,
-                'message': f'Student upward evaluation period started: {evaluation_period.name}. Previous results ({archived_count} records) moved to history. Students can now evaluate coordinators.',
+                'message': f'Student upward evaluation period started: {evaluation_period.name}. Previous results are being moved to history in the background. Students can now evaluate coordinators.',
                 'student_upward_evaluation_released': True,
-                'period_name': evaluation_period.name
+                'period_name': evaluation_period.name,
+                'jobs': jobs
             })
             
         except Exception as e:
@@ -1956,10 +1693,10 @@ def release_student_upward_evaluation(request):
 def unrelease_student_upward_evaluation(request):
     """
     Unrelease student upward evaluation:
-    - Process responses into EvaluationResult
     - Deactivate the period
     - Update evaluation record
-    - Send closure emails
+    - Queue background jobs that process responses into EvaluationResult
+      and send closure emails
     """
     if request.method == 'POST':
         try:
@@ -1977,40 +1714,34 @@ def unrelease_student_upward_evaluation(request):
 
             logger.info(f"Unreleasing student upward evaluation period: {active_period.name}")
 
-            # STEP 1: Process student upward evaluation responses into EvaluationResult
-            logger.info(f"Processing student upward evaluation results for period: {active_period.name}")
-            processing_results = process_student_upward_evaluation_results(evaluation_period=active_period)
-            
-            # STEP 2: Deactivate the evaluation period
+            # STEP 1: Deactivate the evaluation period
             active_period.is_active = False
             active_period.end_date = timezone.now()
             active_period.save()
             logger.info(f"Deactivated student upward evaluation period: {active_period.name}")
 
-            # STEP 3: Update Evaluation record
+            # STEP 2: Update Evaluation record
             Evaluation.objects.filter(
                 evaluation_type='student_upward',
                 evaluation_period=active_period
             ).update(is_released=False)
             
-            # STEP 4: Send closure emails
-            evaluation_email_service = EvaluationEmailService()
-            email_result = evaluation_email_service.send_evaluation_unreleased_notification('student_upward')
+            # STEP 3: Process responses into EvaluationResult and send closure emails in the background
+            jobs = queue_release_side_effects(request, 'student_upward', active_period, released=False)
             
             # Log admin activity
             AdminActivityLog.objects.create(
                 admin=request.user,
                 action='unrelease_evaluation',
-                description=f"Ended student upward evaluation period '{active_period.name}'. Processed {processing_results.get('processed_count', 0)} coordinator results."
+                description=f"Ended student upward evaluation period '{active_period.name}'. Coordinator results queued for processing."
             )
             
             return JsonResponse({
                 'success': True,
-                'message': f"Student upward evaluation period '{active_period.name}' has been closed. Results processed for {processing_results.get('processed_count', 0)} coordinators.",
+                'message': f"Student upward evaluation period '{active_period.name}' has been closed. Results for coordinators are being processed in the background.",
                 'student_upward_evaluation_released': False,
-                'results_processed': processing_results['success'],
-                'processed_count': processing_results.get('processed_count', 0),
-                'emails_sent': email_result.get('sent_count', 0)
+                'period_name': active_period.name,
+                'jobs': jobs
             })
         except Exception as e:
             logger.error(f"Exception in unrelease_student_upward_evaluation: {e}", exc_info=True)
@@ -2029,8 +1760,6 @@ def process_student_upward_evaluation_results(evaluation_period=None):
     Process student upward evaluation results (Student → Coordinator) after evaluation period ends
     """
     try:
-        from main.models import StudentUpwardEvaluationResponse
-        
         # Use the provided evaluation period if given
         current_period = evaluation_period
         if not current_period:
@@ -2053,10 +1782,17 @@ def process_student_upward_evaluation_results(evaluation_period=None):
                 'details': []
             }
         
-        # Get all coordinators who were evaluated
-        coordinator_ids = StudentUpwardEvaluationResponse.objects.filter(
-            evaluation_period=current_period
-        ).values_list('evaluatee', flat=True).distinct()
+        # Score every evaluated coordinator from their running aggregate of this period's responses
+        scores = {
+            group['evaluatee_id']: group['summary']
+            for group in EvaluationAggregateService.aggregate(
+                EvaluationAggregateService.rows(['student_upward'], evaluation_period=current_period),
+                group_by=('evaluatee_id',),
+                layout=STUDENT_UPWARD_CATEGORY_LAYOUT,
+                question_count=12
+            )
+        }
+        coordinator_ids = list(scores)
         
         processed_count = 0
         processing_details = []
@@ -2064,80 +1800,17 @@ def process_student_upward_evaluation_results(evaluation_period=None):
         for coordinator_id in coordinator_ids:
             try:
                 coordinator = User.objects.get(id=coordinator_id)
-                
-                # Get all evaluations for this coordinator in this period
-                responses = StudentUpwardEvaluationResponse.objects.filter(
-                    evaluatee=coordinator,
-                    evaluation_period=current_period
-                )
-                
-                if not responses.exists():
-                    continue
-                
-                # Calculate scores for 12 questions (4 categories, 3 questions each)
-                # Category A: Questions 1-3 (25% weight)
-                # Category B: Questions 4-6 (25% weight)
-                # Category C: Questions 7-9 (25% weight)
-                # Category D: Questions 10-12 (25% weight)
-                
-                rating_values = {
-                    'Outstanding': 5,
-                    'Very Satisfactory': 4,
-                    'Satisfactory': 3,
-                    'Poor': 2,
-                    'Unsatisfactory': 1
-                }
-                
-                total_category_a = 0
-                total_category_b = 0
-                total_category_c = 0
-                total_category_d = 0
-                
-                rating_counts = {
-                    'poor_count': 0,
-                    'unsatisfactory_count': 0,
-                    'satisfactory_count': 0,
-                    'very_satisfactory_count': 0,
-                    'outstanding_count': 0
-                }
-                
-                for response in responses:
-                    # Category A (Questions 1-3)
-                    total_category_a += sum(rating_values.get(getattr(response, f'question{i}'), 0) for i in range(1, 4))
-                    # Category B (Questions 4-6)
-                    total_category_b += sum(rating_values.get(getattr(response, f'question{i}'), 0) for i in range(4, 7))
-                    # Category C (Questions 7-9)
-                    total_category_c += sum(rating_values.get(getattr(response, f'question{i}'), 0) for i in range(7, 10))
-                    # Category D (Questions 10-12)
-                    total_category_d += sum(rating_values.get(getattr(response, f'question{i}'), 0) for i in range(10, 13))
-                    
-                    # Count ratings
-                    for i in range(1, 13):
-                        rating = getattr(response, f'question{i}')
-                        if rating == 'Poor':
-                            rating_counts['poor_count'] += 1
-                        elif rating == 'Unsatisfactory':
-                            rating_counts['unsatisfactory_count'] += 1
-                        elif rating == 'Satisfactory':
-                            rating_counts['satisfactory_count'] += 1
-                        elif rating == 'Very Satisfactory':
-                            rating_counts['very_satisfactory_count'] += 1
-                        elif rating == 'Outstanding':
-                            rating_counts['outstanding_count'] += 1
-                
-                num_responses = responses.count()
-                
-                # Calculate averages (3 questions per category × 5 max rating = 15 max per category)
-                category_a_score = (total_category_a / (num_responses * 15)) * 25 if num_responses > 0 else 0
-                category_b_score = (total_category_b / (num_responses * 15)) * 25 if num_responses > 0 else 0
-                category_c_score = (total_category_c / (num_responses * 15)) * 25 if num_responses > 0 else 0
-                category_d_score = (total_category_d / (num_responses * 15)) * 25 if num_responses > 0 else 0
-                
-                total_percentage = category_a_score + category_b_score + category_c_score + category_d_score
-                
-                # Calculate average rating (1-5 scale)
-                total_ratings = (total_category_a + total_category_b + total_category_c + total_category_d)
-                average_rating = total_ratings / (num_responses * 12) if num_responses > 0 else 0
+                summary = scores[coordinator_id]
+                
+                # 12 questions in 4 categories of 3 (25% weight each)
+                category_a_score, category_b_score, category_c_score, category_d_score = summary['category_scores']
+                total_percentage = summary['total_percentage']
+                average_rating = summary['average_rating']
+                num_responses = summary['response_count']
+                rating_counts = dict(zip(
+                    ['poor_count', 'unsatisfactory_count', 'satisfactory_count', 'very_satisfactory_count', 'outstanding_count'],
+                    summary['distribution']
+                ))
                 
                 # Create or update EvaluationResult
                 from main.models import EvaluationResult
@@ -2271,8 +1944,6 @@ def process_upward_evaluation_results(evaluation_period=None):
     Process upward evaluation results (Faculty → Coordinator) after evaluation period ends
     """
     try:
-        from main.models import UpwardEvaluationResponse
-        
         # Use the provided evaluation period if given; otherwise try to infer
         current_period = evaluation_period
         if not current_period:
@@ -2295,10 +1966,16 @@ def process_upward_evaluation_results(evaluation_period=None):
                 'details': []
             }
         
-        # Get all coordinators who were evaluated
-        coordinator_ids = UpwardEvaluationResponse.objects.filter(
-            evaluation_period=current_period
-        ).values_list('evaluatee', flat=True).distinct()
+        # Score every evaluated coordinator from their running aggregate of this period's responses
+        scores = {
+            group['evaluatee_id']: group['summary']
+            for group in EvaluationAggregateService.aggregate(
+                EvaluationAggregateService.rows(['upward'], evaluation_period=current_period),
+                group_by=('evaluatee_id',),
+                question_count=15
+            )
+        }
+        coordinator_ids = list(scores)
         
         processed_count = 0
         processing_details = []
@@ -2306,43 +1983,13 @@ def process_upward_evaluation_results(evaluation_period=None):
         for coordinator_id in coordinator_ids:
             try:
                 coordinator = User.objects.get(id=coordinator_id)
+                summary = scores[coordinator_id]
                 
-                # Get all upward evaluations for this coordinator in this period
-                responses = UpwardEvaluationResponse.objects.filter(
-                    evaluatee=coordinator,
-                    evaluation_period=current_period
-                )
-                
-                if responses.exists():
-                    # Calculate average scores for 15 questions
-                    total_score = 0
-                    response_count = responses.count()
+                if summary['response_count']:
+                    response_count = summary['response_count']
                     
-                    for i in range(1, 16):  # 15 questions
-                        question_field = f'question{i}'
-                        question_scores = []
-                        
-                        for response in responses:
-                            rating = getattr(response, question_field)
-                            score = {
-                                'Strongly Disagree': 1,
-                                'Disagree': 2,
-                                'Neutral': 3,
-                                'Agree': 4,
-                                'Strongly Agree': 5,
-                                'Poor': 1,
-                                'Fair': 2,
-                                'Satisfactory': 3,
-                                'Very Satisfactory': 4,
-                                'Outstanding': 5
-                            }.get(rating, 3)
-                            question_scores.append(score)
-                        
-                        avg_score = sum(question_scores) / len(question_scores) if question_scores else 0
-                        total_score += avg_score
-                    
-                    # Calculate percentage (15 questions, max 5 points each = 75 total)
-                    overall_percentage = (total_score / 75) * 100
+                    # Average of the 15 question averages (max 5 points each = 75 total)
+                    overall_percentage = summary['flat_percentage']
                     
                     # Create or update EvaluationResult
                     result, created = EvaluationResult.objects.update_or_create(
@@ -2391,8 +2038,6 @@ def process_dean_evaluation_results(evaluation_period=None):
     Process dean evaluation results (Faculty → Dean) after evaluation period ends
     """
     try:
-        from main.models import DeanEvaluationResponse
-        
         # Use the provided evaluation period if given; otherwise try to infer
         current_period = evaluation_period
         if not current_period:
@@ -2415,10 +2060,16 @@ def process_dean_evaluation_results(evaluation_period=None):
                 'details': []
             }
         
-        # Get all deans who were evaluated
-        dean_ids = DeanEvaluationResponse.objects.filter(
-            evaluation_period=current_period
-        ).values_list('evaluatee', flat=True).distinct()
+        # Score every evaluated dean from their running aggregate of this period's responses
+        scores = {
+            group['evaluatee_id']: group['summary']
+            for group in EvaluationAggregateService.aggregate(
+                EvaluationAggregateService.rows(['dean'], evaluation_period=current_period),
+                group_by=('evaluatee_id',),
+                question_count=15
+            )
+        }
+        dean_ids = list(scores)
         
         processed_count = 0
         processing_details = []
@@ -2426,43 +2077,13 @@ def process_dean_evaluation_results(evaluation_period=None):
         for dean_id in dean_ids:
             try:
                 dean = User.objects.get(id=dean_id)
+                summary = scores[dean_id]
                 
-                # Get all dean evaluations for this dean in this period
-                responses = DeanEvaluationResponse.objects.filter(
-                    evaluatee=dean,
-                    evaluation_period=current_period
-                )
-                
-                if responses.exists():
-                    # Calculate average scores for 15 questions
-                    total_score = 0
-                    response_count = responses.count()
-                    
-                    for i in range(1, 16):  # 15 questions
-                        question_field = f'question{i}'
-                        question_scores = []
-                        
-                        for response in responses:
-                            rating = getattr(response, question_field)
-                            score = {
-                                'Strongly Disagree': 1,
-                                'Disagree': 2,
-                                'Neutral': 3,
-                                'Agree': 4,
-                                'Strongly Agree': 5,
-                                'Poor': 1,
-                                'Fair': 2,
-                                'Satisfactory': 3,
-                                'Very Satisfactory': 4,
-                                'Outstanding': 5
-                            }.get(rating, 3)
-                            question_scores.append(score)
-                        
-                        avg_score = sum(question_scores) / len(question_scores) if question_scores else 0
-                        total_score += avg_score
+                if summary['response_count']:
+                    response_count = summary['response_count']
                     
-                    # Calculate percentage (15 questions, max 5 points each = 75 total)
-                    overall_percentage = (total_score / 75) * 100
+                    # Average of the 15 question averages (max 5 points each = 75 total)
+                    overall_percentage = summary['flat_percentage']
                     
                     # Create or update EvaluationResult
                     result, created = EvaluationResult.objects.update_or_create(
@@ -2531,19 +2152,28 @@ def release_all_evaluations(request):
             ).exclude(
                 id__in=EvaluationHistory.objects.values_list('evaluation_period_id', flat=True)
             )
-            for period in previous_student_periods:
-                archived_count = archive_period_results_to_history(period)
-                print(f"🔍 DEBUG: Archived {archived_count} results from previous student period: {period.name}")
-            
             previous_peer_periods = EvaluationPeriod.objects.filter(
                 evaluation_type='peer',
                 is_active=False  # Only archive ENDED periods
             ).exclude(
                 id__in=EvaluationHistory.objects.values_list('evaluation_period_id', flat=True)
             )
-            for period in previous_peer_periods:
-                archived_count = archive_period_results_to_history(period)
-                print(f"🔍 DEBUG: Archived {archived_count} results from previous peer period: {period.name}")
+            
+            # Archiving runs in the background; one job covers every ended period
+            archive_period_ids = sorted(
+                list(previous_student_periods.values_list('id', flat=True)) +
+                list(previous_peer_periods.values_list('id', flat=True))
+            )
+            jobs = []
+            if archive_period_ids:
+                archive_job = JobQueueService.enqueue(
+                    'archive_periods',
+                    {'period_ids': archive_period_ids},
+                    dedupe_key=f"archive_periods:{','.join(map(str, archive_period_ids))}",
+                    user=request.user
+                )
+                jobs.append(JobQueueService.to_dict(archive_job))
+                logger.info(f"Queued archiving of {len(archive_period_ids)} previous periods (job #{archive_job.id})")
             
             # Now deactivate currently active periods (these will NOT be archived yet)
             active_student_periods = EvaluationPeriod.objects.filter(
@@ -2560,13 +2190,17 @@ def release_all_evaluations(request):
             peer_deactivated_count = active_peer_periods.update(is_active=False, end_date=timezone.now())
             print(f"🔍 DEBUG: Deactivated {peer_deactivated_count} active peer periods (NOT archived yet)")
             
+            # Both new periods belong to one evaluation cycle
+            cycle = EvaluationCycleService.start()
+            
             # Create new student evaluation period with unique timestamp
             student_period = EvaluationPeriod.objects.create(
                 name=f"Student Evaluation {timezone.now().strftime('%B %d, %Y %H:%M')}",
                 evaluation_type='student',
                 start_date=timezone.now(),
                 end_date=timezone.now() + timezone.timedelta(days=30),
-                is_active=True
+                is_active=True,
+                cycle=cycle
             )
             print(f"🔍 DEBUG: Created new student period: {student_period.name}")
             
@@ -2576,7 +2210,8 @@ def release_all_evaluations(request):
                 evaluation_type='peer',
                 start_date=timezone.now(),
                 end_date=timezone.now() + timezone.timedelta(days=30),
-                is_active=True
+                is_active=True,
+                cycle=cycle
             )
             print(f"🔍 DEBUG: Created new peer period: {peer_period.name}")
             
@@ -2623,7 +2258,7 @@ def release_all_evaluations(request):
                 log_admin_activity(
                     request=request,
                     action='release_evaluation',
-                    description=f"Released both student ({student_updated}) and peer ({peer_updated}) evaluation forms. Previous periods archived."
+                    description=f"Released both student ({student_updated}) and peer ({peer_updated}) evaluation forms. Previous periods queued for archiving."
                 )
                 
                 response_data = {
@@ -2631,7 +2266,8 @@ def release_all_evaluations(request):
                     'message': f'✅ Both student and peer evaluations have been released! (Student: {student_updated}, Peer: {peer_updated})',
                     'student_evaluation_released': True,
                     'peer_evaluation_released': True,
-                    'evaluation_period_ended': False
+                    'evaluation_period_ended': False,
+                    'jobs': jobs
                 }
                 print(f"🔍 DEBUG: Success - {response_data['message']}")
                 return JsonResponse(response_data)
@@ -2704,17 +2340,21 @@ def unrelease_all_evaluations(request):
             peer_periods.update(is_active=False, end_date=timezone.now())
             print(f"🔍 DEBUG: Deactivated {peer_periods_count} peer evaluation period(s)")
             
-            # Process results for both using the captured periods
-            student_processing = process_all_evaluation_results(evaluation_period=student_active_period) if student_active_period else {'success': False, 'processed_count': 0}
-            peer_processing = process_peer_evaluation_results(evaluation_period=peer_active_period) if peer_active_period else {'success': False, 'processed_count': 0}
+            # Process results for both captured periods in the background
+            jobs = []
+            for period, processor in ((student_active_period, 'student_all'), (peer_active_period, 'peer')):
+                if period:
+                    job = JobQueueService.enqueue(
+                        'process_results',
+                        {'period_id': period.id, 'processor': processor},
+                        dedupe_key=f'process_results:{period.id}:{processor}',
+                        user=request.user
+                    )
+                    jobs.append(JobQueueService.to_dict(job))
             
             message = 'Both student and peer evaluations have been unreleased. Evaluation periods ended.'
-            
-            # Add processing details
-            if student_processing['success']:
-                message += f" Student results: {student_processing['processed_count']} processed."
-            if peer_processing['success']:
-                message += f" Peer results: {peer_processing['processed_count']} processed."
+            if jobs:
+                message += ' Results are being processed in the background.'
             
             if student_updated > 0 or peer_updated > 0:
                 # Log admin activity
@@ -2729,7 +2369,8 @@ def unrelease_all_evaluations(request):
                     'message': message,
                     'student_evaluation_released': False,
                     'peer_evaluation_released': False,
-                    'evaluation_period_ended': True
+                    'evaluation_period_ended': True,
+                    'jobs': jobs
                 }
                 print(f"🔍 DEBUG: Success - {message}")
                 return JsonResponse(response_data)
@@ -2749,6 +2390,33 @@ def unrelease_all_evaluations(request):
     
     print("🔍 DEBUG: Not a POST request")
     return JsonResponse({'success': False, 'error': 'Invalid request'})
+
+
+@require_http_methods(["GET"])
+def api_job_status(request, job_id=None):
+    """
+    Progress of background jobs queued by release/unrelease.
+    GET /api/jobs/<id>/ for one job, or /api/jobs/?ids=1,2 for several.
+    """
+    if not request.user.is_authenticated or not request.user.is_superuser:
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    
+    from main.models import BackgroundJob
+    
+    if job_id is not None:
+        job = BackgroundJob.objects.filter(id=job_id).first()
+        if not job:
+            return JsonResponse({'success': False, 'error': 'Job not found'}, status=404)
+        return JsonResponse({'success': True, 'job': JobQueueService.to_dict(job)})
+    
+    ids = [int(value) for value in request.GET.get('ids', '').split(',') if value.strip().isdigit()]
+    jobs = BackgroundJob.objects.filter(id__in=ids) if ids else BackgroundJob.objects.all()[:20]
+    job_list = [JobQueueService.to_dict(job) for job in jobs]
+    return JsonResponse({
+        'success': True,
+        'jobs': job_list,
+        'all_finished': all(job['status'] in ('succeeded', 'failed') for job in job_list)
+    })
         
 @method_decorator(cache_control(no_store=True, no_cache=True, must_revalidate=True), name='dispatch')       
 class CoordinatorDetailView(View):
@@ -2781,6 +2449,18 @@ class CoordinatorDetailView(View):
             # Get assigned sections for this coordinator
             assigned_sections = SectionAssignment.objects.filter(user=coordinator.user)
             
+            # Live scores of every section from the running aggregates of the
+            # active student period (all periods if none), in one query
+            section_summaries = {
+                group['section_code']: group['summary']
+                for group in EvaluationAggregateService.aggregate(
+                    EvaluationAggregateService.rows(
+                        RESPONSE_TYPES, evaluatee=coordinator.user, evaluation_period=latest_student_period
+                    ),
+                    group_by=('section_code',)
+                )
+            }
+
             # Calculate scores for each section and create section mapping
             section_scores = {}
             section_map = {}  # This will map section IDs to section codes
@@ -2793,21 +2473,15 @@ class CoordinatorDetailView(View):
                 # Add to section mapping
                 section_map[section_id] = section_code
 
-                # Calculate scores for this specific section - NOW WITH 4 CATEGORIES
-                # Pass the latest period to filter by most recent evaluation results
-                category_scores = compute_category_scores(coordinator.user, section_code, latest_student_period)
-                
-                a_avg, b_avg, c_avg, d_avg, total_percentage, total_a, total_b, total_c, total_d = category_scores
-                
-                # Get evaluation count for this section from EvaluationResponse (filtered by active period if exists)
-                eval_filter_kwargs = {
-                    'evaluatee': coordinator.user,
-                    'student_section': section_code
-                }
-                if latest_student_period:
-                    eval_filter_kwargs['submitted_at__gte'] = latest_student_period.start_date
-                    eval_filter_kwargs['submitted_at__lte'] = latest_student_period.end_date
-                evaluation_count = EvaluationResponse.objects.filter(**eval_filter_kwargs).count()
+                # Scores for this specific section - 4 categories
+                summary = section_summaries.get(section_code)
+                if summary:
+                    a_avg, b_avg, c_avg, d_avg = [round(score, 2) for score in summary['category_scores']]
+                    total_percentage = round(summary['total_percentage'], 2)
+                    evaluation_count = summary['response_count']
+                else:
+                    a_avg = b_avg = c_avg = d_avg = total_percentage = 0
+                    evaluation_count = 0
                 
                 # Only include sections that have evaluations
                 if total_percentage > 0:
@@ -2826,24 +2500,16 @@ class CoordinatorDetailView(View):
                     }
 
             # Calculate PEER evaluation scores (overall, no section breakdown)
-            # Filter by active peer evaluation period using date range
-            peer_filter_kwargs = {'evaluatee': coordinator.user}
-            if latest_peer_period:
-                peer_filter_kwargs['submitted_at__gte'] = latest_peer_period.start_date
-                peer_filter_kwargs['submitted_at__lte'] = latest_peer_period.end_date
-                peer_filter_kwargs['evaluation_period__evaluation_type'] = 'peer'
-            else:
-                # If no active peer period, get all peer evaluations
-                peer_filter_kwargs['evaluation_period__evaluation_type'] = 'peer'
-            peer_responses = EvaluationResponse.objects.filter(**peer_filter_kwargs)
-            
-            peer_evaluation_count = peer_responses.count()
+            # from the aggregates of the active peer period (all peer periods if none)
+            peer_summary = EvaluationAggregateService.summary(
+                EvaluationAggregateService.rows(['peer'], evaluatee=coordinator.user, evaluation_period=latest_peer_period)
+            )
+            peer_evaluation_count = peer_summary['response_count']
             
             if peer_evaluation_count > 0:
-                # Calculate peer scores using the same 4-category system
-                # Pass the latest peer period to filter by most recent results
-                peer_scores = compute_category_scores(coordinator.user, section_code=None, evaluation_period=latest_peer_period)
-                p_a_avg, p_b_avg, p_c_avg, p_d_avg, p_total_percentage, _, _, _, _ = peer_scores
+                # Same 4-category system as the section scores
+                p_a_avg, p_b_avg, p_c_avg, p_d_avg = [round(score, 2) for score in peer_summary['category_scores']]
+                p_total_percentage = round(peer_summary['total_percentage'], 2)
                 
                 peer_data = {
                     'category_scores': [p_a_avg, p_b_avg, p_c_avg, p_d_avg],
@@ -2860,75 +2526,16 @@ class CoordinatorDetailView(View):
                 }
 
             # Calculate IRREGULAR evaluation scores
-            # Filter by active student evaluation period using date range
-            irregular_filter_kwargs = {'evaluatee': coordinator.user}
-            if latest_student_period:
-                irregular_filter_kwargs['submitted_at__gte'] = latest_student_period.start_date
-                irregular_filter_kwargs['submitted_at__lte'] = latest_student_period.end_date
-            irregular_responses = IrregularEvaluation.objects.filter(**irregular_filter_kwargs)
-            irregular_evaluation_count = irregular_responses.count()
+            # from the aggregates of the active student period (all periods if none)
+            irregular_summary = EvaluationAggregateService.summary(
+                EvaluationAggregateService.rows(['irregular'], evaluatee=coordinator.user, evaluation_period=latest_student_period)
+            )
+            irregular_evaluation_count = irregular_summary['response_count']
             
             if irregular_evaluation_count > 0:
-                # Calculate irregular scores manually (same logic as compute_category_scores)
-                rating_to_numeric = {
-                    'Poor': 1,
-                    'Unsatisfactory': 2,
-                    'Satisfactory': 3,
-                    'Very Satisfactory': 4,
-                    'Outstanding': 5
-                }
-                
-                category_a_total = category_b_total = category_c_total = category_d_total = 0
-                count_a = count_b = count_c = count_d = 0
-                
-                for response in irregular_responses:
-                    # Category A: Questions 1-4 (35%)
-                    for i in range(1, 5):
-                        question_key = f'question{i}'
-                        rating_text = getattr(response, question_key, 'Poor')
-                        score = rating_to_numeric.get(rating_text, 1)
-                        category_a_total += score
-                        count_a += 1
-                    
-                    # Category B: Questions 5-8 (25%)
-                    for i in range(5, 9):
-                        question_key = f'question{i}'
-                        rating_text = getattr(response, question_key, 'Poor')
-                        score = rating_to_numeric.get(rating_text, 1)
-                        category_b_total += score
-                        count_b += 1
-                    
-                    # Category C: Questions 9-12 (20%)
-                    for i in range(9, 13):
-                        question_key = f'question{i}'
-                        rating_text = getattr(response, question_key, 'Poor')
-                        score = rating_to_numeric.get(rating_text, 1)
-                        category_c_total += score
-                        count_c += 1
-                    
-                    # Category D: Questions 13-15 (20%)
-                    for i in range(13, 16):
-                        question_key = f'question{i}'
-                        rating_text = getattr(response, question_key, 'Poor')
-                        score = rating_to_numeric.get(rating_text, 1)
-                        category_d_total += score
-                        count_d += 1
-                
-                # Calculate averages with weights
-                max_score_per_question = 5
-                a_weight, b_weight, c_weight, d_weight = 0.35, 0.25, 0.20, 0.20
-                
-                def scaled_avg(total, count, weight):
-                    if count == 0:
-                        return 0
-                    average_score = total / count
-                    return (average_score / max_score_per_question) * weight * 100
-                
-                irr_a_avg = scaled_avg(category_a_total, count_a, a_weight)
-                irr_b_avg = scaled_avg(category_b_total, count_b, b_weight)
-                irr_c_avg = scaled_avg(category_c_total, count_c, c_weight)
-                irr_d_avg = scaled_avg(category_d_total, count_d, d_weight)
-                irr_total_percentage = irr_a_avg + irr_b_avg + irr_c_avg + irr_d_avg
+                # Same 4-category system as compute_category_scores (questions 1-15)
+                irr_a_avg, irr_b_avg, irr_c_avg, irr_d_avg = irregular_summary['category_scores']
+                irr_total_percentage = irregular_summary['total_percentage']
                 
                 irregular_data = {
                     'category_scores': [irr_a_avg, irr_b_avg, irr_c_avg, irr_d_avg],
@@ -2951,48 +2558,15 @@ class CoordinatorDetailView(View):
                 is_active=True
             ).first()
             
-            upward_filter_kwargs = {'evaluatee': coordinator.user}
-            if latest_upward_period:
-                upward_filter_kwargs['submitted_at__gte'] = latest_upward_period.start_date
-                upward_filter_kwargs['submitted_at__lte'] = latest_upward_period.end_date
-                upward_filter_kwargs['evaluation_period__evaluation_type'] = 'upward'
-            else:
-                # If no active period, filter by evaluation_type
-                upward_filter_kwargs['evaluation_period__evaluation_type'] = 'upward'
-            
-            from main.models import UpwardEvaluationResponse
-            upward_responses = UpwardEvaluationResponse.objects.filter(**upward_filter_kwargs)
-            upward_evaluation_count = upward_responses.count()
+            upward_summary = EvaluationAggregateService.summary(
+                EvaluationAggregateService.rows(['upward'], evaluatee=coordinator.user, evaluation_period=latest_upward_period),
+                question_count=15
+            )
+            upward_evaluation_count = upward_summary['response_count']
             
             if upward_evaluation_count > 0:
-                # Rating mapping for upward evaluations
-                rating_to_numeric = {
-                    'Strongly Disagree': 1,
-                    'Disagree': 2,
-                    'Neutral': 3,
-                    'Agree': 4,
-                    'Strongly Agree': 5,
-                    'Poor': 1,
-                    'Fair': 2,
-                    'Satisfactory': 3,
-                    'Very Satisfactory': 4,
-                    'Outstanding': 5
-                }
-                
-                # Calculate scores for 15 questions
-                total_score = 0
-                for i in range(1, 16):
-                    question_field = f'question{i}'
-                    question_scores = []
-                    for response in upward_responses:
-                        rating = getattr(response, question_field)
-                        score = rating_to_numeric.get(rating, 3)
-                        question_scores.append(score)
-                    avg_score = sum(question_scores) / len(question_scores) if question_scores else 0
-                    total_score += avg_score
-                
-                # Calculate percentage (15 questions, max 5 points each = 75 total)
-                upward_total_percentage = (total_score / 75) * 100
+                # Average of the question averages (15 questions, max 5 points each)
+                upward_total_percentage = upward_summary['flat_percentage']
                 
                 upward_data = {
                     'total_percentage': upward_total_percentage,
@@ -3013,48 +2587,16 @@ class CoordinatorDetailView(View):
                 is_active=True
             ).first()
             
-            student_upward_filter_kwargs = {'evaluatee': coordinator.user}
-            if latest_student_upward_period:
-                student_upward_filter_kwargs['submitted_at__gte'] = latest_student_upward_period.start_date
-                student_upward_filter_kwargs['submitted_at__lte'] = latest_student_upward_period.end_date
-                student_upward_filter_kwargs['evaluation_period__evaluation_type'] = 'student_upward'
-            else:
-                # If no active period, filter by evaluation_type
-                student_upward_filter_kwargs['evaluation_period__evaluation_type'] = 'student_upward'
-            
-            from main.models import StudentUpwardEvaluationResponse
-            student_upward_responses = StudentUpwardEvaluationResponse.objects.filter(**student_upward_filter_kwargs)
-            student_upward_evaluation_count = student_upward_responses.count()
+            student_upward_summary = EvaluationAggregateService.summary(
+                EvaluationAggregateService.rows(['student_upward'], evaluatee=coordinator.user, evaluation_period=latest_student_upward_period),
+                layout=STUDENT_UPWARD_CATEGORY_LAYOUT,
+                question_count=12
+            )
+            student_upward_evaluation_count = student_upward_summary['response_count']
             
             if student_upward_evaluation_count > 0:
-                # Rating mapping for student upward evaluations
-                rating_to_numeric = {
-                    'Strongly Disagree': 1,
-                    'Disagree': 2,
-                    'Neutral': 3,
-                    'Agree': 4,
-                    'Strongly Agree': 5,
-                    'Poor': 1,
-                    'Fair': 2,
-                    'Satisfactory': 3,
-                    'Very Satisfactory': 4,
-                    'Outstanding': 5
-                }
-                
-                # Calculate scores for 15 questions
-                total_score = 0
-                for i in range(1, 16):
-                    question_field = f'question{i}'
-                    question_scores = []
-                    for response in student_upward_responses:
-                        rating = getattr(response, question_field)
-                        score = rating_to_numeric.get(rating, 3)
-                        question_scores.append(score)
-                    avg_score = sum(question_scores) / len(question_scores) if question_scores else 0
-                    total_score += avg_score
-                
-                # Calculate percentage (15 questions, max 5 points each = 75 total)
-                student_upward_total_percentage = (total_score / 75) * 100
+                # Average of the question averages (12 questions, max 5 points each)
+                student_upward_total_percentage = student_upward_summary['flat_percentage']
                 
                 student_upward_data = {
                     'total_percentage': student_upward_total_percentage,
@@ -3352,44 +2894,17 @@ class DeanDetailView(View):
                 is_active=True
             ).first()
             
-            # Calculate DEAN evaluation scores (Faculty → Dean)
-            dean_filter_kwargs = {'evaluatee': dean.user}
-            if latest_dean_period:
-                dean_filter_kwargs['submitted_at__gte'] = latest_dean_period.start_date
-                dean_filter_kwargs['submitted_at__lte'] = latest_dean_period.end_date
-                dean_filter_kwargs['evaluation_period__evaluation_type'] = 'dean'
-            else:
-                # If no active period, filter by evaluation_type
-                dean_filter_kwargs['evaluation_period__evaluation_type'] = 'dean'
-            
-            from main.models import DeanEvaluationResponse
-            dean_responses = DeanEvaluationResponse.objects.filter(**dean_filter_kwargs)
-            dean_evaluation_count = dean_responses.count()
+            # Calculate DEAN evaluation scores (Faculty → Dean) from the aggregates
+            # of the active dean period (all dean periods if none)
+            dean_summary = EvaluationAggregateService.summary(
+                EvaluationAggregateService.rows(['dean'], evaluatee=dean.user, evaluation_period=latest_dean_period),
+                question_count=15
+            )
+            dean_evaluation_count = dean_summary['response_count']
             
             if dean_evaluation_count > 0:
-                # Rating mapping for dean evaluations
-                rating_to_numeric = {
-                    'Strongly Disagree': 1,
-                    'Disagree': 2,
-                    'Neutral': 3,
-                    'Agree': 4,
-                    'Strongly Agree': 5
-                }
-                
-                # Calculate scores for 15 questions
-                total_score = 0
-                for i in range(1, 16):
-                    question_field = f'question{i}'
-                    question_scores = []
-                    for response in dean_responses:
-                        rating = getattr(response, question_field)
-                        score = rating_to_numeric.get(rating, 1)
-                        question_scores.append(score)
-                    avg_score = sum(question_scores) / len(question_scores) if question_scores else 0
-                    total_score += avg_score
-                
-                # Calculate percentage (15 questions, max 5 points each = 75 total)
-                dean_total_percentage = (total_score / 75) * 100
+                # Average of the question averages (15 questions, max 5 points each)
+                dean_total_percentage = dean_summary['flat_percentage']
                 
                 dean_data = {
                     'total_percentage': dean_total_percentage,
@@ -3432,242 +2947,39 @@ def custom_logout(request):
     return response
 
 def submit_evaluation(request):
-    print("=" * 80)
-    print(f"SUBMIT EVALUATION CALLED - Method: {request.method}")
-    print("=" * 80)
-    
     if request.method == 'POST':
         # Check if user is authenticated
         if not request.user.is_authenticated:
-            print("ERROR: User not authenticated")
             messages.error(request, 'You must be logged in to submit an evaluation.')
             return redirect('main:login')
 
         try:
-            # Get user profile first to determine evaluation type
-            print(f"User: {request.user.username}")
-            print(f"POST keys: {list(request.POST.keys())}")
-            logger.info(f"🔍 Submit evaluation called by {request.user.username}")
-            logger.info(f"🔍 POST data keys: {list(request.POST.keys())}")
-            
-            evaluator_profile = request.user.userprofile
-            
-            # Determine evaluation type based on user role
-            if evaluator_profile.role == Role.STUDENT:
-                evaluation_type_to_check = 'student'
-            else:
-                evaluation_type_to_check = 'peer'
-            
-            # Check if the appropriate evaluation period is active
-            is_active = EvaluationPeriod.objects.filter(
-                evaluation_type=evaluation_type_to_check,
-                is_active=True
-            ).exists()
-            
-            print(f"Evaluation type: {evaluation_type_to_check}, Active: {is_active}")
-            logger.info(f"🔍 Evaluation type: {evaluation_type_to_check}, Active: {is_active}")
-            
-            if not is_active:
-                print(f"ERROR: {evaluation_type_to_check} evaluation period not active")
-                messages.error(request, 'Evaluation period has ended. You cannot submit evaluations at this time.')
-                logger.warning(f"⚠️ {evaluation_type_to_check} evaluation period not active for {request.user.username}")
-                return redirect('main:evaluationform')
-
-            # Retrieve the evaluatee
-            evaluatee_id = request.POST.get('evaluatee')
-            print(f"Evaluatee ID: {evaluatee_id}")
-            logger.info(f"🔍 Evaluatee ID: {evaluatee_id}")
-            
-            if not evaluatee_id:
-                messages.error(request, 'No instructor selected.')
-                return redirect('main:evaluationform')
-            
-            try:
-                evaluatee = User.objects.get(id=evaluatee_id)
-                evaluatee_profile = evaluatee.userprofile
-            except User.DoesNotExist:
-                messages.error(request, 'Selected instructor does not exist.')
-                return redirect('main:evaluationform')
+            evaluator_profile = EvaluationSubmissionService.evaluator_profile(request.user)
 
-            # ✅ UPDATED VALIDATION: Check if user can evaluate this staff member
-            evaluator_profile = request.user.userprofile
-            
-            # Student evaluating staff (Faculty, Coordinator, Dean)
-            if evaluator_profile.role == Role.STUDENT and evaluatee_profile.role in [Role.FACULTY, Role.COORDINATOR, Role.DEAN]:
-                # Irregular students can evaluate any instructor - skip section check
-                if not evaluator_profile.is_irregular:
-                    # Regular students: Check if student's section is assigned to this staff member
-                    if evaluator_profile.section:
-                        is_assigned = SectionAssignment.objects.filter(
-                            user=evaluatee,
-                            section=evaluator_profile.section
-                        ).exists()
-                        
-                        if not is_assigned:
-                            messages.error(request, f'You cannot evaluate {evaluatee.username} as you are not in their assigned section.')
-                            return redirect('main:evaluationform')
-                    else:
-                        messages.error(request, 'You cannot evaluate instructors as you are not assigned to any section.')
-                        return redirect('main:evaluationform')
-
-            # ✅ ADDED: Staff peer evaluation (Faculty, Coordinator, Dean evaluating each other)
-            elif evaluator_profile.role in [Role.FACULTY, Role.COORDINATOR, Role.DEAN] and evaluatee_profile.role in [Role.FACULTY, Role.COORDINATOR, Role.DEAN]:
-                # Check if they are from the same institute
-                if evaluator_profile.institute != evaluatee_profile.institute:
-                    messages.error(request, f'You cannot evaluate {evaluatee.username} as they are from a different institute.')
-                    return redirect('main:evaluationform')
-                
-                # Check if it's a self-evaluation
-                if request.user.id == evaluatee.id:
-                    messages.error(request, 'You cannot evaluate yourself.')
-                    return redirect('main:evaluationform')
-
-            else:
+            # Students submit student (or irregular) evaluations, staff submit peer evaluations
+            submission_type = EvaluationSubmissionService.submission_type(evaluator_profile)
+            if submission_type is None:
                 messages.error(request, 'You do not have permission to evaluate this user.')
                 return redirect('main:evaluationform')
 
-            # Get the current active evaluation period
-            # Determine evaluation type based on user roles
-            if evaluator_profile.role == Role.STUDENT:
-                evaluation_type = 'student'
-                total_questions = 19  # Student evaluation has 19 questions
-            else:
-                evaluation_type = 'peer'
-                total_questions = 15  # Peer evaluation has 15 questions
-            
-            try:
-                current_period = EvaluationPeriod.objects.get(
-                    evaluation_type=evaluation_type,
-                    is_active=True
-                )
-            except EvaluationPeriod.DoesNotExist:
-                messages.error(request, 'No active evaluation period found.')
-                return redirect('main:evaluationform')
-
-            # Prevent duplicate evaluation IN THE SAME PERIOD (checked later based on irregular status)
-            # Allow re-evaluation in different periods
-
-            # Convert numeric values to text ratings
-            rating_map = {
-                '1': 'Poor',
-                '2': 'Unsatisfactory', 
-                '3': 'Satisfactory',
-                '4': 'Very Satisfactory',
-                '5': 'Outstanding'
-            }
-            
-            # Validate all questions and convert to text
-            questions = {}
-            for i in range(1, total_questions + 1):  # Use dynamic question count based on evaluation type
-                question_key = f'question{i}'
-                question_value = request.POST.get(question_key)
-                
-                if not question_value:
-                    messages.error(request, f'All questions must be answered. Missing: Question {i}')
-                    return redirect('main:evaluationform')
-                
-                if question_value not in rating_map:
-                    messages.error(request, f'Invalid rating for question {i}.')
-                    return redirect('main:evaluationform')
-                    
-                questions[question_key] = rating_map[question_value]
-
-            # Get student information (for students) or staff information
-            student_number = request.POST.get('studentNumber', '')
-            student_section = request.POST.get('student_section', '')
-
-            # ✅ FIXED: Properly set student_section based on user role
-            evaluator_profile = request.user.userprofile
-            
-            if evaluator_profile.role == Role.STUDENT:
-                # Use the student's actual section from their profile
-                if evaluator_profile.section:
-                    student_section = evaluator_profile.section.code
-                
-                else:
-                    student_section = 'No Section'
-                    
-            elif evaluator_profile.role in [Role.FACULTY, Role.COORDINATOR, Role.DEAN]:
-                # For staff evaluations, use their institute
-                student_section = f"{evaluator_profile.institute} Staff"
-                
-
-            # Get comments (NEW FIELD)
-            comments = request.POST.get('comments', '')
-
-            
-
-            # Create and save the evaluation response
-            logger.info(f"🔍 Creating evaluation with {len(questions)} questions")
-            logger.info(f"🔍 Questions dict: {questions}")
-            
-            # Check if evaluator is an irregular student
-            if evaluator_profile.role == Role.STUDENT and evaluator_profile.is_irregular:
-                # Save to IrregularEvaluation table
-                logger.info(f"🔍 Irregular student detected - saving to IrregularEvaluation")
-                
-                # Check for duplicate irregular evaluation
-                if IrregularEvaluation.objects.filter(
-                    evaluator=request.user,
-                    evaluatee=evaluatee,
-                    evaluation_period=current_period
-                ).exists():
-                    messages.error(request, 'You have already evaluated this instructor in this evaluation period.')
-                    return redirect('main:evaluationform')
-                
-                evaluation_response = IrregularEvaluation(
-                    evaluator=request.user,
-                    evaluatee=evaluatee,
-                    evaluation_period=current_period,
-                    student_number=student_number,
-                    comments=comments,
-                    **questions
-                )
-                evaluation_response.save()
-                logger.info(f"✅ Irregular evaluation saved successfully! ID: {evaluation_response.id}")
-            else:
-                # Save to regular EvaluationResponse table
-                logger.info(f"🔍 Regular student/staff evaluation - saving to EvaluationResponse")
-                
-                # Check for duplicate regular evaluation in current period
-                if EvaluationResponse.objects.filter(
-                    evaluator=request.user,
-                    evaluatee=evaluatee,
-                    evaluation_period=current_period
-                ).exists():
-                    messages.error(request, 'You have already evaluated this instructor in this evaluation period.')
-                    return redirect('main:evaluationform')
-                
-                evaluation_response = EvaluationResponse(
-                    evaluator=request.user,
-                    evaluatee=evaluatee,
-                    evaluation_period=current_period,
-                    student_number=student_number,
-                    student_section=student_section,
-                    comments=comments,
-                    **questions
-                )
-                evaluation_response.save()
-                logger.info(f"✅ Evaluation saved successfully! ID: {evaluation_response.id}")
-
-            
+            EvaluationSubmissionService.submit(
+                request.user, submission_type, request.POST.get('evaluatee'), request.POST,
+                evaluator_profile=evaluator_profile
+            )
 
             messages.success(request, 'Evaluation submitted successfully!')
 
             evaluation_url = reverse('main:evaluation') + '?submitted=true'
             return redirect(evaluation_url)
 
+        except SubmissionError as e:
+            messages.error(request, str(e))
+            return redirect('main:evaluationform')
         except Exception as e:
-            print("=" * 80)
-            print(f"EXCEPTION OCCURRED: {str(e)}")
-            print("=" * 80)
-            import traceback
-            traceback.print_exc()
-            
+            logger.error(f"Error submitting evaluation for {request.user.username}: {str(e)}", exc_info=True)
             messages.error(request, f'An error occurred: {str(e)}')
             return redirect('main:evaluationform')
 
-    print("Method was not POST, redirecting")
     return redirect('main:evaluationform')
 
 
@@ -3675,128 +2987,36 @@ def submit_upward_evaluation(request):
     """
     Handle submission of upward evaluation (Faculty → Coordinator)
     """
-    print("=" * 80)
-    print(f"SUBMIT UPWARD EVALUATION CALLED - Method: {request.method}")
-    print("=" * 80)
-    
     if request.method == 'POST':
         # Check if user is authenticated
         if not request.user.is_authenticated:
-            print("ERROR: User not authenticated")
             messages.error(request, 'You must be logged in to submit an evaluation.')
             return redirect('main:login')
 
         try:
-            evaluator_profile = request.user.userprofile
-            
+            evaluator_profile = EvaluationSubmissionService.evaluator_profile(request.user)
+
             # ✅ ONLY FACULTY can submit upward evaluation
             if evaluator_profile.role != Role.FACULTY:
                 messages.error(request, 'Only faculty members can submit upward evaluations.')
                 return redirect('main:index')
-            
-            print(f"User: {request.user.username} (Faculty)")
-            logger.info(f"🔍 Upward evaluation submission by {request.user.username}")
-            
-            # Get the coordinator being evaluated
-            coordinator_id = request.POST.get('coordinator_id')
-            print(f"Coordinator ID: {coordinator_id}")
-            
-            if not coordinator_id:
-                messages.error(request, 'No coordinator selected.')
-                return redirect('main:evaluation_form_upward')
-            
-            try:
-                coordinator = User.objects.get(id=coordinator_id)
-                coordinator_profile = coordinator.userprofile
-            except User.DoesNotExist:
-                messages.error(request, 'Selected coordinator does not exist.')
-                return redirect('main:evaluation_form_upward')
-            
-            # Validate coordinator role
-            if coordinator_profile.role != Role.COORDINATOR:
-                messages.error(request, 'You can only evaluate coordinators.')
-                return redirect('main:evaluation_form_upward')
-            
-            # Validate same institute
-            if evaluator_profile.institute != coordinator_profile.institute:
-                messages.error(request, 'You can only evaluate your own institute coordinator.')
-                return redirect('main:evaluation_form_upward')
 
-            # Get the current active upward evaluation period
-            try:
-                current_period = EvaluationPeriod.objects.get(
-                    evaluation_type='upward',
-                    is_active=True
-                )
-            except EvaluationPeriod.DoesNotExist:
-                messages.error(request, 'No active upward evaluation period found.')
-                return redirect('main:evaluation_form_upward')
-
-            # Check for duplicate evaluation in this period
-            from main.models import UpwardEvaluationResponse
-            if UpwardEvaluationResponse.objects.filter(
-                evaluator=request.user,
-                evaluatee=coordinator,
-                evaluation_period=current_period
-            ).exists():
-                messages.error(request, 'You have already evaluated this coordinator in this evaluation period.')
-                return redirect('main:evaluation_form_upward')
-
-            # Convert numeric values to text ratings
-            rating_map = {
-                '1': 'Strongly Disagree',
-                '2': 'Disagree', 
-                '3': 'Neutral',
-                '4': 'Agree',
-                '5': 'Strongly Agree'
-            }
-            
-            # Validate all 15 questions and convert to text
-            questions = {}
-            for i in range(1, 16):  # 15 questions for upward evaluation
-                question_key = f'question{i}'
-                question_value = request.POST.get(question_key)
-                
-                if not question_value:
-                    messages.error(request, f'All questions must be answered. Missing: Question {i}')
-                    return redirect('main:evaluation_form_upward')
-                
-                if question_value not in rating_map:
-                    messages.error(request, f'Invalid rating for question {i}.')
-                    return redirect('main:evaluation_form_upward')
-                    
-                questions[question_key] = rating_map[question_value]
-
-            # Get comments
-            comments = request.POST.get('comments', '')
-
-            # Create and save the upward evaluation response
-            logger.info(f"🔍 Creating upward evaluation with 15 questions")
-            
-            evaluation_response = UpwardEvaluationResponse(
-                evaluator=request.user,
-                evaluatee=coordinator,
-                evaluation_period=current_period,
-                comments=comments,
-                **questions
+            EvaluationSubmissionService.submit(
+                request.user, 'upward', request.POST.get('coordinator_id'), request.POST,
+                evaluator_profile=evaluator_profile
             )
-            evaluation_response.save()
-            logger.info(f"✅ Upward evaluation saved successfully! ID: {evaluation_response.id}")
 
             messages.success(request, 'Upward evaluation submitted successfully!')
             return redirect('main:evaluation_form_upward')
 
+        except SubmissionError as e:
+            messages.error(request, str(e))
+            return redirect('main:evaluation_form_upward')
         except Exception as e:
-            print("=" * 80)
-            print(f"EXCEPTION OCCURRED: {str(e)}")
-            print("=" * 80)
-            import traceback
-            traceback.print_exc()
-            
+            logger.error(f"Error submitting upward evaluation for {request.user.username}: {str(e)}", exc_info=True)
             messages.error(request, f'An error occurred: {str(e)}')
             return redirect('main:evaluation_form_upward')
 
-    print("Method was not POST, redirecting")
     return redirect('main:evaluation_form_upward')
 
 
@@ -3929,128 +3149,36 @@ def submit_dean_evaluation(request):
     """
     Handle submission of dean evaluation (Faculty → Dean)
     """
-    print("=" * 80)
-    print(f"SUBMIT DEAN EVALUATION CALLED - Method: {request.method}")
-    print("=" * 80)
-    
     if request.method == 'POST':
         # Check if user is authenticated
         if not request.user.is_authenticated:
-            print("ERROR: User not authenticated")
             messages.error(request, 'You must be logged in to submit an evaluation.')
             return redirect('main:login')
 
         try:
-            evaluator_profile = request.user.userprofile
-            
+            evaluator_profile = EvaluationSubmissionService.evaluator_profile(request.user)
+
             # ✅ ONLY FACULTY can submit dean evaluation
             if evaluator_profile.role != Role.FACULTY:
                 messages.error(request, 'Only faculty members can submit dean evaluations.')
                 return redirect('main:index')
-            
-            print(f"User: {request.user.username} (Faculty)")
-            logger.info(f"🔍 Dean evaluation submission by {request.user.username}")
-            
-            # Get the dean being evaluated
-            dean_id = request.POST.get('dean_id')
-            print(f"Dean ID: {dean_id}")
-            
-            if not dean_id:
-                messages.error(request, 'No dean selected.')
-                return redirect('main:evaluation_form_dean')
-            
-            try:
-                dean = User.objects.get(id=dean_id)
-                dean_profile = dean.userprofile
-            except User.DoesNotExist:
-                messages.error(request, 'Selected dean does not exist.')
-                return redirect('main:evaluation_form_dean')
-            
-            # Validate dean role
-            if dean_profile.role != Role.DEAN:
-                messages.error(request, 'You can only evaluate deans.')
-                return redirect('main:evaluation_form_dean')
-            
-            # Validate same institute
-            if evaluator_profile.institute != dean_profile.institute:
-                messages.error(request, 'You can only evaluate your own institute dean.')
-                return redirect('main:evaluation_form_dean')
-
-            # Get the current active dean evaluation period
-            try:
-                current_period = EvaluationPeriod.objects.get(
-                    evaluation_type='dean',
-                    is_active=True
-                )
-            except EvaluationPeriod.DoesNotExist:
-                messages.error(request, 'No active dean evaluation period found.')
-                return redirect('main:evaluation_form_dean')
-
-            # Check for duplicate evaluation in this period
-            from main.models import DeanEvaluationResponse
-            if DeanEvaluationResponse.objects.filter(
-                evaluator=request.user,
-                evaluatee=dean,
-                evaluation_period=current_period
-            ).exists():
-                messages.error(request, 'You have already evaluated this dean in this evaluation period.')
-                return redirect('main:evaluation_form_dean')
-
-            # Convert numeric values to text ratings
-            rating_map = {
-                '1': 'Strongly Disagree',
-                '2': 'Disagree', 
-                '3': 'Neutral',
-                '4': 'Agree',
-                '5': 'Strongly Agree'
-            }
-            
-            # Validate all 15 questions and convert to text
-            questions = {}
-            for i in range(1, 16):  # 15 questions for dean evaluation
-                question_key = f'question{i}'
-                question_value = request.POST.get(question_key)
-                
-                if not question_value:
-                    messages.error(request, f'All questions must be answered. Missing: Question {i}')
-                    return redirect('main:evaluation_form_dean')
-                
-                if question_value not in rating_map:
-                    messages.error(request, f'Invalid rating for question {i}.')
-                    return redirect('main:evaluation_form_dean')
-                    
-                questions[question_key] = rating_map[question_value]
-
-            # Get comments
-            comments = request.POST.get('comments', '')
 
-            # Create and save the dean evaluation response
-            logger.info(f"🔍 Creating dean evaluation with 15 questions")
-            
-            evaluation_response = DeanEvaluationResponse(
-                evaluator=request.user,
-                evaluatee=dean,
-                evaluation_period=current_period,
-                comments=comments,
-                **questions
+            EvaluationSubmissionService.submit(
+                request.user, 'dean', request.POST.get('dean_id'), request.POST,
+                evaluator_profile=evaluator_profile
             )
-            evaluation_response.save()
-            logger.info(f"✅ Dean evaluation saved successfully! ID: {evaluation_response.id}")
 
             messages.success(request, 'Dean evaluation submitted successfully!')
             return redirect('main:evaluation_form_dean')
 
+        except SubmissionError as e:
+            messages.error(request, str(e))
+            return redirect('main:evaluation_form_dean')
         except Exception as e:
-            print("=" * 80)
-            print(f"EXCEPTION OCCURRED: {str(e)}")
-            print("=" * 80)
-            import traceback
-            traceback.print_exc()
-            
+            logger.error(f"Error submitting dean evaluation for {request.user.username}: {str(e)}", exc_info=True)
             messages.error(request, f'An error occurred: {str(e)}')
             return redirect('main:evaluation_form_dean')
 
-    print("Method was not POST, redirecting")
     return redirect('main:evaluation_form_dean')
 
 
@@ -4179,61 +3307,29 @@ def submit_student_upward_evaluation(request):
     Handle submission of student upward evaluation (Student → Coordinator)
     """
     if request.method == 'POST':
+        # Check if user is authenticated
+        if not request.user.is_authenticated:
+            messages.error(request, 'You must be logged in to submit an evaluation.')
+            return redirect('main:login')
+
         try:
-            from main.models import StudentUpwardEvaluationResponse, StudentUpwardEvaluationQuestion
-            
-            # Get the evaluatee (coordinator being evaluated)
-            evaluatee_id = request.POST.get('evaluatee_id')
-            evaluatee = User.objects.get(id=evaluatee_id)
-            
-            # Get active period
-            current_period = EvaluationPeriod.objects.get(
-                evaluation_type='student_upward',
-                is_active=True
-            )
-            
-            # Check if already evaluated
-            if StudentUpwardEvaluationResponse.objects.filter(
-                evaluator=request.user,
-                evaluatee=evaluatee,
-                evaluation_period=current_period
-            ).exists():
-                messages.error(request, 'You have already evaluated this coordinator in this period.')
-                return redirect('main:evaluation_form_student_upward')
-            
-            # Collect ratings for all 12 questions
-            question_ratings = {}
-            for i in range(1, 13):  # 12 questions
-                rating_key = f'question{i}'
-                rating_value = request.POST.get(rating_key)
-                
-                if not rating_value:
-                    messages.error(request, f'Please answer question {i}.')
-                    return redirect('main:evaluation_form_student_upward')
-                
-                question_ratings[rating_key] = rating_value
-            
-            # Get comments
-            comments = request.POST.get('comments', '').strip()
-            
-            # Create the evaluation response
-            response = StudentUpwardEvaluationResponse.objects.create(
-                evaluator=request.user,
-                evaluatee=evaluatee,
-                evaluation_period=current_period,
-                **question_ratings,
-                comments=comments
+            evaluator_profile = EvaluationSubmissionService.evaluator_profile(request.user)
+
+            # ✅ ONLY STUDENTS can submit student upward evaluation
+            if evaluator_profile.role != Role.STUDENT:
+                messages.error(request, 'Only students can submit coordinator evaluations.')
+                return redirect('main:index')
+
+            EvaluationSubmissionService.submit(
+                request.user, 'student_upward', request.POST.get('evaluatee_id'), request.POST,
+                evaluator_profile=evaluator_profile
             )
-            
-            logger.info(f"✅ Student upward evaluation created: {request.user.username} → {evaluatee.username}")
+
             messages.success(request, 'Coordinator evaluation submitted successfully!')
             return redirect('main:evaluation_form_student_upward')
-            
-        except EvaluationPeriod.DoesNotExist:
-            messages.error(request, 'No active evaluation period found.')
-            return redirect('main:evaluation_form_student_upward')
-        except User.DoesNotExist:
-            messages.error(request, 'Coordinator not found.')
+
+        except SubmissionError as e:
+            messages.error(request, str(e))
             return redirect('main:evaluation_form_student_upward')
         except Exception as e:
             logger.error(f"Error submitting student upward evaluation: {e}")
@@ -4328,8 +3424,8 @@ class EvaluationFormView(View):
             user_profile = request.user.userprofile
 
             # ✅ Check release statuses once
-            student_eval_released = Evaluation.objects.filter(is_released=True, evaluation_type='student').exists()
-            peer_eval_released = Evaluation.objects.filter(is_released=True, evaluation_type='peer').exists()
+            student_eval_released = Evaluation.is_evaluation_period_active('student')
+            peer_eval_released = Evaluation.is_evaluation_period_active('peer')
 
             # 🔹 STUDENT VIEW
             if user_profile.role == Role.STUDENT:
@@ -4516,118 +3612,39 @@ class EvaluationFormView(View):
 def compute_category_scores(evaluatee, section_code=None, evaluation_period=None):
     """
     Calculate evaluation scores for a specific evaluatee and optional section
-    CRITICAL: Now accepts evaluation_period to filter responses by date range
+    CRITICAL: Now accepts evaluation_period to only count that period's responses
     
     IMPORTANT: This function ONLY uses EvaluationResponse, NOT IrregularEvaluation.
     Irregular student evaluations are excluded from overall results calculations.
     They are displayed separately in profile views but do not affect final scores.
+
+    Scores come from the running EvaluationAggregate rows of the period's
+    responses (all periods without one) instead of re-reading every response.
     """
     
-    # Filter responses by evaluatee
-    # NOTE: Using EvaluationResponse only - irregular evaluations excluded by design
-    responses = EvaluationResponse.objects.filter(evaluatee=evaluatee)
-    
-    # CRITICAL FIX: If evaluation period provided, filter responses by its date range
-    if evaluation_period:
-        responses = responses.filter(
-            submitted_at__gte=evaluation_period.start_date,
-            submitted_at__lte=evaluation_period.end_date
-        )
-    
-    # Filter by section if provided
-    if section_code:        
-        responses = responses.filter(student_section=section_code)
-    
-
-    # Rating to numeric value mapping
-    rating_to_numeric = {
-        'Poor': 1,
-        'Unsatisfactory': 2,
-        'Satisfactory': 3,
-        'Very Satisfactory': 4,
-        'Outstanding': 5
-    }
-
-    # Initialize totals for 4 categories
-    category_a_total = category_b_total = category_c_total = category_d_total = 0
-    count_a = count_b = count_c = count_d = 0
-
-    for response in responses:
-        
-        
-        # Category A: Questions 1-4 (Mastery of Subject Matter) - 35%
-        for i in range(1, 5):
-            question_key = f'question{i}'
-            rating_text = getattr(response, question_key, 'Poor')
-            score = rating_to_numeric.get(rating_text, 1)
-            category_a_total += score
-            count_a += 1
-            
-
-        # Category B: Questions 5-8 (Classroom Management) - 25%
-        for i in range(5, 9):
-            question_key = f'question{i}'
-            rating_text = getattr(response, question_key, 'Poor')
-            score = rating_to_numeric.get(rating_text, 1)
-            category_b_total += score
-            count_b += 1
-            
-
-        # Category C: Questions 9-12 (Compliance to Policies) - 20%
-        for i in range(9, 13):
-            question_key = f'question{i}'
-            rating_text = getattr(response, question_key, 'Poor')
-            score = rating_to_numeric.get(rating_text, 1)
-            category_c_total += score
-            count_c += 1
-            
-
-        # Category D: Questions 13-15 (Personality) - 20%
-        for i in range(13, 16):
-            question_key = f'question{i}'
-            rating_text = getattr(response, question_key, 'Poor')
-            score = rating_to_numeric.get(rating_text, 1)
-            category_d_total += score
-            count_d += 1
-            
-
-    # CORRECTED WEIGHTS to match template
-    max_score_per_question = 5
-    a_weight = 0.35  # Mastery of Subject Matter
-    b_weight = 0.25  # Classroom Management  
-    c_weight = 0.20  # Compliance to Policies
-    d_weight = 0.20  # Personality
-
-    # Compute averages per category as a percent of their weights
-    def scaled_avg(total, count, weight):
-        if count == 0:
-            return 0
-        average_score = total / count  # average out of 5
-        result = (average_score / max_score_per_question) * weight * 100
-        
-        return result
-
-    a_avg = scaled_avg(category_a_total, count_a, a_weight)
-    b_avg = scaled_avg(category_b_total, count_b, b_weight)
-    c_avg = scaled_avg(category_c_total, count_c, c_weight)
-    d_avg = scaled_avg(category_d_total, count_d, d_weight)
-
-    total_percentage = a_avg + b_avg + c_avg + d_avg
+    # NOTE: Student and peer aggregates only - irregular evaluations excluded by design
+    aggregates = EvaluationAggregateService.rows(
+        RESPONSE_TYPES,
+        evaluatee=evaluatee,
+        evaluation_period=evaluation_period,
+        section_code=section_code
+    )
+    summary = EvaluationAggregateService.summary(aggregates, STUDENT_CATEGORY_LAYOUT)
+    a_avg, b_avg, c_avg, d_avg = summary['category_scores']
+    category_a_total, category_b_total, category_c_total, category_d_total = summary['category_totals']
 
     final_result = [
         round(a_avg, 2),
         round(b_avg, 2),
         round(c_avg, 2),
         round(d_avg, 2),
-        round(total_percentage, 2),
+        round(summary['total_percentage'], 2),
         category_a_total,
         category_b_total,
         category_c_total,
         category_d_total
     ]
     
-    
-    
     return final_result
 
 def compute_peer_scores(evaluatee, evaluation_period=None):
@@ -4646,36 +3663,12 @@ def compute_peer_scores(evaluatee, evaluation_period=None):
     if evaluation_period:
         responses = responses.filter(evaluation_period=evaluation_period)
     
-    if not responses.exists():
+    summary = ScoringEngine.score_responses(responses)
+    if summary['response_count'] == 0:
         return [0, 0, 0, 0, 0, 0, 0, 0, 0]  # Return zeros matching the format
     
-    # Rating to numeric value mapping
-    rating_to_numeric = {
-        'Poor': 1,
-        'Unsatisfactory': 2,
-        'Satisfactory': 3,
-        'Very Satisfactory': 4,
-        'Outstanding': 5
-    }
-    
-    total_score = 0
-    total_questions = 0
-    
-    for response in responses:
-        # Peer evaluation has 15 questions
-        for i in range(1, 16):
-            question_key = f'question{i}'
-            rating_text = getattr(response, question_key, 'Poor')
-            score = rating_to_numeric.get(rating_text, 1)
-            total_score += score
-            total_questions += 1
-    
-    # Calculate simple average as percentage
-    if total_questions == 0:
-        total_percentage = 0
-    else:
-        average_score = total_score / total_questions  # Average out of 5
-        total_percentage = (average_score / 5) * 100  # Convert to percentage
+    # Simple average of all 15 questions as a percentage
+    total_percentage = summary['flat_percentage']
     
     # Return format compatible with existing code (no categories for peer)
     return [
@@ -4729,7 +3722,8 @@ def evaluation_form_staffs(request):
                         evaluation_type='peer',
                         start_date=timezone.now(),
                         end_date=timezone.now() + timezone.timedelta(days=30),
-                        is_active=True
+                        is_active=True,
+                        cycle=EvaluationCycleService.for_release('peer')
                     )
                     logger.warning(f"⚠️  AUTO-CREATED peer period: ID={current_peer_period.id}")
                     logger.info("💡 HINT: Admin should run 'Release Evaluations' to properly set up evaluations")
@@ -5123,35 +4117,16 @@ class DeanProfileSettingsView(View):
             if user.userprofile.role != 'Dean':
                 return redirect(index_url)
             
-            evaluation_data = self.get_evaluation_data(user)
-            ai_recommendations = self.get_ai_recommendations(user)
-            assigned_sections = self.get_assigned_sections(user)
-            section_scores = self.get_section_scores(user, assigned_sections)
-            
-            # Get peer evaluation scores
-            peer_scores = self.get_peer_evaluation_scores(user)
-            
-            # Get irregular student evaluation scores
-            irregular_scores = self.get_irregular_evaluation_scores(user)
-            
-            # Convert to JSON for JavaScript
-            import json
-            section_scores_json = json.dumps(section_scores)
+            # Only the page shell is rendered here: scores, comments, history and
+            # ranking are loaded per tab from api_profile_dashboard
             # Convert to list to avoid queryset exhaustion
-            assigned_sections_list = list(assigned_sections)
+            assigned_sections_list = list(self.get_assigned_sections(user).select_related('section'))
+            import json
             section_map_json = json.dumps({assignment.section.id: assignment.section.code for assignment in assigned_sections_list})
-            peer_scores_json = json.dumps(peer_scores)
-            irregular_scores_json = json.dumps(irregular_scores)
-            
-            # Calculate overall statistics for the template
             total_sections = len(assigned_sections_list)
-            sections_with_data = sum(1 for scores in section_scores.values() if scores['has_data'])
-            total_evaluations = EvaluationResponse.objects.filter(evaluatee=user).count()
 
-            evaluation_history = self.get_evaluation_history(user)
-            
             # Identify current active student evaluation period (if any)
-            active_student_period = EvaluationPeriod.objects.filter(evaluation_type='student', is_active=True).order_by('-start_date').first()
+            active_student_period_id = ReleaseStateRegistry.active_period_id('student')
 
             # Get all sections and years for section assignment
             sections = Section.objects.all().order_by('year_level', 'code')
@@ -5161,37 +4136,19 @@ class DeanProfileSettingsView(View):
             # Add timestamp for cache busting
             import time
             timestamp = int(time.time())
-            
-            # Calculate user ranking
-            ranking_data = calculate_user_ranking(user)
 
             return render(request, 'main/dean_profile_settings.html', {
                 'user': user,
                 'next_url': next_url,
-                'evaluation_data': evaluation_data,
-                'ai_recommendations': ai_recommendations,
                 'assigned_sections': assigned_sections_list,
-                'section_scores': section_scores,
-                'section_scores_json': section_scores_json,
                 'section_map_json': section_map_json,
-                'peer_scores': peer_scores,
-                'peer_scores_json': peer_scores_json,
-                'irregular_scores': irregular_scores,
-                'irregular_scores_json': irregular_scores_json,
-                'has_any_data': any(scores['has_data'] for scores in section_scores.values()),
                 'total_sections': total_sections,
-                'sections_with_data': sections_with_data,
-                'total_evaluations': total_evaluations,
                 'evaluation_period_ended': can_view_evaluation_results('student'),
-                'evaluation_history': evaluation_history,
-                'active_student_period_id': active_student_period.id if active_student_period else None,
+                'active_student_period_id': active_student_period_id,
                 'sections': sections,
                 'years': years,
                 'currently_assigned_ids': currently_assigned_ids,
-                'timestamp': timestamp,  # Cache busting timestamp
-                'ranking': ranking_data.get('rank'),
-                'total_users': ranking_data.get('total_users'),
-                'overall_score': ranking_data.get('overall_score'),
+                'timestamp': timestamp,
             })
         return redirect('login')
     
@@ -5449,7 +4406,7 @@ class DeanProfileSettingsView(View):
                     submitted_at__gte=latest_period.start_date,
                     submitted_at__lte=latest_period.end_date,
                     comments__isnull=False
-                ).exclude(comments='').values_list('comments', flat=True)
+                ).exclude(comments='').values_list('comments', 'comment_sentiment')
             else:
                 # No results yet - section has no data
                 a_avg = b_avg = c_avg = d_avg = total_percentage = 0
@@ -5462,8 +4419,7 @@ class DeanProfileSettingsView(View):
             negative_comments = []
             mixed_comments = []
             
-            for comment in comments_queryset:
-                sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+            for comment, sentiment in SentimentClassifier.labelled(comments_queryset):
                 if sentiment == 'positive':
                     positive_comments.append(comment)
                 elif sentiment == 'negative':
@@ -5598,15 +4554,14 @@ class DeanProfileSettingsView(View):
         if latest_period:
             comments_query = comments_query.filter(evaluation_period=latest_period)
         
-        all_comments = comments_query.values_list('comments', flat=True)
+        all_comments = comments_query.values_list('comments', 'comment_sentiment')
         
         # Categorize all comments using sentiment analysis
         positive_comments = []
         negative_comments = []
         mixed_comments = []
         
-        for comment in all_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(all_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -5770,13 +4725,12 @@ class DeanProfileSettingsView(View):
         # Fetch peer comments and categorize them
         peer_comments = peer_evaluations.filter(
             comments__isnull=False
-        ).exclude(comments='').values_list('comments', flat=True)
+        ).exclude(comments='').values_list('comments', 'comment_sentiment')
         
         positive_comments = []
         negative_comments = []
         
-        for comment in peer_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(peer_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -5876,13 +4830,12 @@ class DeanProfileSettingsView(View):
         
         irregular_comments = irregular_evaluations.filter(
             comments__isnull=False
-        ).exclude(comments='').values_list('comments', flat=True)
+        ).exclude(comments='').values_list('comments', 'comment_sentiment')
         
         positive_comments = []
         negative_comments = []
         
-        for comment in irregular_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(irregular_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -5914,71 +4867,34 @@ class CoordinatorProfileSettingsView(View):
             if user.userprofile.role != 'Coordinator':
                 return redirect(index_url)
             
-            evaluation_data = self.get_evaluation_data(user)
-            ai_recommendations = self.get_ai_recommendations(user)
-            assigned_sections = self.get_assigned_sections(user)
-            section_scores = self.get_section_scores(user, assigned_sections)
-            
-            # Get peer evaluation scores
-            peer_scores = self.get_peer_evaluation_scores(user)
-            
-            # Get irregular student evaluation scores
-            irregular_scores = self.get_irregular_evaluation_scores(user)
-            
-            # Convert to JSON for JavaScript
-            import json
-            section_scores_json = json.dumps(section_scores)
+            # Only the page shell is rendered here: scores, comments, history and
+            # ranking are loaded per tab from api_profile_dashboard
             # Convert to list to avoid queryset exhaustion
-            assigned_sections_list = list(assigned_sections)
+            assigned_sections_list = list(self.get_assigned_sections(user).select_related('section'))
+            import json
             section_map_json = json.dumps({assignment.section.id: assignment.section.code for assignment in assigned_sections_list})
-            peer_scores_json = json.dumps(peer_scores)
-            irregular_scores_json = json.dumps(irregular_scores)
-            
-            # Calculate overall statistics for the template
             total_sections = len(assigned_sections_list)
-            sections_with_data = sum(1 for scores in section_scores.values() if scores['has_data'])
-            total_evaluations = EvaluationResponse.objects.filter(evaluatee=user).count()
 
-            evaluation_history = self.get_evaluation_history(user)
-            
             # Get all sections and years for section assignment
             sections = Section.objects.all().order_by('year_level', 'code')
             years = list(Section.objects.values_list('year_level', flat=True).distinct().order_by('year_level'))
             currently_assigned_ids = [assignment.section.id for assignment in assigned_sections_list]
-            
+
             # Add timestamp for cache busting
             import time
             timestamp = int(time.time())
-            
-            # Calculate user ranking
-            ranking_data = calculate_user_ranking(user)
 
             return render(request, 'main/coordinator_profile_settings.html', {
                 'user': user,
                 'next_url': next_url,
-                'evaluation_data': evaluation_data,
-                'ai_recommendations': ai_recommendations,
                 'assigned_sections': assigned_sections_list,
-                'section_scores': section_scores,
-                'section_scores_json': section_scores_json,
                 'section_map_json': section_map_json,
-                'peer_scores': peer_scores,
-                'peer_scores_json': peer_scores_json,
-                'irregular_scores': irregular_scores,
-                'irregular_scores_json': irregular_scores_json,
-                'has_any_data': any(scores['has_data'] for scores in section_scores.values()),
                 'total_sections': total_sections,
-                'sections_with_data': sections_with_data,
-                'total_evaluations': total_evaluations,
                 'evaluation_period_ended': can_view_evaluation_results('student'),
-                'evaluation_history': evaluation_history,
                 'sections': sections,
                 'years': years,
                 'currently_assigned_ids': currently_assigned_ids,
                 'timestamp': timestamp,
-                'ranking': ranking_data.get('rank'),
-                'total_users': ranking_data.get('total_users'),
-                'overall_score': ranking_data.get('overall_score'),
             })
         return redirect('login')
     
@@ -6234,7 +5150,7 @@ class CoordinatorProfileSettingsView(View):
                     submitted_at__gte=latest_period.start_date,
                     submitted_at__lte=latest_period.end_date,
                     comments__isnull=False
-                ).exclude(comments='').values_list('comments', flat=True)
+                ).exclude(comments='').values_list('comments', 'comment_sentiment')
             else:
                 # No results yet - section has no data
                 a_avg = b_avg = c_avg = d_avg = total_percentage = 0
@@ -6247,8 +5163,7 @@ class CoordinatorProfileSettingsView(View):
             negative_comments = []
             mixed_comments = []
             
-            for comment in comments_queryset:
-                sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+            for comment, sentiment in SentimentClassifier.labelled(comments_queryset):
                 if sentiment == 'positive':
                     positive_comments.append(comment)
                 elif sentiment == 'negative':
@@ -6383,15 +5298,14 @@ class CoordinatorProfileSettingsView(View):
         if latest_period:
             comments_query = comments_query.filter(evaluation_period=latest_period)
         
-        all_comments = comments_query.values_list('comments', flat=True)
+        all_comments = comments_query.values_list('comments', 'comment_sentiment')
         
         # Categorize all comments using sentiment analysis
         positive_comments = []
         negative_comments = []
         mixed_comments = []
         
-        for comment in all_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(all_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -6555,13 +5469,12 @@ class CoordinatorProfileSettingsView(View):
         # Fetch peer comments and categorize them
         peer_comments = peer_evaluations.filter(
             comments__isnull=False
-        ).exclude(comments='').values_list('comments', flat=True)
+        ).exclude(comments='').values_list('comments', 'comment_sentiment')
         
         positive_comments = []
         negative_comments = []
         
-        for comment in peer_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(peer_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -6661,13 +5574,12 @@ class CoordinatorProfileSettingsView(View):
         
         irregular_comments = irregular_evaluations.filter(
             comments__isnull=False
-        ).exclude(comments='').values_list('comments', flat=True)
+        ).exclude(comments='').values_list('comments', 'comment_sentiment')
         
         positive_comments = []
         negative_comments = []
         
-        for comment in irregular_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(irregular_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -6697,38 +5609,19 @@ class FacultyProfileSettingsView(View):
             
             next_url = request.GET.get('next', request.META.get('HTTP_REFERER', index_url))
             
-            if user.userprofile.role != 'Faculty':
-                return redirect(index_url)
-            
-            # Get assigned sections for this faculty
-            assigned_sections = self.get_assigned_sections(user)
-            
-            
-            # Check if faculty has any assigned sections
-            has_sections = assigned_sections.exists()
-            
-            # Get section scores and map
-            section_scores = self.get_section_scores(user, assigned_sections) if has_sections else {}
-            section_scores_json = json.dumps(section_scores)
+            if user.userprofile.role != 'Faculty':
+                return redirect(index_url)
             
-            # Get peer evaluation scores
-            peer_scores = self.get_peer_evaluation_scores(user)
-            peer_scores_json = json.dumps(peer_scores)
+            # Only the page shell is rendered here: scores, comments, history and
+            # ranking are loaded per tab from api_profile_dashboard
+            assigned_sections = list(self.get_assigned_sections(user).select_related('section'))
             
-            # Get irregular student evaluation scores
-            irregular_scores = self.get_irregular_evaluation_scores(user)
-            irregular_scores_json = json.dumps(irregular_scores)
+            # Check if faculty has any assigned sections
+            has_sections = bool(assigned_sections)
             
             # Create section map for JavaScript
-            section_map = {}
-            if has_sections:
-                for assignment in assigned_sections:
-                    section_map[assignment.section.id] = assignment.section.code
-            
+            section_map = {assignment.section.id: assignment.section.code for assignment in assigned_sections}
             section_map_json = json.dumps(section_map)
-            has_any_data = any(scores.get('has_data', False) for scores in section_scores.values()) if has_sections else False
-
-            evaluation_history = self.get_evaluation_history(user)
             
             # Get all sections and years for section assignment
             sections = Section.objects.all().order_by('year_level', 'code')
@@ -6738,32 +5631,18 @@ class FacultyProfileSettingsView(View):
             # Add timestamp for cache busting
             import time
             timestamp = int(time.time())
-            
-            # Calculate user ranking
-            ranking_data = calculate_user_ranking(user)
 
             return render(request, 'main/faculty_profile_settings.html', {
                 'user': user,
                 'next_url': next_url,
                 'assigned_sections': assigned_sections,
-                'section_scores': section_scores,
-                'section_scores_json': section_scores_json,
                 'section_map_json': section_map_json,
-                'peer_scores': peer_scores,
-                'peer_scores_json': peer_scores_json,
-                'irregular_scores': irregular_scores,
-                'irregular_scores_json': irregular_scores_json,
-                'has_any_data': has_any_data,
                 'has_sections': has_sections,
                 'evaluation_period_ended': can_view_evaluation_results('student'),
-                'evaluation_history': evaluation_history,
                 'sections': sections,
                 'years': years,
                 'currently_assigned_ids': currently_assigned_ids,
                 'timestamp': timestamp,
-                'ranking': ranking_data.get('rank'),
-                'total_users': ranking_data.get('total_users'),
-                'overall_score': ranking_data.get('overall_score'),
             })
         return redirect('login')
 
@@ -6897,7 +5776,7 @@ class FacultyProfileSettingsView(View):
                     submitted_at__gte=latest_period.start_date,
                     submitted_at__lte=latest_period.end_date,
                     comments__isnull=False
-                ).exclude(comments='').values_list('comments', flat=True)
+                ).exclude(comments='').values_list('comments', 'comment_sentiment')
             else:
                 # No results yet - section has no data
                 a_avg = b_avg = c_avg = d_avg = total_percentage = 0
@@ -6910,8 +5789,7 @@ class FacultyProfileSettingsView(View):
             negative_comments = []
             mixed_comments = []
             
-            for comment in comments_queryset:
-                sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+            for comment, sentiment in SentimentClassifier.labelled(comments_queryset):
                 if sentiment == 'positive':
                     positive_comments.append(comment)
                 elif sentiment == 'negative':
@@ -6946,47 +5824,8 @@ class FacultyProfileSettingsView(View):
             student_section=section_code
         )
         
-        if not responses.exists():
-            return [0, 0, 0, 0, 0]
-        
-        # Initialize counters for each rating level
-        poor = 0
-        unsatisfactory = 0
-        satisfactory = 0
-        very_satisfactory = 0
-        outstanding = 0
-        
-        # Rating to numeric mapping for calculation
-        rating_values = {
-            'Poor': 1,
-            'Unsatisfactory': 2, 
-            'Satisfactory': 3,
-            'Very Satisfactory': 4,
-            'Outstanding': 5
-        }
-        
         # Count ratings across all questions and responses
-        for response in responses:
-            # Check all 15 questions
-            for i in range(1, 16):
-                question_key = f'question{i}'
-                rating = getattr(response, question_key, 'Poor')
-                
-                # Convert rating to numeric and categorize
-                numeric_rating = rating_values.get(rating, 1)
-                if numeric_rating == 1:
-                    poor += 1
-                elif numeric_rating == 2:
-                    unsatisfactory += 1
-                elif numeric_rating == 3:
-                    satisfactory += 1
-                elif numeric_rating == 4:
-                    very_satisfactory += 1
-                elif numeric_rating == 5:
-                    outstanding += 1
-        
-        # Return the distribution
-        return [poor, unsatisfactory, satisfactory, very_satisfactory, outstanding]
+        return ScoringEngine.score_responses(responses)['distribution']
     
     def get_evaluation_data(self, user):
         """Get evaluation data for the faculty - WITH SECTION FILTERING"""
@@ -7244,13 +6083,12 @@ class FacultyProfileSettingsView(View):
         # Fetch peer comments and categorize them
         peer_comments = peer_evaluations.filter(
             comments__isnull=False
-        ).exclude(comments='').values_list('comments', flat=True)
+        ).exclude(comments='').values_list('comments', 'comment_sentiment')
         
         positive_comments = []
         negative_comments = []
         
-        for comment in peer_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(peer_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -7346,13 +6184,12 @@ class FacultyProfileSettingsView(View):
         # Fetch irregular comments and categorize them
         irregular_comments = irregular_evaluations.filter(
             comments__isnull=False
-        ).exclude(comments='').values_list('comments', flat=True)
+        ).exclude(comments='').values_list('comments', 'comment_sentiment')
         
         positive_comments = []
         negative_comments = []
         
-        for comment in irregular_comments:
-            sentiment = TeachingAIRecommendationService.analyze_comment_sentiment(comment)
+        for comment, sentiment in SentimentClassifier.labelled(irregular_comments):
             if sentiment == 'positive':
                 positive_comments.append(comment)
             elif sentiment == 'negative':
@@ -7525,8 +6362,7 @@ def assign_section(request, user_id):
                         
                         # Delete all evaluations
                         total_deleted = evaluator_count + evaluatee_count
-                        evaluations_as_evaluator.delete()
-                        evaluations_as_evaluatee.delete()
+                        ResponseDeletionService.delete(evaluations_as_evaluator, evaluations_as_evaluatee)
                         
                     
                     # Students still get single section
@@ -7602,7 +6438,6 @@ def remove_section_assignment(request, assignment_id):
                 student_section=section_code
             )
             evaluatee_count = evaluations_as_evaluatee.count()
-            evaluations_as_evaluatee.delete()
             
             # Delete evaluations where this user is the EVALUATOR (evaluations they submitted)
             evaluations_as_evaluator = EvaluationResponse.objects.filter(
@@ -7610,7 +6445,7 @@ def remove_section_assignment(request, assignment_id):
                 student_section=section_code
             )
             evaluator_count = evaluations_as_evaluator.count()
-            evaluations_as_evaluator.delete()
+            ResponseDeletionService.delete(evaluations_as_evaluatee, evaluations_as_evaluator)
             
             # Log admin activity
             log_admin_activity(
@@ -7996,6 +6831,32 @@ def admin_activity_logs(request):
     }
     return render(request, 'main/activity_logs.html', context)
 
+@login_required
+def admin_request_metrics(request):
+    """Per-endpoint request timings, SQL query counts and slow requests"""
+    if not request.user.is_superuser:
+        return redirect('main:index')
+    
+    context = {
+        'metrics': RequestMetrics.snapshot(),
+    }
+    return render(request, 'main/request_metrics.html', context)
+
+@require_http_methods(["GET", "POST"])
+def api_request_metrics(request):
+    """
+    Request metrics as JSON (see RequestMetrics.snapshot).
+    POST clears them, e.g. before a load test.
+    """
+    if not request.user.is_authenticated or not request.user.is_superuser:
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    
+    if request.method == 'POST':
+        RequestMetrics.reset()
+        return JsonResponse({'success': True, 'message': 'Request metrics cleared'})
+    
+    return JsonResponse({'success': True, **RequestMetrics.snapshot()})
+
 def manage_institutes_courses(request):
     """View for managing institutes and courses"""
     if not request.user.is_authenticated or not request.user.is_superuser:
@@ -8087,31 +6948,20 @@ class EvaluationHistoryView(View):
         evaluation_history = []
         rating_values = {'Poor': 1, 'Unsatisfactory': 2, 'Satisfactory': 3, 'Very Satisfactory': 4, 'Outstanding': 5}
         
-        # Group periods by timestamp - combine "Student Evaluation" and "Peer Evaluation" with same timestamp
+        # Group periods by evaluation cycle - combine "Student Evaluation" and "Peer Evaluation" released together
         import re
         from collections import defaultdict
-        timestamp_groups = defaultdict(list)
+        cycle_groups = defaultdict(list)
         
         for period in completed_periods:
-            # Extract timestamp pattern from period name to group related periods
-            # Match patterns like "December 02, 2025 19:36" or "December 2025"
-            timestamp_match = re.search(r'((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}(?:\s+\d{1,2}:\d{2})?)', period.name)
-            
-            if timestamp_match:
-                timestamp_key = timestamp_match.group(1)
-            else:
-                # If no timestamp, use full name as key
-                timestamp_key = period.name
-            
-            # Group all periods with same timestamp together
-            timestamp_groups[timestamp_key].append(period)
+            cycle_groups[EvaluationCycleService.group_key(period)].append(period)
         
-        # Process each timestamp group - ONE entry per timestamp combining ALL evaluation types from all related periods
-        for timestamp_key, periods_in_group in timestamp_groups.items():
+        # Process each cycle - ONE entry per cycle combining ALL evaluation types from all related periods
+        for cycle_key, periods_in_group in cycle_groups.items():
             # Get the representative period (first one) for display info
             representative_period = periods_in_group[0]
             
-            # Collect ALL responses from ALL periods in this timestamp group
+            # Collect ALL responses from ALL periods in this cycle
             all_period_ids = [p.id for p in periods_in_group]
             # Get ALL evaluations across ALL periods in this group (student, irregular, peer)
             regular_responses = EvaluationResponse.objects.filter(
@@ -8307,7 +7157,9 @@ def process_evaluation_results_for_user(user, evaluation_period=None):
                 'calculated_at': timezone.now()
             }
         )
-        
+        RankingService.invalidate(evaluation_period)
+        AIRecommendationCacheService.invalidate_user(user)
+        ProfileDashboardService.invalidate_period(evaluation_period)
         
         return evaluation_result
         
@@ -8322,24 +7174,9 @@ def archive_period_results_to_history(evaluation_period):
     After archiving, deletes the old results from EvaluationResult table
     """
     try:
-        # Get all results for this evaluation period
-        results = EvaluationResult.objects.filter(evaluation_period=evaluation_period)
-        
-        archived_count = 0
-        for result in results:
-            # Create a history record from the result
-            history = EvaluationHistory.create_from_result(result)
-            archived_count += 1
-            logger.info(f"Archived result for {result.user.username} to history: {result.total_percentage}%")
-        
-        # DELETE the old results from EvaluationResult after archiving to history
-        # This ensures only current period results remain in EvaluationResult table
-        if archived_count > 0:
-            deleted_count = results.delete()[0]
-            logger.info(f"Deleted {deleted_count} old evaluation results from EvaluationResult table after archiving")
-        
-        logger.info(f"Successfully archived {archived_count} evaluation results to history for period: {evaluation_period.name}")
-        return archived_count
+        stats = HistoryArchiveService.archive_period(evaluation_period)
+        logger.info(f"Successfully archived {stats['archived_count']} evaluation results to history for period: {evaluation_period.name}")
+        return stats['archived_count']
         
     except Exception as e:
         logger.error(f"Error archiving period results to history: {str(e)}", exc_info=True)
@@ -8358,34 +7195,7 @@ def get_rating_distribution(user, evaluation_period=None):
             submitted_at__lte=evaluation_period.end_date
         )
     
-    poor = unsatisfactory = satisfactory = very_satisfactory = outstanding = 0
-    
-    rating_values = {
-        'Poor': 1,
-        'Unsatisfactory': 2, 
-        'Satisfactory': 3,
-        'Very Satisfactory': 4,
-        'Outstanding': 5
-    }
-    
-    for response in responses:
-        for i in range(1, 16):
-            question_key = f'question{i}'
-            rating = getattr(response, question_key, 'Poor')
-            numeric_rating = rating_values.get(rating, 1)
-            
-            if numeric_rating == 1:
-                poor += 1
-            elif numeric_rating == 2:
-                unsatisfactory += 1
-            elif numeric_rating == 3:
-                satisfactory += 1
-            elif numeric_rating == 4:
-                very_satisfactory += 1
-            elif numeric_rating == 5:
-                outstanding += 1
-    
-    return [poor, unsatisfactory, satisfactory, very_satisfactory, outstanding]
+    return ScoringEngine.score_responses(responses)['distribution']
 
 def move_current_results_to_history():
     """
@@ -8395,123 +7205,71 @@ def move_current_results_to_history():
     Returns: count of records moved
     """
     try:
-        results = EvaluationResult.objects.all()
-        
-        if not results.exists():
-            return 0
-        
-        # Bulk create history records for better performance
-        history_records = []
-        for result in results:
-            history_records.append(EvaluationHistory(
-                user=result.user,
-                evaluation_period=result.evaluation_period,
-                evaluation_type=result.evaluation_type,
-                total_percentage=result.total_percentage,
-                total_responses=result.total_responses,
-                archived_at=timezone.now()
-            ))
-        
-        # Bulk insert all history records at once (much faster)
-        EvaluationHistory.objects.bulk_create(history_records, batch_size=100)
-        moved_count = len(history_records)
-        logger.info(f"Bulk moved {moved_count} results to history")
-        
-        # Delete all results from EvaluationResult after moving to history
-        deleted_count = results.delete()[0]
-        logger.info(f"Cleared {deleted_count} records from EvaluationResult table")
-        
-        return moved_count
+        stats = HistoryArchiveService.archive()
+        logger.info(f"Bulk moved {stats['archived_count']} results to history ({stats['rows_per_second']} rows/s)")
+        return stats['archived_count']
         
     except Exception as e:
         logger.error(f"Error moving results to history: {str(e)}", exc_info=True)
         return 0
 
-def process_evaluation_period_to_results(evaluation_period):
+def process_evaluation_period_to_results(evaluation_period, raise_errors=False):
     """
     Process all evaluation responses from a period and create EvaluationResult records
     This is called when admin UNRELEASES (ends) an evaluation period
     These results will be displayed in instructor profile settings
-    Returns: count of results processed
+    Returns: count of results processed (0 on error, unless raise_errors=True)
     """
     try:
-        from main.models import EvaluationResult, Section
+        from main.models import Section
         
-        # Get all staff members
-        staff_users = User.objects.filter(
-            userprofile__role__in=[Role.FACULTY, Role.COORDINATOR, Role.DEAN]
-        ).distinct()
+        # Score every staff member's responses in this period, grouped by section,
+        # from the running aggregates: one row per evaluatee and section
+        aggregates = EvaluationAggregateService.rows(
+            RESPONSE_TYPES, evaluation_period=evaluation_period
+        ).filter(
+            evaluatee__userprofile__role__in=[Role.FACULTY, Role.COORDINATOR, Role.DEAN]
+        ).exclude(section_code='')
+        
+        groups = EvaluationAggregateService.aggregate(
+            aggregates,
+            group_by=('evaluatee_id', 'evaluatee__username', 'section_code'),
+            layout=PERIOD_RESULTS_CATEGORY_LAYOUT
+        )
         
+        section_codes = {group['section_code'] for group in groups}
+        sections = Section.objects.in_bulk(section_codes, field_name='code')
+        
+        writer = EvaluationResultWriter(evaluation_period)
         processed_count = 0
         
-        for staff_user in staff_users:
-            # Get all responses for this user in this period
-            responses = EvaluationResponse.objects.filter(
-                evaluatee=staff_user,
-                submitted_at__gte=evaluation_period.start_date,
-                submitted_at__lte=evaluation_period.end_date
-            )
-            
-            if not responses.exists():
+        for group in groups:
+            section_code = group['section_code']
+            section = sections.get(section_code)
+            if section is None:
+                logger.warning(f"Section {section_code} not found")
                 continue
             
-            # Group responses by section
-            sections_evaluated = set(responses.values_list('student_section', flat=True).distinct())
+            summary = group['summary']
+            writer.add_summary(group['evaluatee_id'], summary, section=section)
             
-            for section_code in sections_evaluated:
-                if not section_code:
-                    continue
-                
-                # Get section object
-                try:
-                    section = Section.objects.get(code=section_code)
-                except Section.DoesNotExist:
-                    logger.warning(f"Section {section_code} not found")
-                    continue
-                
-                # Filter responses for this section
-                section_responses = responses.filter(student_section=section_code)
-                
-                if not section_responses.exists():
-                    continue
-                
-                # Calculate category scores
-                category_scores = compute_category_scores_from_responses(section_responses)
-                
-                # Get rating distribution
-                rating_dist = get_rating_distribution_from_responses(section_responses)
-                
-                # Create or update EvaluationResult
-                result, created = EvaluationResult.objects.update_or_create(
-                    user=staff_user,
-                    evaluation_period=evaluation_period,
-                    section=section,
-                    defaults={
-                        'category_a_score': category_scores['category_a'],
-                        'category_b_score': category_scores['category_b'],
-                        'category_c_score': category_scores['category_c'],
-                        'category_d_score': category_scores['category_d'],
-                        'total_percentage': category_scores['total_percentage'],
-                        'average_rating': category_scores['average_rating'],
-                        'total_responses': section_responses.count(),
-                        'total_questions': 15,
-                        'poor_count': rating_dist[0],
-                        'unsatisfactory_count': rating_dist[1],
-                        'satisfactory_count': rating_dist[2],
-                        'very_satisfactory_count': rating_dist[3],
-                        'outstanding_count': rating_dist[4],
-                    }
-                )
-                
-                processed_count += 1
-                action = "Created" if created else "Updated"
-                logger.info(f"{action} EvaluationResult for {staff_user.username} - {section_code}: {category_scores['total_percentage']:.1f}%")
+            processed_count += 1
+            logger.info(f"Queued EvaluationResult for {group['evaluatee__username']} - {section_code}: {summary['total_percentage']:.1f}%")
+        
+        # Upsert every result row in batches inside one transaction
+        writer.write()
         
+        # Materialize rankings once so rankings pages, profiles and reports never recompute them
+        RankingService.snapshot_period(evaluation_period)
+        AIRecommendationCacheService.invalidate_period(evaluation_period)
+        ProfileDashboardService.build_for_staff()
         logger.info(f"Processed {processed_count} evaluation results for period: {evaluation_period.name}")
         return processed_count
         
     except Exception as e:
         logger.error(f"Error processing evaluation period to results: {str(e)}", exc_info=True)
+        if raise_errors:
+            raise
         return 0
 
 def compute_category_scores_from_responses(responses):
@@ -8519,68 +7277,16 @@ def compute_category_scores_from_responses(responses):
     Compute category scores from a queryset of EvaluationResponse objects
     Returns dict with category scores and totals
     """
-    rating_values = {'Poor': 1, 'Unsatisfactory': 2, 'Satisfactory': 3, 'Very Satisfactory': 4, 'Outstanding': 5}
-    
-    # Category mappings (question number -> category)
-    category_a_questions = [1, 2, 3, 4, 5]  # Mastery (35%)
-    category_b_questions = [6, 7, 8, 9]     # Classroom Management (25%)
-    category_c_questions = [10, 11, 12]     # Compliance (20%)
-    category_d_questions = [13, 14, 15]     # Personality (20%)
-    
-    total_a = total_b = total_c = total_d = 0
-    count_a = count_b = count_c = count_d = 0
-    
-    for response in responses:
-        # Category A
-        for q in category_a_questions:
-            rating = getattr(response, f'question{q}', 'Poor')
-            total_a += rating_values.get(rating, 1)
-            count_a += 1
-        
-        # Category B
-        for q in category_b_questions:
-            rating = getattr(response, f'question{q}', 'Poor')
-            total_b += rating_values.get(rating, 1)
-            count_b += 1
-        
-        # Category C
-        for q in category_c_questions:
-            rating = getattr(response, f'question{q}', 'Poor')
-            total_c += rating_values.get(rating, 1)
-            count_c += 1
-        
-        # Category D
-        for q in category_d_questions:
-            rating = getattr(response, f'question{q}', 'Poor')
-            total_d += rating_values.get(rating, 1)
-            count_d += 1
-    
-    # Calculate averages (1-5 scale)
-    avg_a = (total_a / count_a) if count_a > 0 else 0
-    avg_b = (total_b / count_b) if count_b > 0 else 0
-    avg_c = (total_c / count_c) if count_c > 0 else 0
-    avg_d = (total_d / count_d) if count_d > 0 else 0
-    
-    # Convert to percentages with weights
-    category_a = (avg_a / 5) * 35  # 35% weight
-    category_b = (avg_b / 5) * 25  # 25% weight
-    category_c = (avg_c / 5) * 20  # 20% weight
-    category_d = (avg_d / 5) * 20  # 20% weight
-    
-    total_percentage = category_a + category_b + category_c + category_d
-    
-    # Calculate overall average rating
-    total_ratings = total_a + total_b + total_c + total_d
-    total_questions = count_a + count_b + count_c + count_d
-    average_rating = (total_ratings / total_questions) if total_questions > 0 else 0
+    summary = ScoringEngine.score_responses(responses, PERIOD_RESULTS_CATEGORY_LAYOUT)
+    category_a, category_b, category_c, category_d = summary['category_scores']
     
     return {
         'category_a': round(category_a, 2),
         'category_b': round(category_b, 2),
         'category_c': round(category_c, 2),
         'category_d': round(category_d, 2),
-        'total_percentage': round(total_percentage, 2),
-        'average_rating': round(average_rating, 2)
+        'total_percentage': round(summary['total_percentage'], 2),
+        'average_rating': round(summary['average_rating'], 2)
     }
 
 def get_rating_distribution_from_responses(responses):
@@ -8588,27 +7294,7 @@ def get_rating_distribution_from_responses(responses):
     Get rating distribution counts from a queryset of responses
     Returns [poor, unsatisfactory, satisfactory, very_satisfactory, outstanding]
     """
-    rating_values = {'Poor': 1, 'Unsatisfactory': 2, 'Satisfactory': 3, 'Very Satisfactory': 4, 'Outstanding': 5}
-    
-    poor = unsatisfactory = satisfactory = very_satisfactory = outstanding = 0
-    
-    for response in responses:
-        for i in range(1, 16):
-            rating = getattr(response, f'question{i}', 'Poor')
-            numeric_rating = rating_values.get(rating, 1)
-            
-            if numeric_rating == 1:
-                poor += 1
-            elif numeric_rating == 2:
-                unsatisfactory += 1
-            elif numeric_rating == 3:
-                satisfactory += 1
-            elif numeric_rating == 4:
-                very_satisfactory += 1
-            elif numeric_rating == 5:
-                outstanding += 1
-    
-    return [poor, unsatisfactory, satisfactory, very_satisfactory, outstanding]
+    return ScoringEngine.score_responses(responses)['distribution']
 
 def process_all_evaluation_results(evaluation_period=None):
     """
@@ -8637,36 +7323,60 @@ def process_all_evaluation_results(evaluation_period=None):
             }
         
         # Get all staff members who might have been evaluated
-        staff_users = User.objects.filter(
+        staff_users = list(User.objects.filter(
             userprofile__role__in=[Role.FACULTY, Role.COORDINATOR, Role.DEAN]
-        ).distinct()
+        ).distinct().values_list('id', 'username', 'userprofile__section_id'))
+        
+        # One GROUP BY query scores every staff member for the whole period
+        is_peer_evaluation = current_period.evaluation_type == 'peer'
+        groups = EvaluationAggregateService.period_section_scores(
+            current_period,
+            evaluatee_ids=[user_id for user_id, _, _ in staff_users]
+        )
+        evaluatee_scores = ScoreAggregationService.merge_groups(groups)
+        
+        section_codes = {scores['top_section'] for scores in evaluatee_scores.values() if scores['top_section']}
+        sections = Section.objects.in_bulk(section_codes, field_name='code')
         
+        writer = EvaluationResultWriter(current_period)
         processed_count = 0
         processing_details = []
         
-        for staff_user in staff_users:
+        for staff_id, username, profile_section_id in staff_users:
             try:
-                # Check if this staff member has any evaluations in this period
-                evaluation_responses = EvaluationResponse.objects.filter(evaluatee=staff_user)
+                scores = evaluatee_scores.get(staff_id)
+                if not scores:
+                    processing_details.append(f"➖ No evaluations for {username}")
+                    continue
                 
-                if evaluation_responses.exists():
-                    # Process results for this staff member
-                    result = process_evaluation_results_for_user(staff_user, current_period)
-                    if result:
-                        processed_count += 1
-                        processing_details.append(f"✅ Processed {staff_user.username}: {result.total_percentage:.1f}% ({result.total_responses} evaluations)")
-                    else:
-                        processing_details.append(f"❌ Failed to process {staff_user.username}")
-                else:
-                    processing_details.append(f"➖ No evaluations for {staff_user.username}")
+                summary = scores['summary']
+                total_percentage = summary['flat_percentage'] if is_peer_evaluation else summary['total_percentage']
+                
+                # Profile section if set, otherwise the most common section in this period
+                section = profile_section_id or sections.get(scores['top_section'])
+                
+                writer.add_summary(
+                    staff_id,
+                    summary,
+                    section=section,
+                    peer=is_peer_evaluation,
+                    average_rating=total_percentage / 20
+                )
+                processed_count += 1
+                processing_details.append(f"✅ Processed {username}: {total_percentage:.1f}% ({summary['response_count']} evaluations)")
                     
             except Exception as e:
-                processing_details.append(f"❌ Error processing {staff_user.username}: {str(e)}")
+                processing_details.append(f"❌ Error processing {username}: {str(e)}")
+        
+        writer.write()
+        RankingService.snapshot_period(current_period)
+        AIRecommendationCacheService.invalidate_period(current_period)
+        ProfileDashboardService.build_for_staff()
         
         return {
             'success': True,
             'processed_count': processed_count,
-            'total_staff': staff_users.count(),
+            'total_staff': len(staff_users),
             'details': processing_details,
             'evaluation_period': current_period.name
         }
@@ -8690,7 +7400,7 @@ from main.services.import_export_service import AccountImportExportService
 
 @method_decorator(login_required(login_url='login'), name='dispatch')
 class ExportAccountsView(View):
-    """Export all accounts to Excel file."""
+    """Export all accounts to an Excel file, or CSV with ?format=csv."""
     
     def get(self, request):
         # Check if user is admin
@@ -8704,24 +7414,32 @@ class ExportAccountsView(View):
         except UserProfile.DoesNotExist:
             return HttpResponseForbidden("User profile not found. You do not have permission to export accounts.")
         
+        export_format = request.GET.get('format', 'xlsx').lower()
+        
         try:
-            # Generate Excel file
-            excel_file = AccountImportExportService.export_accounts_to_excel()
+            # Rows are generated while the response is being sent, so memory
+            # stays flat regardless of the number of accounts
+            if export_format == 'csv':
+                response = StreamingHttpResponse(
+                    AccountImportExportService.stream_accounts_csv(),
+                    content_type='text/csv; charset=utf-8'
+                )
+                response['Content-Disposition'] = 'attachment; filename="accounts_export.csv"'
+            else:
+                response = StreamingHttpResponse(
+                    AccountImportExportService.stream_accounts_excel(),
+                    content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                )
+                response['Content-Disposition'] = 'attachment; filename="accounts_export.xlsx"'
             
             # Log the export action
             log_admin_activity(
                 request=request,
                 action='export_accounts',
-                description='Exported all accounts to Excel file',
+                description=f'Exported all accounts to {"CSV" if export_format == "csv" else "Excel"} file',
                 target_user=None
             )
             
-            # Return file as download
-            response = HttpResponse(
-                excel_file.read(),
-                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-            )
-            response['Content-Disposition'] = 'attachment; filename="accounts_export.xlsx"'
             return response
             
         except Exception as e:
@@ -9033,6 +7751,45 @@ def reset_evaluation_questions(request):
         return redirect('main:manage_evaluation_questions')
 
 
+# ============================================
+# PROFILE SETTINGS DATA API
+# ============================================
+
+def _profile_dashboard_etag(request, tab):
+    """ETag for one tab of the user's dashboard, from its results-version stamp."""
+    user = request.user
+    if not user.is_authenticated or tab not in ProfileDashboardService.TABS:
+        return None
+    role = getattr(getattr(user, 'userprofile', None), 'role', None)
+    if role not in ProfileDashboardService.PROFILE_VIEWS:
+        return None
+    stamp = ProfileDashboardService.version(user, role)
+    if stamp is None:
+        return None
+    return hashlib.md5(f'{user.id}:{stamp}:{tab}'.encode('utf-8')).hexdigest()
+
+
+@login_required
+@require_http_methods(["GET"])
+@revalidate_privately
+@condition(etag_func=_profile_dashboard_etag)
+def api_profile_dashboard(request, tab):
+    """
+    One tab of the profile settings dashboard (summary, sections, peer,
+    irregular, overall, history) as JSON, loaded on demand by
+    static/js/profile_settings.js. A repeat request with a matching
+    If-None-Match costs one version lookup and returns 304.
+    """
+    role = getattr(getattr(request.user, 'userprofile', None), 'role', None)
+    if role not in ProfileDashboardService.PROFILE_VIEWS:
+        return JsonResponse({'error': 'Only faculty, coordinators, and deans have a dashboard'}, status=403)
+    try:
+        data = ProfileDashboardService.tab(request.user, tab, role)
+    except KeyError:
+        return JsonResponse({'error': f'Unknown tab: {tab}'}, status=404)
+    return JsonResponse(data, safe=False)
+
+
 # ============================================
 # EVALUATION HISTORY API ENDPOINTS
 # ============================================
@@ -9043,8 +7800,9 @@ def api_evaluation_history(request):
     """API endpoint to fetch user's evaluation history"""
     try:
         user = request.user
-        records = EvaluationHistory.objects.filter(
-            user=user
+        # Timeline summary rows are served by api_evaluation_history_timeline
+        records = HistoryTimelineService.without_summaries(
+            EvaluationHistory.objects.filter(user=user)
         ).select_related('evaluation_period').order_by('-archived_at')
         
         data = []
@@ -9075,6 +7833,43 @@ def api_evaluation_history(request):
         }, status=500)
 
 
+@login_required
+@require_http_methods(["GET"])
+def api_evaluation_history_timeline(request):
+    """
+    The user's evaluation history timeline, newest period first, served from
+    EvaluationHistory with keyset pagination. Pass ?cursor=<next_cursor> for
+    the next page and ?limit=N (max 50). The first page also carries a
+    compact trend series for charts.
+    """
+    try:
+        try:
+            limit = int(request.GET.get('limit') or 0) or None
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'limit must be a number'}, status=400)
+        cursor = request.GET.get('cursor') or None
+        
+        try:
+            page = HistoryTimelineService.page(request.user, cursor=cursor, limit=limit)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        
+        data = {
+            'success': True,
+            'entries': page['entries'],
+            'next_cursor': page['next_cursor'],
+        }
+        if cursor is None:
+            data['trend'] = HistoryTimelineService.trend(request.user)
+        return JsonResponse(data)
+    except Exception as e:
+        logger.error(f"Error fetching evaluation history timeline: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
 @login_required
 @require_http_methods(["GET"])
 def api_evaluation_history_detail(request, history_id):
@@ -9141,16 +7936,25 @@ def api_evaluation_history_by_period(request, period_id):
         except EvaluationPeriod.DoesNotExist:
             return JsonResponse({'success': False, 'error': 'Period not found'}, status=404)
 
+        # The user's archived rows for every period of this period's cycle, in one query
+        history_records = list(EvaluationCycleService.history_records(user, period))
+        period_records = [
+            record for record in history_records
+            if record.evaluation_period_id == period.id and record.evaluation_type == 'student'
+        ]
+        section_records = {}
+        for record in period_records:
+            if record.section_id is not None:
+                section_records.setdefault(record.section_id, record)
+
         # Build overall (student) from history if available, else compute
         overall_data = None
         try:
-            # Prefer archived overall (section is null)
-            hist_overall = EvaluationHistory.objects.filter(
-                user=user,
-                evaluation_period=period,
-                evaluation_type='student',
-                section__isnull=True
-            ).first()
+            # Prefer the archived timeline summary, then a real section-less result
+            hist_overall = (
+                next((record for record in period_records if record.is_summary), None)
+                or next((record for record in period_records if record.section_id is None), None)
+            )
             if hist_overall:
                 overall_data = {
                     'has_data': (hist_overall.total_responses or 0) > 0 or (hist_overall.total_percentage or 0) > 0,
@@ -9184,16 +7988,14 @@ def api_evaluation_history_by_period(request, period_id):
                 'average_rating': round(total/20, 2) if resp_count > 0 else 0.0
             }
 
-        # Peer overall: try matching peer history record for same month/year
+        # Peer overall: the peer history record of the same cycle
         peer_data = None
         try:
-            peer_hist = EvaluationHistory.objects.filter(
-                user=user,
-                evaluation_type='peer',
-                section__isnull=True,
-                period_start_date__month=period.start_date.month,
-                period_start_date__year=period.start_date.year
-            ).order_by('-period_start_date').first()
+            peer_hist = next(
+                (record for record in history_records
+                 if record.evaluation_type == 'peer' and record.section_id is None),
+                None
+            )
             if peer_hist:
                 peer_data = {
                     'has_data': (peer_hist.total_responses or 0) > 0 or (peer_hist.total_percentage or 0) > 0,
@@ -9216,12 +8018,7 @@ def api_evaluation_history_by_period(request, period_id):
         for assign in assigned_sections:
             sec = assign.section
             # Prefer archived per-section history
-            hist_section = EvaluationHistory.objects.filter(
-                user=user,
-                evaluation_period=period,
-                evaluation_type='student',
-                section=sec
-            ).first()
+            hist_section = section_records.get(sec.id)
             if hist_section:
                 has_data = (hist_section.total_responses or 0) > 0 or (hist_section.total_percentage or 0) > 0
                 sections_payload.append({
@@ -9645,23 +8442,247 @@ def compute_irregular_scores_for_period(user, period_or_periods):
     return {'has_data': False}
 
 
+def render_evaluation_report_pdf(user, period, all_period_ids):
+    """
+    Render the PDF report for an archived evaluation period and its related
+    periods: ranking, sections, peer, irregular and comments. Returns bytes.
+    Called by ReportArtifactStore, which keeps each rendered report on disk.
+    """
+    from io import BytesIO
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    
+    # Create PDF buffer
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    
+    # Container for PDF elements
+    story = []
+    styles = getSampleStyleSheet()
+    
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1a237e'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1a237e'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    )
+    
+    subheading_style = ParagraphStyle(
+        'CustomSubHeading',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor('#283593'),
+        spaceAfter=6,
+        fontName='Helvetica-Bold'
+    )
+    
+    # Title
+    story.append(Paragraph("Teacher Evaluation Report", title_style))
+    story.append(Paragraph(f"Evaluation Period: {period.name}", styles['Heading3']))
+    story.append(Paragraph(f"Instructor: {user.get_full_name() or user.username}", styles['Normal']))
+    
+    # Institute ranking for this period, read from the stored ranking snapshot
+    ranking_period = period if period.evaluation_type == 'student' else EvaluationPeriod.objects.filter(
+        id__in=all_period_ids, evaluation_type='student'
+    ).first()
+    if ranking_period:
+        ranking_data = calculate_user_ranking(user, ranking_period)
+        if ranking_data.get('rank'):
+            story.append(Paragraph(
+                f"Institute Ranking: {ranking_data['rank']} of {ranking_data['total_users']} "
+                f"({ranking_data['overall_score']}%)",
+                styles['Normal']
+            ))
+    story.append(Paragraph(f"Generated: {timezone.now().strftime('%B %d, %Y at %I:%M %p')}", styles['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Get assigned sections for this user
+    from main.models import SectionAssignment
+    assigned_sections = SectionAssignment.objects.filter(user=user).select_related('section')
+    
+    # ========== SECTION BREAKDOWN ==========
+    story.append(Paragraph("Section-wise Performance", heading_style))
+    
+    section_scores_list = []
+    for assignment in assigned_sections:
+        section = assignment.section
+        # Get responses across all periods
+        responses = EvaluationResponse.objects.filter(
+            evaluatee=user,
+            student_section=section.code,
+            evaluation_period__id__in=all_period_ids
+        ).exclude(evaluator__userprofile__role__in=[Role.FACULTY, Role.COORDINATOR, Role.DEAN])
+        
+        response_count = responses.count()
+        if response_count > 0:
+            # Calculate category scores manually
+            rating_values = {'Poor': 1, 'Unsatisfactory': 2, 'Satisfactory': 3, 'Very Satisfactory': 4, 'Outstanding': 5}
+            total_score = 0
+            for resp in responses:
+                resp_total = sum([rating_values.get(getattr(resp, f'question{i}'), 0) for i in range(1, 20)])
+                total_score += (resp_total / 95) * 100  # 19 questions * 5 = 95
+            
+            total_percentage = total_score / response_count if response_count > 0 else 0
+            
+            section_scores_list.append({
+                'section': section.code,
+                'score': total_percentage,
+                'responses': response_count
+            })
+    
+    if section_scores_list:
+        section_data = [['Section', 'Responses', 'Score', 'Rating']]
+        for item in sorted(section_scores_list, key=lambda x: x['score'], reverse=True):
+            rating = 'Outstanding' if item['score'] >= 90 else \
+                     'Very Satisfactory' if item['score'] >= 80 else \
+                     'Satisfactory' if item['score'] >= 70 else \
+                     'Needs Improvement'
+            section_data.append([
+                item['section'],
+                str(item['responses']),
+                f"{item['score']:.2f}%",
+                rating
+            ])
+        
+        section_table = Table(section_data, colWidths=[1.5*inch, 1.2*inch, 1.3*inch, 1.5*inch])
+        section_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#283593')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f5f5f5')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
+        ]))
+        story.append(section_table)
+    else:
+        story.append(Paragraph("No section evaluation data available.", styles['Normal']))
+    
+    story.append(Spacer(1, 0.3*inch))
+    
+    # ========== PEER EVALUATION ==========
+    story.append(Paragraph("Peer Evaluation Results", heading_style))
+    
+    peer_data = compute_peer_scores_for_period(user, all_period_ids)
+    
+    if peer_data['has_data']:
+        peer_table_data = [
+            ['Metric', 'Value'],
+            ['Number of Evaluators', str(peer_data['count'])],
+            ['Average Score', f"{peer_data['average']:.2f}%"],
+        ]
+        peer_table = Table(peer_table_data, colWidths=[3*inch, 2*inch])
+        peer_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e8f5e9')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ]))
+        story.append(peer_table)
+    else:
+        story.append(Paragraph("No peer evaluation data available.", styles['Normal']))
+    
+    story.append(Spacer(1, 0.3*inch))
+    
+    # ========== IRREGULAR STUDENT EVALUATION ==========
+    story.append(Paragraph("Irregular Student Evaluation Results", heading_style))
+    
+    irregular_data = compute_irregular_scores_for_period(user, all_period_ids)
+    
+    if irregular_data['has_data']:
+        irregular_table_data = [
+            ['Metric', 'Value'],
+            ['Number of Evaluators', str(irregular_data['count'])],
+            ['Average Score', f"{irregular_data['average']:.2f}%"],
+        ]
+        irregular_table = Table(irregular_table_data, colWidths=[3*inch, 2*inch])
+        irregular_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#fff3e0')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ]))
+        story.append(irregular_table)
+    else:
+        story.append(Paragraph("No irregular student evaluation data available.", styles['Normal']))
+    
+    story.append(Spacer(1, 0.2*inch))
+    
+    # ========== STUDENT COMMENTS ==========
+    story.append(PageBreak())
+    story.append(Paragraph("Student Comments", heading_style))
+    
+    # Get comments from regular student evaluations - ONLY from periods in all_period_ids
+    regular_comments = EvaluationResponse.objects.filter(
+        evaluatee=user,
+        evaluation_period__id__in=all_period_ids,
+        comments__isnull=False
+    ).exclude(comments='').exclude(
+        evaluator__userprofile__role__in=[Role.FACULTY, Role.COORDINATOR, Role.DEAN]
+    )
+    
+    # Get comments from irregular evaluations - ONLY from periods in all_period_ids
+    irregular_comments_qs = IrregularEvaluation.objects.filter(
+        evaluatee=user,
+        evaluation_period__id__in=all_period_ids,
+        comments__isnull=False
+    ).exclude(comments='')
+    
+    if regular_comments.exists() or irregular_comments_qs.exists():
+        comment_num = 1
+        for response in regular_comments:
+            clean_comment = re.sub('<[^<]+?>', '', response.comments)
+            story.append(Paragraph(f"<b>Comment {comment_num} [Student]:</b> {clean_comment}", styles['Normal']))
+            story.append(Spacer(1, 0.1*inch))
+            comment_num += 1
+        
+        for response in irregular_comments_qs:
+            clean_comment = re.sub('<[^<]+?>', '', response.comments)
+            story.append(Paragraph(f"<b>Comment {comment_num} [Irregular Student]:</b> {clean_comment}", styles['Normal']))
+            story.append(Spacer(1, 0.1*inch))
+            comment_num += 1
+    else:
+        story.append(Paragraph("No student comments provided.", styles['Normal']))
+    
+    # ========== FOOTER ==========
+    story.append(Spacer(1, 0.5*inch))
+    footer_style = ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.gray, alignment=TA_CENTER)
+    story.append(Paragraph(f"This report is confidential and generated from the Edulytics Evaluation System.", footer_style))
+    story.append(Paragraph(f"© {timezone.now().year} Edulytics. All rights reserved.", footer_style))
+    
+    # Build PDF
+    doc.build(story)
+    
+    return buffer.getvalue()
+
+
 @login_required
 def download_evaluation_history_pdf(request, period_id):
     """
-    Generate comprehensive PDF report for archived evaluation period
-    Shows same data as profile settings: Overall, Sections, Peer, Irregular, Comments, AI Recommendations
+    Download the PDF report for an archived evaluation period.
+    Shows same data as profile settings: Sections, Peer, Irregular, Comments.
+    The report is rendered once per data version and then sent from the
+    report artifact store (see ReportArtifactStore).
     """
     try:
-        from io import BytesIO
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        from django.http import HttpResponse
-        import re
-        
         user = request.user
         
         # Get the evaluation period
@@ -9671,237 +8692,12 @@ def download_evaluation_history_pdf(request, period_id):
         if not user.userprofile.role in [Role.FACULTY, Role.COORDINATOR, Role.DEAN]:
             return HttpResponse("Access denied", status=403)
         
-        # Find ALL periods with the same timestamp (e.g., "Student Evaluation" and "Peer Evaluation" for same date)
-        timestamp_match = re.search(r'((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}(?:\s+\d{1,2}:\d{2})?)', period.name)
-        
-        if timestamp_match:
-            timestamp_key = timestamp_match.group(1)
-            # Find all periods with this timestamp
-            related_periods = EvaluationPeriod.objects.filter(
-                name__icontains=timestamp_key,
-                is_active=False
-            )
-            all_period_ids = [p.id for p in related_periods]
-        else:
-            # No timestamp match, use single period
-            all_period_ids = [period_id]
-        
-        # Check if there's any data across ALL related periods
-        student_responses = EvaluationResponse.objects.filter(evaluatee=user, evaluation_period__id__in=all_period_ids)
-        irregular_responses = IrregularEvaluation.objects.filter(evaluatee=user, evaluation_period__id__in=all_period_ids)
-        
-        if not student_responses.exists() and not irregular_responses.exists():
+        report = ReportArtifactStore.open_report(user, period)
+        if report is None:
             return HttpResponse("No evaluation data found for this period", status=404)
         
-        # Create PDF buffer
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Container for PDF elements
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1a237e'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#1a237e'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
-        
-        subheading_style = ParagraphStyle(
-            'CustomSubHeading',
-            parent=styles['Heading3'],
-            fontSize=12,
-            textColor=colors.HexColor('#283593'),
-            spaceAfter=6,
-            fontName='Helvetica-Bold'
-        )
-        
-        # Title
-        story.append(Paragraph("Teacher Evaluation Report", title_style))
-        story.append(Paragraph(f"Evaluation Period: {period.name}", styles['Heading3']))
-        story.append(Paragraph(f"Instructor: {user.get_full_name() or user.username}", styles['Normal']))
-        story.append(Paragraph(f"Generated: {timezone.now().strftime('%B %d, %Y at %I:%M %p')}", styles['Normal']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Get assigned sections for this user
-        from main.models import SectionAssignment
-        assigned_sections = SectionAssignment.objects.filter(user=user).select_related('section')
-        
-        # ========== SECTION BREAKDOWN ==========
-        story.append(Paragraph("Section-wise Performance", heading_style))
-        
-        section_scores_list = []
-        for assignment in assigned_sections:
-            section = assignment.section
-            # Get responses across all periods
-            responses = EvaluationResponse.objects.filter(
-                evaluatee=user,
-                student_section=section.code,
-                evaluation_period__id__in=all_period_ids
-            ).exclude(evaluator__userprofile__role__in=[Role.FACULTY, Role.COORDINATOR, Role.DEAN])
-            
-            response_count = responses.count()
-            if response_count > 0:
-                # Calculate category scores manually
-                rating_values = {'Poor': 1, 'Unsatisfactory': 2, 'Satisfactory': 3, 'Very Satisfactory': 4, 'Outstanding': 5}
-                total_score = 0
-                for resp in responses:
-                    resp_total = sum([rating_values.get(getattr(resp, f'question{i}'), 0) for i in range(1, 20)])
-                    total_score += (resp_total / 95) * 100  # 19 questions * 5 = 95
-                
-                total_percentage = total_score / response_count if response_count > 0 else 0
-                
-                section_scores_list.append({
-                    'section': section.code,
-                    'score': total_percentage,
-                    'responses': response_count
-                })
-        
-        if section_scores_list:
-            section_data = [['Section', 'Responses', 'Score', 'Rating']]
-            for item in sorted(section_scores_list, key=lambda x: x['score'], reverse=True):
-                rating = 'Outstanding' if item['score'] >= 90 else \
-                         'Very Satisfactory' if item['score'] >= 80 else \
-                         'Satisfactory' if item['score'] >= 70 else \
-                         'Needs Improvement'
-                section_data.append([
-                    item['section'],
-                    str(item['responses']),
-                    f"{item['score']:.2f}%",
-                    rating
-                ])
-            
-            section_table = Table(section_data, colWidths=[1.5*inch, 1.2*inch, 1.3*inch, 1.5*inch])
-            section_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#283593')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f5f5f5')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
-            ]))
-            story.append(section_table)
-        else:
-            story.append(Paragraph("No section evaluation data available.", styles['Normal']))
-        
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== PEER EVALUATION ==========
-        story.append(Paragraph("Peer Evaluation Results", heading_style))
-        
-        peer_data = compute_peer_scores_for_period(user, all_period_ids)
-        
-        if peer_data['has_data']:
-            peer_table_data = [
-                ['Metric', 'Value'],
-                ['Number of Evaluators', str(peer_data['count'])],
-                ['Average Score', f"{peer_data['average']:.2f}%"],
-            ]
-            peer_table = Table(peer_table_data, colWidths=[3*inch, 2*inch])
-            peer_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e8f5e9')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ]))
-            story.append(peer_table)
-        else:
-            story.append(Paragraph("No peer evaluation data available.", styles['Normal']))
-        
-        story.append(Spacer(1, 0.3*inch))
-        
-        # ========== IRREGULAR STUDENT EVALUATION ==========
-        story.append(Paragraph("Irregular Student Evaluation Results", heading_style))
-        
-        irregular_data = compute_irregular_scores_for_period(user, all_period_ids)
-        
-        if irregular_data['has_data']:
-            irregular_table_data = [
-                ['Metric', 'Value'],
-                ['Number of Evaluators', str(irregular_data['count'])],
-                ['Average Score', f"{irregular_data['average']:.2f}%"],
-            ]
-            irregular_table = Table(irregular_table_data, colWidths=[3*inch, 2*inch])
-            irregular_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#fff3e0')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ]))
-            story.append(irregular_table)
-        else:
-            story.append(Paragraph("No irregular student evaluation data available.", styles['Normal']))
-        
-        story.append(Spacer(1, 0.2*inch))
-        
-        # ========== STUDENT COMMENTS ==========
-        story.append(PageBreak())
-        story.append(Paragraph("Student Comments", heading_style))
-        
-        # Get comments from regular student evaluations - ONLY from periods in all_period_ids
-        regular_comments = EvaluationResponse.objects.filter(
-            evaluatee=user,
-            evaluation_period__id__in=all_period_ids,
-            comments__isnull=False
-        ).exclude(comments='').exclude(
-            evaluator__userprofile__role__in=[Role.FACULTY, Role.COORDINATOR, Role.DEAN]
-        )
-        
-        # Get comments from irregular evaluations - ONLY from periods in all_period_ids
-        irregular_comments_qs = IrregularEvaluation.objects.filter(
-            evaluatee=user,
-            evaluation_period__id__in=all_period_ids,
-            comments__isnull=False
-        ).exclude(comments='')
-        
-        if regular_comments.exists() or irregular_comments_qs.exists():
-            comment_num = 1
-            for response in regular_comments:
-                clean_comment = re.sub('<[^<]+?>', '', response.comments)
-                story.append(Paragraph(f"<b>Comment {comment_num} [Student]:</b> {clean_comment}", styles['Normal']))
-                story.append(Spacer(1, 0.1*inch))
-                comment_num += 1
-            
-            for response in irregular_comments_qs:
-                clean_comment = re.sub('<[^<]+?>', '', response.comments)
-                story.append(Paragraph(f"<b>Comment {comment_num} [Irregular Student]:</b> {clean_comment}", styles['Normal']))
-                story.append(Spacer(1, 0.1*inch))
-                comment_num += 1
-        else:
-            story.append(Paragraph("No student comments provided.", styles['Normal']))
-        
-        # ========== FOOTER ==========
-        story.append(Spacer(1, 0.5*inch))
-        footer_style = ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.gray, alignment=TA_CENTER)
-        story.append(Paragraph(f"This report is confidential and generated from the Edulytics Evaluation System.", footer_style))
-        story.append(Paragraph(f"© {timezone.now().year} Edulytics. All rights reserved.", footer_style))
-        
-        # Build PDF
-        doc.build(story)
-        
-        # Return PDF response
-        buffer.seek(0)
-        response = HttpResponse(buffer, content_type='application/pdf')
         filename = f"Evaluation_Report_{user.username}_{period.name.replace(' ', '_')}.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        return response
+        return FileResponse(report, as_attachment=True, filename=filename, content_type='application/pdf')
         
     except EvaluationPeriod.DoesNotExist:
         return HttpResponse("Evaluation period not found", status=404)